@@ -0,0 +1,46 @@
+"""
+Line input for asyncio REPLs.
+
+`input()` blocks the event loop, so while a prompt waits no MCP messages are
+processed: no notifications, no background tool reloads, no other queries.
+AsyncLineReader reads stdin in a daemon thread and hands lines to the loop
+through a queue, so awaiting the next line leaves the loop running.
+
+A daemon thread is used rather than `loop.connect_read_pipe`. The pipe
+transport would put the terminal in non-blocking mode, which also affects
+stdout. The thread also works when stdin is a regular file.
+"""
+
+import asyncio
+import sys
+import threading
+from typing import Optional, TextIO
+
+
+class AsyncLineReader:
+    """Reads lines from a text stream (default: stdin) without blocking the event loop."""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self._stream = stream or sys.stdin
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lines: Optional[asyncio.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+
+    async def readline(self, prompt: str = "") -> Optional[str]:
+        """Print `prompt` and return the next line without its newline, or None at EOF."""
+        if self._thread is None:
+            self._loop = asyncio.get_running_loop()
+            self._lines = asyncio.Queue()
+            self._thread = threading.Thread(target=self._read, name="stdin-reader", daemon=True)
+            self._thread.start()
+        if prompt:
+            print(prompt, end="", flush=True)
+        return await self._lines.get()
+
+    def _read(self):
+        try:
+            for line in iter(self._stream.readline, ""):
+                self._loop.call_soon_threadsafe(self._lines.put_nowait, line.rstrip("\n"))
+            self._loop.call_soon_threadsafe(self._lines.put_nowait, None)
+        except RuntimeError:
+            pass  # The event loop was closed while waiting for input
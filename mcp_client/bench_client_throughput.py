@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark end-to-end MCPClient + MCP server throughput, offline.
+
+Queries go through MCPClient.process_query with the mock LLM backend (see
+llm_backends), so only the client, the transport and the server are
+measured. The mock's simulated latency and streaming rate can be set to
+model a real LLM. Each query ("What is i plus i+1?") makes one
+sum_two_numbers tool call and two completions. The numbers differ per
+query, so the result cache never answers.
+
+The server is a stdio server script (default: the calculator server) or the
+URL of an SSE server, so transports can be compared on the same tools.
+
+Usage: python bench_client_throughput.py [n] [--concurrency C] [--latency S]
+           [--tokens-per-second T] [--server PATH_OR_URL [ARGS...]]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import time
+
+from client import MCPClient
+from llm_backends import MockLLMBackend
+
+DEFAULT_SERVER = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "stdio_mcp_server", "calculator_mcp_server.py"
+)
+
+
+class TimedBackend:
+    """Wraps a backend, summing the time spent in completions."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.name = backend.name
+        self.seconds = 0.0
+
+    async def complete(self, model, messages, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await self.backend.complete(model=model, messages=messages, **kwargs)
+        finally:
+            self.seconds += time.perf_counter() - started
+
+
+async def run(args) -> None:
+    llm = TimedBackend(
+        MockLLMBackend(latency=args.latency, tokens_per_second=args.tokens_per_second)
+    )
+    client = MCPClient(llm=llm)
+    client.result_cache.default_ttl = 0
+
+    tool_seconds = 0.0
+    call_tool = client.call_tool
+
+    async def timed_call_tool(name, arguments):
+        nonlocal tool_seconds
+        started = time.perf_counter()
+        try:
+            return await call_tool(name, arguments)
+        finally:
+            tool_seconds += time.perf_counter() - started
+
+    client.call_tool = timed_call_tool
+
+    queries = asyncio.Queue()
+    for i in range(args.n):
+        queries.put_nowait(f"What is {i} plus {i + 1}?")
+    latencies = []
+
+    async def worker():
+        while not queries.empty():
+            query = queries.get_nowait()
+            started = time.perf_counter()
+            response, _ = await client.process_query(query)
+            latencies.append(time.perf_counter() - started)
+            if "Tool results" not in response:
+                raise RuntimeError(f"Unexpected response to {query!r}: {response}")
+
+    try:
+        # The client prints progress for every query; keep the table readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            await client.connect_to_server(args.server[0], args.server[1:] or None)
+            await timed_call_tool("sum_two_numbers", {"a": -1, "b": -1})  # warm-up
+            tool_seconds = 0.0
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - started
+    finally:
+        await client.clenup()
+
+    latencies.sort()
+    print(f"server:       {args.server[0]}")
+    print(
+        f"mock LLM:     latency {args.latency * 1000:.0f} ms,"
+        f" {args.tokens_per_second or 'unlimited'} tokens/s"
+    )
+    print(f"queries:      {args.n} at concurrency {args.concurrency}")
+    print(f"throughput:   {args.n / elapsed:.1f} queries/s")
+    print(
+        f"latency:      p50 {statistics.median(latencies) * 1000:.2f} ms,"
+        f" p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.2f} ms"
+    )
+    busy = sum(latencies)
+    print(
+        f"time split:   LLM {llm.seconds / busy:.0%}, tool calls {tool_seconds / busy:.0%},"
+        f" client {(busy - llm.seconds - tool_seconds) / busy:.0%}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("n", type=int, nargs="?", default=200)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0, help="mock LLM seconds per completion")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--server", nargs="+", default=[DEFAULT_SERVER])
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
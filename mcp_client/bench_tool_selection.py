@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark tool pre-selection (see tool_selection.py).
+
+Lists the tools of the combined stdio server and, for a set of sample
+queries, compares sending all tool definitions with sending the top-k picked
+by ToolSelector: prompt tokens of the tool payload, selection latency, and
+whether the tool the query needs was kept.
+
+With --live and OPENAI_API_KEY set, each query is also sent to the chat
+completions API both ways, reporting the prompt tokens billed and the
+response latency.
+
+Usage: python bench_tool_selection.py [top_k] [--live]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from tool_cache import to_openai_tools
+from tool_selection import ToolSelector
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+MODEL = "gpt-4o"
+SERVER_SCRIPT = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "stdio_mcp_server", "combined_mcp_server.py"
+)
+
+# Query -> the tool a model needs to answer it
+QUERIES = {
+    "What is 1234 plus 5678?": "sum_two_numbers",
+    "Multiply 12 by 34": "multiply_two_numbers",
+    "Evaluate the expression (15 * 8 + 20) / 4": "evaluate_expression",
+    "Compute the dot product of [1, 2, 3] and [4, 5, 6]": "dot_product",
+    "Give me a random image URL of 800x600": "generate_image_url",
+    "Render a 256x256 gradient PNG image": "render_image",
+    "Search dev.to for articles about rust": "search_articles",
+    "What are the popular tags on dev.to?": "get_tags",
+    "Publish a new article titled 'Hello' on dev.to": "create_article",
+    "Show the latency metrics of the calculator server": "calculator_server_stats",
+}
+
+
+def token_counter():
+    """Return (count(text), label): tiktoken for MODEL, else ~4 characters per token."""
+    if tiktoken is not None:
+        encoding = tiktoken.encoding_for_model(MODEL)
+        return (lambda text: len(encoding.encode(text))), "tiktoken"
+    return (lambda text: len(text) // 4), "estimated, chars/4"
+
+
+async def list_server_tools():
+    server = StdioServerParameters(
+        command=sys.executable, args=[SERVER_SCRIPT, "--auth-token", "bench"]
+    )
+    with open(os.devnull, "w") as devnull:
+        async with stdio_client(server, errlog=devnull) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                return (await session.list_tools()).tools
+
+
+async def live_completion(openai, query, tools):
+    started = time.perf_counter()
+    response = await openai.chat.completions.create(
+        model=MODEL,
+        messages=[{"role": "user", "content": query}],
+        tools=tools,
+        tool_choice="auto",
+    )
+    return response.usage.prompt_tokens, time.perf_counter() - started
+
+
+async def main():
+    args = [arg for arg in sys.argv[1:] if arg != "--live"]
+    top_k = int(args[0]) if args else 3
+    live = "--live" in sys.argv[1:]
+
+    tools = to_openai_tools(await list_server_tools())
+    count_tokens, counting = token_counter()
+
+    started = time.perf_counter()
+    selector = ToolSelector(tools)
+    index_ms = (time.perf_counter() - started) * 1000
+
+    print(f"{len(tools)} tools, top_k={top_k}, index built in {index_ms:.2f} ms")
+    print(f"Tool payload tokens ({counting})\n")
+    print(f"{'query':<52} {'all':>6} {'top-k':>6} {'select':>9}  expected tool kept")
+    print("-" * 90)
+
+    all_tokens = count_tokens(json.dumps(tools))
+    totals = {"selected": 0, "seconds": 0.0, "kept": 0}
+    selections = {}
+    for query, expected in QUERIES.items():
+        started = time.perf_counter()
+        selected = selector.select(query, top_k)
+        seconds = time.perf_counter() - started
+        selections[query] = selected
+
+        selected_tokens = count_tokens(json.dumps(selected))
+        kept = any(tool["function"]["name"] == expected for tool in selected)
+        totals["selected"] += selected_tokens
+        totals["seconds"] += seconds
+        totals["kept"] += kept
+        print(
+            f"{query[:52]:<52} {all_tokens:>6} {selected_tokens:>6}"
+            f" {seconds * 1e6:>7.0f}µs  {'yes' if kept else 'NO'}"
+        )
+
+    runs = len(QUERIES)
+    print("-" * 90)
+    print(
+        f"{'mean':<52} {all_tokens:>6} {totals['selected'] // runs:>6}"
+        f" {totals['seconds'] / runs * 1e6:>7.0f}µs  {totals['kept']}/{runs}"
+    )
+    print(f"\nTool payload reduced by {1 - totals['selected'] / (all_tokens * runs):.0%}")
+
+    if not live:
+        return
+    if not os.getenv("OPENAI_API_KEY"):
+        print("\n--live needs OPENAI_API_KEY; skipping chat completions")
+        return
+
+    from openai import AsyncOpenAI
+
+    openai = AsyncOpenAI()
+    print(f"\nChat completions ({MODEL}): prompt tokens and latency")
+    print(f"{'query':<52} {'all':>14} {'top-k':>14}")
+    print("-" * 82)
+    for query in QUERIES:
+        all_prompt, all_seconds = await live_completion(openai, query, tools)
+        top_prompt, top_seconds = await live_completion(openai, query, selections[query])
+        print(
+            f"{query[:52]:<52} {all_prompt:>6} {all_seconds * 1000:>5.0f}ms"
+            f" {top_prompt:>6} {top_seconds * 1000:>5.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Compare the stdio, SSE and Unix socket transports.
+
+All three run the combined server (stdio_mcp_server/combined_mcp_server.py),
+so only the transport differs. SSE and Unix socket servers are started once
+and shared by every client. Over stdio each client spawns its own server
+process, as a stdio server serves a single client.
+
+For each transport this prints:
+    - connect:    time to a completed `initialize`, including the process
+                  spawn for stdio
+    - p50 / p95:  latency of sequential sum_two_numbers calls on one session
+    - throughput: calls per second of several concurrent clients
+
+Usage: python bench_transports.py [calls] [--clients C]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+
+from unix_client import unix_client
+
+SERVER_SCRIPT = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "stdio_mcp_server", "combined_mcp_server.py"
+)
+SERVER_ARGS = [SERVER_SCRIPT, "--auth-token", "bench"]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_ready(process: subprocess.Popen, ready) -> None:
+    while not ready():
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with {process.returncode} during startup")
+        await asyncio.sleep(0.05)
+
+
+def port_open(port: int) -> bool:
+    with socket.socket() as sock:
+        return sock.connect_ex(("127.0.0.1", port)) == 0
+
+
+@asynccontextmanager
+async def session(transport: str, address: str):
+    if transport == "stdio":
+        server = StdioServerParameters(command=sys.executable, args=SERVER_ARGS)
+        with open(os.devnull, "w") as devnull:
+            async with stdio_client(server, errlog=devnull) as streams:
+                async with ClientSession(*streams) as client_session:
+                    await client_session.initialize()
+                    yield client_session
+        return
+
+    streams_context = sse_client(address) if transport == "sse" else unix_client(address)
+    async with streams_context as streams:
+        async with ClientSession(*streams) as client_session:
+            await client_session.initialize()
+            yield client_session
+
+
+@asynccontextmanager
+async def open_sessions(transport: str, address: str, count: int):
+    """`count` open sessions on the transport."""
+    async with AsyncExitStack() as stack:
+        yield [
+            await stack.enter_async_context(session(transport, address)) for _ in range(count)
+        ]
+
+
+async def measure(transport: str, address: str, calls: int, clients: int) -> dict:
+    connect_times = []
+    for _ in range(3):
+        started = time.perf_counter()
+        async with session(transport, address):
+            connect_times.append(time.perf_counter() - started)
+
+    latencies = []
+    async with session(transport, address) as client_session:
+        for i in range(calls):
+            started = time.perf_counter()
+            await client_session.call_tool("sum_two_numbers", {"a": i, "b": 1})
+            latencies.append(time.perf_counter() - started)
+    latencies.sort()
+
+    async def client(client_session: ClientSession, count: int):
+        for i in range(count):
+            await client_session.call_tool("sum_two_numbers", {"a": i, "b": 2})
+
+    async with open_sessions(transport, address, clients) as sessions:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(s, calls // clients) for s in sessions))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "connect": statistics.mean(connect_times),
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "throughput": (calls // clients) * clients / elapsed,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("calls", type=int, nargs="?", default=1000)
+    parser.add_argument("--clients", type=int, default=4)
+    args = parser.parse_args()
+
+    port = free_port()
+    socket_path = os.path.join(tempfile.mkdtemp(), "mcp.sock")
+    server_command = [sys.executable, *SERVER_ARGS]
+    servers = {
+        "sse": subprocess.Popen(
+            [*server_command, "--transport", "sse", "--host", "127.0.0.1", "--port", str(port)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        ),
+        "unix": subprocess.Popen(
+            [*server_command, "--transport", "unix", "--socket", socket_path],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        ),
+    }
+    addresses = {"stdio": None, "sse": f"http://127.0.0.1:{port}/sse", "unix": socket_path}
+    try:
+        await wait_until_ready(servers["sse"], lambda: port_open(port))
+        await wait_until_ready(servers["unix"], lambda: os.path.exists(socket_path))
+
+        print(f"{args.calls} calls, {args.clients} concurrent clients for throughput\n")
+        print(f"{'transport':<10} {'connect':>10} {'p50':>10} {'p95':>10} {'throughput':>14}")
+        print("-" * 58)
+        for transport, address in addresses.items():
+            result = await measure(transport, address, args.calls, args.clients)
+            print(
+                f"{transport:<10} {result['connect'] * 1000:>8.1f}ms"
+                f" {result['p50'] * 1000:>8.3f}ms {result['p95'] * 1000:>8.3f}ms"
+                f" {result['throughput']:>9.0f} /s"
+            )
+    finally:
+        for server in servers.values():
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""
+Okapi BM25 ranking over short, locally tokenized documents.
+
+Used by the dev.to server's article chunks (article_chunks.py) and, from an
+identical copy in mcp_client/ (see its tests/test_shared_modules.py), by the
+client's tool pre-selection. Both rank a few dozen documents per query, so
+the index is plain dicts, built once per document list:
+
+    index = BM25Index([tokenize(text) for text in documents])
+    scores = index.scores(tokenize(query))
+"""
+
+import math
+import re
+from collections import Counter
+from typing import AbstractSet, Dict, List, Sequence
+
+STOPWORDS = frozenset(
+    """a an and are as at be by can do does for from has have how i in is it its me my
+    of on or so that the this to we what when which with you your""".split()
+)
+
+
+def tokenize(
+    text: str, stopwords: AbstractSet[str] = STOPWORDS, split_camel_case: bool = False
+) -> List[str]:
+    """Lowercase word tokens without stopwords, with crude plural stemming.
+
+    With `split_camel_case`, "getArticleById" is read as "get article by id".
+    """
+    text = text or ""
+    if split_camel_case:
+        text = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", text)
+    tokens = []
+    for token in re.findall(r"[a-z0-9]+", text.lower()):
+        if token in stopwords or len(token) < 2:
+            continue
+        # So that "articles" matches "article"
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of tokenized documents."""
+
+    def __init__(self, documents: Sequence[Sequence[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.lengths = [len(document) for document in documents]
+        self.average_length = sum(self.lengths) / len(documents) if documents else 0.0
+
+        self.postings: Dict[str, List[tuple]] = {}
+        for index, document in enumerate(documents):
+            for term, frequency in Counter(document).items():
+                self.postings.setdefault(term, []).append((index, frequency))
+
+        count = len(documents)
+        self.idf = {
+            term: math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+
+    def scores(self, query: Sequence[str]) -> List[float]:
+        """The score of each document for `query`; repeated query terms count once."""
+        scores = [0.0] * len(self.lengths)
+        for term in set(query):
+            for index, frequency in self.postings.get(term, ()):
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[index] / self.average_length)
+                scores[index] += self.idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+        return scores
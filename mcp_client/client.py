@@ -1,20 +1,39 @@
 import asyncio
+import functools
+import itertools
+import os
 import sys
 import logging
 import json
 import re
+import time
 
 from typing import Optional
 from contextlib import AsyncExitStack
 
-from mcp import ClientSession, StdioServerParameters
+from mcp import ClientSession, StdioServerParameters, types
 from mcp.client.stdio import stdio_client
 from mcp.client.sse import sse_client
 
-from openai import AsyncOpenAI
-
 from dotenv import load_dotenv
 
+import fast_json
+from async_input import AsyncLineReader
+from llm_backends import create_backend
+from result_cache import ToolResultCache
+from tool_cache import ToolSchemaCache, server_fingerprint, source_stamp, to_openai_tools
+from tool_selection import ToolSelector
+from tracing import (
+    TracedClientSession,
+    configure_tracing,
+    flush_tracing,
+    server_environment,
+    set_span_attributes,
+    shutdown_tracing,
+    start_span,
+)
+from unix_client import socket_path_from_url, unix_client
+
 load_dotenv()
 
 # Set up logger
@@ -48,14 +67,38 @@ mcp_payload_logger.addHandler(mcp_payload_file_handler)
 mcp_payload_logger.propagate = False  # Don't propagate to parent logger
 
 
+def tool_result_text(result: types.CallToolResult) -> str:
+    """Tool result content as one string for the LLM, encoded once.
+
+    Text items are passed through; other items (images, resources) are
+    encoded as JSON.
+    """
+    return "\n".join(
+        item.text if isinstance(item, types.TextContent) else fast_json.dumps(item)
+        for item in result.content
+    )
+
+
 class MCPClient:
-    def __init__(self):
+    def __init__(self, llm=None):
         self.session: Optional[ClientSession] = None
         self.exit_stack = AsyncExitStack()
-        self.openai = AsyncOpenAI()
-        self.cached_tools = None  # Cache for available tools
-
-        logger.info("Initialized MCPClient with OpenAI as the LLM provider")
+        # Chat completions backend, see llm_backends (MCP_LLM_BACKEND)
+        self.llm = llm or create_backend()
+        self.openai_tools = None  # Tool definitions in OpenAI format
+        self.tool_annotations = {}  # Tool name -> MCP annotations (hints)
+        self.result_cache = ToolResultCache.from_env()  # Results of pure tools
+        # Send only the k most relevant tools per query (0: send all)
+        self.tool_top_k = int(os.getenv("MCP_TOOL_TOP_K", "0"))
+        self._tool_selector: Optional[ToolSelector] = None
+        self.tool_cache = ToolSchemaCache()  # Persisted across runs
+        self._server_id = None
+        self._server_source = None  # source_stamp of a local stdio server
+        self._server_label = None
+        self._tool_cache_key = None
+        self._tools_task: Optional[asyncio.Task] = None
+
+        logger.info(f"Initialized MCPClient with the {self.llm.name} LLM backend")
 
     async def connect_to_sse_server(self, server_url: str):
         """Connect to an SSE MCP server.
@@ -69,19 +112,49 @@ class MCPClient:
         self._streams_context = sse_client(url=server_url)
         streams = await self._streams_context.__aenter__()
 
-        self._session_context = ClientSession(*streams)
+        self._session_context = TracedClientSession(
+            *streams, message_handler=self._handle_server_message
+        )
         self.session: ClientSession = await self._session_context.__aenter__()
 
         # Initialize
-        await self.session.initialize()
+        init_result = await self.session.initialize()
 
-        # Load and cache tools
-        await self._load_and_cache_tools()
+        # Load tools, from the on-disk cache when possible
+        self._server_id = self._server_label = server_url
+        await self._load_tools(init_result.serverInfo)
         
         print(f"Connected to SSE MCP Server at {server_url}")
-        print(f"Available tools: {[tool['name'] for tool in self.cached_tools]}")
+        print(f"Available tools: {self.tool_names}")
+        logger.info(
+            f"Connected to SSE MCP Server at {server_url}. Available tools: {self.tool_names}"
+        )
+
+    async def connect_to_unix_server(self, server_url: str):
+        """Connect to an MCP server listening on a Unix socket.
+
+        Args:
+            server_url (str): unix:// URL of the socket, e.g. unix:///tmp/mcp.sock.
+        """
+        logger.debug(f"Connecting to Unix socket MCP server at {server_url}")
+
+        streams = await self.exit_stack.enter_async_context(
+            unix_client(socket_path_from_url(server_url))
+        )
+        self.session = await self.exit_stack.enter_async_context(
+            TracedClientSession(*streams, message_handler=self._handle_server_message)
+        )
+
+        init_result = await self.session.initialize()
+
+        # Load tools, from the on-disk cache when possible
+        self._server_id = self._server_label = server_url
+        await self._load_tools(init_result.serverInfo)
+
+        print(f"Connected to Unix socket MCP Server at {server_url}")
+        print(f"Available tools: {self.tool_names}")
         logger.info(
-            f"Connected to SSE MCP Server at {server_url}. Available tools: {[tool['name'] for tool in self.cached_tools]}"
+            f"Connected to Unix socket MCP Server at {server_url}. Available tools: {self.tool_names}"
         )
 
     async def connect_to_stdio_server(self, server_script_path: str, server_args: list = None):
@@ -116,7 +189,10 @@ class MCPClient:
 
             command = "python" if is_python else "node"
 
-        server_params = StdioServerParameters(command=command, args=args, env=None)
+        # Forward the tracing setup so server spans land in the same trace
+        server_params = StdioServerParameters(
+            command=command, args=args, env=server_environment() or None
+        )
 
         logger.debug(
             f"\n\nConnecting to stdio MCP server with command: {command} and args: {args}"
@@ -128,25 +204,33 @@ class MCPClient:
         )
         self.stdio, self.writer = stdio_transport
         self.session = await self.exit_stack.enter_async_context(
-            ClientSession(self.stdio, self.writer)
+            TracedClientSession(
+                self.stdio, self.writer, message_handler=self._handle_server_message
+            )
         )
 
-        await self.session.initialize()
+        init_result = await self.session.initialize()
 
-        # Load and cache tools
-        await self._load_and_cache_tools()
+        # Load tools, from the on-disk cache when possible. The cache entry
+        # is keyed by the full command line, but only the command and script
+        # are stored, so arguments such as tokens are not written to disk.
+        self._server_id = json.dumps([command, *args])
+        self._server_label = f"{command} {server_script_path}"
+        self._server_source = source_stamp(server_script_path)
+        await self._load_tools(init_result.serverInfo)
         
         print("Connected to stdio MCP Server")
-        print(f"Available tools: {[tool['name'] for tool in self.cached_tools]}")
+        print(f"Available tools: {self.tool_names}")
         logger.info(
-            f"Connected to stdio MCP Server. Available tools: {[tool['name'] for tool in self.cached_tools]}"
+            f"Connected to stdio MCP Server. Available tools: {self.tool_names}"
         )
 
     async def connect_to_server(self, server_path_or_url: str, server_args: list = None):
-        """Connect to an MCP server (either stdio or SSE).
+        """Connect to an MCP server (stdio, SSE or Unix socket).
 
         Args:
-            server_path_or_url (str): Path to the server script or URL of SSE server.
+            server_path_or_url (str): Path to the server script, URL of SSE server,
+                or unix:// URL of a Unix socket server.
             server_args (list, optional): Additional arguments to pass to stdio servers.
         """
         # Check if the input is a URL (for SSE server)
@@ -155,6 +239,8 @@ class MCPClient:
         if url_pattern.match(server_path_or_url):
             # It's a URL, connect to SSE server
             await self.connect_to_sse_server(server_path_or_url)
+        elif server_path_or_url.startswith("unix://"):
+            await self.connect_to_unix_server(server_path_or_url)
         else:
             # It's a script path, connect to stdio server
             await self.connect_to_stdio_server(server_path_or_url, server_args)
@@ -175,156 +261,241 @@ class MCPClient:
             raise RuntimeError("Client session is not initialized.")
 
         # Use cached tools instead of fetching them every time
-        if self.cached_tools is None:
+        if self.openai_tools is None:
             raise RuntimeError("Tools not cached. Make sure to connect to server first.")
 
         return await self._process_query_openai(
-            query, self.cached_tools, previous_messages
+            query, self.select_tools(query), previous_messages
+        )
+
+    def select_tools(self, query: str) -> list:
+        """Tools to offer the model for `query`: all, or the top-k by BM25 relevance."""
+        if not self.tool_top_k:
+            return self.openai_tools
+        if self._tool_selector is None or self._tool_selector.tools is not self.openai_tools:
+            self._tool_selector = ToolSelector(self.openai_tools)
+        selected = self._tool_selector.select(query, self.tool_top_k)
+        logger.info(
+            f"Selected {len(selected)} of {len(self.openai_tools)} tools: "
+            f"{[tool['function']['name'] for tool in selected]}"
         )
+        return selected
 
     async def _process_query_openai(
-        self, query: str, available_tools: list, previous_messages: list = None
+        self, query: str, openai_tools: list, previous_messages: list = None
     ) -> tuple[str, list]:
-        """Process a query using OpenAI's GPT models."""
-        model = "gpt-4o"
-
-        # Convert available_tools to OpenAI format
-        openai_tools = [
-            {
-                "type": "function",
-                "function": {
-                    "name": tool["name"],
-                    "description": tool["description"],
-                    "parameters": tool["input_schema"],
-                },
-            }
-            for tool in available_tools
-        ]
-
-        messages = []
-        if previous_messages:
-            messages.extend(previous_messages)
-
-        messages.append({"role": "user", "content": query})
+        """Process a query using OpenAI's GPT models.
 
-        mcp_payload_logger.info("=" * 50)
-        mcp_payload_logger.info("OPENAI REQUEST PAYLOAD:")
-        mcp_payload_logger.info(f"Model: {model}")
-        try:
-            mcp_payload_logger.info(f"Messages: {json.dumps(messages, indent=2, default=str)}")
-        except Exception:
-            mcp_payload_logger.info(f"Messages: {str(messages)}")
-        mcp_payload_logger.info(f"Tools: {json.dumps(openai_tools, indent=2)}")
-        mcp_payload_logger.info("=" * 50)
+        `openai_tools` are already in OpenAI format; they are converted once
+        when the tools are loaded, not on every query.
+        """
+        model = self.llm.model
 
-        logger.debug("Messages sent to OpenAI: %s", messages)
-        logger.debug("Available tools: %s", openai_tools)
+        with start_span("process_query", **{"gen_ai.request.model": model}):
+            messages = []
+            if previous_messages:
+                messages.extend(previous_messages)
 
-        # Initialize OpenAI API call
-        print(f"Sending query to {model}...")
-        logger.info(f"Sending query to {model}...")
-        response = await self.openai.chat.completions.create(
-            model=model, messages=messages, tools=openai_tools, tool_choice="auto"
-        )
+            messages.append({"role": "user", "content": query})
 
-        response_message = response.choices[0].message
-        
-        mcp_payload_logger.info("=" * 50)
-        mcp_payload_logger.info("OPENAI RESPONSE PAYLOAD:")
-        mcp_payload_logger.info(f"Content: {response_message.content}")
-        mcp_payload_logger.info(f"Tool Calls: {response_message.tool_calls}")
-        mcp_payload_logger.info("=" * 50)
-        
-        final_text = []
-
-        # Process tool calls if any
-        if response_message.tool_calls:
-            final_text.append(response_message.content or "")
-
-            # Add the assistant's response to messages
-            messages.append(
-                {
-                    "role": "assistant",
-                    "content": response_message.content,
-                    "tool_calls": response_message.tool_calls,
-                }
+            mcp_payload_logger.info("=" * 50)
+            mcp_payload_logger.info("OPENAI REQUEST PAYLOAD:")
+            mcp_payload_logger.info(f"Model: {model}")
+            try:
+                mcp_payload_logger.info(f"Messages: {fast_json.dumps(messages, indent=True)}")
+            except Exception:
+                mcp_payload_logger.info(f"Messages: {str(messages)}")
+            mcp_payload_logger.info(f"Tools: {fast_json.dumps(openai_tools, indent=True)}")
+            mcp_payload_logger.info("=" * 50)
+
+            logger.debug("Messages sent to OpenAI: %s", messages)
+            logger.debug("Available tools: %s", openai_tools)
+
+            # Initialize OpenAI API call
+            print(f"Sending query to {model}...")
+            logger.info(f"Sending query to {model}...")
+            response = await self._create_chat_completion(
+                model=model, messages=messages, tools=openai_tools, tool_choice="auto"
             )
 
-            for tool_call in response_message.tool_calls:
-                function_name = tool_call.function.name
-                function_args = json.loads(tool_call.function.arguments)
+            response_message = response.choices[0].message
+        
+            mcp_payload_logger.info("=" * 50)
+            mcp_payload_logger.info("OPENAI RESPONSE PAYLOAD:")
+            mcp_payload_logger.info(f"Content: {response_message.content}")
+            mcp_payload_logger.info(f"Tool Calls: {response_message.tool_calls}")
+            mcp_payload_logger.info("=" * 50)
+        
+            final_text = []
 
-                # Log the MCP request payload
-                mcp_payload_logger.info("=" * 50)
-                mcp_payload_logger.info("MCP TOOL REQUEST PAYLOAD:")
-                mcp_payload_logger.info(f"Tool Name: {function_name}")
-                mcp_payload_logger.info(f"Tool Arguments: {json.dumps(function_args, indent=2)}")
-                mcp_payload_logger.info("=" * 50)
+            # Process tool calls if any
+            if response_message.tool_calls:
+                final_text.append(response_message.content or "")
 
-                # Execute tool call
-                logger.debug(
-                    f"Calling tool {function_name} with args {function_args}..."
-                )
-                final_text.append(
-                    f"[Calling tool {function_name} with args {function_args}]"
+                # Add the assistant's response to messages
+                messages.append(
+                    {
+                        "role": "assistant",
+                        "content": response_message.content,
+                        "tool_calls": response_message.tool_calls,
+                    }
                 )
-                result = await self.session.call_tool(function_name, function_args)
+
+                for tool_call in response_message.tool_calls:
+                    function_name = tool_call.function.name
+                    function_args = fast_json.loads(tool_call.function.arguments)
+
+                    # Log the MCP request payload
+                    mcp_payload_logger.info("=" * 50)
+                    mcp_payload_logger.info("MCP TOOL REQUEST PAYLOAD:")
+                    mcp_payload_logger.info(f"Tool Name: {function_name}")
+                    mcp_payload_logger.info(f"Tool Arguments: {fast_json.dumps(function_args, indent=True)}")
+                    mcp_payload_logger.info("=" * 50)
+
+                    # Execute tool call
+                    logger.debug(
+                        f"Calling tool {function_name} with args {function_args}..."
+                    )
+                    final_text.append(
+                        f"[Calling tool {function_name} with args {function_args}]"
+                    )
+                    result = await self.call_tool(function_name, function_args)
                 
-                # Log the MCP response payload
-                mcp_payload_logger.info("=" * 50)
-                mcp_payload_logger.info("MCP TOOL RESPONSE PAYLOAD:")
-                mcp_payload_logger.info(f"Result Meta: {result.meta}")
-                mcp_payload_logger.info(f"Result Content: {result.content}")
-                mcp_payload_logger.info(f"Is Error: {result.isError}")
-                mcp_payload_logger.info("=" * 50)
+                    # Log the MCP response payload
+                    mcp_payload_logger.info("=" * 50)
+                    mcp_payload_logger.info("MCP TOOL RESPONSE PAYLOAD:")
+                    mcp_payload_logger.info(f"Result Meta: {result.meta}")
+                    mcp_payload_logger.info(f"Result Content: {result.content}")
+                    mcp_payload_logger.info(f"Is Error: {result.isError}")
+                    mcp_payload_logger.info("=" * 50)
                 
-                final_text.append(f"[tool results: {result}]")
+                    final_text.append(f"[tool results: {result}]")
+
+                    # Add tool result to messages
+                    messages.append(
+                        {
+                            "role": "tool",
+                            "tool_call_id": tool_call.id,
+                            "content": tool_result_text(result),
+                        }
+                    )
+
+                # Get the final response after tool calls
+                logger.debug("Getting next response from OpenAI...")
+                next_response = await self._create_chat_completion(
+                    model=model, messages=messages
+                )
 
-                # Add tool result to messages
+                logger.debug("Response from OpenAI: %s", next_response.choices[0].message)
+                final_text.append(next_response.choices[0].message.content)
                 messages.append(
                     {
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": result.content,
+                        "role": "assistant",
+                        "content": next_response.choices[0].message.content,
                     }
                 )
+            else:
+                final_text.append(response_message.content)
+
+            return "\n".join(final_text), messages
+
+    async def _create_chat_completion(self, model: str, **kwargs):
+        """Request a chat completion from the LLM backend inside a client span."""
+        with start_span(
+            f"chat {model}",
+            kind="client",
+            **{"gen_ai.system": self.llm.name, "gen_ai.request.model": model},
+        ):
+            response = await self.llm.complete(model=model, **kwargs)
+            if response.usage:
+                set_span_attributes(
+                    **{
+                        "gen_ai.usage.input_tokens": response.usage.prompt_tokens,
+                        "gen_ai.usage.output_tokens": response.usage.completion_tokens,
+                    }
+                )
+            return response
 
-            # Get the final response after tool calls
-            logger.debug("Getting next response from OpenAI...")
-            next_response = await self.openai.chat.completions.create(
-                model=model, messages=messages
-            )
+    async def call_tool(self, name: str, arguments: dict) -> types.CallToolResult:
+        """Call a tool on the connected MCP server.
 
-            logger.debug("Response from OpenAI: %s", next_response.choices[0].message)
-            final_text.append(next_response.choices[0].message.content)
-            messages.append(
-                {
-                    "role": "assistant",
-                    "content": next_response.choices[0].message.content,
-                }
-            )
-        else:
-            final_text.append(response_message.content)
+        Results of tools opted in to caching (see result_cache) are served
+        from memory for identical calls. When tracing is enabled, TracedClientSession sends the
+        current trace context in the request `_meta`, so the server span joins
+        this trace.
 
-        return "\n".join(final_text), messages
+        Args:
+            name (str): Name of the tool.
+            arguments (dict): Tool arguments.
+        """
+        if not self.session:
+            raise RuntimeError("Client session is not initialized.")
+
+        with start_span(f"tools/call {name}", kind="client", **{"mcp.tool.name": name}):
+            ttl = self.result_cache.ttl_for(name, self.tool_annotations.get(name))
+            if ttl:
+                key = self.result_cache.key(self._server_id, name, arguments)
+                cached = self.result_cache.get(key)
+                set_span_attributes(**{"mcp.result_cache.hit": cached is not None})
+                if cached is not None:
+                    logger.debug(f"Result cache hit for {name}")
+                    return cached
+
+            started = time.perf_counter()
+            result = await self.session.call_tool(name, arguments)
+            if ttl:
+                self.result_cache.put(key, result, ttl, time.perf_counter() - started)
+            return result
 
     async def chat_loop(self):
-        """Run an interactive chat loop with the server."""
-        previous_messages = []
+        """Run an interactive chat loop with the server.
+
+        Input is read without blocking the event loop and every query runs as
+        a task. Several queries can be in flight at once, and server
+        notifications and background tool reloads are handled between prompts.
+        A finished query adds its messages to the shared history. At EOF the
+        loop waits for queries still running; 'quit' cancels them.
+        """
+        history = []
+        in_flight: dict[int, asyncio.Task] = {}
+        query_ids = itertools.count(1)
+        reader = AsyncLineReader()
         print("Type your queries or 'quit' to exit.")
+        print("Queries run in the background; type 'jobs' to list them and")
+        print("'cancel <n>' or 'cancel all' to cancel them.")
         print("Type 'refresh' to clear conversation history.")
         print("Type 'refresh-tools' to reload tools from the server.")
-        print("Using OpenAI as the LLM provider.")
+        print("Type 'cache-stats' to show tool result cache statistics.")
+        print(f"Using the {self.llm.name} LLM backend.")
+
+        def finish(query_id: int, history_length: int, task: asyncio.Task):
+            del in_flight[query_id]
+            if task.cancelled():
+                print(f"\n[#{query_id}] Cancelled.")
+            elif task.exception():
+                logger.error("Error in query #%d", query_id, exc_info=task.exception())
+                print(f"\n[#{query_id}] Error:", str(task.exception()))
+            else:
+                response, messages = task.result()
+                history.extend(messages[history_length:])
+                print(f"\n[#{query_id}] Response:", response)
 
-        while True:
-            try:
-                query = input("\nQuery: ").strip()
+        try:
+            while True:
+                line = await reader.readline("\nQuery: ")
+                if line is None:
+                    # End of input: let the submitted queries finish
+                    await asyncio.gather(*in_flight.values(), return_exceptions=True)
+                    break
+                query = line.strip()
+                if not query:
+                    continue
                 if query.lower() == "quit":
                     break
 
                 #  Check if the user wants to refresh conversation (history)
                 if query.lower() == "refresh":
-                    previous_messages = []
+                    history.clear()
                     print("Conversation history cleared.")
                     continue
 
@@ -333,26 +504,110 @@ class MCPClient:
                     try:
                         await self.refresh_tools_cache()
                         print("Tools cache refreshed successfully.")
-                        print(f"Available tools: {[tool['name'] for tool in self.cached_tools]}")
+                        print(f"Available tools: {self.tool_names}")
                     except Exception as e:
                         print(f"Failed to refresh tools cache: {str(e)}")
                     continue
 
-                response, previous_messages = await self.process_query(
-                    query, previous_messages=previous_messages
+                if query.lower() == "cache-stats":
+                    print(json.dumps(self.result_cache.stats(), indent=2))
+                    continue
+
+                if query.lower() == "jobs":
+                    for query_id, task in in_flight.items():
+                        print(f"[#{query_id}] {task.get_name()}")
+                    if not in_flight:
+                        print("No queries in flight.")
+                    continue
+
+                if query.lower().split()[0] == "cancel":
+                    target = query.split()[1:2]
+                    if target == ["all"]:
+                        ids = list(in_flight)
+                    elif target and target[0].lstrip("#").isdigit():
+                        ids = [int(target[0].lstrip("#"))]
+                    else:
+                        print("Usage: cancel <n> | cancel all")
+                        continue
+                    for query_id in ids:
+                        if query_id in in_flight:
+                            in_flight[query_id].cancel()
+                        else:
+                            print(f"No query #{query_id} in flight.")
+                    continue
+
+                query_id = next(query_ids)
+                task = asyncio.create_task(
+                    self.process_query(query, previous_messages=list(history)), name=query
                 )
-                print("\nResponse:", response)
-            except Exception as e:
-                logger.exception("Error in chat loop")
-                print("Error:", str(e))
+                in_flight[query_id] = task
+                task.add_done_callback(functools.partial(finish, query_id, len(history)))
+                print(f"[#{query_id}] Started.")
+        finally:
+            for task in list(in_flight.values()):
+                task.cancel()
+            await asyncio.gather(*in_flight.values(), return_exceptions=True)
 
     async def clenup(self):
         """Clean up resources."""
+        if self._tools_task:
+            self._tools_task.cancel()
         await self.exit_stack.aclose()
         if hasattr(self, "_session_context") and self._session_context:
             await self._session_context.__aexit__(None, None, None)
         if hasattr(self, "_streams_context") and self._streams_context:
             await self._streams_context.__aexit__(None, None, None)
+        # Spans are exported in batches; write out the last one
+        flush_tracing()
+
+    @property
+    def tool_names(self) -> list:
+        return [tool["function"]["name"] for tool in self.openai_tools or []]
+
+    async def _load_tools(self, server_info: types.Implementation):
+        """Load tools from the on-disk cache, falling back to the server.
+
+        On a cache hit the cached tools are usable right away, and
+        `tools/list` revalidates them in the background.
+        """
+        self._tool_cache_key = server_fingerprint(
+            self._server_id, server_info, self._server_source
+        )
+        cached = self.tool_cache.get(self._tool_cache_key)
+        if cached is None:
+            await self._load_and_cache_tools()
+            return
+
+        self.openai_tools = cached["tools"]
+        self.tool_annotations = cached.get("annotations", {})
+        logger.info(
+            f"Loaded {len(self.openai_tools)} tools from {self.tool_cache.path}; revalidating"
+        )
+        self._schedule_tools_reload()
+
+    def _schedule_tools_reload(self):
+        """Reload the tools in the background, replacing a reload in progress."""
+        if self._tools_task and not self._tools_task.done():
+            self._tools_task.cancel()
+        self._tools_task = asyncio.create_task(self._reload_tools())
+
+    async def _reload_tools(self):
+        try:
+            await self._load_and_cache_tools()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Failed to reload tools from the server")
+
+    async def _handle_server_message(self, message):
+        """Session message handler; reloads the tools on `tools/list_changed`."""
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root, types.ToolListChangedNotification
+        ):
+            logger.info("Server tool list changed; reloading tools")
+            self.result_cache.clear()
+            # Not awaited here: the response is read by this same receive loop
+            self._schedule_tools_reload()
 
     async def _load_and_cache_tools(self):
         """Load tools from the MCP server and cache them."""
@@ -372,17 +627,26 @@ class MCPClient:
             mcp_payload_logger.info(f"  Input Schema: {tool.inputSchema}")
         mcp_payload_logger.info("=" * 50)
         
-        # Cache the tools in the format needed for OpenAI
-        self.cached_tools = [
-            {
-                "name": tool.name,
-                "description": tool.description,
-                "input_schema": dict(tool.inputSchema) if tool.inputSchema else {},
-            }
+        # Cache the tools in the format needed for OpenAI, in memory and on disk
+        self.openai_tools = to_openai_tools(response.tools)
+        self.tool_annotations = {
+            tool.name: tool.annotations.model_dump(exclude_none=True)
             for tool in response.tools
-        ]
+            if tool.annotations
+        }
+        if self._tool_cache_key:
+            try:
+                if self.tool_cache.put(
+                    self._tool_cache_key,
+                    self._server_label,
+                    self.openai_tools,
+                    self.tool_annotations,
+                ):
+                    logger.info(f"Updated tool cache entry in {self.tool_cache.path}")
+            except OSError as e:
+                logger.warning(f"Could not write tool cache {self.tool_cache.path}: {e}")
         
-        logger.info(f"Cached {len(self.cached_tools)} tools")
+        logger.info(f"Cached {len(self.openai_tools)} tools")
 
     async def refresh_tools_cache(self):
         """Refresh the cached tools by fetching them again from the server."""
@@ -399,17 +663,21 @@ async def main():
         print("  - stdio server (python): python client.py ./weather.py")
         print("  - stdio server with args: python client.py ./dev_blog_server.py --auth-token YOUR_TOKEN")
         print("  - SSE server: python client.py http://localhost:3000/mcp")
+        print("  - Unix socket server: python client.py unix:///tmp/mcp.sock")
         sys.exit(1)
 
     server_path_or_url = sys.argv[1]
     server_args = sys.argv[2:] if len(sys.argv) > 2 else None
 
+    configure_tracing()
+
     client = MCPClient()
     try:
         await client.connect_to_server(server_path_or_url, server_args)
         await client.chat_loop()
     finally:
         await client.clenup()
+        shutdown_tracing()
         print("\nMCP Client Closed!")
 
 
@@ -0,0 +1,58 @@
+"""
+Fast JSON encoding for the MCP client.
+
+Tool arguments, payload logs and cache keys are encoded with orjson when it
+is installed (`uv sync --extra fast-json`). Otherwise they fall back to
+pydantic_core, which is installed with mcp and openai. The standard library
+is used only for sorted keys, which pydantic_core does not support. Objects
+JSON does not know are encoded as pydantic models or with str().
+"""
+
+import json
+from typing import Any, Union
+
+import pydantic_core
+
+try:
+    import orjson
+except ImportError:  # fast-json is an optional extra
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if hasattr(value, "model_dump"):  # pydantic models, e.g. MCP content
+        return value.model_dump(mode="json", exclude_none=True)
+    return str(value)
+
+
+def dumps(value: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    """JSON for `value`: compact, or indented by two spaces."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(value, default=_default, option=option).decode()
+        except TypeError:  # orjson.JSONEncodeError, e.g. an integer wider than 64 bits
+            pass
+    if sort_keys:
+        return json.dumps(
+            value,
+            default=_default,
+            ensure_ascii=False,
+            indent=2 if indent else None,
+            separators=None if indent else (",", ":"),
+            sort_keys=True,
+        )
+    # pydantic_core serializes models itself, without calling _default
+    return pydantic_core.to_json(
+        value, indent=2 if indent else None, fallback=_default, exclude_none=True
+    ).decode()
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return pydantic_core.from_json(data)
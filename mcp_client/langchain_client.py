@@ -1,9 +1,19 @@
 import asyncio
+import functools
+import json
 import os
+from typing import Any, List, Optional
 from dotenv import load_dotenv
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, convert_to_openai_messages
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from langgraph.prebuilt import create_react_agent
+from async_input import AsyncLineReader
+from llm_backends import create_backend
 from logging_utils import create_logger
+from server_config import default_server_config, mcp_dir
 
 # Load environment variables
 load_dotenv()
@@ -11,32 +21,11 @@ load_dotenv()
 # Initialize logger
 logger = create_logger()
 
-mcp_dir = os.path.dirname(os.path.abspath(__file__)) + "/../stdio_mcp_server"
 dev_blog_auth_token = os.getenv("DEV_BLOG_AUTH_TOKEN", "")
 
 print(f"Using MCP directory: {mcp_dir}")
 
-server_config = {
-    "math": {
-        "command": "python",
-        "args": [f"{mcp_dir}/calculator_mcp_server.py"],
-        "transport": "stdio",
-    },
-    "image-generation": {
-        "command": "python",
-        "args": [f"{mcp_dir}/image_generator_mcp_server.py"],
-        "transport": "stdio",
-    },
-    "dev-blog": {
-        "command": "python",
-        "args": [
-            f"{mcp_dir}/dev_blog_mcp_server.py",
-            "--auth-token",
-            dev_blog_auth_token,
-        ],
-        "transport": "stdio",
-    },
-}
+server_config = default_server_config(dev_blog_auth_token)
 
 
 def create_mcp_client() -> MultiServerMCPClient:
@@ -68,13 +57,62 @@ async def discover_available_tools(client: MultiServerMCPClient) -> list:
         raise
 
 
+class BackendChatModel(BaseChatModel):
+    """LangChain chat model over an llm_backends backend, such as the mock one."""
+
+    backend: Any
+    model_name: str = "gpt-4o-mini"
+
+    @property
+    def _llm_type(self) -> str:
+        return f"mcp-{self.backend.name}"
+
+    def bind_tools(self, tools: list, **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, **kwargs):
+        return asyncio.run(self._agenerate(messages, stop, **kwargs))
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        response = await self.backend.complete(
+            model=self.model_name, messages=convert_to_openai_messages(messages), **kwargs
+        )
+        message = response.choices[0].message
+        tool_calls = [
+            {
+                "name": call.function.name,
+                "args": json.loads(call.function.arguments),
+                "id": call.id,
+            }
+            for call in message.tool_calls or []
+        ]
+        return ChatResult(
+            generations=[
+                ChatGeneration(message=AIMessage(content=message.content or "", tool_calls=tool_calls))
+            ]
+        )
+
+
 def create_langchain_agent(tools: list, model_name: str = "gpt-4o-mini"):
-    """Create a React agent with the specified model and tools."""
+    """Create a React agent with the specified model and tools.
+
+    With MCP_LLM_BACKEND set to a backend other than openai (see
+    llm_backends), the agent runs on that backend instead of model_name.
+    """
     logger.log_step(4, f"Creating React Agent with {model_name}...")
 
     try:
+        model = model_name
+        if os.getenv("MCP_LLM_BACKEND", "openai") != "openai":
+            model = BackendChatModel(backend=create_backend(), model_name=model_name)
         agent = create_react_agent(
-            model=model_name,
+            model=model,
             tools=tools,
             prompt="You are a helpful assistant that can use tools to answer questions.",
             debug=False,
@@ -163,7 +201,12 @@ def display_final_results(messages: list, original_query: str, query_number: int
 
 
 async def run_interactive_chat(agent):
-    """Run an interactive chat loop where user can send multiple queries."""
+    """Run an interactive chat loop where user can send multiple queries.
+
+    Input is read without blocking the event loop, and each query runs as a
+    task, so several can be in flight at once. A finished query adds its
+    messages to the conversation history.
+    """
     print("\n" + "🚀" * 30)
     print("🤖 INTERACTIVE LANGCHAIN MCP CHAT")
     print("🚀" * 30)
@@ -174,11 +217,42 @@ async def run_interactive_chat(agent):
 
     query_number = 1
     conversation_history = []  # Initialize conversation history
-
-    while True:
+    in_flight = {}  # Query number -> task
+    reader = AsyncLineReader()
+
+    async def run_query(user_input: str, query_number: int):
+        # Each query works on a copy, so concurrent queries don't overwrite
+        # each other's history; its new messages are appended when done
+        history = list(conversation_history)
+        known = len(history)
         try:
+            response = await execute_query(agent, user_input, history, query_number)
+
+            # Analyze and display results
+            messages = analyze_conversation_flow(response, query_number)
+            display_final_results(messages, user_input, query_number)
+            conversation_history.extend(history[known:])
+        except Exception as e:
+            print(f"\n❌ Error processing query #{query_number}: {e}")
+            logger.log_chat_error(str(e))
+
+    def finish(query_number: int, task: asyncio.Task):
+        # A done callback rather than a `finally` in run_query: a task
+        # cancelled before its first step never runs its body
+        del in_flight[query_number]
+        if task.cancelled():
+            print(f"\n🛑 Query #{query_number} cancelled")
+
+    try:
+        while True:
             # Get user input
-            user_input = input(f"\n💬 Query #{query_number}: ").strip()
+            user_input = await reader.readline(f"\n💬 Query #{query_number}: ")
+            if user_input is None:
+                # End of input: let the submitted queries finish
+                await asyncio.gather(*in_flight.values(), return_exceptions=True)
+                logger.log_chat_session_end("eof")
+                break
+            user_input = user_input.strip()
 
             # Handle special commands
             if user_input.lower() in ["quit", "exit", "q"]:
@@ -189,34 +263,57 @@ async def run_interactive_chat(agent):
             if user_input.lower() == "help":
                 print("\n📚 Available commands:")
                 print("  - Type any question to get an answer")
+                print("  - 'jobs' - List the queries in flight")
+                print("  - 'cancel <n>' or 'cancel all' - Cancel queries in flight")
                 print("  - 'quit', 'exit', 'q' - End the chat")
                 print("  - 'help' - Show this help message")
                 continue
 
-            if not user_input:
-                print("❌ Please enter a question or command")
+            if user_input.lower() == "jobs":
+                for number, task in in_flight.items():
+                    print(f"  #{number}: {task.get_name()}")
+                if not in_flight:
+                    print("  No queries in flight")
                 continue
 
-            # Execute the query with conversation history
-            response = await execute_query(
-                agent, user_input, conversation_history, query_number
-            )
+            if user_input.lower().startswith("cancel"):
+                target = user_input.split()[1:2]
+                if target == ["all"]:
+                    numbers = list(in_flight)
+                elif target and target[0].lstrip("#").isdigit():
+                    numbers = [int(target[0].lstrip("#"))]
+                else:
+                    print("❌ Usage: cancel <n> | cancel all")
+                    continue
+                for number in numbers:
+                    if number in in_flight:
+                        in_flight[number].cancel()
+                    else:
+                        print(f"❌ No query #{number} in flight")
+                continue
 
-            # Analyze and display results
-            messages = analyze_conversation_flow(response, query_number)
-            display_final_results(messages, user_input, query_number)
+            if not user_input:
+                print("❌ Please enter a question or command")
+                continue
 
-            # Conversation history is now automatically updated in execute_query
+            # Execute the query in the background with conversation history
+            task = asyncio.create_task(run_query(user_input, query_number), name=user_input)
+            in_flight[query_number] = task
+            task.add_done_callback(functools.partial(finish, query_number))
             query_number += 1
 
-        except KeyboardInterrupt:
-            print("\n\n👋 Chat interrupted by user (Ctrl+C)")
-            logger.log_chat_session_end("interrupt")
-            break
-        except Exception as e:
-            print(f"\n❌ Error processing query: {e}")
-            logger.log_chat_error(str(e))
-            continue
+    except KeyboardInterrupt:
+        print("\n\n👋 Chat interrupted by user (Ctrl+C)")
+        logger.log_chat_session_end("interrupt")
+    except asyncio.CancelledError:
+        # asyncio.run() cancels the main task on Ctrl+C; let the cancellation through
+        print("\n\n👋 Chat interrupted by user (Ctrl+C)")
+        logger.log_chat_session_end("interrupt")
+        raise
+    finally:
+        for task in list(in_flight.values()):
+            task.cancel()
+        await asyncio.gather(*in_flight.values(), return_exceptions=True)
 
 
 async def main():
@@ -244,4 +341,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,277 @@
+"""
+Pluggable chat completion backends for the MCP clients.
+
+    - openai: the OpenAI chat completions API (default)
+    - mock:   MockLLMBackend, a local and deterministic stand-in that needs no
+              network or API key, for profiling and load-testing the client
+              and MCP servers in isolation
+
+Select the backend with MCP_LLM_BACKEND. The mock backend is configured with:
+
+    - MCP_MOCK_LLM_SCRIPT:            JSON file of rules (see MockLLMBackend),
+                                      instead of the built-in calculator rules
+    - MCP_MOCK_LLM_LATENCY:           seconds before the first token (default 0)
+    - MCP_MOCK_LLM_TOKENS_PER_SECOND: streaming rate of the reply tokens
+                                      (default 0: no delay per token)
+
+Both backends return openai `ChatCompletion` objects, so callers handle them
+the same way.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from openai.types import CompletionUsage
+from openai.types.chat import ChatCompletion, ChatCompletionMessage
+from openai.types.chat.chat_completion import Choice
+from openai.types.chat.chat_completion_message_tool_call import (
+    ChatCompletionMessageToolCall,
+    Function,
+)
+
+BACKENDS = ("openai", "mock")
+
+_NUMBER = r"-?\d+(?:\.\d+)?"
+
+# Built-in mock rules, matching the calculator and image generator tools
+DEFAULT_RULES = [
+    {
+        "match": r"image.*?(?P<width>\d+)\s*x\s*(?P<height>\d+)",
+        "tool_calls": [
+            {"name": "generate_image_url", "arguments": {"width": "{width}", "height": "{height}"}}
+        ],
+    },
+    {
+        "match": rf"(?P<a>{_NUMBER})\s*(?:\+|plus)\s*(?P<b>{_NUMBER})",
+        "tool_calls": [{"name": "sum_two_numbers", "arguments": {"a": "{a}", "b": "{b}"}}],
+    },
+    {
+        "match": rf"(?P<a>{_NUMBER})\s*(?:-|minus)\s*(?P<b>{_NUMBER})",
+        "tool_calls": [{"name": "subtract_two_numbers", "arguments": {"a": "{a}", "b": "{b}"}}],
+    },
+    {
+        "match": rf"(?P<a>{_NUMBER})\s*(?:\*|x|times)\s*(?P<b>{_NUMBER})",
+        "tool_calls": [{"name": "multiply_two_numbers", "arguments": {"a": "{a}", "b": "{b}"}}],
+    },
+]
+
+
+def _estimate_tokens(value: Any) -> int:
+    return max(1, len(json.dumps(value, default=str)) // 4)
+
+
+def _fill(value: Any, groups: Dict[str, str]) -> Any:
+    """Substitute "{group}" placeholders in rule arguments with regex groups.
+
+    A value that is a single placeholder takes the group's JSON value, so
+    "{a}" with a=12 becomes the number 12.
+    """
+    if isinstance(value, dict):
+        return {key: _fill(item, groups) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_fill(item, groups) for item in value]
+    if isinstance(value, str):
+        placeholder = re.fullmatch(r"\{(\w+)\}", value)
+        if placeholder and placeholder.group(1) in groups:
+            raw = groups[placeholder.group(1)]
+            try:
+                return json.loads(raw)
+            except ValueError:
+                return raw
+        return re.sub(r"\{(\w+)\}", lambda m: groups.get(m.group(1), m.group(0)), value)
+    return value
+
+
+def _message_field(message: Any, field: str) -> Any:
+    if isinstance(message, dict):
+        return message.get(field)
+    return getattr(message, field, None)
+
+
+class OpenAIBackend:
+    """The OpenAI chat completions API."""
+
+    name = "openai"
+
+    def __init__(self, client: Any = None, model: str = "gpt-4o"):
+        from openai import AsyncOpenAI
+
+        self.client = client or AsyncOpenAI()
+        self.model = model  # Default model for MCPClient
+
+    async def complete(self, model: str, messages: List[Any], **kwargs: Any) -> ChatCompletion:
+        return await self.client.chat.completions.create(model=model, messages=messages, **kwargs)
+
+
+class MockLLMBackend:
+    """Scripted chat completions with simulated latency and token streaming.
+
+    On a user turn the latest user message is matched against `rules` in
+    order. The first rule whose "match" regex is found emits its
+    "tool_calls", with "{group}" placeholders in the arguments filled in from
+    the regex groups. A rule with "reply" answers with that text instead.
+    Rules naming tools that were not offered are skipped. When no rule
+    applies, the reply is `default_reply`.
+
+    After tool results the reply lists them, so each query takes the same
+    two completions as with a real model. For example:
+
+        {"rules": [{"match": "tags", "tool_calls": [{"name": "get_tags", "arguments": {}}]}],
+         "default_reply": "I don't know."}
+
+    Replies are streamed word by word to `on_token`, after `latency`
+    seconds and at `tokens_per_second` (0: no delay per token). `model` is
+    the model name MCPClient requests, and so the one its spans record.
+    """
+
+    name = "mock"
+
+    def __init__(
+        self,
+        rules: Optional[List[Dict[str, Any]]] = None,
+        default_reply: str = "This is a mock response.",
+        latency: float = 0.0,
+        tokens_per_second: float = 0.0,
+        on_token: Optional[Callable[[str], None]] = None,
+        model: str = "mock",
+    ):
+        self.rules = [
+            {**rule, "pattern": re.compile(rule["match"], re.IGNORECASE)}
+            for rule in (DEFAULT_RULES if rules is None else rules)
+        ]
+        self.default_reply = default_reply
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.on_token = on_token
+        self.model = model
+
+        self.calls = 0
+        self._ids = itertools.count(1)
+
+    @classmethod
+    def from_env(cls) -> "MockLLMBackend":
+        """Build a mock backend from the MCP_MOCK_LLM_* environment variables."""
+        script: Dict[str, Any] = {}
+        script_path = os.getenv("MCP_MOCK_LLM_SCRIPT")
+        if script_path:
+            with open(script_path) as file:
+                script = json.load(file)
+        return cls(
+            rules=script.get("rules"),
+            default_reply=script.get("default_reply", "This is a mock response."),
+            latency=float(os.getenv("MCP_MOCK_LLM_LATENCY", "0")),
+            tokens_per_second=float(os.getenv("MCP_MOCK_LLM_TOKENS_PER_SECOND", "0")),
+        )
+
+    async def complete(
+        self,
+        model: str,
+        messages: List[Any],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs: Any,
+    ) -> ChatCompletion:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        content, tool_calls = None, None
+        last = messages[-1] if messages else {}
+        if _message_field(last, "role") == "tool":
+            content = self._summarize_tool_results(messages)
+        else:
+            tool_calls = self._match_tool_calls(_message_field(last, "content") or "", tools)
+            if tool_calls is None:
+                content = self._match_reply(_message_field(last, "content") or "")
+
+        prompt_tokens = _estimate_tokens([messages, tools or []])
+        completion_tokens = await self._stream(content) if content else 0
+        if tool_calls:
+            completion_tokens += _estimate_tokens([call.model_dump() for call in tool_calls])
+
+        return ChatCompletion(
+            id=f"mock-{self.calls}",
+            object="chat.completion",
+            created=int(time.time()),
+            model=model,
+            choices=[
+                Choice(
+                    index=0,
+                    finish_reason="tool_calls" if tool_calls else "stop",
+                    message=ChatCompletionMessage(
+                        role="assistant", content=content, tool_calls=tool_calls
+                    ),
+                )
+            ],
+            usage=CompletionUsage(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens,
+            ),
+        )
+
+    def _match_tool_calls(
+        self, text: str, tools: Optional[List[Dict[str, Any]]]
+    ) -> Optional[List[ChatCompletionMessageToolCall]]:
+        offered = {tool["function"]["name"] for tool in tools or []}
+        for rule in self.rules:
+            if "tool_calls" not in rule:
+                continue
+            match = rule["pattern"].search(text)
+            if not match or not all(call["name"] in offered for call in rule["tool_calls"]):
+                continue
+            groups = {key: value for key, value in match.groupdict().items() if value is not None}
+            return [
+                ChatCompletionMessageToolCall(
+                    id=f"call_mock_{next(self._ids)}",
+                    type="function",
+                    function=Function(
+                        name=call["name"],
+                        arguments=json.dumps(_fill(call.get("arguments", {}), groups)),
+                    ),
+                )
+                for call in rule["tool_calls"]
+            ]
+        return None
+
+    def _match_reply(self, text: str) -> str:
+        for rule in self.rules:
+            if "reply" in rule and rule["pattern"].search(text):
+                return rule["reply"]
+        return self.default_reply
+
+    @staticmethod
+    def _summarize_tool_results(messages: List[Any]) -> str:
+        results = []
+        for message in reversed(messages):
+            if _message_field(message, "role") != "tool":
+                break
+            content = _message_field(message, "content")
+            if isinstance(content, list):
+                content = " ".join(str(getattr(item, "text", item)) for item in content)
+            results.append(str(content))
+        return "Tool results: " + "; ".join(reversed(results))
+
+    async def _stream(self, content: str) -> int:
+        tokens = re.findall(r"\S+\s*", content)
+        delay = 1 / self.tokens_per_second if self.tokens_per_second else 0
+        for token in tokens:
+            if delay:
+                await asyncio.sleep(delay)
+            if self.on_token:
+                self.on_token(token)
+        return len(tokens)
+
+
+def create_backend(name: Optional[str] = None):
+    """Backend by name, defaulting to MCP_LLM_BACKEND and then "openai"."""
+    name = name or os.getenv("MCP_LLM_BACKEND") or "openai"
+    if name == "openai":
+        return OpenAIBackend()
+    if name == "mock":
+        return MockLLMBackend.from_env()
+    raise ValueError(f"Unknown LLM backend '{name}', expected one of: {', '.join(BACKENDS)}")
@@ -9,35 +9,15 @@ import os
 from dotenv import load_dotenv
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from langgraph.prebuilt import create_react_agent
+from server_config import default_server_config
 
 # Load environment variables
 load_dotenv()
 
 # Configuration
-mcp_dir = os.path.dirname(os.path.abspath(__file__)) + "/../stdio_mcp_server"
 dev_blog_auth_token = os.getenv("DEV_BLOG_AUTH_TOKEN", "")
 
-server_config = {
-    "math": {
-        "command": "python",
-        "args": [f"{mcp_dir}/calculator_mcp_server.py"],
-        "transport": "stdio",
-    },
-    "image-generation": {
-        "command": "python",
-        "args": [f"{mcp_dir}/image_generator_mcp_server.py"],
-        "transport": "stdio",
-    },
-    "dev-blog": {
-        "command": "python",
-        "args": [
-            f"{mcp_dir}/dev_blog_mcp_server.py",
-            "--auth-token",
-            dev_blog_auth_token,
-        ],
-        "transport": "stdio",
-    },
-}
+server_config = default_server_config(dev_blog_auth_token)
 
 
 async def ask_question(question: str) -> str:
@@ -0,0 +1,145 @@
+"""
+Client-side memoization of deterministic tool results.
+
+A result is cached under (server, tool name, canonical JSON of the
+arguments) only for tools the user opted in:
+
+    - tools named in the allowlist (MCP_RESULT_CACHE_TOOLS, comma separated);
+    - with MCP_RESULT_CACHE=annotations, also tools the server annotates
+      readOnlyHint=true, idempotentHint=true and openWorldHint=false. The
+      annotations are hints from the server, not a guarantee that a tool is
+      deterministic, so they are not trusted unless enabled.
+
+Entries expire after a TTL: MCP_RESULT_CACHE_TTL seconds (default 300), or a
+per-tool value from MCP_RESULT_CACHE_TOOL_TTLS ("tool=seconds,..."). A TTL of
+0 disables caching, for all tools or for one tool. Error results are never
+cached.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from mcp import types
+
+import fast_json
+
+DEFAULT_TTL = 300.0
+MAX_ENTRIES = 1024
+
+# MCP_RESULT_CACHE values: cache allowlisted tools only, or annotated pure tools too
+CACHE_MODES = ("allowlist", "annotations")
+
+
+class ToolResultCache:
+    """LRU cache of CallToolResults with per-tool TTLs and hit statistics."""
+
+    def __init__(
+        self,
+        default_ttl: float = DEFAULT_TTL,
+        tool_ttls: Optional[Dict[str, float]] = None,
+        allowlist: Iterable[str] = (),
+        max_entries: int = MAX_ENTRIES,
+        trust_annotations: bool = False,
+    ):
+        self.default_ttl = default_ttl
+        self.tool_ttls = dict(tool_ttls or {})
+        self.allowlist = frozenset(allowlist)
+        self.trust_annotations = trust_annotations
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, float, types.CallToolResult]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    @classmethod
+    def from_env(cls) -> "ToolResultCache":
+        """Build a cache from the MCP_RESULT_CACHE_* environment variables."""
+        tool_ttls = {}
+        for item in os.getenv("MCP_RESULT_CACHE_TOOL_TTLS", "").split(","):
+            if "=" in item:
+                name, ttl = item.split("=", 1)
+                tool_ttls[name.strip()] = float(ttl)
+        allowlist = [
+            name.strip()
+            for name in os.getenv("MCP_RESULT_CACHE_TOOLS", "").split(",")
+            if name.strip()
+        ]
+        mode = os.getenv("MCP_RESULT_CACHE") or "allowlist"
+        if mode not in CACHE_MODES:
+            raise ValueError(
+                f"Unknown MCP_RESULT_CACHE '{mode}', expected one of: {', '.join(CACHE_MODES)}"
+            )
+        return cls(
+            default_ttl=float(os.getenv("MCP_RESULT_CACHE_TTL", DEFAULT_TTL)),
+            tool_ttls=tool_ttls,
+            allowlist=allowlist,
+            trust_annotations=mode == "annotations",
+        )
+
+    def ttl_for(self, name: str, annotations: Optional[Dict[str, Any]] = None) -> float:
+        """Seconds a result of tool `name` may be reused; 0 if it is not cacheable."""
+        ttl = self.tool_ttls.get(name, self.default_ttl)
+        if name in self.allowlist:
+            return ttl
+        if self.trust_annotations and annotations:
+            if (
+                annotations.get("readOnlyHint") is True
+                and annotations.get("idempotentHint") is True
+                and annotations.get("openWorldHint") is False
+            ):
+                return ttl
+        return 0.0
+
+    @staticmethod
+    def key(server: str, name: str, arguments: Optional[Dict[str, Any]]) -> Tuple[str, str, str]:
+        canonical = fast_json.dumps(arguments or {}, sort_keys=True)
+        return server, name, canonical
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[types.CallToolResult]:
+        """Return a fresh cached result, counting the hit or miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, latency, result = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.saved_seconds += latency
+                return result
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(
+        self,
+        key: Tuple[str, str, str],
+        result: types.CallToolResult,
+        ttl: float,
+        latency: float,
+    ) -> None:
+        """Store a result that took `latency` seconds to fetch."""
+        if ttl <= 0 or result.isError:
+            return
+        self._entries[key] = (time.monotonic() + ttl, latency, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hit_ratio, 3),
+            "saved_seconds": round(self.saved_seconds, 3),
+        }
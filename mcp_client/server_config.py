@@ -0,0 +1,41 @@
+"""
+Stdio server configuration shared by the LangChain clients.
+
+Set MCP_COMBINED_SERVER to run one process serving all three tool sets
+(combined_mcp_server.py) instead of one process per server.
+"""
+
+import os
+
+mcp_dir = os.path.dirname(os.path.abspath(__file__)) + "/../stdio_mcp_server"
+
+
+def stdio_server(script: str, *args: str) -> dict:
+    """Config for a stdio server in mcp_dir.
+
+    With MCP_ZYGOTE_SOCKET set, the server is forked from a running zygote
+    (`python stdio_mcp_server/zygote.py serve`) instead of started cold.
+    """
+    command_args = [f"{mcp_dir}/{script}", *args]
+    zygote_socket = os.getenv("MCP_ZYGOTE_SOCKET")
+    if zygote_socket:
+        command_args = [f"{mcp_dir}/zygote.py", "run", "--socket", zygote_socket, *command_args]
+    return {"command": "python", "args": command_args, "transport": "stdio"}
+
+
+def default_server_config(dev_blog_auth_token: str) -> dict:
+    """MultiServerMCPClient config for the calculator, image and dev.to servers."""
+    if os.getenv("MCP_COMBINED_SERVER"):
+        # One process serving all three tool sets, with the same tools
+        return {
+            "all": stdio_server(
+                "combined_mcp_server.py", "--auth-token", dev_blog_auth_token
+            ),
+        }
+    return {
+        "math": stdio_server("calculator_mcp_server.py"),
+        "image-generation": stdio_server("image_generator_mcp_server.py"),
+        "dev-blog": stdio_server(
+            "dev_blog_mcp_server.py", "--auth-token", dev_blog_auth_token
+        ),
+    }
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+from mcp import types
+
+import fast_json
+from client import tool_result_text
+from fast_json import dumps, loads
+
+
+@pytest.fixture(params=["orjson", "fallback"])
+def encoder(request, monkeypatch):
+    """Run a test with orjson, if installed, and with the pydantic_core/stdlib fallback."""
+    if request.param == "orjson":
+        if fast_json.orjson is None:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(fast_json, "orjson", None)
+    return request.param
+
+
+def test_dumps_options(encoder):
+    value = {"b": [1, 2], "a": "é"}
+    assert dumps(value) == '{"b":[1,2],"a":"é"}'
+    assert dumps(value, sort_keys=True) == '{"a":"é","b":[1,2]}'
+    assert json.loads(dumps(value, indent=True)) == value
+    assert dumps(value, indent=True).splitlines()[1] == '  "b": ['
+    assert dumps({1: None}) == '{"1":null}'
+    assert loads(dumps([2**70])) == [2**70]
+    assert loads(b"[1]") == [1]
+
+
+def test_models_drop_unset_fields(encoder):
+    image = types.ImageContent(type="image", data="AAAA", mimeType="image/png")
+    assert json.loads(dumps(image)) == {"type": "image", "data": "AAAA", "mimeType": "image/png"}
+
+
+def test_tool_result_text_joins_items():
+    result = types.CallToolResult(
+        content=[
+            types.TextContent(type="text", text='{"id":1}'),
+            types.TextContent(type="text", text='{"id":2}'),
+            types.ImageContent(type="image", data="AAAA", mimeType="image/png"),
+        ]
+    )
+    lines = tool_result_text(result).split("\n")
+    assert lines[:2] == ['{"id":1}', '{"id":2}']
+    assert json.loads(lines[2])["mimeType"] == "image/png"
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("langchain_mcp_adapters")
+pytest.importorskip("langgraph")
+
+import langchain_client  # noqa: E402
+
+
+# In scripted input: let the submitted tasks run before reading the next line
+YIELD = object()
+
+
+class ScriptedReader:
+    """Stands in for AsyncLineReader: returns `lines`, then waits forever (or EOF)."""
+
+    def __init__(self, lines, eof=True):
+        self.lines = list(lines)
+        self.eof = eof
+
+    async def readline(self, prompt=""):
+        while self.lines and self.lines[0] is YIELD:
+            self.lines.pop(0)
+            await asyncio.sleep(0.01)
+        if self.lines:
+            return self.lines.pop(0)
+        if self.eof:
+            return None
+        await asyncio.Event().wait()
+
+
+@pytest.fixture
+def chat(monkeypatch):
+    """Run the chat loop over scripted input with a slow fake agent."""
+    started = []
+
+    async def execute_query(agent, user_input, history, query_number):
+        started.append(query_number)
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(langchain_client, "execute_query", execute_query)
+
+    def run(lines, eof=True):
+        reader = ScriptedReader(lines, eof)
+        monkeypatch.setattr(langchain_client, "AsyncLineReader", lambda: reader)
+        return langchain_client.run_interactive_chat(agent=None)
+
+    run.started = started
+    return run
+
+
+def test_cancel_before_the_query_starts_forgets_it(chat, capsys):
+    # "cancel all" is read before the new task has run a single step
+    asyncio.run(chat(["first question", "cancel all", YIELD, "jobs", "quit"]))
+    output = capsys.readouterr().out
+    assert chat.started == []
+    assert "Query #1 cancelled" in output
+    assert "No queries in flight" in output
+
+
+def test_jobs_lists_queries_in_flight(chat, capsys):
+    asyncio.run(chat(["first question", YIELD, "jobs", "cancel #1", YIELD, "jobs", "quit"]))
+    output = capsys.readouterr().out
+    assert chat.started == [1]
+    assert "#1: first question" in output
+    assert output.index("#1: first question") < output.index("No queries in flight")
+
+
+def test_cancelling_the_chat_propagates(chat):
+    async def run():
+        task = asyncio.create_task(chat(["first question"], eof=False))
+        while not chat.started:
+            await asyncio.sleep(0)
+        task.cancel()
+        await task
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(run())
@@ -0,0 +1,104 @@
+import asyncio
+import json
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from llm_backends import MockLLMBackend, OpenAIBackend, create_backend
+
+TOOLS = [
+    {"type": "function", "function": {"name": name, "parameters": {}}}
+    for name in ("sum_two_numbers", "multiply_two_numbers", "generate_image_url")
+]
+
+
+def complete(backend, messages, tools=TOOLS):
+    return asyncio.run(backend.complete(model=backend.model, messages=messages, tools=tools))
+
+
+def test_mock_calls_the_matching_tool():
+    response = complete(MockLLMBackend(), [{"role": "user", "content": "What is 2.5 plus 3?"}])
+    [choice] = response.choices
+    assert choice.finish_reason == "tool_calls"
+    [call] = choice.message.tool_calls
+    assert call.function.name == "sum_two_numbers"
+    assert json.loads(call.function.arguments) == {"a": 2.5, "b": 3}
+    assert response.model == "mock"
+    usage = response.usage
+    assert usage.total_tokens == usage.prompt_tokens + usage.completion_tokens
+
+
+def test_mock_skips_rules_for_tools_not_offered():
+    backend = MockLLMBackend(default_reply="No idea.")
+    response = complete(backend, [{"role": "user", "content": "6 times 7"}], tools=TOOLS[:1])
+    assert response.choices[0].message.content == "No idea."
+    assert response.choices[0].message.tool_calls is None
+
+
+def test_mock_summarizes_tool_results():
+    messages = [
+        {"role": "user", "content": "2 plus 3"},
+        {"role": "assistant", "content": None},
+        {"role": "tool", "tool_call_id": "1", "content": "5"},
+        {"role": "tool", "tool_call_id": "2", "content": [{"type": "text", "text": "6"}]},
+    ]
+    response = complete(MockLLMBackend(), messages)
+    assert response.choices[0].message.content.startswith("Tool results: 5; ")
+    assert response.choices[0].finish_reason == "stop"
+
+
+def test_mock_script_and_streaming(tmp_path, monkeypatch):
+    script = tmp_path / "script.json"
+    script.write_text(json.dumps({"rules": [{"match": "hello", "reply": "Hi there, friend"}]}))
+    monkeypatch.setenv("MCP_MOCK_LLM_SCRIPT", str(script))
+    monkeypatch.setenv("MCP_LLM_BACKEND", "mock")
+    backend = create_backend()
+    tokens = []
+    backend.on_token = tokens.append
+
+    response = complete(backend, [{"role": "user", "content": "Hello!"}])
+    assert response.choices[0].message.content == "Hi there, friend"
+    assert tokens == ["Hi ", "there, ", "friend"]
+    assert response.usage.completion_tokens == 3
+
+
+def test_backend_selection():
+    assert OpenAIBackend(client=object()).model == "gpt-4o"
+    assert OpenAIBackend(client=object(), model="gpt-4o-mini").model == "gpt-4o-mini"
+    with pytest.raises(ValueError, match="Unknown LLM backend 'llama'"):
+        create_backend("llama")
+
+
+def test_client_requests_and_traces_the_backend_model(connect, monkeypatch, tmp_path):
+    monkeypatch.setenv("MCP_TOOL_CACHE_FILE", str(tmp_path / "tools.json"))
+    import client as client_module
+    from client import MCPClient
+
+    spans = []
+    real_start_span = client_module.start_span
+
+    def recording_start_span(name, **attributes):
+        spans.append((name, attributes))
+        return real_start_span(name, **attributes)
+
+    monkeypatch.setattr(client_module, "start_span", recording_start_span)
+
+    server = FastMCP("calculator")
+
+    @server.tool()
+    def sum_two_numbers(a: float, b: float) -> float:
+        return a + b
+
+    backend = MockLLMBackend()
+    client = MCPClient(llm=backend)
+
+    async def run():
+        async with connect(server) as session:
+            client.session = session
+            await client.refresh_tools_cache()
+            return await client.process_query("What is 2 plus 3?")
+
+    answer, _ = asyncio.run(run())
+    assert "5.0" in answer
+    assert backend.calls == 2
+    assert ("process_query", {"gen_ai.request.model": "mock"}) in spans
@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+from mcp import types
+from mcp.server.fastmcp import Context, FastMCP
+
+import result_cache
+from result_cache import ToolResultCache
+
+PURE = {"readOnlyHint": True, "idempotentHint": True, "openWorldHint": False}
+
+
+def result(text: str, is_error: bool = False) -> types.CallToolResult:
+    content = [types.TextContent(type="text", text=text)]
+    return types.CallToolResult(content=content, isError=is_error)
+
+
+def test_only_opted_in_tools_are_cached():
+    cache = ToolResultCache(allowlist=["convert"])
+    assert cache.ttl_for("convert") == result_cache.DEFAULT_TTL
+    # Annotations alone are not trusted by default
+    assert cache.ttl_for("add", PURE) == 0
+
+    trusting = ToolResultCache(trust_annotations=True)
+    assert trusting.ttl_for("add", PURE) == result_cache.DEFAULT_TTL
+    assert trusting.ttl_for("add", {**PURE, "idempotentHint": False}) == 0
+    assert trusting.ttl_for("add", {**PURE, "openWorldHint": True}) == 0
+    assert trusting.ttl_for("add", {"readOnlyHint": True, "openWorldHint": False}) == 0
+    assert trusting.ttl_for("add") == 0
+
+
+def test_per_tool_ttls():
+    cache = ToolResultCache(
+        default_ttl=10, tool_ttls={"slow": 60, "live": 0}, allowlist=["slow", "live", "x"]
+    )
+    assert (cache.ttl_for("slow"), cache.ttl_for("live"), cache.ttl_for("x")) == (60, 0, 10)
+
+
+def test_from_env(monkeypatch):
+    monkeypatch.setenv("MCP_RESULT_CACHE_TOOLS", " add , multiply,")
+    monkeypatch.setenv("MCP_RESULT_CACHE_TOOL_TTLS", "add=5, multiply=0")
+    monkeypatch.setenv("MCP_RESULT_CACHE_TTL", "30")
+    monkeypatch.delenv("MCP_RESULT_CACHE", raising=False)
+    cache = ToolResultCache.from_env()
+    assert cache.allowlist == {"add", "multiply"}
+    assert (cache.ttl_for("add"), cache.ttl_for("multiply"), cache.default_ttl) == (5, 0, 30)
+    assert not cache.trust_annotations
+
+    monkeypatch.setenv("MCP_RESULT_CACHE", "annotations")
+    assert ToolResultCache.from_env().trust_annotations
+    monkeypatch.setenv("MCP_RESULT_CACHE", "everything")
+    with pytest.raises(ValueError, match="Unknown MCP_RESULT_CACHE 'everything'"):
+        ToolResultCache.from_env()
+
+
+def test_keys_ignore_argument_order():
+    assert ToolResultCache.key("s", "add", {"a": 1, "b": 2}) == ToolResultCache.key(
+        "s", "add", {"b": 2, "a": 1}
+    )
+    assert ToolResultCache.key("s", "add", None) == ToolResultCache.key("s", "add", {})
+    assert ToolResultCache.key("s", "add", {"a": 1}) != ToolResultCache.key("t", "add", {"a": 1})
+
+
+def test_entries_expire_and_errors_are_not_cached(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, "monotonic", lambda: now[0])
+    cache = ToolResultCache()
+    cache.put(("s", "a", "{}"), result("1"), ttl=10, latency=0.5)
+    cache.put(("s", "b", "{}"), result("boom", is_error=True), ttl=10, latency=0.5)
+    cache.put(("s", "c", "{}"), result("3"), ttl=0, latency=0.5)
+
+    assert cache.get(("s", "a", "{}")).content[0].text == "1"
+    assert cache.get(("s", "b", "{}")) is None
+    assert cache.get(("s", "c", "{}")) is None
+    now[0] += 10
+    assert cache.get(("s", "a", "{}")) is None
+    assert cache.stats() == {
+        "entries": 0,
+        "hits": 1,
+        "misses": 3,
+        "hit_ratio": 0.25,
+        "saved_seconds": 0.5,
+    }
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ToolResultCache(max_entries=2)
+    for name in ("a", "b"):
+        cache.put(("s", name, "{}"), result(name), ttl=60, latency=0)
+    cache.get(("s", "a", "{}"))
+    cache.put(("s", "c", "{}"), result("c"), ttl=60, latency=0)
+    assert cache.get(("s", "b", "{}")) is None
+    assert cache.get(("s", "a", "{}")) is not None
+    assert cache.get(("s", "c", "{}")) is not None
+
+
+def counting_server():
+    server = FastMCP("counting")
+    calls = []
+
+    @server.tool(annotations=types.ToolAnnotations(**PURE))
+    def add(a: int, b: int) -> int:
+        calls.append((a, b))
+        return a + b
+
+    @server.tool()
+    async def reload_tools(ctx: Context) -> str:
+        await ctx.session.send_tool_list_changed()
+        return "ok"
+
+    return server, calls
+
+
+def test_client_caches_until_the_tool_list_changes(connect, monkeypatch, tmp_path):
+    monkeypatch.setenv("MCP_TOOL_CACHE_FILE", str(tmp_path / "tools.json"))
+    monkeypatch.setenv("MCP_RESULT_CACHE", "annotations")
+    from client import MCPClient
+    from llm_backends import MockLLMBackend
+    from tracing import TracedClientSession
+
+    server, calls = counting_server()
+    client = MCPClient(llm=MockLLMBackend())
+
+    async def run():
+        async with connect(
+            server, TracedClientSession, message_handler=client._handle_server_message
+        ) as session:
+            client.session = session
+            await client.refresh_tools_cache()
+            assert client.tool_annotations["add"] == PURE
+
+            first = await client.call_tool("add", {"a": 1, "b": 2})
+            second = await client.call_tool("add", {"b": 2, "a": 1})
+            assert first.content[0].text == second.content[0].text == "3"
+            assert len(calls) == 1
+
+            await client.call_tool("reload_tools", {})
+            await client._tools_task
+            await client.call_tool("add", {"a": 1, "b": 2})
+            assert len(calls) == 2
+
+    asyncio.run(run())
+    assert client.result_cache.hits == 1
@@ -0,0 +1,37 @@
+import os
+
+from server_config import default_server_config, mcp_dir, stdio_server
+
+
+def test_stdio_server_runs_the_script(monkeypatch):
+    monkeypatch.delenv("MCP_ZYGOTE_SOCKET", raising=False)
+    assert os.path.isfile(f"{mcp_dir}/calculator_mcp_server.py")
+    assert stdio_server("calculator_mcp_server.py", "--auth-token", "t") == {
+        "command": "python",
+        "args": [f"{mcp_dir}/calculator_mcp_server.py", "--auth-token", "t"],
+        "transport": "stdio",
+    }
+
+
+def test_stdio_server_goes_through_the_zygote(monkeypatch):
+    monkeypatch.setenv("MCP_ZYGOTE_SOCKET", "/tmp/zygote.sock")
+    assert stdio_server("server.py")["args"] == [
+        f"{mcp_dir}/zygote.py",
+        "run",
+        "--socket",
+        "/tmp/zygote.sock",
+        f"{mcp_dir}/server.py",
+    ]
+
+
+def test_default_server_config(monkeypatch):
+    monkeypatch.delenv("MCP_ZYGOTE_SOCKET", raising=False)
+    monkeypatch.delenv("MCP_COMBINED_SERVER", raising=False)
+    config = default_server_config("token")
+    assert set(config) == {"math", "image-generation", "dev-blog"}
+    assert config["dev-blog"]["args"][1:] == ["--auth-token", "token"]
+
+    monkeypatch.setenv("MCP_COMBINED_SERVER", "1")
+    assert default_server_config("token") == {
+        "all": stdio_server("combined_mcp_server.py", "--auth-token", "token")
+    }
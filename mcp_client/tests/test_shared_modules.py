@@ -0,0 +1,16 @@
+from pathlib import Path
+
+import pytest
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+SERVER_DIR = PROJECT_DIR.parent / "stdio_mcp_server"
+
+# Copied as is from stdio_mcp_server, since each project is installed on its own
+SHARED_MODULES = ["bm25.py", "tracing_setup.py", "unix_transport.py"]
+
+
+@pytest.mark.skipif(not SERVER_DIR.is_dir(), reason="stdio_mcp_server is not next to this project")
+@pytest.mark.parametrize("name", SHARED_MODULES)
+def test_copies_match_the_server_modules(name):
+    copy, original = (PROJECT_DIR / name).read_text(), (SERVER_DIR / name).read_text()
+    assert copy == original, f"{name} differs from stdio_mcp_server/{name}: copy it over"
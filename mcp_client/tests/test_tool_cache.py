@@ -0,0 +1,104 @@
+import os
+
+from mcp import types
+
+from tool_cache import (
+    CACHE_FORMAT_VERSION,
+    ToolSchemaCache,
+    server_fingerprint,
+    source_stamp,
+    to_openai_tools,
+)
+
+INFO = types.Implementation(name="calculator", version="1.9.2")
+TOOLS = [{"type": "function", "function": {"name": "add", "description": "", "parameters": {}}}]
+
+
+def write_server(directory):
+    (directory / "server.py").write_text("import helpers\n")
+    (directory / "helpers.py").write_text("SCHEMA = {'type': 'object'}\n")
+    return str(directory / "server.py")
+
+
+def test_fingerprint_changes_when_the_server_source_changes(tmp_path):
+    script = write_server(tmp_path)
+    command = '["python", "server.py"]'
+    before = server_fingerprint(command, INFO, source_stamp(script))
+    assert before == server_fingerprint(command, INFO, source_stamp(script))
+
+    # An edited helper module changes the key although the version does not
+    helpers = tmp_path / "helpers.py"
+    helpers.write_text("SCHEMA = {'type': 'object', 'required': ['a']}\n")
+    after = server_fingerprint(command, INFO, source_stamp(script))
+    assert after != before
+
+    # Same size, new modification time
+    stat = helpers.stat()
+    os.utime(helpers, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert server_fingerprint(command, INFO, source_stamp(script)) != after
+
+
+def test_fingerprint_depends_on_command_and_server_info():
+    key = server_fingerprint("http://localhost:8000/sse", INFO)
+    assert key != server_fingerprint("http://localhost:8001/sse", INFO)
+    assert key != server_fingerprint(
+        "http://localhost:8000/sse", types.Implementation(name="calculator", version="2")
+    )
+
+
+def test_source_stamp_for_non_python_and_missing_servers(tmp_path):
+    assert source_stamp("@playwright/mcp@latest") is None
+    assert source_stamp(str(tmp_path / "missing.py")) is None
+    script = tmp_path / "server.js"
+    script.write_text("// server")
+    (tmp_path / "other.py").write_text("")
+    [[name, _, size]] = source_stamp(str(script))
+    assert (name, size) == ("server.js", 9)
+
+
+def test_put_and_get_persist_across_instances(tmp_path):
+    path = tmp_path / "cache" / "tools.json"
+    cache = ToolSchemaCache(path)
+    assert cache.get("key") is None
+    assert cache.put("key", "python server.py", TOOLS, {"add": {"readOnlyHint": True}})
+    assert not cache.put("key", "python server.py", TOOLS, {"add": {"readOnlyHint": True}})
+
+    entry = ToolSchemaCache(path).get("key")
+    assert entry["tools"] == TOOLS
+    assert entry["annotations"] == {"add": {"readOnlyHint": True}}
+
+
+def test_new_key_for_a_server_replaces_its_stale_entry(tmp_path):
+    cache = ToolSchemaCache(tmp_path / "tools.json")
+    cache.put("old", "python server.py", TOOLS)
+    cache.put("other", "python other.py", TOOLS)
+    cache.put("new", "python server.py", [])
+
+    reloaded = ToolSchemaCache(tmp_path / "tools.json")
+    assert reloaded.get("old") is None
+    assert reloaded.get("new")["tools"] == []
+    assert reloaded.get("other") is not None
+
+
+def test_unreadable_or_old_cache_files_are_ignored(tmp_path):
+    path = tmp_path / "tools.json"
+    path.write_text("not json")
+    assert ToolSchemaCache(path).get("key") is None
+    path.write_text(f'{{"format": {CACHE_FORMAT_VERSION + 1}, "entries": {{"key": {{}}}}}}')
+    assert ToolSchemaCache(path).get("key") is None
+
+
+def test_to_openai_tools():
+    tool = types.Tool(
+        name="add", description="Add.", inputSchema={"type": "object", "properties": {}}
+    )
+    assert to_openai_tools([tool]) == [
+        {
+            "type": "function",
+            "function": {
+                "name": "add",
+                "description": "Add.",
+                "parameters": {"type": "object", "properties": {}},
+            },
+        }
+    ]
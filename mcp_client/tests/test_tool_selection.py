@@ -0,0 +1,59 @@
+import pytest
+
+from tool_selection import ToolSelector, tokenize
+
+
+def tool(name, description="", *parameters):
+    properties = {parameter: {"type": "string"} for parameter in parameters}
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": {"type": "object", "properties": properties},
+        },
+    }
+
+
+TOOLS = [
+    tool("sum_two_numbers", "Add two numbers.", "a", "b"),
+    tool("generate_image_url", "Generate a random image URL from Lorem Picsum.", "width", "height"),
+    tool("search_articles", "Search dev.to articles by tag.", "tag", "page"),
+    tool("get_article", "Get one dev.to article by its id.", "article_id"),
+    tool("multiply_two_numbers", "Multiply two numbers.", "a", "b"),
+]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("getArticleById", ["article", "id"]),
+        ("Please show some dict args", []),
+        ("search_articles", ["search", "article"]),
+        ("Show me the articles, please!", ["article"]),
+        ("class", ["class"]),
+        ("x 2 width42", ["width42"]),
+        ("", []),
+        (None, []),
+    ],
+)
+def test_tokenize(text, expected):
+    assert tokenize(text) == expected
+
+
+def test_selects_the_relevant_tools_in_their_original_order():
+    selector = ToolSelector(TOOLS)
+    names = [t["function"]["name"] for t in selector.select("find articles tagged python", 2)]
+    assert names == ["search_articles", "get_article"]
+
+    names = [t["function"]["name"] for t in selector.select("multiply 6 by 7", 1)]
+    assert names == ["multiply_two_numbers"]
+
+
+def test_falls_back_to_all_tools():
+    selector = ToolSelector(TOOLS)
+    assert selector.select("hmm, and then?", 2) == TOOLS
+    assert selector.select("image", 0) == TOOLS
+    assert selector.select("image", len(TOOLS)) == TOOLS
+    # Only matching tools are returned, even if fewer than top_k
+    assert [t["function"]["name"] for t in selector.select("picsum", 3)] == ["generate_image_url"]
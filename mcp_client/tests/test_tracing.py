@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+import tracing
+
+
+def meta_server() -> FastMCP:
+    server = FastMCP("meta")
+
+    @server.tool()
+    def request_meta() -> dict:
+        meta = server.get_context().request_context.meta
+        return meta.model_dump(exclude_none=True) if meta else {}
+
+    return server
+
+
+def call_request_meta(connect, session_class) -> dict:
+    async def run():
+        async with connect(meta_server(), session_class) as session:
+            result = await session.call_tool("request_meta", {})
+            return json.loads(result.content[0].text)
+
+    return asyncio.run(run())
+
+
+def test_traced_session_sends_trace_context_in_meta(connect, monkeypatch):
+    traceparent = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+    monkeypatch.setattr(tracing, "inject_context", lambda: {"traceparent": traceparent})
+
+    assert call_request_meta(connect, tracing.TracedClientSession) == {"traceparent": traceparent}
+
+
+def test_traced_session_sends_no_meta_without_tracing(connect):
+    assert tracing.inject_context() == {}
+    assert call_request_meta(connect, tracing.TracedClientSession) == {}
+
+
+def test_shutdown_tracing_exports_the_last_batch(tmp_path, monkeypatch):
+    pytest.importorskip("opentelemetry.sdk")
+    pytest.importorskip("opentelemetry.exporter.otlp.proto.common")
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setenv("MCP_TRACING_EXPORTER", "otlp-file")
+    monkeypatch.setenv("MCP_TRACING_FILE", str(path))
+
+    assert tracing.configure_tracing("test-client")
+    try:
+        with tracing.start_span("process_query"):
+            assert "traceparent" in tracing.inject_context()
+    finally:
+        tracing.shutdown_tracing()
+
+    [request] = [json.loads(line) for line in path.read_text().splitlines()]
+    [span] = request["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert span["name"] == "process_query"
+    assert len(span["traceId"]) == 32 and int(span["traceId"], 16)
+    assert tracing.inject_context() == {}  # Disabled after shutdown
+
+
+def test_tracing_off_without_exporter(monkeypatch):
+    monkeypatch.delenv("MCP_TRACING_EXPORTER", raising=False)
+    assert not tracing.configure_tracing()
+    assert tracing.server_environment() == {}
@@ -0,0 +1,44 @@
+import asyncio
+
+import anyio
+import pytest
+from mcp import ClientSession
+from mcp.server.fastmcp import FastMCP
+
+from unix_client import socket_path_from_url, unix_client
+from unix_transport import serve_unix
+
+
+def test_socket_path_from_url():
+    assert socket_path_from_url("unix:///tmp/mcp.sock") == "/tmp/mcp.sock"
+    with pytest.raises(ValueError, match="Not a unix:// URL"):
+        socket_path_from_url("http://localhost:8000/sse")
+
+
+def test_clients_share_one_server(tmp_path):
+    path = str(tmp_path / "mcp.sock")
+    server = FastMCP("unix")
+
+    @server.tool()
+    def echo(text: str) -> str:
+        return text
+
+    async def call(text, max_line_bytes=1 << 20):
+        async with unix_client(path, max_line_bytes) as streams:
+            async with ClientSession(*streams) as session:
+                await session.initialize()
+                return (await session.call_tool("echo", {"text": text})).content[0].text
+
+    async def run():
+        async with anyio.create_task_group() as tg:
+            await tg.start(serve_unix, server, path)
+            results = await asyncio.gather(call("one"), call("two"))
+            # A reply longer than the client accepts ends the session
+            with pytest.raises(Exception) as raised:
+                with anyio.fail_after(5):
+                    await call("x" * 1000, max_line_bytes=500)
+            assert not raised.errisinstance(TimeoutError)
+            tg.cancel_scope.cancel()
+        return results
+
+    assert asyncio.run(run()) == ["one", "two"]
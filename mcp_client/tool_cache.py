@@ -0,0 +1,160 @@
+"""
+Persistent cache of MCP tool definitions, converted for the OpenAI API.
+
+Entries are keyed by a fingerprint of the server: its command line or URL,
+the name and version it reports in `initialize` and, for a local script, the
+modification time and size of the script and the Python modules next to it.
+FastMCP reports the mcp package version as the server version, so without the
+source stamp an edited tool schema would be served from the cache on every
+start. A client builds its first request from the cached tools while
+`tools/list` revalidates them in the background.
+
+The cache file defaults to ~/.cache/mcp-client/tool_schemas.json and can be
+moved with MCP_TOOL_CACHE_FILE.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from mcp import types
+
+import fast_json
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+
+
+def default_cache_file() -> Path:
+    return Path(
+        os.getenv("MCP_TOOL_CACHE_FILE")
+        or Path.home() / ".cache" / "mcp-client" / "tool_schemas.json"
+    )
+
+
+def source_stamp(script_path: str) -> Optional[List[List[Any]]]:
+    """[name, mtime_ns, size] of a server script and its sibling modules.
+
+    Returns None when the script is not a local file (an npm package, say).
+    """
+    path = Path(script_path)
+    if not path.is_file():
+        return None
+    files = sorted(path.parent.glob("*.py")) if path.suffix == ".py" else [path]
+    stamp = []
+    for file in files:
+        try:
+            stat = file.stat()
+        except OSError:  # Removed while listing
+            continue
+        stamp.append([file.name, stat.st_mtime_ns, stat.st_size])
+    return stamp
+
+
+def server_fingerprint(
+    server: str,
+    server_info: types.Implementation,
+    source: Optional[List[List[Any]]] = None,
+) -> str:
+    """Cache key for a server command line or URL, its reported name and version
+    and, for a local script, its source_stamp."""
+    identity = json.dumps(
+        {
+            "server": server,
+            "name": server_info.name,
+            "version": server_info.version,
+            "source": source,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+def to_openai_tools(tools: List[types.Tool]) -> List[Dict[str, Any]]:
+    """Convert MCP tools to OpenAI function tool definitions."""
+    return [
+        {
+            "type": "function",
+            "function": {
+                "name": tool.name,
+                "description": tool.description,
+                "parameters": dict(tool.inputSchema) if tool.inputSchema else {},
+            },
+        }
+        for tool in tools
+    ]
+
+
+class ToolSchemaCache:
+    """OpenAI tool definitions per server fingerprint, stored in one JSON file."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or default_cache_file())
+        self._entries: Optional[Dict[str, Any]] = None
+
+    def _load(self) -> Dict[str, Any]:
+        if self._entries is None:
+            try:
+                data = fast_json.loads(self.path.read_bytes())
+                if data.get("format") != CACHE_FORMAT_VERSION:
+                    raise ValueError(f"unsupported format {data.get('format')!r}")
+                self._entries = data["entries"]
+            except FileNotFoundError:
+                self._entries = {}
+            except (OSError, ValueError, KeyError, AttributeError) as e:
+                logger.warning(f"Ignoring unreadable tool cache {self.path}: {e}")
+                self._entries = {}
+        return self._entries
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached entry for a server: {"tools", "annotations", ...}, or None."""
+        return self._load().get(key)
+
+    def put(
+        self,
+        key: str,
+        label: str,
+        tools: List[Dict[str, Any]],
+        annotations: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> bool:
+        """Store a server's tool definitions and annotations; returns whether the entry changed.
+
+        Entries for the same server `label` under other keys (from before the
+        server was edited) are dropped.
+        """
+        # Re-read first so entries written by other clients are kept
+        self._entries = None
+        entries = self._load()
+        annotations = annotations or {}
+        previous = entries.get(key)
+        if previous and previous["tools"] == tools and previous.get("annotations") == annotations:
+            return False
+        stale = [k for k, entry in entries.items() if k != key and entry.get("server") == label]
+        for stale_key in stale:
+            del entries[stale_key]
+        entries[key] = {
+            "server": label,
+            "updated_at": time.time(),
+            "tools": tools,
+            "annotations": annotations,
+        }
+        self._save()
+        return True
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = fast_json.dumps({"format": CACHE_FORMAT_VERSION, "entries": self._entries})
+        fd, temp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                file.write(data)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
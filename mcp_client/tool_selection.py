@@ -0,0 +1,65 @@
+"""
+Local tool pre-selection with BM25.
+
+Sending every tool schema to the LLM on each turn costs prompt tokens and
+latency, most of it on tools that are irrelevant to the query. ToolSelector
+indexes each tool's name, description and parameter names with Okapi BM25.
+It returns only the top-k tools for a query, entirely in-process and
+without a model download.
+
+Enable it in MCPClient with MCP_TOOL_TOP_K=<k>.
+"""
+
+from typing import Any, Dict, List
+
+# Ranked as the dev.to server ranks article chunks (bm25.py is a copy of the server's)
+from bm25 import STOPWORDS, BM25Index
+from bm25 import tokenize as bm25_tokenize
+
+# Tool names are matched more strongly than description words
+NAME_WEIGHT = 3
+
+# Words common in queries and tool descriptions that say nothing about the tool
+_STOPWORDS = STOPWORDS | frozenset(
+    """get give please show some use
+    args optional default returns str int float bool dict list""".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, splitting snake_case and camelCase identifiers."""
+    return bm25_tokenize(text, _STOPWORDS, split_camel_case=True)
+
+
+def _tool_document(tool: Dict[str, Any]) -> List[str]:
+    function = tool["function"]
+    properties = (function.get("parameters") or {}).get("properties", {})
+    return (
+        tokenize(function["name"]) * NAME_WEIGHT
+        + tokenize(function.get("description") or "")
+        + tokenize(" ".join(properties))
+    )
+
+
+class ToolSelector:
+    """Picks the tools most relevant to a query from OpenAI tool definitions."""
+
+    def __init__(self, tools: List[Dict[str, Any]]):
+        self.tools = tools
+        self.index = BM25Index([_tool_document(tool) for tool in tools])
+
+    def select(self, query: str, top_k: int) -> List[Dict[str, Any]]:
+        """Return up to `top_k` tools ranked by relevance, in their original order.
+
+        All tools are returned when none matches the query, so a vague
+        follow-up ("and the other one?") still reaches the model with tools.
+        """
+        if top_k <= 0 or len(self.tools) <= top_k:
+            return self.tools
+
+        scores = self.index.scores(tokenize(query))
+        ranked = sorted(range(len(self.tools)), key=lambda i: scores[i], reverse=True)
+        selected = sorted(i for i in ranked[:top_k] if scores[i] > 0)
+        if not selected:
+            return self.tools
+        return [self.tools[i] for i in selected]
@@ -0,0 +1,148 @@
+"""
+Optional OpenTelemetry tracing for the MCP client.
+
+Tracing is off unless MCP_TRACING_EXPORTER is set and opentelemetry-sdk is
+installed (`uv sync --extra tracing`). Supported exporters:
+
+    - console:   spans are printed to stderr
+    - otlp-file: spans are appended as OTLP/JSON lines to MCP_TRACING_FILE
+                 (default: logs/traces.otlp.jsonl), readable offline without a collector
+
+TracedClientSession injects the current trace context into the `_meta` field
+of each `tools/call` request, and the tracing settings are forwarded to
+spawned stdio servers so that client and server spans end up in the same
+trace and file.
+"""
+
+import logging
+import os
+from contextlib import nullcontext
+from typing import Dict
+
+from mcp import ClientSession, types
+
+try:
+    from opentelemetry import propagate, trace
+except ImportError:  # tracing is an optional extra
+    propagate = trace = None
+
+# The exporter setup is the servers' (a copy of stdio_mcp_server/tracing_setup.py)
+from tracing_setup import create_tracer_provider
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRACING_FILE = "logs/traces.otlp.jsonl"
+
+_provider = None
+_tracer = None
+_exporter_name = None
+
+
+def configure_tracing(service_name: str = "mcp-client") -> bool:
+    """Install a tracer provider for this process if tracing is enabled.
+
+    Spans are exported in batches; call `shutdown_tracing` before exiting.
+
+    Returns:
+        bool: Whether spans will be recorded.
+    """
+    global _provider, _tracer, _exporter_name
+
+    exporter_name = os.getenv("MCP_TRACING_EXPORTER", "").strip().lower()
+    if exporter_name in ("", "none"):
+        return False
+
+    provider = create_tracer_provider(service_name, exporter_name, _tracing_file(), batch=True)
+    if provider is None:
+        return False
+
+    trace.set_tracer_provider(provider)
+    _provider = provider
+    _tracer = provider.get_tracer(service_name)
+    _exporter_name = exporter_name
+
+    logger.info(f"Tracing enabled ({exporter_name} exporter)")
+    return True
+
+
+def flush_tracing() -> None:
+    """Export the spans still waiting in the current batch."""
+    if _provider is not None:
+        _provider.force_flush()
+
+
+def shutdown_tracing() -> None:
+    """Flush the pending spans and stop the exporter; spans after this are dropped."""
+    global _provider, _tracer
+
+    if _provider is not None:
+        _provider.shutdown()
+    _provider = _tracer = None
+
+
+def _tracing_file() -> str:
+    return os.path.abspath(os.getenv("MCP_TRACING_FILE", DEFAULT_TRACING_FILE))
+
+
+def start_span(name: str, kind: str = "internal", **attributes):
+    """Start a span as the current span, or do nothing when tracing is disabled.
+
+    Args:
+        name (str): The span name.
+        kind (str): "internal", "server" or "client".
+        **attributes: Span attributes.
+    """
+    if _tracer is None:
+        return nullcontext()
+
+    return _tracer.start_as_current_span(
+        name, kind=trace.SpanKind[kind.upper()], attributes=attributes
+    )
+
+
+def set_span_attributes(**attributes) -> None:
+    """Set attributes on the current span, if tracing is enabled."""
+    if _tracer is None:
+        return
+    trace.get_current_span().set_attributes(attributes)
+
+
+def inject_context() -> Dict[str, str]:
+    """Return the current trace context as `_meta` entries (empty when disabled)."""
+    carrier: Dict[str, str] = {}
+    if _tracer is not None:
+        propagate.inject(carrier)
+    return carrier
+
+
+def server_environment() -> Dict[str, str]:
+    """Environment variables that enable the same tracing setup in a stdio server."""
+    if _tracer is None:
+        return {}
+
+    env = {"MCP_TRACING_EXPORTER": _exporter_name}
+    if _exporter_name == "otlp-file":
+        env["MCP_TRACING_FILE"] = _tracing_file()
+    return env
+
+
+class TracedClientSession(ClientSession):
+    """ClientSession that sends the current trace context with every tool call.
+
+    The context is added where requests are sent, so `call_tool` (and any
+    result handling it does) stays the only way tools are called.
+    """
+
+    async def send_request(self, request: types.ClientRequest, result_type, *args, **kwargs):
+        meta = inject_context()
+        if meta and isinstance(request.root, types.CallToolRequest):
+            params = request.root.params
+            if params.meta is not None:
+                meta = {**params.meta.model_dump(exclude_none=True), **meta}
+            request = types.ClientRequest(
+                request.root.model_copy(
+                    update={"params": params.model_copy(update={"meta": types.RequestParams.Meta(**meta)})}
+                )
+            )
+        return await super().send_request(request, result_type, *args, **kwargs)
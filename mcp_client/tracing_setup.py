@@ -0,0 +1,101 @@
+"""
+Tracer provider setup shared by the MCP servers and the MCP client.
+
+`create_tracer_provider` builds an OpenTelemetry tracer provider for an
+MCP_TRACING_EXPORTER name:
+
+    - console:   spans are printed to stderr
+    - otlp-file: spans are appended as OTLP/JSON lines to a file, readable
+                 offline without a collector
+
+mcp_client/ and sse_server/ are installed and run on their own, so each
+keeps an identical copy of this file; the copies are checked by their
+tests/test_shared_modules.py.
+"""
+
+import base64
+import json
+import logging
+import sys
+import threading
+from typing import Any, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class OTLPJsonFileSpanExporter:
+    """Span exporter that appends one OTLP/JSON `ExportTraceServiceRequest` per batch."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Any]):
+        from google.protobuf.json_format import MessageToDict
+        from opentelemetry.exporter.otlp.proto.common.trace_encoder import encode_spans
+        from opentelemetry.sdk.trace.export import SpanExportResult
+
+        request = MessageToDict(encode_spans(spans))
+
+        # OTLP/JSON encodes trace and span ids as hex, protobuf JSON as base64
+        for resource_spans in request.get("resourceSpans", []):
+            for scope_spans in resource_spans.get("scopeSpans", []):
+                for span in scope_spans.get("spans", []):
+                    for key in ("traceId", "spanId", "parentSpanId"):
+                        if span.get(key):
+                            span[key] = base64.b64decode(span[key]).hex()
+
+        try:
+            with self._lock, open(self.path, "a") as file:
+                file.write(json.dumps(request, separators=(",", ":")) + "\n")
+        except OSError as e:
+            logger.error(f"Failed to write spans to {self.path}: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+
+def create_tracer_provider(
+    service_name: str, exporter_name: str, path: str, batch: bool
+) -> Optional[Any]:
+    """A TracerProvider exporting to `exporter_name`, or None if tracing cannot be enabled.
+
+    Args:
+        service_name (str): The `service.name` resource attribute.
+        exporter_name (str): "console" or "otlp-file".
+        path (str): File written by the otlp-file exporter.
+        batch (bool): Export in batches from a background thread. The
+            caller must then shut the provider down on exit, or the last
+            batch is lost.
+    """
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import (
+            BatchSpanProcessor,
+            ConsoleSpanExporter,
+            SimpleSpanProcessor,
+        )
+    except ImportError:
+        logger.warning(
+            "MCP_TRACING_EXPORTER is set but opentelemetry-sdk is not installed; tracing disabled"
+        )
+        return None
+
+    if exporter_name == "console":
+        exporter = ConsoleSpanExporter(out=sys.stderr)
+    elif exporter_name == "otlp-file":
+        exporter = OTLPJsonFileSpanExporter(path)
+    else:
+        logger.warning(f"Unknown MCP_TRACING_EXPORTER '{exporter_name}'; tracing disabled")
+        return None
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    processor = BatchSpanProcessor(exporter) if batch else SimpleSpanProcessor(exporter)
+    provider.add_span_processor(processor)
+    return provider
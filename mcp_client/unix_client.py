@@ -0,0 +1,34 @@
+"""
+Unix domain socket client transport.
+
+Connects to an MCP server listening on a Unix socket (see
+stdio_mcp_server/unix_transport.py). Messages use the stdio framing, one
+JSON-RPC message per line, but many clients can share one long-running
+local server. The framing is the server's: unix_transport.py is a copy of
+stdio_mcp_server/unix_transport.py.
+
+    async with unix_client("/tmp/mcp.sock") as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            ...
+"""
+
+from contextlib import asynccontextmanager
+
+import anyio
+
+from unix_transport import MAX_LINE_BYTES, socket_streams
+
+
+def socket_path_from_url(url: str) -> str:
+    """Path of a `unix:///path/to/socket` URL."""
+    if not url.startswith("unix://"):
+        raise ValueError(f"Not a unix:// URL: {url}")
+    return url[len("unix://") :]
+
+
+@asynccontextmanager
+async def unix_client(path: str, max_line_bytes: int = MAX_LINE_BYTES):
+    """Connect to the Unix socket `path` and yield MCP read and write streams."""
+    async with await anyio.connect_unix(path) as stream:
+        async with socket_streams(stream, max_line_bytes) as (read_stream, write_stream):
+            yield read_stream, write_stream
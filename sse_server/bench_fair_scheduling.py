@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark fair scheduling of tool calls between SSE sessions.
+
+Serves the app from main.py in-process. A blocking tool (`slow_lookup`,
+sleeping `--tool-ms`) runs in a thread pool of `--workers` threads. One bulk
+session issues `bulk` concurrent calls while three interactive sessions call
+the same tool one at a time. Three setups are compared:
+
+    - fifo:       no scheduling; calls queue for the pool in arrival order
+    - fair:       FairScheduler with capacity = pool size; all calls are
+                  interactive, so only fair queuing and the session limit apply
+    - fair+batch: the same, with the bulk session sending X-MCP-Priority: batch
+
+The table shows interactive latency, the time the bulk calls took, and the
+scheduler's p95 queue wait per class.
+
+Usage: python bench_fair_scheduling.py [bulk] [--workers N] [--tool-ms MS]
+"""
+
+import argparse
+import asyncio
+import logging
+import socket
+import time
+
+import uvicorn
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+import main
+from execution import ToolExecutor
+from fair_scheduler import PRIORITY_CLASSES, ClassStats
+
+UNLIMITED = 1_000_000
+INTERACTIVE_SESSIONS = 3
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def configure(capacity: int, session_limit: int) -> None:
+    scheduler = main.tool_scheduler
+    scheduler.capacity = capacity
+    scheduler.batch_capacity = max(1, int(capacity * 0.75))
+    scheduler.session_limit = session_limit
+    scheduler.key_limit = UNLIMITED
+    scheduler.classes = {priority: ClassStats() for priority in PRIORITY_CLASSES}
+
+
+async def run_setup(url: str, args, bulk_priority: str):
+    latencies = []
+    done = asyncio.Event()
+
+    async def interactive():
+        async with sse_client(url) as streams, ClientSession(*streams) as session:
+            await session.initialize()
+            await started.wait()
+            while not done.is_set():
+                began = time.perf_counter()
+                await session.call_tool("slow_lookup", {"ms": args.tool_ms})
+                latencies.append(time.perf_counter() - began)
+                await asyncio.sleep(0.02)
+
+    async def bulk():
+        headers = {"X-MCP-Priority": bulk_priority}
+        async with sse_client(url, headers=headers) as streams, ClientSession(*streams) as session:
+            await session.initialize()
+            started.set()
+            began = time.perf_counter()
+            await asyncio.gather(
+                *(session.call_tool("slow_lookup", {"ms": args.tool_ms}) for _ in range(args.bulk))
+            )
+            done.set()
+            return time.perf_counter() - began
+
+    started = asyncio.Event()
+    results = await asyncio.gather(bulk(), *(interactive() for _ in range(INTERACTIVE_SESSIONS)))
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return p50, p99, results[0], len(latencies)
+
+
+async def run(args):
+    executor = ToolExecutor(main.mcp_server.name, thread_workers=args.workers)
+
+    def slow_lookup(ms: float) -> str:
+        """Block for `ms` milliseconds, like a synchronous HTTP or database call"""
+        time.sleep(ms / 1000)
+        return "done"
+
+    main.mcp_server.add_tool(executor.wrap("thread", slow_lookup), name="slow_lookup")
+
+    port = free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    setups = [
+        ("fifo", UNLIMITED, UNLIMITED, "interactive"),
+        ("fair", args.workers, args.workers, "interactive"),
+        ("fair+batch", args.workers, args.workers, "batch"),
+    ]
+    print(
+        f"{args.bulk} bulk calls vs {INTERACTIVE_SESSIONS} interactive sessions,"
+        f" {args.tool_ms:.0f}ms tool, {args.workers} pool threads\n"
+    )
+    print(
+        f"{'setup':<11} {'inter p50':>10} {'inter p99':>10} {'calls':>6} {'bulk':>8}"
+        f" {'wait p95 inter':>15} {'wait p95 batch':>15}"
+    )
+    print("-" * 81)
+    try:
+        for name, capacity, session_limit, bulk_priority in setups:
+            configure(capacity, session_limit)
+            p50, p99, bulk_time, calls = await run_setup(
+                f"http://127.0.0.1:{port}/sse", args, bulk_priority
+            )
+            classes = main.tool_scheduler.classes
+            print(
+                f"{name:<11} {p50 * 1000:>8.1f}ms {p99 * 1000:>8.1f}ms {calls:>6} {bulk_time * 1000:>6.0f}ms"
+                f" {classes['interactive'].queue_wait.quantile(0.95) * 1000:>13.1f}ms"
+                f" {classes['batch'].queue_wait.quantile(0.95) * 1000:>13.1f}ms"
+            )
+    finally:
+        server.should_exit = True
+        await serving
+        executor.shutdown()
+
+
+def main_cli():
+    logging.disable(logging.INFO)  # Per-request logs of the server and httpx
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("bulk", type=int, nargs="?", default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--tool-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    if main.tool_scheduler is None:
+        parser.error("the scheduler is disabled (MCP_SCHED_CAPACITY=0)")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main_cli()
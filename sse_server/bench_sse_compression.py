@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark SSE response compression and event batching.
+
+Serves the app from main.py in-process, wrapped in SSECompressionMiddleware
+with each configuration in turn. A bench tool returning dev.to-shaped
+article lists is added. Three workloads run over one MCP SSE session:
+
+    - chatty:     sequential add_numbers calls
+    - concurrent: the same calls issued all at once
+    - large:      article lists of 1000 items
+
+For each, the table shows the time, the response body bytes before and after
+the middleware, and the number of body writes (one send, and about one
+syscall, each).
+
+Usage: python bench_sse_compression.py [calls] [--window-ms MS]
+"""
+
+import argparse
+import asyncio
+import logging
+import socket
+import time
+
+import uvicorn
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+import main
+from sse_compression import SSECompressionMiddleware, brotli
+
+
+@main.mcp_server.tool()
+def bench_articles(count: int) -> list:
+    """Return `count` dev.to-shaped articles"""
+    return [
+        {
+            "type_of": "article",
+            "id": 2_000_000 + i,
+            "title": f"Understanding Python's asyncio event loop, part {i}",
+            "description": "How the event loop schedules callbacks, tasks and I/O.",
+            "url": f"https://dev.to/janedoe/understanding-asyncio-part-{i}-4k2a",
+            "comments_count": i % 37,
+            "public_reactions_count": (i * 7) % 500,
+            "published_at": "2025-10-19T09:30:00Z",
+            "reading_time_minutes": 3 + i % 12,
+            "tag_list": ["python", "asyncio", "tutorial"],
+            "user": {"name": "Jane Doe", "username": "janedoe", "user_id": 1_234_567},
+        }
+        for i in range(count)
+    ]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_workloads(url: str, middleware: SSECompressionMiddleware, calls: int):
+    async def chatty(session):
+        for i in range(calls):
+            await session.call_tool("add_numbers", {"a": i, "b": 1})
+
+    async def concurrent(session):
+        await asyncio.gather(
+            *(session.call_tool("add_numbers", {"a": i, "b": 2}) for i in range(calls))
+        )
+
+    async def large(session):
+        for _ in range(5):
+            await session.call_tool("bench_articles", {"count": 1000})
+
+    results = []
+    async with sse_client(url) as streams, ClientSession(*streams) as session:
+        await session.initialize()
+        for name, workload in (("chatty", chatty), ("concurrent", concurrent), ("large", large)):
+            middleware.bytes_in = middleware.bytes_out = middleware.writes = 0
+            started = time.perf_counter()
+            await workload(session)
+            elapsed = time.perf_counter() - started
+            results.append(
+                (name, elapsed, middleware.bytes_in, middleware.bytes_out, middleware.writes)
+            )
+    return results
+
+
+async def bench(compression: str, batch_window: float, calls: int):
+    middleware = SSECompressionMiddleware(
+        main.app.router, compression=compression, batch_window=batch_window
+    )
+    port = free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(middleware, host="127.0.0.1", port=port, log_level="warning")
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    try:
+        return await run_workloads(f"http://127.0.0.1:{port}/sse", middleware, calls)
+    finally:
+        server.should_exit = True
+        await serving
+
+
+async def run(args):
+    window = args.window_ms / 1000
+    configs = [("off", 0.0), ("off", window), ("gzip", 0.0), ("gzip", window)]
+    if brotli is not None:
+        configs += [("br", 0.0), ("br", window)]
+
+    print(f"{args.calls} calls per chatty workload, 5 x 1000 articles for large\n")
+    print(
+        f"{'compression':<12} {'batch':>6} {'workload':<11} {'time':>9}"
+        f" {'body in':>10} {'body out':>10} {'ratio':>6} {'writes':>7}"
+    )
+    print("-" * 78)
+    for compression, batch_window in configs:
+        for name, elapsed, bytes_in, bytes_out, writes in await bench(
+            compression, batch_window, args.calls
+        ):
+            print(
+                f"{compression:<12} {batch_window * 1000:>4.0f}ms {name:<11}"
+                f" {elapsed * 1000:>7.0f}ms {bytes_in / 1024:>8.0f}KB {bytes_out / 1024:>8.0f}KB"
+                f" {bytes_out / bytes_in if bytes_in else 1:>6.2f} {writes:>7}"
+            )
+
+
+def main_cli():
+    logging.disable(logging.INFO)  # Per-request logs of the server and httpx
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("calls", type=int, nargs="?", default=300)
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark tool execution policies with a CPU-bound tool.
+
+Serves the app from main.py in-process. A pure-Python `crunch` tool is
+registered once per policy (crunch_inline, crunch_thread, crunch_process).
+For each policy, `sessions` SSE sessions call it concurrently while a probe
+session calls the cheap add_numbers tool in a loop. The table shows:
+
+    - probe p50/p99: add_numbers latency seen by the other session
+    - crunch:        wall time for all crunch calls, and calls per second
+    - queue p95:     time crunch calls waited for a pool worker
+
+The pools are warmed up before measuring, so process start-up is excluded.
+
+Usage: python bench_tool_execution.py [sessions] [--calls N] [--work N] [--workers N]
+"""
+
+import argparse
+import asyncio
+import logging
+import socket
+import statistics
+import time
+
+import uvicorn
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+import main
+from execution import POLICIES, ToolExecutor
+from metrics import LATENCY_BUCKETS, Histogram
+
+
+def crunch(n: int) -> int:
+    """Sum of squares modulo a prime, in pure Python"""
+    total = 0
+    for i in range(n):
+        total = (total + i * i) % 1_000_003
+    return total
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_policy(url: str, policy: str, args, executor: ToolExecutor):
+    tool = f"crunch_{policy}"
+    async with sse_client(url) as streams, ClientSession(*streams) as probe:
+        await probe.initialize()
+        # Start every worker of the pool, and leave these calls out of its stats
+        await asyncio.gather(*(probe.call_tool(tool, {"n": 10}) for _ in range(args.workers)))
+        stats = executor.pools.get(policy)
+        if stats is not None:
+            stats.queue_wait = Histogram(LATENCY_BUCKETS)
+
+        latencies = []
+        done = asyncio.Event()
+
+        async def probe_loop():
+            while not done.is_set():
+                started = time.perf_counter()
+                await probe.call_tool("add_numbers", {"a": 1, "b": 2})
+                latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(0.005)
+
+        async def session_calls():
+            async with sse_client(url) as streams, ClientSession(*streams) as session:
+                await session.initialize()
+                for _ in range(args.calls):
+                    await session.call_tool(tool, {"n": args.work})
+
+        probing = asyncio.create_task(probe_loop())
+        started = time.perf_counter()
+        await asyncio.gather(*(session_calls() for _ in range(args.sessions)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probing
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    queue_p95 = stats.queue_wait.quantile(0.95) if stats is not None else 0.0
+    return statistics.median(latencies), p99, elapsed, queue_p95
+
+
+async def run(args):
+    executor = ToolExecutor(
+        main.mcp_server.name, thread_workers=args.workers, process_workers=args.workers
+    )
+    for policy in POLICIES:
+        main.mcp_server.add_tool(executor.wrap(policy, crunch), name=f"crunch_{policy}")
+
+    port = free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    single = time.perf_counter()
+    crunch(args.work)
+    single = time.perf_counter() - single
+    total_calls = args.sessions * args.calls
+    print(
+        f"{args.sessions} sessions x {args.calls} crunch calls ({single * 1000:.0f}ms each),"
+        f" {args.workers} workers per pool\n"
+    )
+    print(
+        f"{'policy':<8} {'probe p50':>10} {'probe p99':>10} {'crunch':>9}"
+        f" {'calls/s':>8} {'queue p95':>10}"
+    )
+    print("-" * 60)
+    try:
+        for policy in POLICIES:
+            p50, p99, elapsed, queue_p95 = await run_policy(
+                f"http://127.0.0.1:{port}/sse", policy, args, executor
+            )
+            print(
+                f"{policy:<8} {p50 * 1000:>8.1f}ms {p99 * 1000:>8.1f}ms {elapsed * 1000:>7.0f}ms"
+                f" {total_calls / elapsed:>8.1f} {queue_p95 * 1000:>8.1f}ms"
+            )
+    finally:
+        server.should_exit = True
+        await serving
+        executor.shutdown()
+
+
+def main_cli():
+    logging.disable(logging.INFO)  # Per-request logs of the server and httpx
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("sessions", type=int, nargs="?", default=4)
+    parser.add_argument("--calls", type=int, default=5)
+    parser.add_argument("--work", type=int, default=2_000_000)
+    parser.add_argument("--workers", type=int, default=4)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,309 @@
+"""
+Fair scheduling of tool calls across the sessions of the SSE server.
+
+Without it, tool calls run in arrival order, so one client issuing bulk
+calls can fill the thread pool (or any other shared capacity) and make
+everyone else wait behind it. FairScheduler admits at most `capacity` tool
+calls at a time. Calls waiting for a slot are ordered as follows:
+
+    - priority classes: waiting "interactive" calls go before "batch" ones,
+      and batch calls hold at most `batch_share` of the capacity, so
+      interactive calls always find a slot soon
+    - weighted fair queuing between sessions, within a class: each call
+      gets a start tag of max(virtual time, the session's previous tag)
+      plus 1 / weight, and the lowest tag runs first, so a session with
+      100 calls queued cannot go ahead of one with a single call
+    - concurrency limits: a session and an API key run at most
+      `session_limit` and `key_limit` calls at once
+
+Clients are identified from the POST request that carried the call:
+
+    - session:  the session_id query parameter of the SSE transport
+    - API key:  the X-API-Key header, or an "Authorization: Bearer" token
+    - class:    "priority" in the request _meta, else the X-MCP-Priority
+                header, else interactive
+
+Settings come from the environment (see `settings_from_env`):
+
+    - MCP_SCHED_CAPACITY:      tool calls running at once (default 16, 0: no scheduler)
+    - MCP_SCHED_SESSION_LIMIT: calls running at once per session (default 4)
+    - MCP_SCHED_KEY_LIMIT:     calls running at once per API key (default 8)
+    - MCP_SCHED_BATCH_SHARE:   fraction of the capacity batch calls may hold (default 0.75)
+    - MCP_SCHED_KEY_WEIGHTS:   fair-share weights per API key, e.g. "team-a=2,bulk=0.5"
+"""
+
+import asyncio
+import itertools
+import math
+import os
+import time
+from bisect import insort
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from mcp.server.fastmcp import FastMCP
+
+from metrics import LATENCY_BUCKETS, Histogram, _escape_label, _format_number
+from middleware import CallNext, add_call_tool_middleware
+
+PRIORITY_CLASSES = ("interactive", "batch")
+ANONYMOUS = "anonymous"
+
+
+def settings_from_env() -> Dict[str, Any]:
+    """Keyword arguments for FairScheduler from MCP_SCHED_* variables."""
+    weights = {}
+    for entry in os.getenv("MCP_SCHED_KEY_WEIGHTS", "").split(","):
+        if entry.strip():
+            key, _, weight = entry.rpartition("=")
+            weights[key.strip()] = float(weight)
+    return {
+        "capacity": int(os.getenv("MCP_SCHED_CAPACITY", "16")),
+        "session_limit": int(os.getenv("MCP_SCHED_SESSION_LIMIT", "4")),
+        "key_limit": int(os.getenv("MCP_SCHED_KEY_LIMIT", "8")),
+        "batch_share": float(os.getenv("MCP_SCHED_BATCH_SHARE", "0.75")),
+        "key_weights": weights,
+    }
+
+
+class _Client:
+    """Running calls and fair-queuing state of a session or an API key."""
+
+    def __init__(self):
+        self.running = 0
+        self.waiting = 0
+        self.last_tag = 0.0
+
+
+class _Waiter:
+    def __init__(self, session: str, key: str, priority: str, tag: float):
+        self.session = session
+        self.key = key
+        self.priority = priority
+        self.tag = tag
+        self.enqueued = time.perf_counter()
+        self.granted = asyncio.get_running_loop().create_future()
+
+
+class ClassStats:
+    """Queue metrics for one priority class."""
+
+    def __init__(self):
+        self.calls = 0
+        self.running = 0
+        self.waiting = 0
+        self.queue_wait = Histogram(LATENCY_BUCKETS)
+
+
+class FairScheduler:
+    """Admits tool calls by priority class, fair share and concurrency limits."""
+
+    def __init__(
+        self,
+        server_name: str,
+        capacity: int = 16,
+        session_limit: int = 4,
+        key_limit: int = 8,
+        batch_share: float = 0.75,
+        key_weights: Optional[Dict[str, float]] = None,
+    ):
+        self.server_name = server_name
+        self.capacity = capacity
+        self.session_limit = session_limit
+        self.key_limit = key_limit
+        self.batch_capacity = max(1, math.floor(capacity * batch_share))
+        self.key_weights = key_weights or {}
+
+        self.classes = {priority: ClassStats() for priority in PRIORITY_CLASSES}
+        self._queues: Dict[str, List[Tuple[float, int, _Waiter]]] = {
+            priority: [] for priority in PRIORITY_CLASSES
+        }
+        self._sessions: Dict[str, _Client] = {}
+        self._keys: Dict[str, _Client] = {}
+        self._running = 0
+        self._virtual_time = 0.0
+        self._sequence = itertools.count()
+
+    def _client(self, clients: Dict[str, _Client], name: str) -> _Client:
+        client = clients.get(name)
+        if client is None:
+            client = clients[name] = _Client()
+        return client
+
+    def _forget_idle(self, clients: Dict[str, _Client], name: str) -> None:
+        client = clients[name]
+        if not client.running and not client.waiting:
+            del clients[name]
+
+    def _can_start(self, waiter: _Waiter) -> bool:
+        return (
+            self._sessions[waiter.session].running < self.session_limit
+            and self._keys[waiter.key].running < self.key_limit
+            and (
+                waiter.priority != "batch"
+                or self.classes["batch"].running < self.batch_capacity
+            )
+        )
+
+    def _start(self, waiter: _Waiter) -> None:
+        self._running += 1
+        self._sessions[waiter.session].running += 1
+        self._keys[waiter.key].running += 1
+        self.classes[waiter.priority].running += 1
+        self._virtual_time = max(self._virtual_time, waiter.tag)
+        self.classes[waiter.priority].queue_wait.observe(time.perf_counter() - waiter.enqueued)
+
+    def _dequeue(self, waiter: _Waiter) -> None:
+        self._sessions[waiter.session].waiting -= 1
+        self._keys[waiter.key].waiting -= 1
+        self.classes[waiter.priority].waiting -= 1
+
+    def _dispatch(self) -> None:
+        """Start waiting calls while there is capacity, best class and lowest tag first."""
+        for priority in PRIORITY_CLASSES:
+            queue = self._queues[priority]
+            i = 0
+            while i < len(queue) and self._running < self.capacity:
+                waiter = queue[i][2]
+                if not self._can_start(waiter):
+                    i += 1
+                    continue
+                del queue[i]
+                self._dequeue(waiter)
+                self._start(waiter)
+                waiter.granted.set_result(None)
+
+    async def acquire(self, session: str, key: str, priority: str) -> None:
+        """Wait for a slot for one tool call of `priority`, one of PRIORITY_CLASSES."""
+        session_state = self._client(self._sessions, session)
+        self._client(self._keys, key)
+        self.classes[priority].calls += 1
+
+        start = max(self._virtual_time, session_state.last_tag)
+        session_state.last_tag = start + 1.0 / self.key_weights.get(key, 1.0)
+        waiter = _Waiter(session, key, priority, start)
+
+        if self._running < self.capacity and not self._queues[priority] and self._can_start(waiter):
+            if priority == "interactive" or not self._queues["interactive"]:
+                self._start(waiter)
+                return
+
+        session_state.waiting += 1
+        self._keys[key].waiting += 1
+        self.classes[priority].waiting += 1
+        insort(self._queues[priority], (waiter.tag, next(self._sequence), waiter))
+        self._dispatch()
+        try:
+            await waiter.granted
+        except asyncio.CancelledError:
+            if waiter.granted.done() and not waiter.granted.cancelled():
+                self.release(session, key, priority)
+            else:
+                self._queues[priority] = [
+                    entry for entry in self._queues[priority] if entry[2] is not waiter
+                ]
+                self._dequeue(waiter)
+                self._forget_idle(self._sessions, session)
+                self._forget_idle(self._keys, key)
+            raise
+
+    def release(self, session: str, key: str, priority: str) -> None:
+        self._running -= 1
+        self._sessions[session].running -= 1
+        self._keys[key].running -= 1
+        self.classes[priority].running -= 1
+        self._dispatch()
+        self._forget_idle(self._sessions, session)
+        self._forget_idle(self._keys, key)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-friendly summary of the scheduler."""
+        return {
+            "capacity": self.capacity,
+            "running": self._running,
+            "sessions": len(self._sessions),
+            "classes": {
+                priority: {
+                    "calls": stats.calls,
+                    "running": stats.running,
+                    "waiting": stats.waiting,
+                    "queue_wait_seconds": {
+                        "p50": round(stats.queue_wait.quantile(0.50), 6),
+                        "p95": round(stats.queue_wait.quantile(0.95), 6),
+                        "p99": round(stats.queue_wait.quantile(0.99), 6),
+                    },
+                }
+                for priority, stats in self.classes.items()
+            },
+        }
+
+    def render_prometheus(self) -> str:
+        """Render the scheduler metrics in the Prometheus text exposition format."""
+        server = _escape_label(self.server_name)
+        lines = [
+            "# HELP mcp_scheduler_capacity Tool calls the scheduler runs at once.",
+            "# TYPE mcp_scheduler_capacity gauge",
+            f'mcp_scheduler_capacity{{server="{server}"}} {self.capacity}',
+        ]
+
+        def scalar(metric: str, kind: str, help_text: str, attribute: str) -> None:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for priority, stats in self.classes.items():
+                lines.append(
+                    f'{metric}{{server="{server}",class="{priority}"}} {getattr(stats, attribute)}'
+                )
+
+        scalar("mcp_scheduler_calls_total", "counter", "Tool calls scheduled.", "calls")
+        scalar("mcp_scheduler_running", "gauge", "Scheduled tool calls running.", "running")
+        scalar("mcp_scheduler_waiting", "gauge", "Tool calls waiting for a slot.", "waiting")
+
+        metric = "mcp_scheduler_queue_wait_seconds"
+        lines.append(f"# HELP {metric} Time tool calls waited for a slot.")
+        lines.append(f"# TYPE {metric} histogram")
+        for priority, stats in self.classes.items():
+            labels = f'server="{server}",class="{priority}"'
+            for bound, count in stats.queue_wait.cumulative_counts():
+                lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f"{metric}_sum{{{labels}}} {_format_number(stats.queue_wait.sum)}")
+            lines.append(f"{metric}_count{{{labels}}} {stats.queue_wait.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _identify(server: FastMCP) -> Tuple[str, str, str]:
+    """Session, API key and priority class of the tool call being handled."""
+    try:
+        context = server._mcp_server.request_context
+    except LookupError:  # Called outside of a request, e.g. in-process
+        return "local", ANONYMOUS, "interactive"
+
+    session, key, priority = str(id(context.session)), ANONYMOUS, None
+    request = context.request
+    if request is not None:
+        session = request.query_params.get("session_id", session)
+        authorization = request.headers.get("authorization", "")
+        if authorization.lower().startswith("bearer "):
+            key = authorization[7:].strip()
+        key = request.headers.get("x-api-key", key)
+        priority = request.headers.get("x-mcp-priority")
+    if context.meta is not None:
+        priority = getattr(context.meta, "priority", None) or priority
+    if priority not in PRIORITY_CLASSES:
+        priority = "interactive"
+    return session, key, priority
+
+
+def schedule_tool_calls(server: FastMCP, scheduler: FairScheduler) -> None:
+    """Admit every tool call of a FastMCP server through `scheduler`."""
+
+    async def schedule(
+        name: str, arguments: Dict[str, Any], call_next: CallNext
+    ) -> Sequence[Any]:
+        session, key, priority = _identify(server)
+        await scheduler.acquire(session, key, priority)
+        try:
+            return await call_next(name, arguments)
+        finally:
+            scheduler.release(session, key, priority)
+
+    add_call_tool_middleware(server, schedule)
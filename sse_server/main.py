@@ -1,12 +1,24 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from mcp.server.fastmcp import FastMCP
 from mcp.server.sse import SseServerTransport
 from starlette.routing import Mount
 import uvicorn
 
+# execution, metrics and tracing are copies of the stdio servers' helpers
+from execution import ToolExecutor, policies_from_env
+import fair_scheduler
+from metrics import PROMETHEUS_CONTENT_TYPE, instrument_metrics
+from sse_compression import SSECompressionMiddleware, settings_from_env
+from tracing import configure_tracing, instrument_tracing
+
+configure_tracing("sse-mcp-server")
+
 # Create the main app
 app = FastAPI()
 
+# Compress /sse and the other responses, optionally batching stream events
+app.add_middleware(SSECompressionMiddleware, **settings_from_env())
+
 # Create MCP server with a simple tool
 mcp_server = FastMCP("Demo")
 
@@ -17,6 +29,21 @@ def add_numbers(a: int, b: int) -> int:
     return a + b
 
 
+# Run tools named in MCP_TOOL_EXECUTION in thread or process pools
+tool_executor = ToolExecutor(mcp_server.name)
+tool_executor.apply(mcp_server, policies_from_env())
+
+# Share tool-call capacity fairly between sessions, API keys and priority classes
+scheduler_settings = fair_scheduler.settings_from_env()
+tool_scheduler = None
+if scheduler_settings["capacity"] > 0:
+    tool_scheduler = fair_scheduler.FairScheduler(mcp_server.name, **scheduler_settings)
+    fair_scheduler.schedule_tool_calls(mcp_server, tool_scheduler)
+
+tool_metrics = instrument_metrics(mcp_server, stats_tool=False)
+instrument_tracing(mcp_server)
+
+
 # Create SSE transport for handling messages
 sse_transport = SseServerTransport("/messages/")
 
@@ -40,6 +67,16 @@ async def sse_endpoint(request: Request):
         )
 
 
+# Prometheus scrape endpoint
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Expose tool metrics in the Prometheus text format"""
+    content = tool_metrics.render_prometheus() + tool_executor.render_prometheus()
+    if tool_scheduler is not None:
+        content += tool_scheduler.render_prometheus()
+    return Response(content=content, media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 # Start the server
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8004)
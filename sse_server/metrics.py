@@ -0,0 +1,269 @@
+"""
+In-process tool metrics for the MCP servers.
+
+`instrument_metrics` wraps every tool call of a FastMCP server and records:
+
+    - call and error counts; a result of the form {"error": ...}, which is how
+      the tools of these servers report failures, counts as an error
+    - a latency histogram
+    - the number of calls in flight
+    - request (arguments) and response (content) payload sizes in bytes
+
+Calls to tools the server does not have are recorded under the tool name
+"unknown", so clients cannot create new metric series at will.
+
+Stdio servers expose a snapshot through a `server_stats` tool; HTTP servers can
+serve `ToolMetrics.render_prometheus()` as a Prometheus text endpoint, as the
+SSE server does with its identical copy of this module.
+"""
+
+import json
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from mcp.server.fastmcp import FastMCP
+
+from middleware import CallNext, add_call_tool_middleware
+
+
+# Prometheus' default latency buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PAYLOAD_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Label of calls to tools the server does not have
+UNKNOWN_TOOL = "unknown"
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Cumulative-bucket histogram, as exposed by Prometheus."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket."""
+        if self.count == 0:
+            return 0.0
+
+        rank = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+    def cumulative_counts(self) -> List[Tuple[str, int]]:
+        result = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            cumulative += bucket_count
+            result.append((_format_number(bound), cumulative))
+        result.append(("+Inf", cumulative + self.counts[-1]))
+        return result
+
+
+class ToolStats:
+    """Metrics for a single tool."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.request_bytes = Histogram(PAYLOAD_BUCKETS)
+        self.response_bytes = Histogram(PAYLOAD_BUCKETS)
+
+
+class ToolMetrics:
+    """Per-tool metrics for one MCP server."""
+
+    def __init__(self, server_name: str):
+        self.server_name = server_name
+        self.started_at = time.time()
+        self.tools: Dict[str, ToolStats] = {}
+        # Other sections of the snapshot, e.g. upstream API statistics
+        self.sections: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def stats(self, tool_name: str) -> ToolStats:
+        stats = self.tools.get(tool_name)
+        if stats is None:
+            stats = self.tools[tool_name] = ToolStats()
+        return stats
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-friendly summary of all tool metrics."""
+        snapshot = {
+            "server": self.server_name,
+            "uptime_seconds": round(time.time() - self.started_at, 3),
+            "tools": {
+                name: {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "in_flight": stats.in_flight,
+                    "latency_seconds": {
+                        "mean": round(stats.latency.sum / stats.latency.count, 6)
+                        if stats.latency.count
+                        else 0.0,
+                        "p50": round(stats.latency.quantile(0.50), 6),
+                        "p95": round(stats.latency.quantile(0.95), 6),
+                        "p99": round(stats.latency.quantile(0.99), 6),
+                    },
+                    "request_bytes_total": int(stats.request_bytes.sum),
+                    "response_bytes_total": int(stats.response_bytes.sum),
+                }
+                for name, stats in self.tools.items()
+            },
+        }
+        for section, collect in self.sections.items():
+            snapshot[section] = collect()
+        return snapshot
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        server = _escape_label(self.server_name)
+        lines = [
+            "# HELP mcp_server_start_time_seconds Start time of the server since unix epoch.",
+            "# TYPE mcp_server_start_time_seconds gauge",
+            f'mcp_server_start_time_seconds{{server="{server}"}} {self.started_at}',
+        ]
+
+        def scalar(metric: str, kind: str, help_text: str, attribute: str) -> None:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, stats in self.tools.items():
+                labels = f'server="{server}",tool="{_escape_label(name)}"'
+                lines.append(f"{metric}{{{labels}}} {getattr(stats, attribute)}")
+
+        def histogram(metric: str, help_text: str, attribute: str) -> None:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for name, stats in self.tools.items():
+                labels = f'server="{server}",tool="{_escape_label(name)}"'
+                hist = getattr(stats, attribute)
+                for bound, count in hist.cumulative_counts():
+                    lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{metric}_sum{{{labels}}} {_format_number(hist.sum)}")
+                lines.append(f"{metric}_count{{{labels}}} {hist.count}")
+
+        scalar("mcp_tool_calls_total", "counter", "Tool calls received.", "calls")
+        scalar("mcp_tool_errors_total", "counter", "Tool calls that failed.", "errors")
+        scalar("mcp_tool_in_flight", "gauge", "Tool calls currently executing.", "in_flight")
+        histogram("mcp_tool_duration_seconds", "Tool call latency.", "latency")
+        histogram("mcp_tool_request_bytes", "Size of tool call arguments.", "request_bytes")
+        histogram("mcp_tool_response_bytes", "Size of tool call results.", "response_bytes")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _content_size(content: Sequence[Any]) -> int:
+    size = 0
+    for item in content:
+        text = getattr(item, "text", None)
+        if text is not None:
+            size += len(text.encode())
+            continue
+        data = getattr(item, "data", None)  # base64 image data
+        if data is not None:
+            size += len(data)
+            continue
+        resource = getattr(item, "resource", None)
+        if resource is not None:
+            size += len(getattr(resource, "text", None) or getattr(resource, "blob", ""))
+    return size
+
+
+def _is_error_result(content: Sequence[Any]) -> bool:
+    """Whether a tool returned a {"error": ...} dict (as one JSON text item)."""
+    if len(content) != 1:
+        return False
+    text = getattr(content[0], "text", None)
+    if not text or not text.startswith("{") or '"error"' not in text:
+        return False
+    try:
+        result = json.loads(text)
+    except ValueError:
+        return False
+    return isinstance(result, dict) and "error" in result
+
+
+def instrument_metrics(
+    server: FastMCP,
+    stats_tool: bool = True,
+    sections: Optional[Dict[str, Callable[[], Dict[str, Any]]]] = None,
+) -> ToolMetrics:
+    """Record metrics for every tool call of a FastMCP server.
+
+    Args:
+        server (FastMCP): The server to instrument.
+        stats_tool (bool): Also register a `server_stats` tool returning a snapshot.
+        sections (dict, optional): Extra snapshot sections, each a function
+            returning a JSON-friendly dict.
+
+    Returns:
+        ToolMetrics: The metrics registry for this server.
+    """
+    metrics = ToolMetrics(server.name)
+    metrics.sections.update(sections or {})
+
+    async def record_tool_call(
+        name: str, arguments: Dict[str, Any], call_next: CallNext
+    ) -> Sequence[Any]:
+        known = server._tool_manager.get_tool(name) is not None
+        stats = metrics.stats(name if known else UNKNOWN_TOOL)
+        stats.calls += 1
+        stats.in_flight += 1
+        stats.request_bytes.observe(
+            len(json.dumps(arguments, separators=(",", ":"), ensure_ascii=False, default=str).encode())
+        )
+        started = time.perf_counter()
+        try:
+            content = await call_next(name, arguments)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.latency.observe(time.perf_counter() - started)
+            stats.in_flight -= 1
+
+        if _is_error_result(content):
+            stats.errors += 1
+        stats.response_bytes.observe(_content_size(content))
+        return content
+
+    add_call_tool_middleware(server, record_tool_call)
+
+    if stats_tool:
+
+        @server.tool(
+            name="server_stats",
+            description="Runtime metrics of this MCP server: per-tool call and error counts, latency percentiles and payload sizes.",
+        )
+        async def server_stats() -> Dict[str, Any]:
+            """Runtime metrics of this MCP server."""
+            return metrics.snapshot()
+
+    return metrics
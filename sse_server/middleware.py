@@ -0,0 +1,31 @@
+"""
+Call-tool middleware for FastMCP servers.
+
+FastMCP registers its `call_tool` method as the low-level `tools/call` handler
+when the server is created. `add_call_tool_middleware` swaps that handler for a
+wrapper, so cross-cutting concerns (tracing, metrics, ...) can run around every
+tool call without touching the tool functions themselves.
+
+sse_server/ has an identical copy.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Sequence
+
+from mcp.server.fastmcp import FastMCP
+
+CallNext = Callable[[str, Dict[str, Any]], Awaitable[Sequence[Any]]]
+Middleware = Callable[[str, Dict[str, Any], CallNext], Awaitable[Sequence[Any]]]
+
+
+def add_call_tool_middleware(server: FastMCP, middleware: Middleware) -> None:
+    """Run `middleware(name, arguments, call_next)` around every tool call.
+
+    Middlewares stack: the one added last runs first.
+    """
+    call_next = server.call_tool
+
+    async def call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Any]:
+        return await middleware(name, arguments, call_next)
+
+    server.call_tool = call_tool
+    server._mcp_server.call_tool()(call_tool)
@@ -0,0 +1,265 @@
+"""
+Response compression and event batching for the SSE server.
+
+Starlette's GZipMiddleware skips text/event-stream responses, because its
+buffering would hold events back. SSECompressionMiddleware compresses event
+streams too. Each write ends with a sync flush of the compressor, so the
+client can decode every event as soon as it arrives.
+
+    - The encoding is negotiated from Accept-Encoding: br when the brotli
+      package is installed, then gzip. A response that completes in a single
+      body message smaller than `minimum_size` is sent uncompressed, which
+      covers the 202 "Accepted" replies to POSTed messages.
+    - With `batch_window` > 0, events of a stream that are emitted within the
+      window are coalesced and written with one send. This means fewer
+      writes and better compression across events, at the cost of up to
+      `batch_window` seconds of extra latency.
+
+Settings come from the environment (see `settings_from_env`):
+
+    - MCP_SSE_COMPRESSION:          auto (default), gzip, br or off
+    - MCP_SSE_BATCH_WINDOW_MS:      coalescing window for stream events (default 0: off)
+    - MCP_SSE_COMPRESSION_MIN_SIZE: smallest complete body worth compressing (default 512)
+"""
+
+import asyncio
+import logging
+import os
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from lazy_imports import lazy_import
+
+brotli = lazy_import("brotli")
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_MODES = ("auto", "gzip", "br", "off")
+GZIP_LEVEL = 6
+# Low qualities keep per-flush CPU cost close to gzip's
+BROTLI_QUALITY = 4
+
+
+class _GzipEncoder:
+    def __init__(self):
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _IdentityEncoder:
+    """Used when only batching applies."""
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def finish(self) -> bytes:
+        return b""
+
+
+ENCODERS = {"br": _BrotliEncoder, "gzip": _GzipEncoder}
+
+
+def negotiate_encoding(accept_encoding: str, encodings: Tuple[str, ...]) -> Optional[str]:
+    """The first of `encodings` (in preference order) that Accept-Encoding allows."""
+    qualities = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[name.strip().lower()] = quality
+    for encoding in encodings:
+        if qualities.get(encoding, qualities.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def settings_from_env() -> Dict[str, Any]:
+    """Keyword arguments for SSECompressionMiddleware from MCP_SSE_* variables."""
+    return {
+        "compression": os.getenv("MCP_SSE_COMPRESSION", "auto"),
+        "batch_window": float(os.getenv("MCP_SSE_BATCH_WINDOW_MS", "0")) / 1000,
+        "minimum_size": int(os.getenv("MCP_SSE_COMPRESSION_MIN_SIZE", "512")),
+    }
+
+
+class SSECompressionMiddleware:
+    """ASGI middleware compressing responses, event streams included, and batching events.
+
+    `bytes_in`, `bytes_out` and `writes` count the body bytes and sends of
+    the responses it handled.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        compression: str = "auto",
+        batch_window: float = 0.0,
+        minimum_size: int = 512,
+    ):
+        if compression not in COMPRESSION_MODES:
+            raise ValueError(
+                f"Unknown compression '{compression}', expected one of: {', '.join(COMPRESSION_MODES)}"
+            )
+        if compression == "br" and brotli is None:
+            logger.warning("brotli is not installed; compressing SSE responses with gzip")
+            compression = "gzip"
+
+        self.app = app
+        self.encodings: Tuple[str, ...] = {
+            "auto": ("br", "gzip") if brotli is not None else ("gzip",),
+            "gzip": ("gzip",),
+            "br": ("br",),
+            "off": (),
+        }[compression]
+        self.batch_window = batch_window
+        self.minimum_size = minimum_size
+
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.writes = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.encodings
+        )
+        writer = _ResponseWriter(self, send, encoding)
+        try:
+            await self.app(scope, receive, writer.send)
+        finally:
+            writer.close()
+
+
+class _ResponseWriter:
+    """The `send` of one response, compressing and coalescing its body."""
+
+    def __init__(self, middleware: SSECompressionMiddleware, send: Send, encoding: Optional[str]):
+        self.middleware = middleware
+        self._send = send
+        self._encoding = encoding
+        self._start: Optional[Message] = None
+        self._passthrough = False
+        self._encoder = None
+        self._batch_window = 0.0
+        self._buffer = bytearray()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+        if self._passthrough:
+            await self._send_unchanged(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self._start is not None:
+            start, self._start = self._start, None
+            await self._send(self._begin(start, body, more_body))
+            if self._passthrough:
+                await self._send_unchanged(message)
+                return
+
+        self.middleware.bytes_in += len(body)
+        if more_body and self._batch_window:
+            self._buffer += body
+            if self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_later())
+            return
+
+        if self._flush_task is not None:  # Still waiting out the window
+            self._flush_task.cancel()
+            self._flush_task = None
+        async with self._lock:
+            data = bytes(self._buffer) + body
+            self._buffer.clear()
+            await self._write(data, final=not more_body)
+
+    def _begin(self, start: Message, body: bytes, more_body: bool) -> Message:
+        """Decide how to send the response and return its adjusted start message."""
+        headers = MutableHeaders(raw=list(start["headers"]))
+        streaming = headers.get("content-type", "").startswith("text/event-stream")
+        if (
+            "content-encoding" in headers
+            or (self._encoding is None and not streaming)
+            or (not more_body and len(body) < self.middleware.minimum_size)
+        ):
+            self._passthrough = True
+            return start
+
+        if self._encoding is not None:
+            self._encoder = ENCODERS[self._encoding]()
+            headers["content-encoding"] = self._encoding
+            headers.add_vary_header("Accept-Encoding")
+            if "content-length" in headers:
+                del headers["content-length"]
+        else:
+            self._encoder = _IdentityEncoder()
+        if streaming:
+            self._batch_window = self.middleware.batch_window
+        return {**start, "headers": headers.raw}
+
+    async def _send_unchanged(self, message: Message) -> None:
+        size = len(message.get("body", b""))
+        self.middleware.bytes_in += size
+        self.middleware.bytes_out += size
+        self.middleware.writes += 1
+        await self._send(message)
+
+    async def _write(self, data: bytes, final: bool) -> None:
+        out = self._encoder.compress(data) if data else b""
+        if final:
+            out += self._encoder.finish()
+        elif not out:
+            return
+        self.middleware.bytes_out += len(out)
+        self.middleware.writes += 1
+        await self._send({"type": "http.response.body", "body": out, "more_body": not final})
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._batch_window)
+        # Past this point the flush is no longer cancelled by a final body
+        self._flush_task = None
+        try:
+            async with self._lock:
+                data = bytes(self._buffer)
+                self._buffer.clear()
+                await self._write(data, final=False)
+        except Exception as e:  # The client went away
+            logger.debug(f"Dropped batched SSE events: {e}")
+
+    def close(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
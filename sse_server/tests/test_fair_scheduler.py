@@ -0,0 +1,217 @@
+import asyncio
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from fair_scheduler import FairScheduler, schedule_tool_calls, settings_from_env
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class Calls:
+    """Submits calls to a scheduler; each holds its slot until released by name."""
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.started = []
+        self.tasks = {}
+        self._done = {}
+
+    def submit(self, name, session="s", key="k", priority="interactive"):
+        done = self._done[name] = asyncio.Event()
+
+        async def call():
+            await self.scheduler.acquire(session, key, priority)
+            self.started.append(name)
+            try:
+                await done.wait()
+            finally:
+                self.scheduler.release(session, key, priority)
+
+        self.tasks[name] = asyncio.create_task(call())
+
+    async def finish(self, name):
+        self._done[name].set()
+        await self.tasks[name]
+        await settle()
+
+    async def drain(self):
+        """Finish calls in the order they start until none is left."""
+        while not all(task.done() for task in self.tasks.values()):
+            await settle()
+            for name in list(self.started):
+                if not self._done[name].is_set():
+                    await self.finish(name)
+        await settle()
+
+
+def run(coroutine_function):
+    return asyncio.run(coroutine_function())
+
+
+def test_capacity_limits_calls_running_at_once():
+    async def scenario():
+        calls = Calls(FairScheduler("t", capacity=2))
+        for name in "abc":
+            calls.submit(name, session=name)
+        await settle()
+        assert calls.started == ["a", "b"]
+        assert calls.scheduler.snapshot()["classes"]["interactive"]["waiting"] == 1
+        await calls.finish("a")
+        assert calls.started == ["a", "b", "c"]
+        await calls.drain()
+        assert calls.scheduler.snapshot()["running"] == 0
+
+    run(scenario)
+
+
+def test_a_bulk_session_does_not_starve_others():
+    async def scenario():
+        calls = Calls(FairScheduler("t", capacity=1))
+        calls.submit("hold", session="x")
+        await settle()
+        for i in range(4):
+            calls.submit(f"bulk{i}", session="bulk")
+        await settle()
+        calls.submit("one", session="small")
+        await calls.drain()
+        # The single call goes right after the bulk session's first one
+        assert calls.started == ["hold", "bulk0", "one", "bulk1", "bulk2", "bulk3"]
+
+    run(scenario)
+
+
+def test_key_weights_share_capacity_in_proportion():
+    async def scenario():
+        calls = Calls(FairScheduler("t", capacity=1, key_weights={"gold": 2}))
+        calls.submit("hold", session="x")
+        await settle()
+        for i in range(4):
+            calls.submit(f"g{i}", session="g", key="gold")
+            calls.submit(f"b{i}", session="b", key="basic")
+        await calls.drain()
+        # Gold's tags advance by 1/2, basic's by 1; equal tags go in arrival order
+        assert calls.started[1:] == ["g0", "b0", "g1", "b1", "g2", "g3", "b2", "b3"]
+
+    run(scenario)
+
+
+def test_interactive_calls_go_first_and_batch_keeps_to_its_share():
+    async def scenario():
+        calls = Calls(FairScheduler("t", capacity=4, session_limit=4, batch_share=0.5))
+        for i in range(4):
+            calls.submit(f"batch{i}", session="b", priority="batch")
+        await settle()
+        # Batch calls hold at most half of the slots
+        assert calls.started == ["batch0", "batch1"]
+        calls.submit("ui", session="u")
+        await settle()
+        assert calls.started[-1] == "ui"
+        await calls.finish("batch0")
+        assert calls.started[-1] == "batch2"
+
+        calls.submit("ui2", session="u")
+        await settle()
+        # The last slot is free, but batch is at its share: ui2 takes it
+        assert calls.started[-1] == "ui2"
+        await calls.drain()
+
+    run(scenario)
+
+
+def test_session_and_key_limits():
+    async def scenario():
+        calls = Calls(FairScheduler("t", capacity=10, session_limit=2, key_limit=3))
+        for i in range(3):
+            calls.submit(f"a{i}", session="a", key="shared")
+        calls.submit("b0", session="b", key="shared")
+        calls.submit("b1", session="b", key="shared")
+        calls.submit("c0", session="c", key="own")
+        await settle()
+        assert sorted(calls.started) == ["a0", "a1", "b0", "c0"]
+        await calls.finish("a0")
+        # a2 queued first with the same tag as b1; then the key is at its limit
+        assert calls.started[-1] == "a2"
+        assert "b1" not in calls.started
+        await calls.drain()
+
+    run(scenario)
+
+
+def test_cancel_while_queued():
+    async def scenario():
+        scheduler = FairScheduler("t", capacity=1)
+        calls = Calls(scheduler)
+        calls.submit("hold", session="x")
+        calls.submit("gone", session="y", key="y")
+        calls.submit("next", session="z")
+        await settle()
+
+        calls.tasks["gone"].cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await calls.tasks["gone"]
+        del calls.tasks["gone"]
+        snapshot = scheduler.snapshot()
+        assert snapshot["classes"]["interactive"]["waiting"] == 1
+        # The cancelled call's session and key are forgotten
+        assert "y" not in scheduler._sessions and "y" not in scheduler._keys
+
+        await calls.finish("hold")
+        assert calls.started == ["hold", "next"]
+        await calls.drain()
+        assert scheduler.snapshot()["running"] == 0
+        assert not scheduler._sessions and not scheduler._keys
+
+    run(scenario)
+
+
+def test_cancel_after_the_slot_was_granted_releases_it():
+    async def scenario():
+        scheduler = FairScheduler("t", capacity=1)
+        await scheduler.acquire("x", "k", "interactive")
+        waiter = asyncio.create_task(scheduler.acquire("y", "k", "interactive"))
+        await settle()
+        # The slot is handed over, and the waiting task cancelled before it resumes
+        scheduler.release("x", "k", "interactive")
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert scheduler.snapshot()["running"] == 0
+        assert not scheduler._sessions and not scheduler._keys
+
+    run(scenario)
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.setenv("MCP_SCHED_CAPACITY", "2")
+    monkeypatch.setenv("MCP_SCHED_KEY_WEIGHTS", "team-a=2, bulk=0.5,")
+    monkeypatch.delenv("MCP_SCHED_SESSION_LIMIT", raising=False)
+    settings = settings_from_env()
+    assert settings["capacity"] == 2 and settings["session_limit"] == 4
+    assert settings["key_weights"] == {"team-a": 2.0, "bulk": 0.5}
+
+
+def test_tool_calls_go_through_the_scheduler():
+    server = FastMCP("sched")
+    running = []
+
+    @server.tool()
+    async def slow() -> int:
+        running.append(1)
+        peak = len(running)
+        await asyncio.sleep(0.01)
+        running.pop()
+        return peak
+
+    scheduler = FairScheduler("sched", capacity=1)
+    schedule_tool_calls(server, scheduler)
+
+    async def scenario():
+        return await asyncio.gather(*(server.call_tool("slow", {}) for _ in range(3)))
+
+    results = run(scenario)
+    assert [content[0].text for content in results] == ["1", "1", "1"]
+    assert scheduler.snapshot()["classes"]["interactive"]["calls"] == 3
@@ -0,0 +1,153 @@
+import asyncio
+import gzip
+import zlib
+
+import pytest
+
+import sse_compression
+from sse_compression import SSECompressionMiddleware, negotiate_encoding, settings_from_env
+
+EVENTS = [f"event: message\r\ndata: {{\"id\": {i}}}\r\n\r\n".encode() for i in range(3)]
+
+
+def stream_app(events, content_type=b"text/event-stream", pause=0.0):
+    """An ASGI app sending `events` as separate body messages."""
+
+    async def app(scope, receive, send):
+        headers = [(b"content-type", content_type)]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        for event in events:
+            await send({"type": "http.response.body", "body": event, "more_body": True})
+            await asyncio.sleep(pause)
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    return app
+
+
+def body_app(body, headers=()):
+    async def app(scope, receive, send):
+        headers_ = [(b"content-type", b"application/json"), *headers]
+        headers_.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers_})
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+def request(middleware, accept_encoding="gzip, deflate"):
+    """Run one GET through `middleware`; returns the start message and the body messages."""
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    scope = {"type": "http", "method": "GET", "path": "/sse", "headers": headers}
+    asyncio.run(middleware(scope, receive, send))
+    start, *bodies = messages
+    return start, bodies
+
+
+def header(start, name):
+    return dict(start["headers"]).get(name.encode(), b"").decode()
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0, gzip;q=0.5", "gzip"),
+        ("*", "br"),
+        ("gzip;q=0", None),
+        ("deflate", None),
+        ("gzip;q=bogus", None),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding, ("br", "gzip")) == expected
+
+
+def test_each_gzip_write_decodes_on_arrival():
+    middleware = SSECompressionMiddleware(stream_app(EVENTS), compression="gzip")
+    start, bodies = request(middleware)
+    assert header(start, "content-encoding") == "gzip"
+    assert header(start, "vary") == "Accept-Encoding"
+
+    # Sync flush: every event decodes completely from the writes so far
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for event, body in zip(EVENTS, bodies):
+        assert body["more_body"]
+        assert decoder.decompress(body["body"]) == event
+        assert body["body"].endswith(b"\x00\x00\xff\xff")
+    # The last write ends the gzip member, trailer included
+    *_, last = bodies
+    assert not last["more_body"]
+    assert decoder.decompress(last["body"]) == b""
+    assert decoder.eof and decoder.unused_data == b""
+    assert gzip.decompress(b"".join(body["body"] for body in bodies)) == b"".join(EVENTS)
+
+    assert middleware.bytes_in == sum(map(len, EVENTS))
+    assert middleware.bytes_out == sum(len(body["body"]) for body in bodies)
+    assert middleware.writes == len(bodies) == len(EVENTS) + 1
+
+
+def test_batching_coalesces_events_within_the_window():
+    app = stream_app(EVENTS * 2, pause=0.0)
+    middleware = SSECompressionMiddleware(app, compression="gzip", batch_window=0.05)
+    _, bodies = request(middleware)
+    assert len(bodies) < len(EVENTS) * 2
+    data = b"".join(body["body"] for body in bodies)
+    assert gzip.decompress(data) == b"".join(EVENTS * 2)
+
+
+def test_batching_without_compression():
+    middleware = SSECompressionMiddleware(stream_app(EVENTS), batch_window=0.05)
+    start, bodies = request(middleware, accept_encoding="")
+    assert header(start, "content-encoding") == ""
+    assert b"".join(body["body"] for body in bodies) == b"".join(EVENTS)
+    assert len(bodies) < len(EVENTS) + 1
+
+
+def test_complete_bodies():
+    large = b'{"result": "' + b"x" * 2000 + b'"}'
+    start, [body] = request(SSECompressionMiddleware(body_app(large), compression="gzip"))
+    assert header(start, "content-encoding") == "gzip"
+    assert header(start, "content-length") == ""
+    assert gzip.decompress(body["body"]) == large
+
+    # Small replies, responses without a shared encoding and already encoded ones pass through
+    for app, accept_encoding in [
+        (body_app(b"Accepted"), "gzip"),
+        (body_app(large), "identity"),
+        (body_app(large, [(b"content-encoding", b"gzip")]), "gzip"),
+    ]:
+        middleware = SSECompressionMiddleware(app, compression="gzip")
+        start, [body] = request(middleware, accept_encoding)
+        assert body["body"] in (large, b"Accepted")
+        assert middleware.bytes_in == middleware.bytes_out == len(body["body"])
+
+
+def test_off_and_invalid_modes():
+    start, bodies = request(SSECompressionMiddleware(stream_app(EVENTS), compression="off"))
+    assert header(start, "content-encoding") == ""
+    assert [body["body"] for body in bodies][: len(EVENTS)] == EVENTS
+    with pytest.raises(ValueError, match="Unknown compression 'zstd'"):
+        SSECompressionMiddleware(stream_app([]), compression="zstd")
+
+
+def test_br_falls_back_to_gzip_without_brotli(monkeypatch):
+    monkeypatch.setattr(sse_compression, "brotli", None)
+    assert SSECompressionMiddleware(stream_app([]), compression="br").encodings == ("gzip",)
+    assert SSECompressionMiddleware(stream_app([]), compression="auto").encodings == ("gzip",)
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.setenv("MCP_SSE_COMPRESSION", "gzip")
+    monkeypatch.setenv("MCP_SSE_BATCH_WINDOW_MS", "5")
+    monkeypatch.delenv("MCP_SSE_COMPRESSION_MIN_SIZE", raising=False)
+    assert settings_from_env() == {"compression": "gzip", "batch_window": 0.005, "minimum_size": 512}
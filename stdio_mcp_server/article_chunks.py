@@ -0,0 +1,184 @@
+"""
+Heading-aware chunks of dev.to articles, ranked locally with BM25.
+
+A long article returned whole by `get_article` can fill a good part of the
+model's context, most of it irrelevant to the question. `get_article_chunks`
+returns only the parts of an article that match a query:
+
+    - the markdown body is split at headings (outside fenced code blocks), and
+      sections longer than `max_chars` are split again at blank lines; each
+      chunk keeps its heading path ("Setup > Install") and its character
+      offsets in `body_markdown`
+    - chunks are ranked for a query with Okapi BM25 (see bm25.py) over their
+      heading and text, and paged with `offset`
+    - an article is parsed and indexed once per version (a digest of its
+      body), and up to `max_entries` of them are kept
+
+Articles without `body_markdown` are chunked from `body_html`, with its
+<h1>-<h6> tags read as headings; their offsets are in the tag-stripped text.
+
+Settings come from the environment (see `settings_from_env`):
+
+    - MCP_DEVTO_CHUNK_CHARS:   target size of a chunk in characters (default 1500)
+    - MCP_DEVTO_CHUNK_ENTRIES: chunked articles kept (default 64)
+"""
+
+import hashlib
+import html
+import os
+import re
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from bm25 import BM25Index, tokenize
+
+# Heading words are matched more strongly than body words
+HEADING_WEIGHT = 2
+
+_HEADING = re.compile(r"^(#{1,6})[ \t]+(.*?)[ \t#]*$")
+_FENCE = re.compile(r"^[ \t]*(```|~~~)")
+_HTML_HEADING = re.compile(r"<h([1-6])[^>]*>(.*?)</h\1>", re.IGNORECASE | re.DOTALL)
+_HTML_BREAK = re.compile(r"</(p|pre|li|blockquote|div)>|<br\s*/?>", re.IGNORECASE)
+_HTML_TAG = re.compile(r"<[^>]+>")
+
+
+def settings_from_env() -> Dict[str, Any]:
+    """Keyword arguments for ArticleChunkCache from MCP_DEVTO_CHUNK_* variables."""
+    return {
+        "max_chars": int(os.getenv("MCP_DEVTO_CHUNK_CHARS", "1500")),
+        "max_entries": int(os.getenv("MCP_DEVTO_CHUNK_ENTRIES", "64")),
+    }
+
+
+def html_to_markdown(body_html: str) -> str:
+    """Just enough of `body_html` as markdown to find its headings and paragraphs."""
+    text = _HTML_HEADING.sub(
+        lambda m: "\n\n" + "#" * int(m.group(1)) + " " + _HTML_TAG.sub("", m.group(2)).strip() + "\n\n",
+        body_html,
+    )
+    text = _HTML_BREAK.sub("\n\n", text)
+    return html.unescape(_HTML_TAG.sub("", text))
+
+
+def _sections(markdown: str) -> List[Tuple[str, int, int, List[int]]]:
+    """(heading path, start, end, paragraph breaks) of each section of `markdown`."""
+    sections = []
+    headings: List[Tuple[int, str]] = []
+    path, start, breaks = "", 0, []
+    offset = 0
+    in_fence = False
+    for line in markdown.splitlines(keepends=True):
+        stripped = line.rstrip("\r\n")
+        if _FENCE.match(stripped):
+            in_fence = not in_fence
+        elif not in_fence:
+            match = _HEADING.match(stripped)
+            if match:
+                if markdown[start:offset].strip():
+                    sections.append((path, start, offset, breaks))
+                level = len(match.group(1))
+                while headings and headings[-1][0] >= level:
+                    headings.pop()
+                headings.append((level, match.group(2)))
+                path, start, breaks = " > ".join(title for _, title in headings), offset, []
+            elif not stripped.strip():
+                breaks.append(offset + len(line))
+        offset += len(line)
+    if markdown[start:offset].strip():
+        sections.append((path, start, offset, breaks))
+    return sections
+
+
+def split_markdown(markdown: str, max_chars: int = 1500) -> List[Dict[str, Any]]:
+    """Split `markdown` into chunks of about `max_chars`, never across a heading.
+
+    Long sections are cut at the last blank line that keeps a chunk within
+    `max_chars`; a single paragraph (or code block) longer than that stays
+    whole.
+    """
+    chunks = []
+    for heading, start, end, breaks in _sections(markdown):
+        while start < end:
+            cut = end
+            if end - start > max_chars:
+                fitting = [b for b in breaks if start < b <= start + max_chars and b < end]
+                later = [b for b in breaks if start + max_chars < b < end]
+                if fitting:
+                    cut = fitting[-1]
+                elif later:
+                    cut = later[0]
+            text = markdown[start:cut].strip()
+            if text:
+                first = markdown.index(text, start)
+                chunks.append(
+                    {"index": len(chunks), "heading": heading, "start": first, "end": first + len(text), "text": text}
+                )
+            start = cut
+    return chunks
+
+
+class ChunkedArticle:
+    """The chunks of one article version and their BM25 index."""
+
+    def __init__(self, markdown: str, max_chars: int = 1500):
+        self.chunks = split_markdown(markdown, max_chars)
+        self.index = BM25Index(
+            [tokenize(chunk["heading"]) * HEADING_WEIGHT + tokenize(chunk["text"]) for chunk in self.chunks]
+        )
+
+    def search(self, query: Optional[str]) -> List[Tuple[Dict[str, Any], Optional[float]]]:
+        """Chunks matching `query`, best first, or all chunks in order without a query.
+
+        Scores are None for chunks in document order.
+        """
+        terms = tokenize(query) if query else []
+        if not terms:
+            return [(chunk, None) for chunk in self.chunks]
+        scores = self.index.scores(terms)
+        ranked = sorted(range(len(self.chunks)), key=lambda i: (-scores[i], i))
+        return [(self.chunks[i], round(scores[i], 4)) for i in ranked if scores[i] > 0]
+
+
+class ArticleChunkCache:
+    """Chunked articles by id and body digest, so each version is parsed once."""
+
+    def __init__(self, max_chars: int = 1500, max_entries: int = 64):
+        self.max_chars = max_chars
+        self.max_entries = max_entries
+        self.hits = 0
+        self.parses = 0
+        self._articles: "OrderedDict[Tuple[str, str], ChunkedArticle]" = OrderedDict()
+
+    def get(self, article: Dict[str, Any]) -> ChunkedArticle:
+        """The chunks of a dev.to article object, parsing it if this version is new."""
+        markdown = article.get("body_markdown")
+        if markdown is None:
+            markdown = html_to_markdown(article.get("body_html") or "")
+        digest = hashlib.blake2b(markdown.encode(), digest_size=16).hexdigest()
+        key = (str(article.get("id")), digest)
+
+        chunked = self._articles.get(key)
+        if chunked is not None:
+            self._articles.move_to_end(key)
+            self.hits += 1
+            return chunked
+
+        chunked = ChunkedArticle(markdown, self.max_chars)
+        self.parses += 1
+        # An older version of the same article will not be asked for again
+        for stale in [k for k in self._articles if k[0] == key[0]]:
+            del self._articles[stale]
+        self._articles[key] = chunked
+        while len(self._articles) > self.max_entries:
+            self._articles.popitem(last=False)
+        return chunked
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-friendly summary of the cache."""
+        lookups = self.hits + self.parses
+        return {
+            "articles": len(self._articles),
+            "parses": self.parses,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
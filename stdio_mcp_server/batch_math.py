@@ -0,0 +1,117 @@
+"""
+Vectorized arithmetic for the calculator server's batch tools.
+
+NumPy is used when it is installed (`uv sync --extra numeric`); otherwise the
+same operations run in pure Python with identical inputs and outputs. NumPy is
+only imported when a batch tool first runs, to keep server startup fast.
+"""
+
+import math
+from typing import Dict, List, Sequence, Tuple, Union
+
+from lazy_imports import lazy_import
+
+np = lazy_import("numpy")  # numpy is an optional extra
+
+
+BACKEND = "numpy" if np is not None else "python"
+
+OPERATIONS = ("add", "subtract", "multiply", "divide")
+REDUCTIONS = ("sum", "mean", "min", "max")
+
+Number = Union[int, float]
+
+
+def _check_operation(operation: str) -> None:
+    if operation not in OPERATIONS:
+        raise ValueError(
+            f"Unknown operation '{operation}', expected one of: {', '.join(OPERATIONS)}"
+        )
+
+
+def _check_divisors(divisors: Sequence[Number]) -> None:
+    for index, value in enumerate(divisors):
+        if value == 0:
+            raise ValueError(f"Division by zero at index {index}")
+
+
+def reduce_values(values: Sequence[Number], operation: str) -> float:
+    """Reduce a list of numbers with sum, mean, min or max."""
+    if operation not in REDUCTIONS:
+        raise ValueError(
+            f"Unknown reduction '{operation}', expected one of: {', '.join(REDUCTIONS)}"
+        )
+    if not values and operation != "sum":
+        raise ValueError(f"Cannot compute the {operation} of an empty list")
+
+    if np is not None:
+        array = np.asarray(values, dtype=np.float64)
+        return float(getattr(array, operation)()) if len(array) else 0.0
+
+    if operation == "sum":
+        return math.fsum(values)
+    if operation == "mean":
+        return math.fsum(values) / len(values)
+    return float(min(values) if operation == "min" else max(values))
+
+
+def dot(a: Sequence[Number], b: Sequence[Number]) -> float:
+    """Dot product of two equally long vectors."""
+    if len(a) != len(b):
+        raise ValueError(f"Vectors must have the same length ({len(a)} != {len(b)})")
+
+    if np is not None:
+        return float(np.dot(np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)))
+
+    return math.fsum(x * y for x, y in zip(a, b))
+
+
+def elementwise(
+    operation: str, a: Sequence[Number], b: Union[Sequence[Number], Number]
+) -> List[float]:
+    """Apply an operation pairwise; a scalar `b` is broadcast over `a`."""
+    _check_operation(operation)
+
+    scalar = isinstance(b, (int, float))
+    if not scalar and len(a) != len(b):
+        raise ValueError(f"Arrays must have the same length ({len(a)} != {len(b)})")
+    if operation == "divide":
+        _check_divisors([b] if scalar else b)
+
+    if np is not None:
+        left = np.asarray(a, dtype=np.float64)
+        right = np.float64(b) if scalar else np.asarray(b, dtype=np.float64)
+        return getattr(np, operation)(left, right).tolist()
+
+    apply = _PYTHON_OPERATIONS[operation]
+    if scalar:
+        return [float(apply(x, b)) for x in a]
+    return [float(apply(x, y)) for x, y in zip(a, b)]
+
+
+def calculate_batch(operations: Sequence[Tuple[str, Number, Number]]) -> List[float]:
+    """Evaluate a list of `(operation, a, b)` tuples, vectorized per operation."""
+    groups: Dict[str, List[int]] = {}
+    for index, (operation, _, _) in enumerate(operations):
+        _check_operation(operation)
+        groups.setdefault(operation, []).append(index)
+
+    results: List[float] = [0.0] * len(operations)
+    for operation, indices in groups.items():
+        left = [operations[i][1] for i in indices]
+        right = [operations[i][2] for i in indices]
+        if operation == "divide":
+            for i, value in zip(indices, right):
+                if value == 0:
+                    raise ValueError(f"Division by zero in operation {i}")
+        for i, value in zip(indices, elementwise(operation, left, right)):
+            results[i] = value
+    return results
+
+
+_PYTHON_OPERATIONS = {
+    "add": lambda x, y: x + y,
+    "subtract": lambda x, y: x - y,
+    "multiply": lambda x, y: x * y,
+    "divide": lambda x, y: x / y,
+}
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark get_article_chunks against get_article.
+
+Starts mock_devto_server in-process (no added latency) and asks the dev_blog
+server `calls` times about one article, with a few queries in turn, once
+through get_article (the whole body) and once through get_article_chunks.
+
+The first table shows the size of each tool result, which is what ends up
+in the model's context, and the tool call latency. The second shows the
+server-side cost of chunking one article: parsing and indexing a new
+version, against finding an already chunked version in the cache.
+
+Usage: python bench_article_chunks.py [calls] [--top-k K] [--chunk-chars N]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import time
+
+import uvicorn
+
+import article_chunks
+import dev_blog_mcp_server
+import fast_json
+from mock_devto_server import article, create_app
+
+QUERIES = ("how do timeouts work", "cancellation of tasks", "queues", "debug mode")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_tools(base_url: str, args):
+    os.environ["MCP_DEVTO_CHUNK_CHARS"] = str(args.chunk_chars)
+    try:
+        server = await dev_blog_mcp_server.serve("test", base_url)
+    finally:
+        del os.environ["MCP_DEVTO_CHUNK_CHARS"]
+
+    rows = []
+    for tool in ("get_article", "get_article_chunks"):
+        sizes, latencies = [], []
+        for i in range(args.calls):
+            arguments = {"article_id": "7"}
+            if tool == "get_article_chunks":
+                arguments.update(query=QUERIES[i % len(QUERIES)], top_k=args.top_k)
+            started = time.perf_counter()
+            content = await server.call_tool(tool, arguments)
+            latencies.append(time.perf_counter() - started)
+            sizes.append(len(content[0].text.encode()))
+        latencies.sort()
+        rows.append((tool, sum(sizes) / len(sizes), latencies[len(latencies) // 2]))
+
+    stats = fast_json.loads((await server.call_tool("server_stats", {}))[0].text)["chunks"]
+    return rows, stats
+
+
+def time_chunking(args):
+    body = article(7, body=True)
+    repeats = 200
+
+    started = time.perf_counter()
+    for i in range(repeats):
+        # A new id each time, so every call parses
+        article_chunks.ArticleChunkCache(args.chunk_chars).get({**body, "id": i})
+    parse = (time.perf_counter() - started) / repeats
+
+    cache = article_chunks.ArticleChunkCache(args.chunk_chars)
+    cache.get(body)
+    started = time.perf_counter()
+    for _ in range(repeats):
+        cache.get(body)
+    cached = (time.perf_counter() - started) / repeats
+    return parse, cached, len(cache.get(body).chunks)
+
+
+async def run(args):
+    port = free_port()
+    mock = uvicorn.Server(
+        uvicorn.Config(create_app(latency_ms=0, tail_rate=0.0), host="127.0.0.1", port=port, log_level="warning")
+    )
+    serving = asyncio.create_task(mock.serve())
+    while not mock.started:
+        await asyncio.sleep(0.01)
+    try:
+        rows, stats = await run_tools(f"http://127.0.0.1:{port}/api", args)
+    finally:
+        mock.should_exit = True
+        await serving
+
+    print(f"{args.calls} calls per tool, top_k={args.top_k}, chunks of ~{args.chunk_chars} chars\n")
+    print(f"{'tool':<20} {'result size':>12} {'p50':>9}")
+    print("-" * 43)
+    for tool, size, p50 in rows:
+        print(f"{tool:<20} {size:>10.0f} B {p50 * 1000:>7.1f}ms")
+    print(f"\nchunk cache: {stats['parses']} parses, hit rate {stats['hit_rate']:.1%}\n")
+
+    parse, cached, chunks = time_chunking(args)
+    print(f"{'chunking one article':<28} {'per call':>10}")
+    print("-" * 39)
+    print(f"{f'parse and index ({chunks} chunks)':<28} {parse * 1e6:>8.0f}us")
+    print(f"{'cached version':<28} {cached * 1e6:>8.0f}us")
+
+
+def main():
+    logging.disable(logging.INFO)  # Per-request logs of the server and httpx
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("calls", type=int, nargs="?", default=40)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--chunk-chars", type=int, default=600)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
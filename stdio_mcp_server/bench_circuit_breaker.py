@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark the dev.to circuit breaker through an outage of the mock API.
+
+Starts mock_devto_server in-process and keeps `--concurrency` agents calling
+the dev_blog server's get_article tool over 20 article ids, pausing
+`--think-ms` between calls. The mock goes through three phases: healthy, an
+outage where every request hangs, and healthy again. get_article has a
+`--deadline-ms` budget, and an open circuit is probed again after
+`--open-seconds`. The run is repeated with the breaker off and on. Calls
+are counted in the phase they started in.
+
+For each phase, the table shows the tool calls made, their p50/p95 latency,
+how many returned fresh data, stale cached data or an error, and the
+requests that reached the mock.
+
+Usage: python bench_circuit_breaker.py [--phase-seconds S] [--concurrency N] [--deadline-ms MS] [--open-seconds S] [--think-ms MS]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import time
+
+import uvicorn
+
+import dev_blog_mcp_server
+from mock_devto_server import create_app
+
+PHASES = (("healthy", None), ("outage", "hang"), ("recovered", None))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_breaker(app, base_url: str, breaker: bool, args):
+    env = {
+        "MCP_DEVTO_BREAKER": "on" if breaker else "off",
+        "MCP_DEVTO_BREAKER_OPEN_SECONDS": str(args.open_seconds),
+        "MCP_DEVTO_DEADLINES": f"get_article={args.deadline_ms / 1000}",
+    }
+    os.environ.update(env)
+    try:
+        server = await dev_blog_mcp_server.serve("test", base_url)
+    finally:
+        for name in env:
+            del os.environ[name]
+
+    phase = {"name": PHASES[0][0]}
+    results = {name: {"latencies": [], "fresh": 0, "stale": 0, "error": 0} for name, _ in PHASES}
+    stop = asyncio.Event()
+
+    async def agent(first: int):
+        i = first
+        while not stop.is_set():
+            result = results[phase["name"]]
+            started = time.perf_counter()
+            content = await server.call_tool("get_article", {"article_id": str(i % 20)})
+            result["latencies"].append(time.perf_counter() - started)
+            head, tail = content[0].text[:12], content[-1].text[:12]
+            result["stale" if tail.startswith('{"warning"') else "error" if head.startswith('{"error"') else "fresh"] += 1
+            i += 1
+            await asyncio.sleep(args.think_ms / 1000)
+
+    agents = [asyncio.create_task(agent(n)) for n in range(args.concurrency)]
+    requests = {}
+    for name, outage in PHASES:
+        phase["name"] = name
+        app.state.outage = outage
+        before = app.state.requests
+        await asyncio.sleep(args.phase_seconds)
+        requests[name] = app.state.requests - before
+    stop.set()
+    app.state.outage = None
+    await asyncio.gather(*agents)
+
+    rows = []
+    for name, _ in PHASES:
+        result = results[name]
+        latencies = sorted(result["latencies"]) or [0.0]
+        rows.append(
+            (
+                name,
+                len(result["latencies"]),
+                latencies[len(latencies) // 2] * 1000,
+                latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+                result["fresh"],
+                result["stale"],
+                result["error"],
+                requests[name],
+            )
+        )
+    return rows
+
+
+async def run(args):
+    port = free_port()
+    app = create_app(latency_ms=40, tail_rate=0.0, hang_seconds=30)
+    mock = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.create_task(mock.serve())
+    while not mock.started:
+        await asyncio.sleep(0.01)
+
+    print(
+        f"{args.concurrency} agents, {args.phase_seconds:.0f}s per phase, get_article deadline"
+        f" {args.deadline_ms:.0f}ms, circuit reopens for probing after {args.open_seconds:.0f}s\n"
+    )
+    print(
+        f"{'breaker':<8} {'phase':<10} {'calls':>6} {'p50':>8} {'p95':>8}"
+        f" {'fresh':>6} {'stale':>6} {'error':>6} {'upstream':>9}"
+    )
+    print("-" * 75)
+    try:
+        for breaker in (False, True):
+            for name, calls, p50, p95, fresh, stale, errors, upstream in await run_breaker(
+                app, f"http://127.0.0.1:{port}/api", breaker, args
+            ):
+                print(
+                    f"{'on' if breaker else 'off':<8} {name:<10} {calls:>6} {p50:>6.0f}ms {p95:>6.0f}ms"
+                    f" {fresh:>6} {stale:>6} {errors:>6} {upstream:>9}"
+                )
+    finally:
+        mock.should_exit = True
+        mock.force_exit = True  # Hung outage requests may still be open
+        await serving
+
+
+def main():
+    logging.disable(logging.ERROR)  # Per-request logs, timeouts and circuit changes
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--phase-seconds", type=float, default=4.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--deadline-ms", type=float, default=1000.0)
+    parser.add_argument("--open-seconds", type=float, default=1.0)
+    parser.add_argument("--think-ms", type=float, default=10.0, help="Pause between an agent's calls")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
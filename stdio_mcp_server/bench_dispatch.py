@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-call tool dispatch overhead of the low-level server template
+against FastMCP-decorated servers.
+
+Each server's CallToolRequest handler is invoked directly, in-process, so the
+numbers exclude the transport and JSON encoding and show only what the server
+does around the tool function itself.
+
+Usage: python bench_dispatch.py [calls]
+"""
+
+import asyncio
+import sys
+import time
+
+from mcp import types
+from mcp.server.fastmcp import FastMCP
+
+import calculator_mcp_server
+import server as lowlevel_server
+
+
+def fastmcp_server() -> FastMCP:
+    """A FastMCP server with the same trivial tool as the template."""
+    mcp = FastMCP(name="Bench_Server")
+
+    @mcp.tool(name="sum_two_numbers", description="Add two integers and return the sum.")
+    async def sum_two_numbers(a: int, b: int) -> int:
+        return a + b
+
+    return mcp
+
+
+async def measure(handler, calls: int) -> float:
+    """Return the mean seconds per call of a CallToolRequest handler."""
+    request = types.CallToolRequest(
+        method="tools/call",
+        params=types.CallToolRequestParams(name="sum_two_numbers", arguments={"a": 2, "b": 3}),
+    )
+    result = await handler(request)
+    assert not result.root.isError, result.root.content
+
+    for _ in range(calls // 10):  # Warm up
+        await handler(request)
+    started = time.perf_counter()
+    for _ in range(calls):
+        await handler(request)
+    return (time.perf_counter() - started) / calls
+
+
+async def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+
+    servers = [
+        ("server.py (low-level)", lowlevel_server.create_server()),
+        ("FastMCP", fastmcp_server()._mcp_server),
+        (
+            "calculator_mcp_server.py",
+            (await calculator_mcp_server.serve())._mcp_server,
+        ),
+    ]
+
+    print(f"{'server':<28} {'per call':>12} {'calls/s':>10}")
+    print("-" * 52)
+    baseline = None
+    for label, server in servers:
+        seconds = await measure(server.request_handlers[types.CallToolRequest], calls)
+        baseline = baseline or seconds
+        print(
+            f"{label:<28} {seconds * 1e6:>10.1f}us {1 / seconds:>10.0f}"
+            f"  ({seconds / baseline:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
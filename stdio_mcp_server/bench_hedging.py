@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark hedged and deadline-bounded dev.to reads against the mock API.
+
+Starts mock_devto_server in-process with injected tail latency, then calls
+the dev_blog server's get_article tool `calls` times (`--concurrency` at a
+time) in three setups:
+
+    - plain:    no hedging, default deadlines
+    - hedged:   MCP_DEVTO_HEDGING=on
+    - deadline: no hedging, get_article bounded to `--deadline-ms`
+
+The table shows the tool latency percentiles, the upstream requests sent,
+and the hedge rate, win rate and timeouts reported by server_stats.
+
+Usage: python bench_hedging.py [calls] [--concurrency N] [--latency-ms MS] [--tail-ms MS] [--tail-rate R]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import time
+
+import uvicorn
+
+import dev_blog_mcp_server
+import fast_json
+from mock_devto_server import create_app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_setup(base_url: str, env: dict, args):
+    os.environ.update(env)
+    try:
+        server = await dev_blog_mcp_server.serve("test", base_url)
+    finally:
+        for name in env:
+            del os.environ[name]
+
+    latencies = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def call(i: int):
+        async with semaphore:
+            started = time.perf_counter()
+            await server.call_tool("get_article", {"article_id": str(i)})
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(call(i) for i in range(args.calls)))
+    stats = fast_json.loads((await server.call_tool("server_stats", {}))[0].text)["upstream"]
+
+    latencies.sort()
+
+    def percentile(q: float) -> float:
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+
+    return percentile(0.5), percentile(0.95), percentile(0.99), latencies[-1] * 1000, stats
+
+
+async def run(args):
+    port = free_port()
+    app = create_app(args.latency_ms, args.tail_ms, args.tail_rate, seed=1)
+    mock = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.create_task(mock.serve())
+    while not mock.started:
+        await asyncio.sleep(0.01)
+    base_url = f"http://127.0.0.1:{port}/api"
+
+    setups = [
+        ("plain", {}),
+        ("hedged", {"MCP_DEVTO_HEDGING": "on"}),
+        ("deadline", {"MCP_DEVTO_DEADLINES": f"get_article={args.deadline_ms / 1000}"}),
+    ]
+    print(
+        f"{args.calls} get_article calls, {args.concurrency} at a time; mock latency"
+        f" {args.latency_ms:.0f}ms, {args.tail_rate:.0%} at {args.tail_ms:.0f}ms\n"
+    )
+    print(
+        f"{'setup':<9} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'upstream':>9}"
+        f" {'hedge rate':>11} {'win rate':>9} {'timeouts':>9}"
+    )
+    print("-" * 86)
+    try:
+        for name, env in setups:
+            requests_before = app.state.requests
+            p50, p95, p99, worst, stats = await run_setup(base_url, env, args)
+            print(
+                f"{name:<9} {p50:>6.0f}ms {p95:>6.0f}ms {p99:>6.0f}ms {worst:>6.0f}ms"
+                f" {app.state.requests - requests_before:>9}"
+                f" {stats['hedge_rate']:>11.1%} {stats['win_rate']:>9.1%} {stats['timeouts']:>9}"
+            )
+    finally:
+        mock.should_exit = True
+        await serving
+
+
+def main():
+    logging.disable(logging.ERROR)  # Per-request logs, and the error logged for each timeout
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("calls", type=int, nargs="?", default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--tail-ms", type=float, default=800.0)
+    parser.add_argument("--tail-rate", type=float, default=0.05)
+    parser.add_argument("--deadline-ms", type=float, default=300.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
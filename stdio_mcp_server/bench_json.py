@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON decoding and tool-result encoding on dev.to-shaped payloads.
+
+Payloads mimic the dev.to API: `search_articles` lists of 10, 100 and 1000
+articles, and a single `get_article` with a long markdown and HTML body. For
+each payload it compares:
+
+    - decode:  httpx's response.json() (stdlib) with fast_json.loads(bytes),
+               using orjson and the pydantic_core fallback
+    - encode:  FastMCP's default result conversion with fast_json.to_content
+               (both one item per list element; compact instead of indented
+               JSON), using orjson and the pydantic_core fallback
+
+Times are the mean per call; "peak" is the tracemalloc peak of one call.
+
+Usage: python bench_json.py
+"""
+
+import json
+import time
+import tracemalloc
+
+from mcp.server.fastmcp.server import _convert_to_content
+
+import fast_json
+
+
+def article(i: int, body: bool = False) -> dict:
+    """An article as returned by the dev.to API."""
+    item = {
+        "type_of": "article",
+        "id": 2_000_000 + i,
+        "title": f"Understanding Python's asyncio event loop, part {i} — a deep dive",
+        "description": "How the event loop schedules callbacks, tasks and I/O, with examples. " * 2,
+        "readable_publish_date": "Oct 19",
+        "slug": f"understanding-pythons-asyncio-event-loop-part-{i}-4k2a",
+        "path": f"/janedoe/understanding-pythons-asyncio-event-loop-part-{i}-4k2a",
+        "url": f"https://dev.to/janedoe/understanding-pythons-asyncio-event-loop-part-{i}-4k2a",
+        "comments_count": i % 37,
+        "public_reactions_count": (i * 7) % 500,
+        "collection_id": None,
+        "published_timestamp": "2025-10-19T09:30:00Z",
+        "language": "en",
+        "positive_reactions_count": (i * 7) % 500,
+        "cover_image": f"https://media2.dev.to/dynamic/image/width=1000,height=420/{i}.png",
+        "social_image": f"https://media2.dev.to/dynamic/image/width=1000,height=500/{i}.png",
+        "canonical_url": f"https://dev.to/janedoe/understanding-pythons-asyncio-{i}-4k2a",
+        "created_at": "2025-10-19T09:12:44Z",
+        "edited_at": None,
+        "crossposted_at": None,
+        "published_at": "2025-10-19T09:30:00Z",
+        "last_comment_at": "2025-10-19T11:02:10Z",
+        "reading_time_minutes": 3 + i % 12,
+        "tag_list": ["python", "asyncio", "tutorial", "programming"],
+        "tags": "python, asyncio, tutorial, programming",
+        "user": {
+            "name": "Jane Doe",
+            "username": "janedoe",
+            "twitter_username": None,
+            "github_username": "janedoe",
+            "user_id": 1_234_567,
+            "website_url": "https://janedoe.dev",
+            "profile_image": "https://media2.dev.to/dynamic/image/width=640,height=640/jane.png",
+            "profile_image_90": "https://media2.dev.to/dynamic/image/width=90,height=90/jane.png",
+        },
+    }
+    if body:
+        paragraph = "The event loop runs one callback at a time; `await` yields control. "
+        item["body_markdown"] = ("## Section\n\n" + paragraph * 40 + "\n\n```python\nawait x\n```\n") * 25
+        item["body_html"] = ("<h2>Section</h2><p>" + paragraph * 40 + "</p><pre>await x</pre>") * 25
+    return item
+
+
+def measure(func, min_time: float = 0.3):
+    """Mean seconds per call and tracemalloc peak bytes of one call."""
+    calls = 0
+    started = time.perf_counter()
+    while True:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed / calls, peak
+
+
+def without_orjson(func):
+    """Run `func` with fast_json's fallback to pydantic_core."""
+
+    def run():
+        orjson, fast_json.orjson = fast_json.orjson, None
+        try:
+            return func()
+        finally:
+            fast_json.orjson = orjson
+
+    return run
+
+
+def main():
+    payloads = {
+        "search 10": [article(i) for i in range(10)],
+        "search 100": [article(i) for i in range(100)],
+        "search 1000": [article(i) for i in range(1000)],
+        "get_article": article(0, body=True),
+    }
+    orjson_available = fast_json.orjson is not None
+
+    print(f"orjson installed: {orjson_available}\n")
+    print(f"{'payload':<13} {'step':<36} {'time':>10} {'peak':>10} {'speedup':>8}")
+    print("-" * 81)
+    for name, payload in payloads.items():
+        body = json.dumps(payload).encode()
+        rows = [
+            ("decode", "response.json() (stdlib)", lambda: json.loads(body.decode())),
+            ("decode", "loads (pydantic_core)", without_orjson(lambda: fast_json.loads(body))),
+            ("decode", "loads (orjson)", lambda: fast_json.loads(body)),
+            ("encode", "FastMCP default", lambda: _convert_to_content(payload)),
+            ("encode", "to_content (pydantic_core)", without_orjson(lambda: fast_json.to_content(payload))),
+            ("encode", "to_content (orjson)", lambda: fast_json.to_content(payload)),
+        ]
+        if not orjson_available:
+            rows = [row for row in rows if "(orjson)" not in row[1]]
+
+        baselines = {}
+        print(f"{name} ({len(body) / 1024:.0f} KiB)")
+        for step, label, func in rows:
+            seconds, peak = measure(func)
+            baseline = baselines.setdefault(step, seconds)
+            print(
+                f"{'':<13} {step + ': ' + label:<36} {seconds * 1000:>8.3f}ms"
+                f" {peak / 1024:>8.0f}KiB {baseline / seconds:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
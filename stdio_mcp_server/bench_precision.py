@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark big-integer multiply and result formatting at growing operand sizes.
+
+Compares the cost of producing the product with the cost of each way of
+printing it: full decimal text (quadratic in CPython), hex (linear) and the
+digit-count summary used by the calculator's "auto" encoding.
+
+Usage: python bench_precision.py [max_digits]
+"""
+
+import random
+import sys
+import time
+
+import precise_math
+
+
+def measure(func, min_time: float = 0.2) -> float:
+    """Return the mean seconds per call, repeating until `min_time` has elapsed."""
+    calls = 0
+    started = time.perf_counter()
+    while True:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            return elapsed / calls
+
+
+def main():
+    max_digits = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    # Lift CPython's int -> str limit so the decimal baseline can be measured
+    sys.set_int_max_str_digits(0)
+    random.seed(42)
+
+    print(
+        f"{'digits':>10} {'multiply':>12} {'str()':>12} {'hex()':>12} {'summary':>12}"
+        f" {'mul/s':>10} {'summary/s':>10}"
+    )
+    print("-" * 84)
+
+    digits = 10
+    while digits <= max_digits:
+        bits = int(digits / precise_math._LOG10_2)
+        a = random.getrandbits(bits) | (1 << (bits - 1))
+        b = random.getrandbits(bits) | (1 << (bits - 1))
+        product = a * b
+
+        multiply = measure(lambda: a * b)
+        to_str = measure(lambda: str(product))
+        to_hex = measure(lambda: hex(product))
+        summary = measure(lambda: precise_math.summarize_integer(product))
+
+        print(
+            f"{digits:>10} {multiply * 1e6:>10.1f}us {to_str * 1e6:>10.1f}us"
+            f" {to_hex * 1e6:>10.1f}us {summary * 1e6:>10.1f}us"
+            f" {1 / multiply:>10.0f} {1 / summary:>10.0f}"
+        )
+        digits *= 10
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark predictive prefetch of search results in the dev_blog server.
+
+Starts mock_devto_server in-process and replays an agent `episodes` times:
+search_articles (a new page each time), `--think-ms` of model time, then
+get_article on the first `--reads` results, with the same think time before
+each. This runs for several prefetch depths k (MCP_DEVTO_PREFETCH_K; 0 is
+off).
+
+The table shows get_article latency, the mean episode time, the requests
+that reached the mock, and the hit rate, used rate and cancelled
+prefetches reported by server_stats.
+
+Usage: python bench_prefetch.py [episodes] [--reads N] [--think-ms MS] [--latency-ms MS] [--k K ...]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import time
+
+import uvicorn
+
+import dev_blog_mcp_server
+import fast_json
+from mock_devto_server import create_app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_k(base_url: str, k: int, args):
+    os.environ["MCP_DEVTO_PREFETCH_K"] = str(k)
+    try:
+        server = await dev_blog_mcp_server.serve("test", base_url)
+    finally:
+        del os.environ["MCP_DEVTO_PREFETCH_K"]
+
+    latencies = []
+    started = time.perf_counter()
+    for episode in range(args.episodes):
+        content = await server.call_tool(
+            "search_articles", {"query": "asyncio", "per_page": 10, "page": episode + 1}
+        )
+        articles = [fast_json.loads(item.text) for item in content]
+        for article in articles[: args.reads]:
+            await asyncio.sleep(args.think_ms / 1000)
+            began = time.perf_counter()
+            await server.call_tool("get_article", {"article_id": str(article["id"])})
+            latencies.append(time.perf_counter() - began)
+    episode_time = (time.perf_counter() - started) / args.episodes
+
+    stats = fast_json.loads((await server.call_tool("server_stats", {}))[0].text)["prefetch"]
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return p50, p95, episode_time, stats
+
+
+async def run(args):
+    port = free_port()
+    app = create_app(latency_ms=args.latency_ms, tail_rate=0.0)
+    mock = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.create_task(mock.serve())
+    while not mock.started:
+        await asyncio.sleep(0.01)
+
+    print(
+        f"{args.episodes} episodes: search, then {args.reads} get_article calls,"
+        f" {args.think_ms:.0f}ms think time, mock latency {args.latency_ms:.0f}ms\n"
+    )
+    print(
+        f"{'k':>3} {'get p50':>9} {'get p95':>9} {'episode':>9} {'upstream':>9}"
+        f" {'hit rate':>9} {'used rate':>10} {'cancelled':>10}"
+    )
+    print("-" * 76)
+    try:
+        for k in args.k:
+            before = app.state.requests
+            p50, p95, episode_time, stats = await run_k(f"http://127.0.0.1:{port}/api", k, args)
+            print(
+                f"{k:>3} {p50 * 1000:>7.1f}ms {p95 * 1000:>7.1f}ms {episode_time * 1000:>7.0f}ms"
+                f" {app.state.requests - before:>9} {stats['hit_rate']:>9.1%}"
+                f" {stats['used_rate']:>10.1%} {stats['cancelled']:>10}"
+            )
+    finally:
+        mock.should_exit = True
+        await serving
+
+
+def main():
+    logging.disable(logging.INFO)  # Per-request logs of the server and httpx
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("episodes", type=int, nargs="?", default=30)
+    parser.add_argument("--reads", type=int, default=2)
+    parser.add_argument("--think-ms", type=float, default=200.0)
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--k", type=int, nargs="+", default=[0, 1, 2, 5])
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
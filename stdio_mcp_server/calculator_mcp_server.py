@@ -1,44 +1,237 @@
 from mcp.server.fastmcp import FastMCP
+from mcp.types import ToolAnnotations
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
 import asyncio
 import logging
 
+import batch_math
+import precise_math
+from execution import ToolExecutor, policies_from_env
+from expressions import compile_expression
+from fast_json import use_fast_json
+from metrics import instrument_metrics
+from tracing import configure_tracing, instrument_tracing
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Deterministic tools without side effects; clients may cache their results
+PURE_TOOL = ToolAnnotations(readOnlyHint=True, idempotentHint=True, openWorldHint=False)
+
+
+# The arguments of the tools that take precision settings, for their descriptions
+PRECISION_ARGS = """
+        Args:
+            a (int | str): The first number. Use a string for decimals ("1.25"),
+                fractions ("1/3") or very large integers (decimal or "0x" hex).
+            b (int | str): The second number, in the same format.
+            mode (str, optional): "int" (default, exact big integers), "decimal"
+                (Decimal with `precision` significant digits) or "fraction" (exact rationals).
+            precision (int, optional): Significant digits in decimal mode (default: 28).
+            encoding (str, optional): How to print the result: "auto" (default; a digit
+                count plus leading/trailing digits past 1000 digits), "decimal", "hex"
+                or "summary".
+        """
+
+
+# The tool functions are defined at module level, not inside serve(), so that
+# MCP_TOOL_EXECUTION can also run them in a process pool (see execution.py):
+# a worker process imports them by name.
+def _calculate(operation: str, a, b, mode: str, precision: int, encoding: str) -> str:
+    value = precise_math.calculate(operation, a, b, mode, precision)
+    return precise_math.format_number(value, encoding)
+
+
+def sum_two_numbers(
+    a: Union[int, str],
+    b: Union[int, str],
+    mode: Literal["int", "decimal", "fraction"] = "int",
+    precision: int = precise_math.DEFAULT_PRECISION,
+    encoding: Literal["auto", "decimal", "hex", "summary"] = "auto",
+) -> str:
+    """A tool that sums two numbers."""
+    result = _calculate("add", a, b, mode, precision, encoding)
+    a, b = precise_math.describe_operand(a), precise_math.describe_operand(b)
+    return f"The sum of {a} and {b} is {result} (Calculated by MCP server)."
+
+
+def subtract_two_numbers(
+    a: Union[int, str],
+    b: Union[int, str],
+    mode: Literal["int", "decimal", "fraction"] = "int",
+    precision: int = precise_math.DEFAULT_PRECISION,
+    encoding: Literal["auto", "decimal", "hex", "summary"] = "auto",
+) -> str:
+    """A tool that subtracts two numbers."""
+    result = _calculate("subtract", a, b, mode, precision, encoding)
+    a, b = precise_math.describe_operand(a), precise_math.describe_operand(b)
+    return f"The difference of {a} and {b} is {result} (Calculated by MCP server)."
+
+
+def multiply_two_numbers(
+    a: Union[int, str],
+    b: Union[int, str],
+    mode: Literal["int", "decimal", "fraction"] = "int",
+    precision: int = precise_math.DEFAULT_PRECISION,
+    encoding: Literal["auto", "decimal", "hex", "summary"] = "auto",
+) -> str:
+    """A tool that multiplies two numbers."""
+    result = _calculate("multiply", a, b, mode, precision, encoding)
+    a, b = precise_math.describe_operand(a), precise_math.describe_operand(b)
+    return f"The product of {a} and {b} is {result} (Calculated by MCP server)."
+
+
+def reduce_numbers(
+    values: List[float], operation: Literal["sum", "mean", "min", "max"] = "sum"
+) -> Dict[str, Any]:
+    """Reduce a list of numbers to a single value."""
+    result = batch_math.reduce_values(values, operation)
+    return {"operation": operation, "count": len(values), "result": result}
+
+
+def dot_product(a: List[float], b: List[float]) -> Dict[str, Any]:
+    """Compute the dot product of two vectors."""
+    return {"count": len(a), "result": batch_math.dot(a, b)}
+
+
+def elementwise_operation(
+    operation: Literal["add", "subtract", "multiply", "divide"],
+    a: List[float],
+    b: Union[List[float], float],
+) -> Dict[str, Any]:
+    """Apply an arithmetic operation element by element."""
+    results = batch_math.elementwise(operation, a, b)
+    return {"operation": operation, "count": len(results), "results": results}
+
+
+def batch_calculate(operations: List[Tuple[str, float, float]]) -> Dict[str, Any]:
+    """Evaluate many independent arithmetic operations."""
+    results = batch_math.calculate_batch(operations)
+    return {"count": len(results), "results": results}
+
+
+def evaluate_expression(
+    expression: str,
+    variables: Optional[Dict[str, float]] = None,
+    bindings: Optional[List[Dict[str, float]]] = None,
+) -> Dict[str, Any]:
+    """Evaluate an arithmetic expression safely."""
+    compiled = compile_expression(expression)
+
+    if bindings is None:
+        return {"expression": expression, "result": compiled.evaluate(variables)}
+
+    results = compiled.evaluate_many(bindings, variables)
+    return {"expression": expression, "count": len(results), "results": results}
+
 
 async def serve():
     # 1. Create a FastMCP server instance
     mcp = FastMCP(name="Calculator_MCP_Server")
 
-    # 2. Define a tool that sums two numbers
-    @mcp.tool(
-        name="sum_two_numbers",
-        description="A tool that sums two numbers.",
+    # 2. Register the two-number tools, with optional precision modes
+    mcp.add_tool(
+        sum_two_numbers,
+        annotations=PURE_TOOL,
+        description="A tool that sums two numbers." + PRECISION_ARGS,
+    )
+    mcp.add_tool(
+        subtract_two_numbers,
+        annotations=PURE_TOOL,
+        description="A tool that subtracts two numbers." + PRECISION_ARGS,
+    )
+    mcp.add_tool(
+        multiply_two_numbers,
+        annotations=PURE_TOOL,
+        description="A tool that multiplies two numbers." + PRECISION_ARGS,
     )
-    async def sum_two_numbers_tool(a: int, b: int) -> str:
-        """A tool that sums two numbers."""
-        return f"The sum of {a} and {b} is {a + b} (Calculated by MCP server)."
 
-    @mcp.tool(
-        name="subtract_two_numbers",
-        description="A tool that subtracts two numbers.",
+    # 3. Batch tools: one round-trip for a whole column of numbers
+    mcp.add_tool(
+        reduce_numbers,
+        annotations=PURE_TOOL,
+        description="""
+        Reduce a list of numbers to a single value in one call.
+        Args:
+            values (List[float]): The numbers to reduce.
+            operation (str): One of "sum", "mean", "min", "max".
+        Returns:
+            {"operation", "count", "result"}
+        """,
+    )
+    mcp.add_tool(
+        dot_product,
+        annotations=PURE_TOOL,
+        description="""
+        Compute the dot product of two vectors of the same length.
+        Args:
+            a (List[float]): The first vector.
+            b (List[float]): The second vector.
+        Returns:
+            {"count", "result"}
+        """,
+    )
+    mcp.add_tool(
+        elementwise_operation,
+        annotations=PURE_TOOL,
+        description="""
+        Apply an arithmetic operation element by element over two arrays.
+        Args:
+            operation (str): One of "add", "subtract", "multiply", "divide".
+            a (List[float]): The left operands.
+            b (List[float] | float): The right operands, same length as a,
+                or a single number applied to every element of a.
+        Returns:
+            {"operation", "count", "results"}
+        """,
+    )
+    mcp.add_tool(
+        batch_calculate,
+        annotations=PURE_TOOL,
+        description="""
+        Evaluate many independent arithmetic operations in one call.
+        Args:
+            operations (List[[str, float, float]]): A list of [operation, a, b] tuples,
+                where operation is one of "add", "subtract", "multiply", "divide".
+                e.g. [["add", 1, 2], ["multiply", 3, 4]]
+        Returns:
+            {"count", "results"} with results in the same order as operations
+        """,
     )
-    async def subtract_two_numbers_tool(a: int, b: int) -> str:
-        """A tool that subtracts two numbers."""
-        return f"The difference of {a} and {b} is {a - b} (Calculated by MCP server)."
 
-    @mcp.tool(
-        name="multiply_two_numbers",
-        description="A tool that multiplies two numbers.",
+    # 4. Evaluate a whole arithmetic expression in one call
+    mcp.add_tool(
+        evaluate_expression,
+        annotations=PURE_TOOL,
+        description="""
+        Evaluate an arithmetic expression such as "15 * 8 + 20" in a single call.
+        Args:
+            expression (str): The expression. Supports numbers, variables, parentheses,
+                + - * / // % **, the constants pi and e, and the functions
+                abs, round, min, max, sqrt, exp, log, log10, floor, ceil, sin, cos, tan.
+                Integer results may have up to 4300 digits.
+            variables (Dict[str, float], optional): Values for variables in the expression.
+            bindings (List[Dict[str, float]], optional): Evaluate the expression once per
+                set of variable values, e.g. [{"x": 1}, {"x": 2}]. Values in `variables`
+                are shared by every binding.
+        Returns:
+            {"expression", "result"} or, with bindings, {"expression", "count", "results"}
+        """,
     )
-    async def multiply_two_numbers_tool(a: int, b: int) -> str:
-        """A tool that multiplies two numbers."""
-        return f"The product of {a} and {b} is {a * b} (Calculated by MCP server)."
+
+    # 5. Move tools named in MCP_TOOL_EXECUTION off the event loop
+    ToolExecutor(mcp.name).apply(mcp, policies_from_env())
+
+    use_fast_json(mcp)
+    instrument_metrics(mcp)
+    instrument_tracing(mcp)
 
     return mcp
 
 
 def main():
+    configure_tracing("calculator-mcp-server")
+
     async def _run():
         server = await serve()
         logger.info("Starting Calculator MCP server...")
@@ -0,0 +1,213 @@
+"""
+All stdio tool sets in one process.
+
+The calculator, image generator and dev.to servers are built by their own
+serve() functions and mounted under a namespace. One process and one event
+loop then replace three subprocesses per client. Tool schemas and
+descriptions are the individual servers' own, and calls go through each
+server's own middleware (metrics, tracing).
+
+Tool naming (--namespace):
+    - auto:   a tool keeps its name unless several servers define it (such as
+              server_stats), in which case it is exposed as <namespace>_<name>
+    - always: every tool is exposed as <namespace>_<name>
+The <namespace>_<name> form is accepted for every tool in both modes.
+
+Resources are listed from every mounted server. A resources/read goes to the
+server that owns the URI: the one that registered it (or a matching template)
+with FastMCP, or the one serving its URI prefix, such as image://cache/ for
+the image cache.
+
+Besides stdio and SSE, `--transport unix` serves any number of local clients
+from one process over a Unix socket (see unix_transport.py).
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import click
+from mcp import types
+from mcp.server.fastmcp import FastMCP
+
+import calculator_mcp_server
+import dev_blog_mcp_server
+import image_generator_mcp_server
+from image_resources import URI_PREFIX as IMAGE_URI_PREFIX
+from tracing import configure_tracing
+from unix_transport import serve_unix
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+NAMESPACE_MODES = ("auto", "always")
+
+
+def _registers_resource(server: FastMCP, uri: str) -> bool:
+    """Whether `uri` is one of the server's FastMCP resources or templates."""
+    manager = server._resource_manager
+    return uri in manager._resources or any(
+        template.matches(uri) for template in manager._templates.values()
+    )
+
+
+async def mount(
+    combined: FastMCP,
+    servers: Dict[str, FastMCP],
+    namespace_mode: str = "auto",
+    resource_prefixes: Optional[Dict[str, Sequence[str]]] = None,
+) -> List[types.Tool]:
+    """Serve the tools and resources of `servers` (namespace -> server) from `combined`.
+
+    `resource_prefixes` (namespace -> URI prefixes) names the resources a
+    server serves with its own handlers rather than through FastMCP.
+
+    Returns:
+        List[Tool]: The tools as listed by the combined server.
+    """
+    if namespace_mode not in NAMESPACE_MODES:
+        raise ValueError(
+            f"Unknown namespace mode '{namespace_mode}', expected one of: {', '.join(NAMESPACE_MODES)}"
+        )
+
+    server_tools = {namespace: await server.list_tools() for namespace, server in servers.items()}
+    name_counts = Counter(tool.name for tools in server_tools.values() for tool in tools)
+
+    tools: List[types.Tool] = []
+    routes: Dict[str, Tuple[FastMCP, str]] = {}
+    for namespace, server in servers.items():
+        for tool in server_tools[namespace]:
+            qualified = f"{namespace}_{tool.name}"
+            if qualified in routes or qualified in name_counts:
+                raise ValueError(f"Namespaced tool name '{qualified}' is ambiguous")
+            routes[qualified] = (server, tool.name)
+
+            exposed = tool.name
+            if namespace_mode == "always" or name_counts[tool.name] > 1:
+                exposed = qualified
+            routes[exposed] = (server, tool.name)
+            tools.append(tool.model_copy(update={"name": exposed}))
+
+    async def list_tools() -> List[types.Tool]:
+        return tools
+
+    async def call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Any]:
+        try:
+            server, tool_name = routes[name]
+        except KeyError:
+            raise ValueError(f"Unknown tool: {name}")
+        return await server.call_tool(tool_name, arguments)
+
+    async def list_resources(request: types.ListResourcesRequest) -> types.ServerResult:
+        resources = []
+        for server in servers.values():
+            result = await server._mcp_server.request_handlers[types.ListResourcesRequest](request)
+            resources.extend(result.root.resources)
+        return types.ServerResult(types.ListResourcesResult(resources=resources))
+
+    # Longest prefix first, so a nested prefix wins over its parent
+    prefixes = sorted(
+        (
+            (prefix, servers[namespace])
+            for namespace, namespace_prefixes in (resource_prefixes or {}).items()
+            for prefix in namespace_prefixes
+        ),
+        key=lambda item: len(item[0]),
+        reverse=True,
+    )
+
+    def resource_owner(uri: str) -> Optional[FastMCP]:
+        for prefix, server in prefixes:
+            if uri.startswith(prefix):
+                return server
+        for server in servers.values():
+            if _registers_resource(server, uri):
+                return server
+        return None
+
+    async def read_resource(request: types.ReadResourceRequest) -> types.ServerResult:
+        server = resource_owner(str(request.params.uri))
+        if server is None:
+            raise ValueError(f"Unknown resource: {request.params.uri}")
+        return await server._mcp_server.request_handlers[types.ReadResourceRequest](request)
+
+    combined.list_tools = list_tools
+    combined.call_tool = call_tool
+    combined._mcp_server.list_tools()(list_tools)
+    combined._mcp_server.call_tool()(call_tool)
+    combined._mcp_server.request_handlers[types.ListResourcesRequest] = list_resources
+    combined._mcp_server.request_handlers[types.ReadResourceRequest] = read_resource
+
+    return tools
+
+
+async def serve(auth_token: str, namespace_mode: str = "auto", **settings: Any) -> FastMCP:
+    """Build the combined server; `settings` are FastMCP settings such as host and port."""
+    combined = FastMCP(name="Combined_MCP_Server", **settings)
+
+    servers = {
+        "calculator": await calculator_mcp_server.serve(),
+        "image_generator": await image_generator_mcp_server.serve(),
+        "dev_blog": await dev_blog_mcp_server.serve(auth_token),
+    }
+    tools = await mount(
+        combined, servers, namespace_mode, {"image_generator": [IMAGE_URI_PREFIX]}
+    )
+    logger.info(f"Mounted {len(tools)} tools from {len(servers)} servers")
+
+    return combined
+
+
+@click.command()
+@click.option(
+    "--auth-token",
+    envvar="DEV_TO_AUTH_TOKEN",
+    required=True,
+    help="Dev.to authentication token",
+)
+@click.option(
+    "--namespace",
+    "namespace_mode",
+    type=click.Choice(NAMESPACE_MODES),
+    default="auto",
+    show_default=True,
+    help="Prefix tool names with their server's namespace only on conflicts, or always",
+)
+@click.option(
+    "--transport",
+    type=click.Choice(["stdio", "sse", "unix"]),
+    default="stdio",
+    show_default=True,
+)
+@click.option("--host", default="0.0.0.0", show_default=True, help="SSE host")
+@click.option("--port", default=8005, show_default=True, help="SSE port")
+@click.option(
+    "--socket",
+    "socket_path",
+    envvar="MCP_UNIX_SOCKET",
+    default=os.path.join(tempfile.gettempdir(), f"mcp-combined-{os.getuid()}.sock"),
+    show_default=True,
+    help="Unix socket path",
+)
+def main(
+    auth_token: str, namespace_mode: str, transport: str, host: str, port: int, socket_path: str
+):
+    configure_tracing("combined-mcp-server")
+
+    async def _run():
+        server = await serve(auth_token, namespace_mode, host=host, port=port)
+        logger.info(f"Starting Combined MCP server ({transport})...")
+        return server
+
+    server = asyncio.run(_run())
+    if transport == "unix":
+        asyncio.run(serve_unix(server, socket_path))
+    else:
+        server.run(transport=transport)
+
+
+if __name__ == "__main__":
+    main()
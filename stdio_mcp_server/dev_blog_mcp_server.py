@@ -1,21 +1,113 @@
 from mcp.server.fastmcp import FastMCP
+from mcp.types import TextContent
 from typing import List, Dict, Any, Optional
+from contextvars import ContextVar
 import asyncio
 import logging
 import httpx
 import click
 
+import article_chunks
+import fast_json
+import prefetch
+import upstream
+from metrics import instrument_metrics
+from middleware import CallNext, add_call_tool_middleware
+from tracing import configure_tracing, instrument_tracing, start_span
+
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-async def serve(auth_token: str):
+# Base URL for dev.to API
+DEV_TO_BASE_URL = "https://dev.to/api"
+
+
+# Warnings about the result of the tool call being handled (see add_warnings)
+_warnings: ContextVar[Optional[List[str]]] = ContextVar("warnings", default=None)
+
+
+def warn(message: str) -> None:
+    """Report `message` with the current tool call's result."""
+    warnings = _warnings.get()
+    if warnings is not None:
+        warnings.append(message)
+
+
+async def add_warnings(name: str, arguments: Dict[str, Any], call_next: CallNext) -> List[Any]:
+    """Call-tool middleware sending the call's warnings after its result.
+
+    Each warning is one more {"warning": ...} text item, after the items of
+    the result, so that a result keeps the shape its tool declares.
+    """
+    token = _warnings.set([])
+    try:
+        content = list(await call_next(name, arguments))
+        warnings = _warnings.get()
+    finally:
+        _warnings.reset(token)
+    for message in warnings:
+        content.append(TextContent(type="text", text=fast_json.dumps({"warning": message})))
+    return content
+
+
+def circuit_open_result(e: upstream.CircuitOpenError, failure: str) -> Any:
+    """Stale data, with a warning, if dev.to answered this request before, else a fast error."""
+    logger.warning(f"Circuit open: {e}")
+    if e.stale is not None:
+        warn(f"dev.to is unavailable; showing data cached {e.stale_age:.0f}s ago")
+        return fast_json.loads(e.stale.content)
+    return {"error": f"{failure}: {str(e)}"}
+
+
+async def serve(auth_token: str, base_url: str = DEV_TO_BASE_URL):
     # 1. Create a FastMCP server instance
     mcp = FastMCP(name="DEV_TO_Blog_MCP_Server")
 
-    # Base URL for dev.to API
-    DEV_TO_BASE_URL = "https://dev.to/api"
+    # One connection pool for all tools; per-tool deadlines and optional hedging
+    devto = upstream.UpstreamClient(base_url, **upstream.settings_from_env())
+
+    async def fetch_article(article_id: str) -> Dict[str, Any]:
+        response = await devto.get(
+            "/articles/{id}", f"/articles/{article_id}", deadline=devto.deadline("get_article")
+        )
+        response.raise_for_status()
+        return fast_json.loads(response.content)
+
+    # Optionally fetch the top search results before the agent asks for them
+    prefetcher = prefetch.ArticlePrefetcher(fetch_article, **prefetch.settings_from_env())
+    prefetch_note = (
+        f"""    An article prefetched after a search may be up to {prefetcher.ttl:.0f}s old;
+            it is then followed by one more item, {{"warning": ...}}, giving its age.
+        """
+        if prefetcher.enabled
+        else ""
+    )
+
+    # Articles split into ranked chunks, once per article version
+    chunk_cache = article_chunks.ArticleChunkCache(**article_chunks.settings_from_env())
+
+    async def load_article(article_id: str, tool: str) -> Dict[str, Any]:
+        if prefetcher.enabled:
+            prefetched = await prefetcher.get(article_id)
+            if prefetched is not None:
+                article, age = prefetched
+                if age > 0:
+                    warn(f"Prefetched {age:.0f}s ago; dev.to may have a newer version")
+                return article
+
+        # Make API request
+        with start_span("GET /articles/{id}", kind="client", **{"http.request.method": "GET"}):
+            response = await devto.get(
+                "/articles/{id}",
+                f"/articles/{article_id}",
+                deadline=devto.deadline(tool, mcp),
+                hedge=True,
+            )
+        response.raise_for_status()
+
+        return fast_json.loads(response.content)
 
     @mcp.tool(
         name="search_articles",
@@ -33,6 +125,8 @@ async def serve(auth_token: str):
         
         Returns:
             List of article objects with basic information including title, description, URL, tags, etc.
+            If dev.to is unavailable, the last copy fetched may be returned instead,
+            followed by one more item, {"warning": ...}, giving its age.
         """,
     )
     async def search_articles(
@@ -71,17 +165,30 @@ async def serve(auth_token: str):
                 params["top"] = top
 
             # Make API request
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{DEV_TO_BASE_URL}/articles", params=params
+            with start_span("GET /articles", kind="client", **{"http.request.method": "GET"}):
+                response = await devto.get(
+                    "/articles",
+                    "/articles",
+                    deadline=devto.deadline("search_articles", mcp),
+                    hedge=True,
+                    params=params,
                 )
-                response.raise_for_status()
+            response.raise_for_status()
 
-                articles = response.json()
+            articles = fast_json.loads(response.content)
 
-                # Return the articles
-                return articles
+            # Warm the cache for the get_article calls that usually follow
+            if prefetcher.enabled and isinstance(articles, list):
+                prefetcher.schedule(articles)
 
+            # Return the articles
+            return articles
+
+        except upstream.CircuitOpenError as e:
+            return circuit_open_result(e, "Failed to fetch articles")
+        except TimeoutError as e:
+            logger.error(f"Timed out: {e}")
+            return {"error": f"Failed to fetch articles: {str(e)}"}
         except httpx.HTTPError as e:
             logger.error(f"HTTP error occurred: {e}")
             return {"error": f"Failed to fetch articles: {str(e)}"}
@@ -99,25 +206,100 @@ async def serve(auth_token: str):
         
         Returns:
             Detailed article object including full content (body_html, body_markdown), comments count, reactions, etc.
-        """,
+            If dev.to is unavailable, the last copy fetched may be returned instead,
+            followed by one more item, {"warning": ...}, giving its age.
+        """
+        + prefetch_note,
     )
     async def get_article(article_id: str) -> Dict[str, Any]:
         """
         Get detailed information about a specific dev.to article.
         """
         try:
-            # Make API request
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{DEV_TO_BASE_URL}/articles/{article_id}")
-                response.raise_for_status()
+            article = await load_article(article_id, "get_article")
 
-                article = response.json()
+            return article
 
-                return article
+        except upstream.CircuitOpenError as e:
+            return circuit_open_result(e, "Failed to fetch article")
+        except TimeoutError as e:
+            logger.error(f"Timed out: {e}")
+            return {"error": f"Failed to fetch article: {str(e)}"}
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP error occurred: {e}")
+            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 404:
+                return {"error": f"Article with ID '{article_id}' not found"}
+            return {"error": f"Failed to fetch article: {str(e)}"}
+        except Exception as e:
+            logger.error(f"Unexpected error occurred: {e}")
+            return {"error": f"An unexpected error occurred: {str(e)}"}
 
+    @mcp.tool(
+        name="get_article_chunks",
+        description="""
+        Get only the parts of a dev.to article that are relevant to a query, instead of its whole body.
+        
+        Args:
+            article_id (str): The article ID or path (e.g., "2546060" or "devteam/join-the-worlds-largest-hackathon-1-million-in-prizes-3hfh")
+            query (str, optional): What to look for in the article; without it, chunks are returned in reading order.
+                Chunks that do not match the query are left out.
+            top_k (int, optional): Number of chunks to return (default: 3)
+            offset (int, optional): Number of chunks to skip, to page through the results (default: 0)
+        
+        Returns:
+            Article title and URL, the total number of chunks, next_offset for the following page
+            (null when there is none), and chunks with their index, heading, start/end character
+            offsets in body_markdown, relevance score and text.
+            If dev.to is unavailable, the chunks may come from the last copy fetched,
+            followed by one more item, {"warning": ...}, giving its age.
+        """
+        + prefetch_note,
+    )
+    async def get_article_chunks(
+        article_id: str,
+        query: Optional[str] = None,
+        top_k: Optional[int] = 3,
+        offset: Optional[int] = 0,
+    ) -> Dict[str, Any]:
+        """
+        Get the chunks of a dev.to article that best match a query.
+        """
+        try:
+            try:
+                article = await load_article(article_id, "get_article_chunks")
+            except upstream.CircuitOpenError as e:
+                if e.stale is None:
+                    raise
+                # Chunk the stale copy rather than returning all of it
+                article = circuit_open_result(e, "Failed to fetch article")
+            chunked = chunk_cache.get(article)
+
+            matches = chunked.search(query)
+            offset = max(offset or 0, 0)
+            page = matches[offset : offset + max(top_k or 0, 1)]
+            next_offset = offset + len(page) if offset + len(page) < len(matches) else None
+
+            result = {
+                "id": article.get("id"),
+                "title": article.get("title"),
+                "url": article.get("url"),
+                "query": query,
+                "total_chunks": len(chunked.chunks),
+                "matching_chunks": len(matches),
+                "offset": offset,
+                "next_offset": next_offset,
+                "chunks": [{**chunk, "score": score} for chunk, score in page],
+            }
+            return result
+
+        except upstream.CircuitOpenError as e:
+            return circuit_open_result(e, "Failed to fetch article")
+        except TimeoutError as e:
+            logger.error(f"Timed out: {e}")
+            return {"error": f"Failed to fetch article: {str(e)}"}
         except httpx.HTTPError as e:
             logger.error(f"HTTP error occurred: {e}")
-            if e.response.status_code == 404:
+            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 404:
                 return {"error": f"Article with ID '{article_id}' not found"}
             return {"error": f"Failed to fetch article: {str(e)}"}
         except Exception as e:
@@ -135,6 +317,8 @@ async def serve(auth_token: str):
         
         Returns:
             List of popular tags with their information
+            If dev.to is unavailable, the last copy fetched may be returned instead,
+            followed by one more item, {"warning": ...}, giving its age.
         """,
     )
     async def get_tags(
@@ -147,14 +331,25 @@ async def serve(auth_token: str):
             params = {"per_page": min(per_page, 1000), "page": page}
 
             # Make API request
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{DEV_TO_BASE_URL}/tags", params=params)
-                response.raise_for_status()
+            with start_span("GET /tags", kind="client", **{"http.request.method": "GET"}):
+                response = await devto.get(
+                    "/tags",
+                    "/tags",
+                    deadline=devto.deadline("get_tags", mcp),
+                    hedge=True,
+                    params=params,
+                )
+            response.raise_for_status()
 
-                tags = response.json()
+            tags = fast_json.loads(response.content)
 
-                return tags
+            return tags
 
+        except upstream.CircuitOpenError as e:
+            return circuit_open_result(e, "Failed to fetch tags")
+        except TimeoutError as e:
+            logger.error(f"Timed out: {e}")
+            return {"error": f"Failed to fetch tags: {str(e)}"}
         except httpx.HTTPError as e:
             logger.error(f"HTTP error occurred: {e}")
             return {"error": f"Failed to fetch tags: {str(e)}"}
@@ -243,25 +438,33 @@ async def serve(auth_token: str):
             }
             
 
-            # Make API request
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{DEV_TO_BASE_URL}/articles",
+            # Make API request; never hedged, a duplicate POST would create two articles
+            with start_span("POST /articles", kind="client", **{"http.request.method": "POST"}):
+                response = await devto.request(
+                    "POST",
+                    "/articles",
+                    "/articles",
+                    deadline=devto.deadline("create_article", mcp),
                     json={"article": article_data},
                     headers=headers,
                 )
-                response.raise_for_status()
-
-                article = response.json()
-                
-                logger.info(f"Article created successfully: {article.get('title', 'Unknown title')}")
-                return article
+            response.raise_for_status()
 
+            article = fast_json.loads(response.content)
+            
+            logger.info(f"Article created successfully: {article.get('title', 'Unknown title')}")
+            return article
+
+        except upstream.CircuitOpenError as e:
+            return circuit_open_result(e, "Failed to create article")
+        except TimeoutError as e:
+            logger.error(f"Timed out: {e}")
+            return {"error": f"Failed to create article: {str(e)} (it may still have been created)"}
         except httpx.HTTPError as e:
             logger.error(f"HTTP error occurred: {e}")
             if hasattr(e, 'response') and e.response is not None:
                 try:
-                    error_detail = e.response.json()
+                    error_detail = fast_json.loads(e.response.content)
                     
                     status_code = e.response.status_code
                     
@@ -377,24 +580,33 @@ async def serve(auth_token: str):
             }
 
             # Make API request
-            async with httpx.AsyncClient() as client:
-                response = await client.put(
-                    f"{DEV_TO_BASE_URL}/articles/{article_id.strip()}",
+            with start_span("PUT /articles/{id}", kind="client", **{"http.request.method": "PUT"}):
+                response = await devto.request(
+                    "PUT",
+                    "/articles/{id}",
+                    f"/articles/{article_id.strip()}",
+                    deadline=devto.deadline("update_article", mcp),
                     json={"article": article_data},
                     headers=headers,
                 )
-                response.raise_for_status()
-
-                article = response.json()
-                
-                logger.info(f"Article updated successfully: {article.get('title', 'Unknown title')}")
-                return article
+            response.raise_for_status()
 
+            article = fast_json.loads(response.content)
+            
+            logger.info(f"Article updated successfully: {article.get('title', 'Unknown title')}")
+            prefetcher.invalidate(article_id)
+            return article
+
+        except upstream.CircuitOpenError as e:
+            return circuit_open_result(e, "Failed to update article")
+        except TimeoutError as e:
+            logger.error(f"Timed out: {e}")
+            return {"error": f"Failed to update article: {str(e)}"}
         except httpx.HTTPError as e:
             logger.error(f"HTTP error occurred: {e}")
             if hasattr(e, 'response') and e.response is not None:
                 try:
-                    error_detail = e.response.json()
+                    error_detail = fast_json.loads(e.response.content)
                     
                     status_code = e.response.status_code
                     
@@ -421,6 +633,18 @@ async def serve(auth_token: str):
             logger.error(f"Unexpected error occurred: {e}")
             return {"error": f"An unexpected error occurred: {str(e)}"}
 
+    fast_json.use_fast_json(mcp)
+    add_call_tool_middleware(mcp, add_warnings)
+    instrument_metrics(
+        mcp,
+        sections={
+            "upstream": devto.snapshot,
+            "prefetch": prefetcher.snapshot,
+            "chunks": chunk_cache.snapshot,
+        },
+    )
+    instrument_tracing(mcp)
+
     return mcp
 
 
@@ -431,9 +655,18 @@ async def serve(auth_token: str):
     required=True,
     help="Dev.to authentication token",
 )
-def main(auth_token: str):
+@click.option(
+    "--base-url",
+    envvar="DEV_TO_BASE_URL",
+    default=DEV_TO_BASE_URL,
+    show_default=True,
+    help="Base URL of the dev.to API, e.g. a local mock server",
+)
+def main(auth_token: str, base_url: str):
+    configure_tracing("dev-blog-mcp-server")
+
     async def _run():
-        server = await serve(auth_token)
+        server = await serve(auth_token, base_url)
         logger.info("Starting DevTo Blog MCP server...")
         logger.info(f"Using auth token: {auth_token}")
         return server
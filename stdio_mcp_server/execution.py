@@ -0,0 +1,268 @@
+"""
+Per-tool execution policies for FastMCP servers.
+
+FastMCP calls a sync tool function directly on the event loop, so a
+CPU-heavy tool stalls every other session of the server until it returns.
+A ToolExecutor runs selected tools elsewhere:
+
+    - inline:  on the event loop, as FastMCP does (the default)
+    - thread:  in a bounded thread pool; the loop keeps serving, but pure
+               Python work still shares the GIL
+    - process: in a process pool; arguments and results are pickled, and the
+               function must be defined at module level so the worker
+               process can import it
+
+A policy is chosen with a decorator, placed under `@server.tool()`:
+
+    executor = ToolExecutor("Demo")
+
+    @server.tool()
+    @executor.run_in("process")
+    def crunch(n: int) -> int: ...
+
+Or, for tools that are already registered, with a registry read from the
+environment and applied by `ToolExecutor.apply`:
+
+    - MCP_TOOL_EXECUTION: comma-separated tool=policy pairs, e.g.
+                          "evaluate_expression=thread,batch_calculate=thread"
+    - MCP_TOOL_THREADS:   thread pool size (default 4)
+    - MCP_TOOL_PROCESSES: process pool size (default: the number of CPUs)
+
+Each pool records calls, errors, calls in flight and waiting, and queue-wait
+and run-time histograms (`snapshot`, `render_prometheus`).
+
+The SSE server runs from an identical copy in sse_server/.
+"""
+
+import asyncio
+import functools
+import importlib
+import inspect
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mcp.server.fastmcp import FastMCP
+
+from metrics import LATENCY_BUCKETS, Histogram, _escape_label, _format_number
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ("inline", "thread", "process")
+DEFAULT_THREADS = 4
+
+
+def policies_from_env() -> Dict[str, str]:
+    """The tool=policy registry from MCP_TOOL_EXECUTION."""
+    policies = {}
+    for entry in os.getenv("MCP_TOOL_EXECUTION", "").split(","):
+        if not entry.strip():
+            continue
+        name, _, policy = entry.partition("=")
+        policies[name.strip()] = policy.strip()
+    return policies
+
+
+def _invoke(fn: Callable[..., Any], kwargs: Dict[str, Any]) -> Tuple[float, Any]:
+    """Run `fn` in a worker, returning when it started and its result.
+
+    time.monotonic() is system-wide on the platforms we run on, so a start
+    time taken in a worker process compares with the submit time.
+    """
+    started = time.monotonic()
+    result = fn(**kwargs)
+    if inspect.iscoroutine(result):
+        result = asyncio.run(result)
+    return started, result
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve(module: str, qualname: str) -> Callable[..., Any]:
+    """The undecorated function `module.qualname`, imported in a worker process."""
+    target: Any = importlib.import_module(module)
+    for part in qualname.split("."):
+        target = getattr(target, part)
+    return inspect.unwrap(target)
+
+
+def _invoke_by_name(module: str, qualname: str, kwargs: Dict[str, Any]) -> Tuple[float, Any]:
+    return _invoke(_resolve(module, qualname), kwargs)
+
+
+class PoolStats:
+    """Queue and run-time metrics for one pool."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.queue_wait = Histogram(LATENCY_BUCKETS)
+        self.run_time = Histogram(LATENCY_BUCKETS)
+
+    @property
+    def waiting(self) -> int:
+        """Calls submitted but not yet picked up, assuming every worker is busy."""
+        return max(0, self.in_flight - self.workers)
+
+
+class ToolExecutor:
+    """Runs tool functions inline, in a thread pool or in a process pool.
+
+    The pools are created on first use.
+    """
+
+    def __init__(
+        self,
+        server_name: str,
+        thread_workers: Optional[int] = None,
+        process_workers: Optional[int] = None,
+    ):
+        self.server_name = server_name
+        self.workers = {
+            "thread": thread_workers or int(os.getenv("MCP_TOOL_THREADS", DEFAULT_THREADS)),
+            "process": process_workers
+            or int(os.getenv("MCP_TOOL_PROCESSES", os.cpu_count() or 1)),
+        }
+        self.pools: Dict[str, PoolStats] = {
+            policy: PoolStats(workers) for policy, workers in self.workers.items()
+        }
+        self._executors: Dict[str, Executor] = {}
+
+    def _executor(self, policy: str) -> Executor:
+        executor = self._executors.get(policy)
+        if executor is None:
+            if policy == "thread":
+                executor = ThreadPoolExecutor(
+                    self.workers["thread"], thread_name_prefix="mcp-tool"
+                )
+            else:
+                # Spawned workers do not inherit the server's threads and event loop
+                executor = ProcessPoolExecutor(
+                    self.workers["process"], mp_context=multiprocessing.get_context("spawn")
+                )
+            self._executors[policy] = executor
+        return executor
+
+    def wrap(self, policy: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """An async function running `fn` under `policy`, with `fn`'s signature."""
+        if policy not in POLICIES:
+            raise ValueError(
+                f"Unknown execution policy '{policy}', expected one of: {', '.join(POLICIES)}"
+            )
+        if policy == "inline":
+            return fn
+
+        if policy == "process":
+            if "<locals>" in fn.__qualname__:
+                raise ValueError(
+                    f"{fn.__qualname__} cannot run in a process pool: "
+                    "the worker can only import functions defined at module level"
+                )
+            call = functools.partial(_invoke_by_name, fn.__module__, fn.__qualname__)
+        else:
+            call = functools.partial(_invoke, fn)
+
+        stats = self.pools[policy]
+
+        @functools.wraps(fn)
+        async def run(**kwargs: Any) -> Any:
+            stats.calls += 1
+            stats.in_flight += 1
+            submitted = time.monotonic()
+            try:
+                loop = asyncio.get_running_loop()
+                started, result = await loop.run_in_executor(
+                    self._executor(policy), call, kwargs
+                )
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                stats.in_flight -= 1
+            finished = time.monotonic()
+            stats.queue_wait.observe(max(0.0, started - submitted))
+            stats.run_time.observe(finished - started)
+            return result
+
+        return run
+
+    def run_in(self, policy: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorator choosing the execution policy of a tool function."""
+        return functools.partial(self.wrap, policy)
+
+    def apply(self, server: FastMCP, policies: Dict[str, str]) -> None:
+        """Move registered tools of `server` to the pools named in `policies`."""
+        for name, policy in policies.items():
+            tool = server._tool_manager.get_tool(name)
+            if tool is None:
+                logger.debug(f"No tool '{name}' on {server.name}; skipping its execution policy")
+                continue
+            if policy == "process" and tool.context_kwarg is not None:
+                raise ValueError(f"Tool '{name}' takes a Context, which cannot be sent to a process")
+            tool.fn = self.wrap(policy, tool.fn)
+            tool.is_async = tool.is_async or policy != "inline"
+            logger.info(f"Tool '{name}' runs {policy}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-friendly summary of the pools."""
+        return {
+            policy: {
+                "workers": stats.workers,
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "in_flight": stats.in_flight,
+                "waiting": stats.waiting,
+                "queue_wait_seconds": {
+                    "p50": round(stats.queue_wait.quantile(0.50), 6),
+                    "p95": round(stats.queue_wait.quantile(0.95), 6),
+                },
+                "run_seconds": {
+                    "p50": round(stats.run_time.quantile(0.50), 6),
+                    "p95": round(stats.run_time.quantile(0.95), 6),
+                },
+            }
+            for policy, stats in self.pools.items()
+        }
+
+    def render_prometheus(self) -> str:
+        """Render the pool metrics in the Prometheus text exposition format."""
+        server = _escape_label(self.server_name)
+        lines: List[str] = []
+
+        def scalar(metric: str, kind: str, help_text: str, attribute: str) -> None:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for policy, stats in self.pools.items():
+                lines.append(
+                    f'{metric}{{server="{server}",pool="{policy}"}} {getattr(stats, attribute)}'
+                )
+
+        def histogram(metric: str, help_text: str, attribute: str) -> None:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for policy, stats in self.pools.items():
+                labels = f'server="{server}",pool="{policy}"'
+                hist = getattr(stats, attribute)
+                for bound, count in hist.cumulative_counts():
+                    lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{metric}_sum{{{labels}}} {_format_number(hist.sum)}")
+                lines.append(f"{metric}_count{{{labels}}} {hist.count}")
+
+        scalar("mcp_tool_pool_workers", "gauge", "Workers of the tool pool.", "workers")
+        scalar("mcp_tool_pool_calls_total", "counter", "Tool calls sent to the pool.", "calls")
+        scalar("mcp_tool_pool_errors_total", "counter", "Pool tool calls that failed.", "errors")
+        scalar("mcp_tool_pool_in_flight", "gauge", "Pool tool calls not yet finished.", "in_flight")
+        scalar("mcp_tool_pool_waiting", "gauge", "Pool tool calls waiting for a worker.", "waiting")
+        histogram("mcp_tool_pool_queue_wait_seconds", "Time from submit to a worker starting the call.", "queue_wait")
+        histogram("mcp_tool_pool_run_seconds", "Time a worker spent on the call.", "run_time")
+
+        return "\n".join(lines) + "\n"
+
+    def shutdown(self) -> None:
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._executors.clear()
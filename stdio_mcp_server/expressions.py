@@ -0,0 +1,214 @@
+"""
+Safe arithmetic expression evaluation for the calculator server.
+
+Expressions are parsed with `ast` and checked against a whitelist of node
+types, operators and functions; nothing is ever passed to `eval`. A validated
+tree is compiled into nested closures once and kept in an LRU cache keyed by
+the source text, so re-evaluating the same expression (or one expression over
+many variable bindings) only pays for the arithmetic.
+
+Integers are exact and unbounded in Python, so sizes are limited explicitly:
+an operation that would produce an integer of more than MAX_RESULT_DIGITS
+digits is refused before it is computed (for `*` and `**`) or as soon as it
+is (for everything else), and all results of one evaluation together may
+print to at most MAX_OUTPUT_CHARS characters.
+"""
+
+import ast
+import math
+import operator
+from functools import lru_cache
+from typing import Callable, FrozenSet, List, Mapping, Optional, Sequence, Union
+
+Number = Union[int, float]
+Evaluator = Callable[[Mapping[str, Number]], Number]
+
+MAX_EXPRESSION_LENGTH = 1000
+# Python refuses to print integers longer than this by default (sys.int_info)
+MAX_RESULT_DIGITS = 4300
+MAX_RESULT_BITS = int(MAX_RESULT_DIGITS * math.log2(10))
+MAX_OUTPUT_CHARS = 100_000
+
+def _round(number: Number, ndigits: Optional[int] = None) -> Number:
+    # round(7, -10 ** 8) computes 10 ** 10 ** 8 before rounding
+    if isinstance(ndigits, int) and abs(ndigits) > MAX_RESULT_DIGITS:
+        raise ValueError(f"round() takes at most {MAX_RESULT_DIGITS} digits")
+    return round(number, ndigits)
+
+
+FUNCTIONS = {
+    "abs": abs,
+    "round": _round,
+    "min": min,
+    "max": max,
+    "sqrt": math.sqrt,
+    "exp": math.exp,
+    "log": math.log,
+    "log10": math.log10,
+    "floor": math.floor,
+    "ceil": math.ceil,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+}
+
+CONSTANTS = {"pi": math.pi, "e": math.e}
+
+
+def _too_large() -> ValueError:
+    return ValueError(f"Result is too large (more than {MAX_RESULT_DIGITS} digits)")
+
+
+def _check_size(value: Number) -> Number:
+    if isinstance(value, int) and value.bit_length() > MAX_RESULT_BITS:
+        raise _too_large()
+    return value
+
+
+def _power(base: Number, exponent: Number) -> Number:
+    # Estimate the size first: 9 ** 9 ** 9 or (10 ** 4000) ** 4000 would never finish
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0 and abs(base) > 1:
+        if exponent * math.log2(abs(base)) > MAX_RESULT_BITS:
+            raise _too_large()
+    return operator.pow(base, exponent)
+
+
+def _multiply(left: Number, right: Number) -> Number:
+    if isinstance(left, int) and isinstance(right, int):
+        if left.bit_length() + right.bit_length() > MAX_RESULT_BITS + 1:
+            raise _too_large()
+    return operator.mul(left, right)
+
+
+def _output_chars(value: Number) -> int:
+    if isinstance(value, int):
+        return int(value.bit_length() * math.log10(2)) + 2
+    return 24  # The longest repr of a float
+
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: _multiply,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: _power,
+}
+
+_UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+
+class CompiledExpression:
+    """A validated expression that can be evaluated against variable bindings."""
+
+    def __init__(self, source: str, evaluator: Evaluator, variables: FrozenSet[str]):
+        self.source = source
+        self.variables = variables
+        self._evaluator = evaluator
+
+    def evaluate(self, bindings: Optional[Mapping[str, Number]] = None) -> Number:
+        bindings = bindings or {}
+        missing = self.variables.difference(bindings)
+        if missing:
+            raise ValueError(f"Missing value for variable(s): {', '.join(sorted(missing))}")
+        try:
+            return _check_size(self._evaluator(bindings))
+        except ZeroDivisionError:
+            raise ValueError("Division by zero")
+        except OverflowError:
+            raise ValueError("Numeric overflow")
+        except TypeError as e:
+            raise ValueError(str(e))
+        except RecursionError:
+            raise ValueError("Expression is too deeply nested")
+
+    def evaluate_many(
+        self, bindings: Sequence[Mapping[str, Number]], shared: Optional[Mapping[str, Number]] = None
+    ) -> List[Number]:
+        """Evaluate once per set of bindings; values in `shared` apply to all of them.
+
+        Raises:
+            ValueError: If an evaluation fails or the results together would
+                print to more than MAX_OUTPUT_CHARS characters.
+        """
+        shared = shared or {}
+        results = []
+        output_chars = 0
+        for binding in bindings:
+            result = self.evaluate({**shared, **binding})
+            output_chars += _output_chars(result)
+            if output_chars > MAX_OUTPUT_CHARS:
+                raise ValueError(f"Results are too large (more than {MAX_OUTPUT_CHARS} characters)")
+            results.append(result)
+        return results
+
+
+@lru_cache(maxsize=256)
+def compile_expression(source: str) -> CompiledExpression:
+    """Parse, validate and compile an expression (cached by source text).
+
+    Raises:
+        ValueError: If the expression is not valid arithmetic.
+    """
+    if len(source) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"Expression is longer than {MAX_EXPRESSION_LENGTH} characters")
+
+    try:
+        tree = ast.parse(source.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression: {e.msg}")
+
+    variables = set()
+    try:
+        evaluator = _compile_node(tree.body, variables)
+    except RecursionError:
+        raise ValueError("Expression is too deeply nested")
+    return CompiledExpression(source, evaluator, frozenset(variables))
+
+
+def _compile_node(node: ast.AST, variables: set) -> Evaluator:
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError(f"Unsupported constant: {node.value!r}")
+        value = node.value
+        return lambda bindings: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in CONSTANTS:
+            value = CONSTANTS[name]
+            return lambda bindings: value
+        if name in FUNCTIONS:
+            raise ValueError(f"Function '{name}' must be called")
+        variables.add(name)
+        return lambda bindings: bindings[name]
+
+    if isinstance(node, ast.BinOp):
+        op = _BINARY_OPERATORS.get(type(node.op))
+        if op is None:
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+        left = _compile_node(node.left, variables)
+        right = _compile_node(node.right, variables)
+        return lambda bindings: _check_size(op(left(bindings), right(bindings)))
+
+    if isinstance(node, ast.UnaryOp):
+        op = _UNARY_OPERATORS.get(type(node.op))
+        if op is None:
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+        operand = _compile_node(node.operand, variables)
+        return lambda bindings: op(operand(bindings))
+
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            raise ValueError(f"Unsupported function call: {ast.unparse(node.func)}")
+        if node.keywords:
+            raise ValueError("Keyword arguments are not supported")
+        function = FUNCTIONS[node.func.id]
+        args = [_compile_node(arg, variables) for arg in node.args]
+        return lambda bindings: _check_size(function(*(arg(bindings) for arg in args)))
+
+    raise ValueError(f"Unsupported syntax: {type(node).__name__}")
@@ -0,0 +1,81 @@
+"""
+Fast JSON encoding of tool results.
+
+FastMCP turns a tool result into content item by item: a list of 1000
+dev.to articles becomes 1000 TextContent items, each serialized with
+pydantic_core and indent=2. `use_fast_json` keeps that shape, one item per
+list element, and only swaps the serializer: JSON-like values (dicts,
+numbers, ...) are encoded compactly. Strings, images and MCP content
+objects are converted as before.
+
+Encoding uses orjson when it is installed (`uv sync --extra fast-json`).
+Otherwise it falls back to pydantic_core, which is installed with mcp and
+is faster than the standard library json module. `loads` accepts bytes, so
+HTTP response bodies can be decoded without an intermediate str.
+"""
+
+from typing import Any, Dict, List, Sequence, Union
+
+import pydantic_core
+from mcp.server.fastmcp import FastMCP, Image
+from mcp.types import EmbeddedResource, ImageContent, TextContent
+
+from lazy_imports import lazy_import
+
+orjson = lazy_import("orjson")
+
+Content = Union[TextContent, ImageContent, EmbeddedResource]
+
+
+def _default(value: Any) -> Any:
+    if hasattr(value, "model_dump"):  # pydantic models
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def dumps(value: Any) -> str:
+    """Compact JSON for `value`; objects JSON does not know are encoded with str()."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:  # orjson.JSONEncodeError, e.g. an integer wider than 64 bits
+            pass
+    return pydantic_core.to_json(value, fallback=_default).decode()
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return pydantic_core.from_json(data)
+
+
+def to_content(result: Any) -> List[Content]:
+    """Convert a tool result to MCP content as FastMCP does, with compact JSON text."""
+    if result is None:
+        return []
+    if isinstance(result, (TextContent, ImageContent, EmbeddedResource)):
+        return [result]
+    if isinstance(result, Image):
+        return [result.to_image_content()]
+    if isinstance(result, (list, tuple)):
+        return [content for item in result for content in to_content(item)]
+    if not isinstance(result, str):
+        result = dumps(result)
+    return [TextContent.model_construct(type="text", text=result)]
+
+
+def use_fast_json(server: FastMCP) -> None:
+    """Encode the results of `server`'s tools with `to_content`.
+
+    Call this before adding call-tool middleware, which wraps the handler
+    installed here.
+    """
+
+    async def call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Content]:
+        result = await server._tool_manager.call_tool(
+            name, arguments, context=server.get_context()
+        )
+        return to_content(result)
+
+    server.call_tool = call_tool
+    server._mcp_server.call_tool()(call_tool)
@@ -1,6 +1,8 @@
 from mcp.server.fastmcp import FastMCP
 import logging
 
+from tracing import configure_tracing, instrument_tracing
+
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,11 +21,15 @@ def create_server():
     async def subtract_two_numbers(x: int , y : int) -> str:
         difference = 9
         return f"The difference of {x} and {y} is {difference} (Calculated by MCP server)."
-    
+
+    instrument_tracing(server)
+
     return server
 
 
 def main():
+    configure_tracing("fast-mcp-server")
+
     server = create_server()
     
     logger.info("Starting Fast MCP server...")
@@ -1,11 +1,22 @@
-from mcp.server.fastmcp import FastMCP
-from typing import Dict, Optional
+from mcp.server.fastmcp import FastMCP, Image
+from mcp.types import ToolAnnotations
+from typing import Any, Dict, List, Literal, Optional, Union
 import asyncio
 import logging
 
+import image_render
+import image_urls
+from image_resources import register_image_resources, resource_uri
+from fast_json import use_fast_json
+from metrics import instrument_metrics
+from tracing import configure_tracing, instrument_tracing
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Deterministic tools without side effects; clients may cache their results
+PURE_TOOL = ToolAnnotations(readOnlyHint=True, idempotentHint=True, openWorldHint=False)
+
 
 async def serve():
     # 1. Create a FastMCP server instance
@@ -14,6 +25,7 @@ async def serve():
     # 2. Define a tool that generates a random image URL
     @mcp.tool(
         name="generate_image_url",
+        annotations=PURE_TOOL,
         description="""
         Generate a random image URL from Lorem Picsum.
         Args:
@@ -40,17 +52,119 @@ async def serve():
             options (Dict[str, str], optional): Additional options for the image. Defaults to {}.
         """
 
-        url = f"https://picsum.photos/{width}/{height}"
+        return image_urls.image_url(width, height, options)
 
-        if options:
-            url += "?" + "&".join(f"{key}={value}" for key, value in options.items())
+    # 3. Define a tool that generates many image URLs in one call
+    @mcp.tool(
+        name="generate_image_urls",
+        annotations=PURE_TOOL,
+        description="""
+        Generate many Lorem Picsum image URLs in one call (up to 10000).
+        Either pass `specs`, or a grid of `widths` x `heights` (x seeds).
+        Args:
+            specs (List[Dict], optional): Individual images, e.g.
+                [{"width": 200, "height": 300, "options": {"grayscale": "1"}}].
+            widths (List[int], optional): Grid widths.
+            heights (List[int], optional): Grid heights.
+            seed_start (int, optional): First seed of the grid; one image per seed.
+            seed_count (int, optional): Number of consecutive seeds (default: 1);
+                requires seed_start.
+            options (Dict[str, str], optional): Options applied to every grid image
+                (same as generate_image_url).
+            compact (bool, optional): Return URL templates with placeholders and
+                the values for each URL instead of full URLs (default: true).
+        Returns:
+            {"count", "urls"} or {"format": "template", "count", "groups"}, where
+            each group is {"template", "values"} and every URL of the group is
+            template.format(*values[i]), e.g. template
+            "https://picsum.photos/{0}/{1}?grayscale=1&seed={2}" with values
+            [[200, 300, 1], [200, 300, 2], ...]. Groups are in URL order.
+        """,
+    )
+    async def generate_image_urls(
+        specs: Optional[List[Dict[str, Any]]] = None,
+        widths: Optional[List[int]] = None,
+        heights: Optional[List[int]] = None,
+        seed_start: Optional[int] = None,
+        seed_count: Optional[int] = None,
+        options: Optional[Dict[str, str]] = None,
+        compact: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Generate many Lorem Picsum image URLs in one call.
+        """
+        if specs is not None:
+            urls = image_urls.image_urls_from_specs(specs)
+        elif widths and heights:
+            seeds = image_urls.seed_range(seed_start, seed_count)
+            urls = image_urls.image_urls_from_grid(widths, heights, seeds, options)
+        else:
+            raise ValueError("Pass either specs, or both widths and heights")
+
+        if compact:
+            return image_urls.compact_urls(urls)
+        return {"count": len(urls), "urls": urls}
+
+    image_cache = image_render.ImageCache()
+
+    # 4. Define a tool that renders an image locally instead of linking to one
+    @mcp.tool(
+        name="render_image",
+        description="""
+        Render a placeholder or procedural PNG image locally (no network access).
+        Identical requests are served from an on-disk cache without re-rendering.
+        Args:
+            width (int): The width of the image.
+            height (int): The height of the image.
+            pattern (str, optional): "gradient", "noise" or "solid" (default: "gradient").
+            options (Dict[str, str], optional): grayscale (1/0), blur (0-10) and seed,
+                as for generate_image_url.
+            output (str, optional): "resource" returns a file:// URI and image
+                details, "image" returns the image content itself (default: "resource").
+        Returns:
+            {"uri", "resource_uri", "mime_type", "width", "height", "bytes", "cached"}
+            or an image. The resource_uri can be fetched with resources/read.
+        """,
+    )
+    async def render_image(
+        width: int,
+        height: int,
+        pattern: Literal["gradient", "noise", "solid"] = "gradient",
+        options: Optional[Dict[str, str]] = None,
+        output: Literal["resource", "image"] = "resource",
+    ) -> Union[Dict[str, Any], Image]:
+        """
+        Render an image locally, reusing the cached file for repeat requests.
+        """
+        params = image_render.render_params(width, height, pattern, options)
+        key, path, cached = await image_cache.get_or_render(params)
+
+        if output == "image":
+            return Image(data=await asyncio.to_thread(path.read_bytes), format="png")
+        return {
+            "uri": path.as_uri(),
+            "resource_uri": resource_uri(key),
+            "mime_type": "image/png",
+            "width": width,
+            "height": height,
+            "bytes": path.stat().st_size,
+            "cached": cached,
+            "key": key,
+        }
+
+    # 5. Expose the cached images as MCP resources
+    register_image_resources(mcp, image_cache)
+
+    use_fast_json(mcp)
+    instrument_metrics(mcp)
+    instrument_tracing(mcp)
 
-        return url
-    
     return mcp
 
 
 def main():
+    configure_tracing("image-generator-mcp-server")
+
     async def _run():
         server = await serve()
         logger.info("Starting Calculator MCP server...")
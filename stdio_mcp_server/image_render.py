@@ -0,0 +1,310 @@
+"""
+Local procedural image rendering for the image generator server.
+
+Images are rendered with vectorized NumPy operations (`uv sync --extra
+numeric`) and encoded as PNG without any imaging library. Rendered files are
+stored in a content-addressed disk cache: the file name is a hash of the
+render parameters, so a repeat request is served from disk without rendering.
+
+The cache directory defaults to ~/.cache/mcp-image-generator and can be moved
+with MCP_IMAGE_CACHE_DIR. It is limited to MCP_IMAGE_CACHE_MAX_BYTES (default
+256 MiB): a hit refreshes the file's modification time, and when a new render
+takes the cache over the limit the least recently used images are deleted.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from lazy_imports import lazy_import
+
+np = lazy_import("numpy")  # numpy is an optional extra, imported on first render
+
+
+# Bump when the renderer output changes, so old cache entries are not reused
+RENDERER_VERSION = 1
+
+PATTERNS = ("gradient", "noise", "solid")
+MAX_DIMENSION = 5000
+MAX_PIXELS = 4096 * 2048
+MAX_BLUR = 10
+
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# A sweep evicts down to this fraction of the limit, so it does not run on every render
+CACHE_LOW_WATER = 0.9
+
+
+def default_cache_dir() -> Path:
+    return Path(
+        os.getenv("MCP_IMAGE_CACHE_DIR")
+        or Path.home() / ".cache" / "mcp-image-generator"
+    )
+
+
+def default_cache_max_bytes() -> int:
+    value = os.getenv("MCP_IMAGE_CACHE_MAX_BYTES")
+    if not value:
+        return DEFAULT_CACHE_MAX_BYTES
+    try:
+        max_bytes = int(value)
+    except ValueError:
+        raise ValueError(f"MCP_IMAGE_CACHE_MAX_BYTES must be an integer, got {value!r}")
+    if max_bytes < 1:
+        raise ValueError("MCP_IMAGE_CACHE_MAX_BYTES must be positive")
+    return max_bytes
+
+
+def render_params(
+    width: int,
+    height: int,
+    pattern: str = "gradient",
+    options: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Validate and normalize render parameters.
+
+    `options` uses the same keys as generate_image_url: grayscale (1/0),
+    blur (0-10) and seed; other keys are ignored.
+    """
+    options = options or {}
+    if pattern not in PATTERNS:
+        raise ValueError(f"Unknown pattern '{pattern}', expected one of: {', '.join(PATTERNS)}")
+    if not (1 <= width <= MAX_DIMENSION and 1 <= height <= MAX_DIMENSION):
+        raise ValueError(f"Width and height must be between 1 and {MAX_DIMENSION}")
+    if width * height > MAX_PIXELS:
+        raise ValueError(f"Images are limited to {MAX_PIXELS} pixels")
+
+    try:
+        blur = int(options.get("blur", 0))
+        seed = int(options.get("seed", 0))
+        grayscale = str(options.get("grayscale", "0")).lower() in ("1", "true", "yes")
+    except ValueError as e:
+        raise ValueError(f"Invalid image option: {e}")
+    if not 0 <= blur <= MAX_BLUR:
+        raise ValueError(f"Blur must be between 0 and {MAX_BLUR}")
+
+    return {
+        "width": width,
+        "height": height,
+        "pattern": pattern,
+        "seed": seed,
+        "grayscale": grayscale,
+        "blur": blur,
+    }
+
+
+def cache_key(params: Mapping[str, Any]) -> str:
+    """Content address of a render: a hash of the canonical parameters."""
+    canonical = json.dumps(
+        {**params, "version": RENDERER_VERSION}, sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def render_pixels(params: Mapping[str, Any]):
+    """Render an (height, width, 3) or (height, width) uint8 array."""
+    if np is None:
+        raise RuntimeError("render_image requires numpy (uv sync --extra numeric)")
+
+    width, height = params["width"], params["height"]
+    rng = np.random.default_rng(params["seed"])
+
+    if params["pattern"] == "noise":
+        image = rng.random((height, width, 3), dtype=np.float32) * 255.0
+    elif params["pattern"] == "solid":
+        image = np.broadcast_to(
+            rng.integers(0, 256, 3).astype(np.float32), (height, width, 3)
+        ).copy()
+    else:
+        # Bilinear blend between four seeded corner colors
+        corners = rng.integers(0, 256, (4, 3)).astype(np.float32)
+        x = np.linspace(0.0, 1.0, width, dtype=np.float32)[None, :, None]
+        y = np.linspace(0.0, 1.0, height, dtype=np.float32)[:, None, None]
+        top = corners[0] * (1 - x) + corners[1] * x
+        bottom = corners[2] * (1 - x) + corners[3] * x
+        image = top * (1 - y) + bottom * y
+
+    if params["grayscale"]:
+        image = image @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+    if params["blur"]:
+        # Three box-blur passes per axis approximate a Gaussian blur
+        for _ in range(3):
+            image = _box_blur(image, params["blur"], axis=0)
+            image = _box_blur(image, params["blur"], axis=1)
+
+    return np.clip(image + 0.5, 0, 255).astype(np.uint8)
+
+
+def _box_blur(image, radius: int, axis: int):
+    pad = [(0, 0)] * image.ndim
+    pad[axis] = (radius + 1, radius)
+    cumulative = np.cumsum(np.pad(image, pad, mode="edge"), axis=axis, dtype=np.float32)
+    size = image.shape[axis]
+    window = 2 * radius + 1
+    upper = np.take(cumulative, np.arange(window, window + size), axis=axis)
+    lower = np.take(cumulative, np.arange(0, size), axis=axis)
+    return (upper - lower) / window
+
+
+def encode_png(pixels) -> bytes:
+    """Encode an 8-bit grayscale or RGB array as PNG."""
+    height, width = pixels.shape[:2]
+    channels = 1 if pixels.ndim == 2 else pixels.shape[2]
+    color_type = 0 if channels == 1 else 2
+
+    # Every scanline starts with filter type 0 (none)
+    scanlines = np.zeros((height, width * channels + 1), dtype=np.uint8)
+    scanlines[:, 1:] = pixels.reshape(height, width * channels)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + tag
+            + data
+            + struct.pack(">I", zlib.crc32(tag + data))
+        )
+
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return b"".join(
+        [
+            b"\x89PNG\r\n\x1a\n",
+            chunk(b"IHDR", header),
+            chunk(b"IDAT", zlib.compress(scanlines.tobytes(), 6)),
+            chunk(b"IEND", b""),
+        ]
+    )
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+class ImageCache:
+    """Content-addressed PNG cache on disk, with in-flight render deduplication.
+
+    The total size of the cached files is bounded by `max_bytes`, evicting the
+    least recently used images first.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: Optional[int] = None):
+        self.directory = Path(directory or default_cache_dir())
+        self.max_bytes = max_bytes or default_cache_max_bytes()
+        self._pending: Dict[str, asyncio.Future] = {}
+        # Bytes on disk, counted by the first sweep and kept up to date after it
+        self._size: Optional[int] = None
+        self.hits = 0
+        self.renders = 0
+        self.evictions = 0
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / f"{key}.png"
+
+    def metadata_path_for(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    async def get_or_render(self, params: Mapping[str, Any]) -> Tuple[str, Path, bool]:
+        """Return (key, path, cached) for the image, rendering it only if needed."""
+        key = cache_key(params)
+        path = self.path_for(key)
+
+        while True:
+            if self._touch(path):
+                self.hits += 1
+                return key, path, True
+            pending = self._pending.get(key)
+            if pending is None:
+                break
+            # The same image is being rendered by a concurrent call
+            await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            await asyncio.to_thread(self._render_to_disk, key, params)
+            self.renders += 1
+        finally:
+            del self._pending[key]
+            future.set_result(None)
+        return key, path, False
+
+    @staticmethod
+    def _touch(path: Path) -> bool:
+        """Mark a cached file as recently used; False if it is not cached."""
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _render_to_disk(self, key: str, params: Mapping[str, Any]) -> None:
+        data = encode_png(render_pixels(params))
+        metadata = json.dumps(dict(params)).encode()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._write_atomic(self.metadata_path_for(key), metadata)
+        self._write_atomic(self.path_for(key), data)
+
+        if self._size is None:
+            self._size = self._disk_usage()
+        else:
+            self._size += len(data) + len(metadata)
+        if self._size > self.max_bytes:
+            self.sweep(keep=key)
+
+    def _disk_usage(self) -> int:
+        return sum(_file_size(path) for path in self.directory.glob("*.*"))
+
+    def sweep(self, keep: Optional[str] = None) -> int:
+        """Evict least recently used images until the cache is under its low-water mark.
+
+        The image `keep` and images being rendered are never evicted. Returns
+        the number of images removed.
+        """
+        entries = []
+        total = 0
+        for path in self.directory.glob("*.png"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # Evicted concurrently
+                continue
+            size = stat.st_size + _file_size(self.metadata_path_for(path.stem))
+            entries.append((stat.st_mtime, path.stem, size))
+            total += size
+        entries.sort()
+
+        target = int(self.max_bytes * CACHE_LOW_WATER)
+        removed = 0
+        for _, key, size in entries:
+            if total <= target:
+                break
+            if key == keep or key in self._pending:
+                continue
+            for path in (self.path_for(key), self.metadata_path_for(key)):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            total -= size
+            removed += 1
+
+        self._size = total
+        self.evictions += removed
+        return removed
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
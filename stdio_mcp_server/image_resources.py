@@ -0,0 +1,157 @@
+"""
+MCP resources for images in the render cache.
+
+Every cached PNG is listed by resources/list as image://cache/<key>.png and
+can be fetched with resources/read. A byte range can be requested with
+image://cache/<key>.png?offset=<n>&length=<n>, so a client can stream a large
+image in pieces.
+
+A single read returns at most MAX_READ_BYTES of the file, which bounds the
+memory used per request. The returned range is described in the contents'
+`_meta` as {"range": {"offset", "length", "total"}}; a client reads on from
+offset + length until it reaches total. A read without a range is for the
+whole image: for an image larger than MAX_READ_BYTES it fails, rather than
+return a PNG that is cut short, and the error gives the image's size.
+"""
+
+import asyncio
+import binascii
+import json
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from mcp import types
+from mcp.server.fastmcp import FastMCP
+
+from image_render import ImageCache
+
+URI_PREFIX = "image://cache/"
+
+MAX_READ_BYTES = 4 * 1024 * 1024
+
+
+def resource_uri(key: str) -> str:
+    return f"{URI_PREFIX}{key}.png"
+
+
+def list_image_resources(cache: ImageCache) -> List[types.Resource]:
+    """Describe every image in the cache, newest first."""
+    if not cache.directory.is_dir():
+        return []
+
+    entries = []
+    for path in cache.directory.glob("*.png"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:  # Removed while listing
+            continue
+        entries.append((stat.st_mtime, path, stat.st_size))
+    entries.sort(reverse=True)
+
+    resources = []
+    for _, path, size in entries:
+        key = path.stem
+        description = None
+        try:
+            params = json.loads(cache.metadata_path_for(key).read_text())
+            description = (
+                f"{params['width']}x{params['height']} {params['pattern']} image"
+                f" (seed {params['seed']}, grayscale {int(params['grayscale'])},"
+                f" blur {params['blur']})"
+            )
+        except (OSError, ValueError, KeyError):
+            pass
+        resources.append(
+            types.Resource(
+                uri=resource_uri(key),
+                name=path.name,
+                description=description,
+                mimeType="image/png",
+                size=size,
+            )
+        )
+    return resources
+
+
+def parse_image_uri(cache: ImageCache, uri: str) -> Tuple[Path, int, Optional[int]]:
+    """Resolve an image:// URI to (path, offset, length)."""
+    parts = urlsplit(uri)
+    name = parts.path.lstrip("/")
+    key = name.removesuffix(".png")
+    if parts.netloc != "cache" or not name.endswith(".png") or not key.isalnum():
+        raise ValueError(f"Unknown image resource: {uri}")
+
+    query = parse_qs(parts.query)
+    try:
+        offset = int(query.get("offset", ["0"])[0])
+        length = int(query["length"][0]) if "length" in query else None
+    except ValueError:
+        raise ValueError(f"Invalid range in {uri}")
+    if offset < 0 or (length is not None and length < 0):
+        raise ValueError(f"Invalid range in {uri}")
+
+    path = cache.path_for(key)
+    if not path.is_file():
+        raise ValueError(f"Image resource not found: {uri}")
+    return path, offset, length
+
+
+def encode_file_base64(
+    path: Path, offset: int = 0, length: Optional[int] = None, max_length: int = MAX_READ_BYTES
+) -> Tuple[str, int, int, int]:
+    """Base64-encode a byte range of a file.
+
+    The range is clipped to the file and to `max_length` bytes. Returns
+    (blob, offset, length, total_size) for the range actually read.
+    """
+    with open(path, "rb") as file:
+        total = os.fstat(file.fileno()).st_size
+        offset = min(offset, total)
+        length = max_length if length is None else min(length, max_length)
+        file.seek(offset)
+        data = file.read(min(length, total - offset))
+    return binascii.b2a_base64(data, newline=False).decode("ascii"), offset, len(data), total
+
+
+def register_image_resources(server: FastMCP, cache: ImageCache) -> None:
+    """Serve the cache's images through resources/list and resources/read.
+
+    Resources registered on the FastMCP server itself keep working: they are
+    listed alongside the images and read by the original handler.
+    """
+    list_resources = server.list_resources
+
+    async def list_all_resources() -> List[types.Resource]:
+        return await list_resources() + await asyncio.to_thread(list_image_resources, cache)
+
+    server._mcp_server.list_resources()(list_all_resources)
+
+    read_resource = server._mcp_server.request_handlers[types.ReadResourceRequest]
+
+    async def read_image_resource(request: types.ReadResourceRequest):
+        uri = str(request.params.uri)
+        if not uri.startswith(URI_PREFIX):
+            return await read_resource(request)
+
+        path, offset, length = parse_image_uri(cache, uri)
+        if not urlsplit(uri).query:
+            size = path.stat().st_size
+            if size > MAX_READ_BYTES:
+                raise ValueError(
+                    f"Image is {size} bytes, more than {MAX_READ_BYTES} can be read at once;"
+                    f" read it in ranges with {uri}?offset=<n>&length=<n>"
+                )
+        blob, offset, length, total = await asyncio.to_thread(
+            encode_file_base64, path, offset, length, MAX_READ_BYTES
+        )
+        contents = types.BlobResourceContents(
+            uri=request.params.uri,
+            mimeType="image/png",
+            blob=blob,
+            _meta={"range": {"offset": offset, "length": length, "total": total}},
+        )
+        return types.ServerResult(types.ReadResourceResult(contents=[contents]))
+
+    server._mcp_server.request_handlers[types.ReadResourceRequest] = read_image_resource
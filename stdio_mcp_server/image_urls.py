@@ -0,0 +1,173 @@
+"""
+Lorem Picsum URL building for the image generator server.
+
+The encoded query string for a set of options is computed once and cached, so
+generating thousands of URLs only formats the varying width/height/seed parts.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from urllib.parse import urlencode
+
+BASE_URL = "https://picsum.photos"
+
+MAX_URLS = 10_000
+
+# Longer numbers are left in the template text (they also stay exact in JSON)
+MAX_FIELD_DIGITS = 15
+_NUMBER = re.compile(r"\d+")
+
+
+@lru_cache(maxsize=512)
+def _query_string(options: Tuple[Tuple[str, str], ...], seeded: bool) -> str:
+    """Encoded query for a set of options; ends with "seed=" when `seeded`."""
+    query = urlencode(options)
+    if seeded:
+        query = f"{query}&seed=" if query else "seed="
+    return f"?{query}" if query else ""
+
+
+def _options_key(options: Optional[Mapping[str, Any]], drop_seed: bool = False):
+    if not options:
+        return ()
+    return tuple(
+        (str(key), str(value))
+        for key, value in options.items()
+        if not (drop_seed and key == "seed")
+    )
+
+
+def _check_count(count: int) -> None:
+    if count > MAX_URLS:
+        raise ValueError(f"Requested {count} URLs, the maximum per call is {MAX_URLS}")
+
+
+def image_url(width: int, height: int, options: Optional[Mapping[str, Any]] = None) -> str:
+    """URL of a single Lorem Picsum image."""
+    return f"{BASE_URL}/{width}/{height}{_query_string(_options_key(options), False)}"
+
+
+def image_urls_from_specs(specs: Iterable[Mapping[str, Any]]) -> List[str]:
+    """URLs for a list of {"width", "height", "options"} specs."""
+    specs = list(specs)
+    _check_count(len(specs))
+
+    urls = []
+    for index, spec in enumerate(specs):
+        try:
+            width, height = int(spec["width"]), int(spec["height"])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Spec {index} needs integer 'width' and 'height'")
+        urls.append(image_url(width, height, spec.get("options")))
+    return urls
+
+
+def image_urls_from_grid(
+    widths: Iterable[int],
+    heights: Iterable[int],
+    seeds: Optional[Iterable[int]] = None,
+    options: Optional[Mapping[str, Any]] = None,
+) -> List[str]:
+    """URLs for every width x height (x seed) combination."""
+    widths, heights = list(widths), list(heights)
+    if seeds is not None and not isinstance(seeds, range):
+        seeds = list(seeds)
+    total = len(widths) * len(heights) * (len(seeds) if seeds is not None else 1)
+    _check_count(total)
+
+    if seeds is None:
+        query = _query_string(_options_key(options), False)
+        return [f"{BASE_URL}/{w}/{h}{query}" for w in widths for h in heights]
+
+    # The seed goes last so each URL is a cached prefix plus the seed number
+    query = _query_string(_options_key(options, drop_seed=True), True)
+    urls = []
+    for w in widths:
+        for h in heights:
+            prefix = f"{BASE_URL}/{w}/{h}{query}"
+            urls.extend([f"{prefix}{seed}" for seed in seeds])
+    return urls
+
+
+def seed_range(seed_start: Optional[int], seed_count: Optional[int]) -> Optional[range]:
+    """Seeds of a grid, or None for an unseeded grid."""
+    if seed_start is None:
+        if seed_count is not None:
+            raise ValueError("seed_count needs seed_start")
+        return None
+    if seed_count is None:
+        seed_count = 1
+    if seed_count < 1:
+        raise ValueError("seed_count must be at least 1")
+    return range(seed_start, seed_start + seed_count)
+
+
+def _split_numbers(url: str) -> Tuple[Tuple[str, ...], List[int]]:
+    """Split a URL into its literal text and the numbers between it.
+
+    Numbers with leading zeros or more than MAX_FIELD_DIGITS digits stay in the
+    literal text, so formatting the numbers back always gives the same URL.
+    """
+    literals, numbers, last = [], [], 0
+    for match in _NUMBER.finditer(url):
+        text = match.group()
+        if len(text) > MAX_FIELD_DIGITS or (len(text) > 1 and text[0] == "0"):
+            continue
+        literals.append(url[last:match.start()])
+        numbers.append(int(text))
+        last = match.end()
+    literals.append(url[last:])
+    return tuple(literals), numbers
+
+
+def _template_group(literals: Tuple[str, ...], rows: List[List[int]]) -> Dict[str, Any]:
+    """One template for URLs sharing their literal text.
+
+    Numbers that are the same in every row are written into the template, the
+    others become positional placeholders.
+    """
+    first = rows[0]
+    varying = [i for i in range(len(first)) if any(row[i] != first[i] for row in rows)]
+    template = [literals[0].replace("{", "{{").replace("}", "}}")]
+    for i, literal in enumerate(literals[1:]):
+        if i in varying:
+            template.append(f"{{{varying.index(i)}}}")
+        else:
+            template.append(str(first[i]))
+        template.append(literal.replace("{", "{{").replace("}", "}}"))
+    return {
+        "template": "".join(template),
+        "values": [[row[i] for i in varying] for row in rows],
+    }
+
+
+def compact_urls(urls: List[str]) -> Dict[str, Any]:
+    """Encode URLs as templates with placeholders plus per-item values.
+
+    Consecutive URLs that differ only in their numbers (width, height, seed, ...)
+    share a group, and each URL is `group["template"].format(*values)`. A grid
+    of one option set is a single group however many widths or seeds it has,
+    e.g. "https://picsum.photos/{0}/{1}?grayscale=1&seed={2}".
+    """
+    groups = []
+    literals, rows = None, []
+    for url in urls:
+        url_literals, numbers = _split_numbers(url)
+        if url_literals != literals:
+            if rows:
+                groups.append(_template_group(literals, rows))
+            literals, rows = url_literals, []
+        rows.append(numbers)
+    if rows:
+        groups.append(_template_group(literals, rows))
+    return {"format": "template", "count": len(urls), "groups": groups}
+
+
+def expand_urls(compact: Mapping[str, Any]) -> List[str]:
+    """Full URLs from the output of compact_urls."""
+    return [
+        group["template"].format(*values)
+        for group in compact["groups"]
+        for values in group["values"]
+    ]
@@ -0,0 +1,38 @@
+"""
+Deferred imports for optional heavy dependencies.
+
+`lazy_import("numpy")` returns a module object whose code only runs on the
+first attribute access, so a server that never calls a NumPy-backed tool
+never pays for importing NumPy. Missing optional extras still come back as
+None, as with the usual try/except ImportError pattern.
+
+sse_server/ has an identical copy.
+"""
+
+import importlib.util
+import sys
+from types import ModuleType
+from typing import Optional
+
+
+def lazy_import(name: str) -> Optional[ModuleType]:
+    """Return module `name`, loaded on first use, or None if it is not installed."""
+    if name in sys.modules:
+        return sys.modules[name]
+    try:
+        spec = importlib.util.find_spec(name)
+    except ImportError:  # A parent package is missing
+        return None
+    if spec is None or spec.loader is None:
+        return None
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+
+    parent, _, child = name.rpartition(".")
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    return module
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+A local stand-in for the dev.to API with injected latency.
+
+Serves the routes the dev_blog server uses (GET /api/articles,
+GET /api/articles/{id}, GET /api/tags, POST /api/articles,
+PUT /api/articles/{id}) with generated data. Every response is delayed by
+`latency_ms`. A `tail_rate` fraction of responses is delayed by `tail_ms`
+instead, which mimics the slow tail that hedging is meant to cut.
+
+An outage can be switched on and off while it runs, to exercise the circuit
+breaker: POST /mock/outage with {"mode": "error"} (every API call answers
+503), {"mode": "hang"} (calls take `hang_seconds`) or {"mode": null}.
+
+Point the dev_blog server at it:
+
+    python mock_devto_server.py --port 8010 --latency-ms 40 --tail-ms 800 --tail-rate 0.05
+    DEV_TO_BASE_URL=http://127.0.0.1:8010/api python dev_blog_mcp_server.py --auth-token test
+"""
+
+import asyncio
+import random
+from typing import Any, Dict, Optional
+
+import click
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+# Section headings of the generated article bodies
+SECTIONS = (
+    "The event loop",
+    "Coroutines and tasks",
+    "Futures",
+    "Cancellation",
+    "Timeouts",
+    "Synchronization primitives",
+    "Queues",
+    "Subprocesses",
+    "Streams",
+    "Running blocking code in threads",
+    "Debug mode",
+    "Testing async code",
+)
+
+
+def article(i: int, body: bool = False) -> Dict[str, Any]:
+    item = {
+        "type_of": "article",
+        "id": i,
+        "title": f"Understanding Python's asyncio event loop, part {i}",
+        "description": "How the event loop schedules callbacks, tasks and I/O.",
+        "path": f"/janedoe/understanding-asyncio-part-{i}-4k2a",
+        "url": f"https://dev.to/janedoe/understanding-asyncio-part-{i}-4k2a",
+        "comments_count": i % 37,
+        "public_reactions_count": (i * 7) % 500,
+        "published_at": "2025-10-19T09:30:00Z",
+        "reading_time_minutes": 3 + i % 12,
+        "tag_list": ["python", "asyncio", "tutorial"],
+        "user": {"name": "Jane Doe", "username": "janedoe"},
+    }
+    if body:
+        item["body_markdown"] = "".join(
+            f"## {topic}\n\n"
+            + f"This section covers {topic.lower()} in asyncio. The event loop runs one callback at a time.\n\n" * 6
+            + f"```python\n# {topic.lower()}\nawait asyncio.sleep(0)\n```\n\n"
+            for topic in SECTIONS
+        )
+    return item
+
+
+def create_app(
+    latency_ms: float = 40.0,
+    tail_ms: float = 800.0,
+    tail_rate: float = 0.05,
+    seed: Optional[int] = None,
+    hang_seconds: float = 60.0,
+) -> Starlette:
+    """The mock API.
+
+    `app.state.requests` counts the API requests it received, and
+    `app.state.outage` is the current outage mode (None, "error" or "hang").
+    """
+    rng = random.Random(seed)
+
+    class Outage(Exception):
+        pass
+
+    async def delay() -> None:
+        app.state.requests += 1
+        if app.state.outage == "hang":
+            await asyncio.sleep(hang_seconds)
+        if app.state.outage == "error":
+            raise Outage
+        slow = rng.random() < tail_rate
+        await asyncio.sleep((tail_ms if slow else latency_ms) / 1000)
+
+    async def service_unavailable(request: Request, exc: Exception) -> JSONResponse:
+        return JSONResponse({"error": "service unavailable", "status": 503}, status_code=503)
+
+    async def set_outage(request: Request) -> JSONResponse:
+        app.state.outage = (await request.json()).get("mode")
+        return JSONResponse({"mode": app.state.outage})
+
+    async def list_articles(request: Request) -> JSONResponse:
+        await delay()
+        per_page = min(int(request.query_params.get("per_page", 10)), 1000)
+        page = int(request.query_params.get("page", 1))
+        first = (page - 1) * per_page
+        return JSONResponse([article(i) for i in range(first, first + per_page)])
+
+    async def get_article(request: Request) -> JSONResponse:
+        await delay()
+        article_id = request.path_params["article_id"]
+        if not article_id.isdigit():
+            return JSONResponse({"error": "not found", "status": 404}, status_code=404)
+        return JSONResponse(article(int(article_id), body=True))
+
+    async def list_tags(request: Request) -> JSONResponse:
+        await delay()
+        per_page = min(int(request.query_params.get("per_page", 10)), 1000)
+        return JSONResponse(
+            [{"id": i, "name": f"tag{i}", "bg_color_hex": "#000000"} for i in range(per_page)]
+        )
+
+    async def write_article(request: Request) -> JSONResponse:
+        await delay()
+        data = (await request.json()).get("article", {})
+        article_id = int(request.path_params.get("article_id", 1))
+        return JSONResponse({**article(article_id), **data}, status_code=201)
+
+    app = Starlette(
+        routes=[
+            Route("/api/articles", list_articles, methods=["GET"]),
+            Route("/api/articles", write_article, methods=["POST"]),
+            Route("/api/articles/{article_id:path}", get_article, methods=["GET"]),
+            Route("/api/articles/{article_id}", write_article, methods=["PUT"]),
+            Route("/api/tags", list_tags, methods=["GET"]),
+            Route("/mock/outage", set_outage, methods=["POST"]),
+        ],
+        exception_handlers={Outage: service_unavailable},
+    )
+    app.state.requests = 0
+    app.state.outage = None
+    return app
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", default=8010, show_default=True)
+@click.option("--latency-ms", default=40.0, show_default=True, help="Usual response delay")
+@click.option("--tail-ms", default=800.0, show_default=True, help="Delay of slow responses")
+@click.option("--tail-rate", default=0.05, show_default=True, help="Fraction of slow responses")
+@click.option("--seed", type=int, default=None, help="Seed for reproducible slow responses")
+def main(host: str, port: int, latency_ms: float, tail_ms: float, tail_rate: float, seed: Optional[int]):
+    uvicorn.run(create_app(latency_ms, tail_ms, tail_rate, seed), host=host, port=port)
+
+
+if __name__ == "__main__":
+    main()
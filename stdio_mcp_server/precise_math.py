@@ -0,0 +1,207 @@
+"""
+Arbitrary-precision arithmetic for the calculator tools.
+
+Three precision modes are supported:
+
+    - int:      exact big-integer arithmetic (the default)
+    - decimal:  decimal.Decimal with a configurable number of significant digits
+    - fraction: exact rational arithmetic with fractions.Fraction
+
+Converting a huge int to decimal text is quadratic in CPython (and refused
+past `sys.get_int_max_str_digits()` digits), so large results are encoded
+compactly: either as hex, which is linear, or as a digit count with the
+leading and trailing digits, which never converts the whole number.
+"""
+
+import decimal
+from fractions import Fraction
+from typing import Union
+
+from expressions import MAX_RESULT_DIGITS
+
+MODES = ("int", "decimal", "fraction")
+ENCODINGS = ("auto", "decimal", "hex", "summary")
+
+DEFAULT_PRECISION = 28
+MAX_PRECISION = 100_000
+
+# "auto" encoding switches to a summary above this many (approximate) digits
+AUTO_SUMMARY_DIGITS = 1000
+PREVIEW_DIGITS = 10
+
+# log10(2), to estimate decimal digits from the bit length
+_LOG10_2 = 0.30102999566398120
+_ALMOST_ONE = decimal.Decimal("0.99999999999999999999")
+_ALMOST_TEN = decimal.Decimal("9.99999999999999999999")
+_FLOOR_CONTEXT = decimal.Context(
+    prec=PREVIEW_DIGITS + 30, rounding=decimal.ROUND_FLOOR, Emax=decimal.MAX_EMAX
+)
+
+Operand = Union[int, str]
+Value = Union[int, decimal.Decimal, Fraction]
+
+
+def make_context(precision: int = DEFAULT_PRECISION) -> decimal.Context:
+    """Decimal context with `precision` significant digits."""
+    if not 1 <= precision <= MAX_PRECISION:
+        raise ValueError(f"Precision must be between 1 and {MAX_PRECISION}")
+    return decimal.Context(prec=precision, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+
+
+def parse_operand(value: Operand, mode: str, context: decimal.Context) -> Value:
+    """Convert a tool argument to a number in the given precision mode.
+
+    Strings may be decimal ("12.5"), hex integers ("0x1f") or, in fraction
+    mode, ratios ("1/3").
+    """
+    try:
+        if mode == "int":
+            return value if isinstance(value, int) else _parse_int(value.strip())
+        if mode == "decimal":
+            return context.create_decimal(value if isinstance(value, int) else value.strip())
+        if mode == "fraction":
+            return Fraction(value) if isinstance(value, int) else _parse_fraction(value.strip())
+    except (ValueError, ZeroDivisionError, decimal.InvalidOperation) as e:
+        raise ValueError(f"Invalid {mode} operand {value!r}: {e}")
+    raise ValueError(f"Unknown precision mode '{mode}', expected one of: {', '.join(MODES)}")
+
+
+def _parse_int(text: str) -> int:
+    if text.lower().lstrip("+-").startswith("0x"):
+        return int(text, 16)
+    return int(text)
+
+
+def _parse_fraction(text: str) -> Fraction:
+    # Fraction("1e10000000") builds 10 ** 10000000 before anything else can check it
+    digits = 0
+    for part in text.lower().split("/"):
+        mantissa, _, exponent = part.partition("e")
+        digits += sum(c.isdigit() for c in mantissa)
+        exponent = exponent.strip().replace("_", "")
+        if exponent:
+            digits += abs(int(exponent)) if len(exponent) < 12 else MAX_RESULT_DIGITS + 1
+    if digits > MAX_RESULT_DIGITS:
+        raise ValueError(f"more than {MAX_RESULT_DIGITS} digits")
+    return Fraction(text)
+
+
+def describe_operand(value: Operand, max_length: int = 2 * PREVIEW_DIGITS + 20) -> str:
+    """Short text for echoing an operand back without formatting huge ints."""
+    if isinstance(value, int):
+        return format_number(value)
+    if len(value) > max_length:
+        return f"{value[:PREVIEW_DIGITS]}…{value[-PREVIEW_DIGITS:]} ({len(value)} characters)"
+    return value
+
+
+def calculate(
+    operation: str,
+    a: Operand,
+    b: Operand,
+    mode: str = "int",
+    precision: int = DEFAULT_PRECISION,
+) -> Value:
+    """Apply "add", "subtract" or "multiply" in the given precision mode."""
+    context = make_context(precision)
+    left = parse_operand(a, mode, context)
+    right = parse_operand(b, mode, context)
+
+    if mode == "decimal":
+        if operation == "add":
+            return context.add(left, right)
+        if operation == "subtract":
+            return context.subtract(left, right)
+        if operation == "multiply":
+            return context.multiply(left, right)
+    else:
+        if operation == "add":
+            return left + right
+        if operation == "subtract":
+            return left - right
+        if operation == "multiply":
+            return left * right
+
+    raise ValueError(f"Unknown operation '{operation}'")
+
+
+def _floor_decimal(n: int) -> decimal.Decimal:
+    """A Decimal with PREVIEW_DIGITS + 30 significant digits that is <= n.
+
+    Only the top 256 bits of n are used, so this is linear in the size of n;
+    truncating and rounding down undershoots by less than one unit in the
+    last of the 30 guard digits.
+    """
+    shift = max(0, n.bit_length() - 256)
+    return _FLOOR_CONTEXT.multiply(
+        decimal.Decimal(n >> shift), _FLOOR_CONTEXT.power(2, shift)
+    )
+
+
+def integer_digits(n: int) -> int:
+    """Number of decimal digits of an int, without converting it to text."""
+    n = abs(n)
+    if n.bit_length() <= 256:
+        return len(str(n))
+
+    approx = _floor_decimal(n)
+    digits = approx.adjusted() + 1
+    if approx.scaleb(-approx.adjusted(), _FLOOR_CONTEXT) > _ALMOST_TEN and n >= 10**digits:
+        # Just below the next power of ten by the estimate; settled exactly
+        digits += 1
+    return digits
+
+
+def summarize_integer(n: int, preview_digits: int = PREVIEW_DIGITS) -> str:
+    """Describe a huge int as "<leading>…<trailing> (<count> digits)"."""
+    digits = integer_digits(n)
+    sign = "-" if n < 0 else ""
+    n = abs(n)
+    if digits <= 2 * preview_digits:
+        return f"{sign}{n}"
+
+    scaled = _floor_decimal(n).scaleb(preview_digits - digits, _FLOOR_CONTEXT)
+    leading = int(scaled.to_integral_value(rounding=decimal.ROUND_FLOOR))
+    if scaled - leading > _ALMOST_ONE and (leading + 1) * 10 ** (digits - preview_digits) <= n:
+        # Too close to the next integer to tell from the estimate
+        leading += 1
+
+    trailing = str(n % 10**preview_digits).zfill(preview_digits)
+    return f"{sign}{leading}…{trailing} ({digits} digits)"
+
+
+def format_number(value: Value, encoding: str = "auto") -> str:
+    """Format a result, switching to a compact encoding for huge numbers.
+
+    Args:
+        value: An int, Decimal or Fraction.
+        encoding (str): "decimal" (full text), "hex" (integers only, linear
+            time), "summary" (digit count plus a preview) or "auto" (full
+            text unless the number has more than AUTO_SUMMARY_DIGITS digits).
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown encoding '{encoding}', expected one of: {', '.join(ENCODINGS)}")
+
+    if isinstance(value, Fraction):
+        if value.denominator == 1:
+            return format_number(value.numerator, encoding)
+        return (
+            f"{format_number(value.numerator, encoding)}"
+            f"/{format_number(value.denominator, encoding)}"
+        )
+
+    if isinstance(value, decimal.Decimal):
+        if encoding == "summary" or (
+            encoding == "auto" and len(value.as_tuple().digits) > AUTO_SUMMARY_DIGITS
+        ):
+            significant = len(value.as_tuple().digits)
+            return f"{value:.{PREVIEW_DIGITS - 1}e} ({significant} significant digits)"
+        return str(value)
+
+    if encoding == "hex":
+        return hex(value)
+    if encoding == "summary":
+        return summarize_integer(value)
+    if encoding == "auto" and value.bit_length() * _LOG10_2 > AUTO_SUMMARY_DIGITS:
+        return summarize_integer(value)
+    return str(value)
@@ -0,0 +1,209 @@
+"""
+Predictive prefetch of articles after a search.
+
+After `search_articles`, agents almost always call `get_article` on the first
+few results. ArticlePrefetcher starts fetching the top-k of them in the
+background as soon as the search returns, so that those `get_article` calls
+are answered from memory:
+
+    - at most `concurrency` prefetches run at once
+    - a new search cancels the prefetches of the previous one that have not
+      finished, since the agent has moved on
+    - a `get_article` for an article still being prefetched waits for that
+      fetch instead of sending a second request
+    - fetched articles are kept for `ttl` seconds, for up to `max_entries`
+      articles, under both their id and their path; `get` returns each with
+      its age, so that callers can say it may be out of date
+
+`snapshot()` reports the hit rate of `get_article` (from memory or from a
+running prefetch) and the share of prefetched articles that were used, which
+is what to watch when tuning k.
+
+Settings come from the environment (see `settings_from_env`):
+
+    - MCP_DEVTO_PREFETCH_K:           articles to prefetch per search (default 0: off)
+    - MCP_DEVTO_PREFETCH_CONCURRENCY: prefetches running at once (default 2)
+    - MCP_DEVTO_PREFETCH_TTL:         seconds a prefetched article is served (default 30)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def settings_from_env() -> Dict[str, Any]:
+    """Keyword arguments for ArticlePrefetcher from MCP_DEVTO_PREFETCH_* variables."""
+    return {
+        "top_k": int(os.getenv("MCP_DEVTO_PREFETCH_K", "0")),
+        "concurrency": int(os.getenv("MCP_DEVTO_PREFETCH_CONCURRENCY", "2")),
+        "ttl": float(os.getenv("MCP_DEVTO_PREFETCH_TTL", "30")),
+    }
+
+
+class PrefetchStats:
+    def __init__(self):
+        self.scheduled = 0
+        self.fetched = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.used = 0
+        self.hits = 0
+        self.in_flight_hits = 0
+        self.misses = 0
+
+
+class ArticlePrefetcher:
+    """Fetches the top search results ahead of `get_article`."""
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[Dict[str, Any]]],
+        top_k: int = 3,
+        concurrency: int = 2,
+        ttl: float = 30.0,
+        max_entries: int = 256,
+    ):
+        self.fetch = fetch
+        self.top_k = top_k
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = PrefetchStats()
+
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # Article id or path -> (time fetched, article)
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._unused: Set[int] = set()  # ids of prefetched articles not asked for yet
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.top_k > 0
+
+    def schedule(self, articles: List[Dict[str, Any]]) -> None:
+        """Start prefetching the first `top_k` of a search's results."""
+        for task in set(self._in_flight.values()):
+            if task.cancel():
+                self.stats.cancelled += 1
+        self._in_flight.clear()
+
+        for article in articles[: self.top_k]:
+            if not isinstance(article, dict) or "id" not in article:
+                continue
+            article_id = str(article["id"])
+            if self._lookup(article_id) is not None:
+                continue
+            task = asyncio.create_task(self._prefetch(article_id))
+            task.add_done_callback(self._finished)
+            self.stats.scheduled += 1
+            self._in_flight[article_id] = task
+            path = article.get("path")
+            if path:
+                self._in_flight[path.strip("/")] = task
+
+    async def get(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """The article for an id or path and its age in seconds, if prefetched
+        or being prefetched (age 0); None on a miss.
+        """
+        key = key.strip().strip("/")
+        age = 0.0
+        entry = self._lookup(key)
+        if entry is not None:
+            fetched, article = entry
+            age = time.monotonic() - fetched
+            self.stats.hits += 1
+        else:
+            article = None
+            task = self._in_flight.get(key)
+            if task is not None:
+                try:
+                    # Shielded: a cancelled tool call must not cancel the prefetch
+                    article = await asyncio.shield(task)
+                except asyncio.CancelledError:
+                    if not task.cancelled():
+                        raise
+                    article = None  # Cancelled by a newer search
+                except Exception:
+                    article = None
+                if article is not None:
+                    self.stats.in_flight_hits += 1
+        if article is None:
+            self.stats.misses += 1
+            return None
+
+        if article.get("id") in self._unused:
+            self._unused.discard(article["id"])
+            self.stats.used += 1
+        return article, age
+
+    def invalidate(self, key: str) -> None:
+        """Forget an article, e.g. after it was updated."""
+        key = key.strip().strip("/")
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            article = entry[1]
+            for other in (str(article.get("id", "")), str(article.get("path", "")).strip("/")):
+                self._cache.pop(other, None)
+
+    def _finished(self, task: asyncio.Task) -> None:
+        # From now on the article is only served from the cache, which expires
+        for key in [key for key, other in self._in_flight.items() if other is task]:
+            del self._in_flight[key]
+
+    def _lookup(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] + self.ttl < time.monotonic():
+            del self._cache[key]
+            return None
+        return entry
+
+    async def _prefetch(self, article_id: str) -> Optional[Dict[str, Any]]:
+        async with self._semaphore:
+            try:
+                article = await self.fetch(article_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats.failed += 1
+                logger.debug(f"Prefetch of article {article_id} failed: {e}")
+                return None
+        self.stats.fetched += 1
+        self._store(article_id, article)
+        return article
+
+    def _store(self, article_id: str, article: Dict[str, Any]) -> None:
+        fetched = time.monotonic()
+        keys = [article_id]
+        if article.get("path"):
+            keys.append(str(article["path"]).strip("/"))
+        for key in keys:
+            self._cache[key] = (fetched, article)
+            self._cache.move_to_end(key)
+        self._unused.add(article.get("id"))
+        while len(self._cache) > self.max_entries:
+            _, (_, evicted) = self._cache.popitem(last=False)
+            self._unused.discard(evicted.get("id"))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-friendly summary of the prefetcher."""
+        stats = self.stats
+        lookups = stats.hits + stats.in_flight_hits + stats.misses
+        return {
+            "top_k": self.top_k,
+            "scheduled": stats.scheduled,
+            "fetched": stats.fetched,
+            "failed": stats.failed,
+            "cancelled": stats.cancelled,
+            "hits": stats.hits,
+            "in_flight_hits": stats.in_flight_hits,
+            "misses": stats.misses,
+            "hit_rate": round((stats.hits + stats.in_flight_hits) / lookups, 4) if lookups else 0.0,
+            "used_rate": round(stats.used / stats.fetched, 4) if stats.fetched else 0.0,
+            "cached": len(self._cache),
+        }
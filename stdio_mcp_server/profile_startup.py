@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Profile stdio server startup.
+
+For each server this prints the slowest imports of its entry point (from
+`python -X importtime`), then the time from spawning the process to a
+completed `initialize` handshake, started directly and through a warm
+zygote (see zygote.py). The zygote is started on a temporary socket for
+the duration of the run.
+
+Usage: python profile_startup.py [runs]
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+SERVER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SERVERS = {
+    "calculator_mcp_server": [],
+    "dev_blog_mcp_server": ["--auth-token", "profile"],
+    "image_generator_mcp_server": [],
+    "fast_mcp_server": [],
+}
+
+
+def slowest_imports(module: str, top: int = 8):
+    """Return the total import time of `module` and the slowest packages it pulls in.
+
+    Times are microseconds of `python -X importtime` self time, summed per
+    top-level package.
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SERVER_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+
+    total = 0
+    packages = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        name = name.strip()
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+        if name == module:
+            total = int(cumulative_us)
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return total, slowest
+
+
+async def time_to_initialize(args) -> float:
+    started = time.perf_counter()
+    server = StdioServerParameters(command=sys.executable, args=args)
+    with open(os.devnull, "w") as devnull:
+        async with stdio_client(server, errlog=devnull) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                return time.perf_counter() - started
+
+
+async def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    print("Slowest imports per entry point")
+    for module in SERVERS:
+        total, entries = slowest_imports(module)
+        print(f"\n{module} ({total / 1000:.0f} ms total, self time per package)")
+        for package, self_us in entries:
+            print(f"  {self_us / 1000:>8.1f} ms  {package}")
+
+    socket_path = os.path.join(tempfile.mkdtemp(), "zygote.sock")
+    zygote = subprocess.Popen(
+        [sys.executable, os.path.join(SERVER_DIR, "zygote.py"), "serve", "--socket", socket_path],
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while not os.path.exists(socket_path):
+            if zygote.poll() is not None:
+                raise RuntimeError("zygote exited during startup")
+            await asyncio.sleep(0.05)
+
+        print(f"\nTime to initialize (mean of {runs} runs)")
+        print(f"{'server':<28} {'direct':>10} {'zygote':>10} {'speedup':>8}")
+        print("-" * 60)
+        for module, args in SERVERS.items():
+            script = os.path.join(SERVER_DIR, f"{module}.py")
+            launcher = [os.path.join(SERVER_DIR, "zygote.py"), "run", "--socket", socket_path]
+            direct = [await time_to_initialize([script, *args]) for _ in range(runs)]
+            forked = [await time_to_initialize([*launcher, script, *args]) for _ in range(runs)]
+            direct_mean, forked_mean = sum(direct) / runs, sum(forked) / runs
+            print(
+                f"{module:<28} {direct_mean * 1000:>8.0f}ms {forked_mean * 1000:>8.0f}ms"
+                f" {direct_mean / forked_mean:>7.1f}x"
+            )
+    finally:
+        zygote.terminate()
+        zygote.wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
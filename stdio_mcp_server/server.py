@@ -1,22 +1,226 @@
-from typing import Sequence
+"""
+Low-level MCP server template with table-driven tool dispatch.
+
+FastMCP builds a pydantic model for every tool and validates each call through
+it. This template does that work once, at startup:
+
+    - ToolRegistry turns each handler's signature into a JSON schema, a Tool
+      object and a compiled argument validator when the tool is registered;
+    - list_tools returns the prebuilt Tool list;
+    - call_tool looks the tool up in a dict, runs the validator and builds
+      the result without re-validating it, reusing TextContent objects for
+      results that repeat.
+
+Add tools with the @registry.tool() decorator; parameters may be annotated
+with int, float, str, bool, List[...], Dict[...] or Optional[...].
+"""
+
+import inspect
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from typing import get_args, get_origin
+
+from mcp import types
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
-from mcp.types import Tool, TextContent
+from mcp.types import TextContent, Tool
 
+ToolHandler = Callable[..., Awaitable[Any]]
+Validator = Callable[[Dict[str, Any]], Dict[str, Any]]
+TypeCheck = Callable[[Any], bool]
 
-async def serve() -> None:
+_JSON_TYPES = {
+    int: ("integer", (int,)),
+    float: ("number", (int, float)),
+    str: ("string", (str,)),
+    bool: ("boolean", (bool,)),
+    list: ("array", (list,)),
+    dict: ("object", (dict,)),
+}
+
+# Text results up to this length are shared between calls; longer ones are not cached
+CACHED_TEXT_LENGTH = 256
+
+
+def _compile_type(annotation: Any) -> Tuple[Dict[str, Any], TypeCheck]:
+    """JSON schema and a compiled type check for an annotation.
+
+    List and Dict item types are checked too, so a handler annotated with
+    List[int] never sees a list of strings.
+    """
+    if get_origin(annotation) is Union:
+        members = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(members) != 1:
+            raise TypeError(f"Unsupported union annotation {annotation}")
+        schema, check = _compile_type(members[0])
+        return schema, lambda value: value is None or check(value)
+
+    origin = get_origin(annotation) or annotation
+    if origin not in _JSON_TYPES:
+        raise TypeError(f"Unsupported parameter annotation {annotation}")
+    json_type, accepted = _JSON_TYPES[origin]
+    schema: Dict[str, Any] = {"type": json_type}
+
+    allow_bool = bool in accepted
+
+    def check(value: Any) -> bool:
+        # bool is a subclass of int, but JSON true is not a number
+        return isinstance(value, accepted) and (allow_bool or not isinstance(value, bool))
+
+    args = get_args(annotation)
+    if origin is list and args:
+        schema["items"], item_check = _compile_type(args[0])
+        return schema, lambda value: check(value) and all(map(item_check, value))
+    if origin is dict and args:
+        if args[0] is not str:
+            raise TypeError(f"Object keys are strings, not {args[0]}, in {annotation}")
+        schema["additionalProperties"], value_check = _compile_type(args[1])
+        return schema, lambda value: check(value) and all(map(value_check, value.values()))
+    return schema, check
+
+
+def _compile_validator(
+    name: str, parameters: List[Tuple[str, TypeCheck, bool, Any]]
+) -> Validator:
+    """Build a validator for one tool from (name, type check, required, default)."""
+    known = frozenset(parameter[0] for parameter in parameters)
+
+    def validate(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        unknown = arguments.keys() - known
+        if unknown:
+            raise ValueError(f"Unknown argument(s) for {name}: {', '.join(sorted(unknown))}")
+        values = {}
+        for key, check, required, default in parameters:
+            if key not in arguments:
+                if required:
+                    raise ValueError(f"Missing required argument '{key}' for {name}")
+                values[key] = default
+                continue
+            value = arguments[key]
+            if not check(value):
+                raise ValueError(f"Argument '{key}' for {name} has the wrong type")
+            values[key] = value
+        return values
+
+    return validate
+
+
+@lru_cache(maxsize=1024)
+def _shared_text_result(text: str) -> Tuple[TextContent, ...]:
+    return (TextContent.model_construct(type="text", text=text),)
+
+
+def text_result(text: str) -> Tuple[TextContent, ...]:
+    """Tool result content for a string.
+
+    Short texts are shared between calls with the same text; long ones are
+    built per call, so the cache never holds large results.
+    """
+    if len(text) <= CACHED_TEXT_LENGTH:
+        return _shared_text_result(text)
+    return (TextContent.model_construct(type="text", text=text),)
+
+
+class ToolRegistry:
+    """Tools, their schemas and validators, all built at registration time."""
+
+    def __init__(self):
+        self.tools: List[Tool] = []
+        self._handlers: Dict[str, Tuple[ToolHandler, Validator]] = {}
+
+    def tool(self, name: Optional[str] = None, description: Optional[str] = None):
+        """Register an async handler as a tool; its docstring is the default description."""
+
+        def decorator(func: ToolHandler) -> ToolHandler:
+            tool_name = name or func.__name__
+            if tool_name in self._handlers:
+                raise ValueError(f"Tool '{tool_name}' is already registered")
+
+            properties = {}
+            required = []
+            parameters = []
+            for parameter in inspect.signature(func).parameters.values():
+                schema, check = _compile_type(parameter.annotation)
+                is_required = parameter.default is inspect.Parameter.empty
+                if is_required:
+                    required.append(parameter.name)
+                else:
+                    schema["default"] = parameter.default
+                properties[parameter.name] = schema
+                parameters.append((parameter.name, check, is_required, parameter.default))
+
+            self.tools.append(
+                Tool(
+                    name=tool_name,
+                    description=inspect.cleandoc(description or func.__doc__ or ""),
+                    inputSchema={
+                        "type": "object",
+                        "properties": properties,
+                        "required": required,
+                    },
+                )
+            )
+            self._handlers[tool_name] = (func, _compile_validator(tool_name, parameters))
+            return func
+
+        return decorator
+
+    async def call(self, name: str, arguments: Dict[str, Any]) -> Sequence[Any]:
+        """Validate the arguments and run the tool, returning MCP content."""
+        try:
+            handler, validate = self._handlers[name]
+        except KeyError:
+            raise ValueError(f"Unknown tool: {name}")
+
+        result = await handler(**validate(arguments))
+        if isinstance(result, str):
+            return text_result(result)
+        if isinstance(result, (int, float)):
+            return text_result(str(result))
+        return result
+
+    def attach(self, server: Server) -> None:
+        """Install list_tools and call_tool handlers for this registry on `server`."""
+        tools_result = types.ServerResult(types.ListToolsResult(tools=self.tools))
+
+        async def list_tools(_: types.ListToolsRequest) -> types.ServerResult:
+            return tools_result
+
+        async def call_tool(request: types.CallToolRequest) -> types.ServerResult:
+            try:
+                content = await self.call(request.params.name, request.params.arguments or {})
+                result = types.CallToolResult.model_construct(content=list(content), isError=False)
+            except Exception as e:
+                result = types.CallToolResult.model_construct(
+                    content=list(text_result(str(e))), isError=True
+                )
+            return types.ServerResult.model_construct(root=result)
+
+        server.request_handlers[types.ListToolsRequest] = list_tools
+        server.request_handlers[types.CallToolRequest] = call_tool
+
+
+def create_server() -> Server:
     server = Server("mcp_server")
+    registry = ToolRegistry()
+
+    # Example tools; replace them with your own
+    @registry.tool()
+    async def sum_two_numbers(a: int, b: int) -> int:
+        """Add two integers and return the sum."""
+        return a + b
+
+    @registry.tool()
+    async def echo(text: str, repeat: int = 1) -> str:
+        """Return the text, repeated `repeat` times."""
+        return text * repeat
 
-    @server.list_tools()
-    async def list_tools() -> list[Tool]:
-        """List available time tools."""
-        return [
-            #
-        ]
+    registry.attach(server)
+    return server
 
-    @server.call_tool()
-    async def call_tool(name: str, arguments: dict) -> Sequence[TextContent]:
-        pass
+
+async def serve() -> None:
+    server = create_server()
 
     options = server.create_initialization_options()
     async with stdio_server() as (read_stream, write_stream):
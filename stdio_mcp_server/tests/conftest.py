@@ -0,0 +1,26 @@
+from contextlib import asynccontextmanager
+
+import anyio
+import pytest
+from mcp import ClientSession
+from mcp.shared.memory import create_client_server_memory_streams
+
+
+@pytest.fixture
+def connect():
+    """Connect a client session to a FastMCP server over in-memory streams."""
+
+    @asynccontextmanager
+    async def connect(server, session_class=ClientSession, **session_kwargs):
+        lowlevel = server._mcp_server
+        async with create_client_server_memory_streams() as (client_streams, server_streams):
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(
+                    lambda: lowlevel.run(*server_streams, lowlevel.create_initialization_options())
+                )
+                async with session_class(*client_streams, **session_kwargs) as session:
+                    await session.initialize()
+                    yield session
+                tg.cancel_scope.cancel()
+
+    return connect
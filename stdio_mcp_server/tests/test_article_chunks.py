@@ -0,0 +1,95 @@
+import pytest
+
+from article_chunks import (
+    ArticleChunkCache,
+    ChunkedArticle,
+    html_to_markdown,
+    settings_from_env,
+    split_markdown,
+)
+
+ARTICLE = """Intro paragraph about asyncio.
+
+# Setup
+
+Install the package.
+
+## Install
+
+```python
+# not a heading
+pip install thing
+```
+
+# Timeouts
+
+Use asyncio.timeout to bound a call.
+
+Cancel tasks that take too long.
+"""
+
+
+def test_chunks_follow_headings_and_keep_their_offsets():
+    chunks = split_markdown(ARTICLE)
+    assert [chunk["heading"] for chunk in chunks] == ["", "Setup", "Setup > Install", "Timeouts"]
+    for index, chunk in enumerate(chunks):
+        assert chunk["index"] == index
+        assert ARTICLE[chunk["start"] : chunk["end"]] == chunk["text"]
+    # A "#" line in a fenced code block is not a heading
+    assert "# not a heading" in chunks[2]["text"]
+    assert chunks[3]["text"].startswith("# Timeouts")
+
+
+def test_long_sections_are_split_at_blank_lines():
+    paragraphs = ["word " * 20 for _ in range(5)]
+    markdown = "# Long\n\n" + "\n\n".join(paragraphs)
+    chunks = split_markdown(markdown, max_chars=250)
+    assert len(chunks) > 1
+    assert {chunk["heading"] for chunk in chunks} == {"Long"}
+    for chunk in chunks:
+        assert markdown[chunk["start"] : chunk["end"]] == chunk["text"]
+        assert len(chunk["text"]) <= 250
+    # Chunks cover the section in order, without overlapping
+    assert all(a["end"] <= b["start"] for a, b in zip(chunks, chunks[1:]))
+
+    # A paragraph longer than max_chars stays whole
+    [chunk] = split_markdown("x" * 500, max_chars=100)
+    assert (chunk["start"], chunk["end"]) == (0, 500)
+
+
+def test_search_ranks_matching_chunks():
+    article = ChunkedArticle(ARTICLE)
+    [(best, score), *rest] = article.search("cancelling timeouts")
+    assert best["heading"] == "Timeouts" and score > 0
+    assert all(s <= score for _, s in rest)
+    assert article.search("kubernetes") == []
+    # No query (or only stopwords): every chunk, in reading order, without scores
+    assert [(c["index"], s) for c, s in article.search("the")] == [(i, None) for i in range(4)]
+
+
+def test_html_bodies_are_chunked_at_their_headings():
+    markdown = html_to_markdown("<p>Intro &amp; more</p><h2 id='a'>Part <em>one</em></h2><p>Body</p>")
+    chunks = split_markdown(markdown)
+    assert [chunk["heading"] for chunk in chunks] == ["", "Part one"]
+    assert chunks[0]["text"] == "Intro & more"
+
+
+def test_articles_are_parsed_once_per_version():
+    cache = ArticleChunkCache(max_entries=2)
+    first = cache.get({"id": 1, "body_markdown": ARTICLE})
+    assert cache.get({"id": 1, "body_markdown": ARTICLE}) is first
+    # A new version replaces the old one
+    edited = cache.get({"id": 1, "body_markdown": ARTICLE + "\nMore."})
+    assert edited is not first
+    cache.get({"id": 2, "body_html": "<p>Two</p>"})
+    cache.get({"id": 3, "body_markdown": "Three"})
+    assert cache.snapshot() == {"articles": 2, "parses": 4, "hits": 1, "hit_rate": 0.2}
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.setenv("MCP_DEVTO_CHUNK_CHARS", "800")
+    monkeypatch.delenv("MCP_DEVTO_CHUNK_ENTRIES", raising=False)
+    assert settings_from_env() == {"max_chars": 800, "max_entries": 64}
+    monkeypatch.setenv("MCP_DEVTO_CHUNK_ENTRIES", "many")
+    with pytest.raises(ValueError):
+        settings_from_env()
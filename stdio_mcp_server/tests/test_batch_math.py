@@ -0,0 +1,60 @@
+import pytest
+
+import batch_math
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Run a test with NumPy (when installed) and with the pure Python fallback."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(batch_math, "np", None)
+    return request.param
+
+
+@pytest.mark.parametrize(
+    "operation, expected", [("sum", 6.5), ("mean", 6.5 / 4), ("min", -1.0), ("max", 4.5)]
+)
+def test_reduce_values(backend, operation, expected):
+    assert batch_math.reduce_values([1, 2, -1, 4.5], operation) == pytest.approx(expected)
+
+
+def test_reduce_empty_list(backend):
+    assert batch_math.reduce_values([], "sum") == 0.0
+    with pytest.raises(ValueError, match="empty list"):
+        batch_math.reduce_values([], "mean")
+    with pytest.raises(ValueError, match="Unknown reduction"):
+        batch_math.reduce_values([1], "median")
+
+
+def test_dot(backend):
+    assert batch_math.dot([1, 2, 3], [4, 5, 6]) == 32.0
+    with pytest.raises(ValueError, match="same length"):
+        batch_math.dot([1, 2], [1])
+
+
+def test_elementwise_arrays_and_scalar_broadcast(backend):
+    assert batch_math.elementwise("subtract", [5, 7], [1, 2]) == [4.0, 5.0]
+    assert batch_math.elementwise("multiply", [1, 2, 3], 2) == [2.0, 4.0, 6.0]
+    assert batch_math.elementwise("divide", [1, 3], 2.0) == [0.5, 1.5]
+
+
+def test_elementwise_errors(backend):
+    with pytest.raises(ValueError, match="same length"):
+        batch_math.elementwise("add", [1, 2], [1])
+    with pytest.raises(ValueError, match="Division by zero at index 1"):
+        batch_math.elementwise("divide", [1, 2], [1, 0])
+    with pytest.raises(ValueError, match="Unknown operation 'power'"):
+        batch_math.elementwise("power", [1], [1])
+
+
+def test_calculate_batch_keeps_input_order(backend):
+    operations = [("add", 1, 2), ("multiply", 3, 4), ("add", 10, 5), ("divide", 1, 4)]
+    assert batch_math.calculate_batch(operations) == [3.0, 12.0, 15.0, 0.25]
+    assert batch_math.calculate_batch([]) == []
+
+
+def test_calculate_batch_reports_the_failing_operation(backend):
+    with pytest.raises(ValueError, match="Division by zero in operation 2"):
+        batch_math.calculate_batch([("add", 1, 1), ("divide", 1, 1), ("divide", 1, 0)])
@@ -0,0 +1,50 @@
+import math
+
+import pytest
+
+from bm25 import BM25Index, tokenize
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("How do I cancel asyncio tasks?", ["cancel", "asyncio", "task"]),
+        ("class process", ["class", "process"]),
+        ("x 2 width42", ["width42"]),
+        ("getArticleById", ["getarticlebyid"]),
+        ("", []),
+        (None, []),
+    ],
+)
+def test_tokenize(text, expected):
+    assert tokenize(text) == expected
+
+
+def test_tokenize_options():
+    assert tokenize("getArticleById", split_camel_case=True) == ["get", "article", "id"]
+    assert tokenize("show the tags", stopwords={"show"}) == ["the", "tag"]
+
+
+def test_bm25_prefers_rare_terms_and_short_documents():
+    index = BM25Index([["image", "url"], ["image", "url", "url", "blur", "seed", "size"], ["tag"]])
+    scores = index.scores(["image"])
+    assert scores[0] > scores[1] > 0 and scores[2] == 0
+    # "tag" appears in one document, so it outweighs "image", which is in two
+    assert index.idf["tag"] > index.idf["image"]
+    # Repeated query terms count once
+    assert index.scores(["tag", "tag"]) == index.scores(["tag"])
+
+
+def test_bm25_scores():
+    # One document: idf = ln(1 + 0.5 / 1.5); its length is the average, so
+    # a term seen once scores idf * (k1 + 1) / (1 + k1)
+    index = BM25Index([["asyncio", "timeout"]])
+    assert index.scores(["asyncio"]) == [pytest.approx(math.log(4 / 3))]
+    assert index.scores(["asyncio", "timeout"]) == [pytest.approx(2 * math.log(4 / 3))]
+    assert index.scores(["unknown"]) == [0.0]
+
+
+def test_bm25_edge_cases():
+    assert BM25Index([]).scores(["x"]) == []
+    assert BM25Index([[], ["x"]]).scores(["x"])[0] == 0.0
+    assert BM25Index([["x"]]).scores([]) == [0.0]
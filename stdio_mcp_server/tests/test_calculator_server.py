@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+import pytest
+
+import calculator_mcp_server
+
+TOOLS = [
+    "sum_two_numbers",
+    "subtract_two_numbers",
+    "multiply_two_numbers",
+    "reduce_numbers",
+    "dot_product",
+    "elementwise_operation",
+    "batch_calculate",
+    "evaluate_expression",
+]
+
+CALLS = [
+    ("sum_two_numbers", {"a": "1/3", "b": "1/6", "mode": "fraction"}, "The sum of 1/3 and 1/6 is 1/2"),
+    ("multiply_two_numbers", {"a": 2**70, "b": 2}, f"is {2**71} "),
+    ("batch_calculate", {"operations": [["add", 1, 2], ["multiply", 3, 4]]}, '"results":[3.0,12.0]'),
+    ("evaluate_expression", {"expression": "x * 2 + 1", "bindings": [{"x": 1}, {"x": 2}]}, '"results":[3.0,5.0]'),
+    ("reduce_numbers", {"values": [1, 2, 3], "operation": "mean"}, '"result":2'),
+]
+
+
+def call_all(connect, server):
+    async def run():
+        async with connect(server) as session:
+            listed = [tool.name for tool in (await session.list_tools()).tools]
+            results = [await session.call_tool(name, arguments) for name, arguments, _ in CALLS]
+            return listed, results
+
+    return asyncio.run(run())
+
+
+def check(listed, results):
+    assert [name for name in listed if name in TOOLS] == TOOLS
+    for (name, _, expected), result in zip(CALLS, results):
+        assert not result.isError, (name, result.content)
+        assert expected in result.content[0].text
+
+
+def test_tools_run_inline_by_default(connect, monkeypatch):
+    monkeypatch.delenv("MCP_TOOL_EXECUTION", raising=False)
+    server = asyncio.run(calculator_mcp_server.serve())
+    check(*call_all(connect, server))
+    assert not server._tool_manager.get_tool("evaluate_expression").is_async
+
+
+@pytest.mark.parametrize("policy", ["thread", "process"])
+def test_tools_run_in_a_pool(connect, monkeypatch, policy):
+    # Every calculator tool can be moved, to a process pool too
+    monkeypatch.setenv("MCP_TOOL_EXECUTION", ",".join(f"{name}={policy}" for name in TOOLS))
+    monkeypatch.setenv("MCP_TOOL_PROCESSES", "1")
+    server = asyncio.run(calculator_mcp_server.serve())
+    check(*call_all(connect, server))
+    assert all(server._tool_manager.get_tool(name).is_async for name in TOOLS)
+
+    stats = asyncio.run(server.call_tool("server_stats", {}))
+    assert json.loads(stats[0].text)["tools"]["evaluate_expression"]["calls"] == 1
+
+
+def test_expression_errors_are_tool_errors(connect, monkeypatch):
+    monkeypatch.setenv("MCP_TOOL_EXECUTION", "evaluate_expression=process")
+    monkeypatch.setenv("MCP_TOOL_PROCESSES", "1")
+    server = asyncio.run(calculator_mcp_server.serve())
+
+    async def run():
+        async with connect(server) as session:
+            return await session.call_tool("evaluate_expression", {"expression": "__import__('os')"})
+
+    result = asyncio.run(run())
+    assert result.isError
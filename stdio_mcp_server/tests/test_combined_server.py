@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+from mcp import types
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.exceptions import McpError
+
+from combined_mcp_server import mount
+
+
+def math_server() -> FastMCP:
+    server = FastMCP("math")
+
+    @server.tool(description="Add two numbers.")
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    @server.tool()
+    def server_stats() -> str:
+        return "math stats"
+
+    @server.resource("math://constants/pi")
+    def pi() -> str:
+        return "3.14159"
+
+    return server
+
+
+def notes_server() -> FastMCP:
+    server = FastMCP("notes")
+
+    @server.tool()
+    def server_stats() -> str:
+        return "notes stats"
+
+    @server.resource("note://{name}")
+    def note(name: str) -> str:
+        return f"note {name}"
+
+    # Resources served by a handler of its own, as the image cache is
+    read_resource = server._mcp_server.request_handlers[types.ReadResourceRequest]
+
+    async def read_blob(request: types.ReadResourceRequest):
+        uri = str(request.params.uri)
+        if not uri.startswith("blob://store/"):
+            return await read_resource(request)
+        if uri.endswith("/bad"):
+            raise ValueError(f"Invalid range in {uri}")
+        contents = types.TextResourceContents(uri=uri, mimeType="text/plain", text="blob")
+        return types.ServerResult(types.ReadResourceResult(contents=[contents]))
+
+    server._mcp_server.request_handlers[types.ReadResourceRequest] = read_blob
+    return server
+
+
+def combined_server(namespace_mode="auto"):
+    combined = FastMCP("combined")
+    # notes first: with trial and error, math's "unknown resource" would hide its errors
+    servers = {"notes": notes_server(), "math": math_server()}
+    tools = asyncio.run(mount(combined, servers, namespace_mode, {"notes": ["blob://store/"]}))
+    return combined, tools
+
+
+def test_tool_names_are_namespaced_on_conflict():
+    _, tools = combined_server()
+    assert [tool.name for tool in tools] == ["notes_server_stats", "add", "math_server_stats"]
+    assert tools[1].description == "Add two numbers."
+
+    _, tools = combined_server("always")
+    assert [tool.name for tool in tools] == ["notes_server_stats", "math_add", "math_server_stats"]
+
+    with pytest.raises(ValueError, match="Unknown namespace mode"):
+        combined_server("never")
+
+
+def test_calls_are_routed_to_the_owning_server():
+    combined, _ = combined_server()
+
+    async def run():
+        add = await combined.call_tool("add", {"a": 1, "b": 2})
+        qualified = await combined.call_tool("math_add", {"a": 3, "b": 4})
+        stats = await combined.call_tool("notes_server_stats", {})
+        with pytest.raises(ValueError, match="Unknown tool: server_stats"):
+            await combined.call_tool("server_stats", {})
+        return add, qualified, stats
+
+    add, qualified, stats = asyncio.run(run())
+    assert (add[0].text, qualified[0].text, stats[0].text) == ("3", "7", "notes stats")
+
+
+def test_resources_are_read_from_the_owning_server(connect):
+    combined, _ = combined_server()
+
+    async def run():
+        async with connect(combined) as session:
+            listed = await session.list_resources()
+            pi = await session.read_resource("math://constants/pi")
+            note = await session.read_resource("note://todo")
+            blob = await session.read_resource("blob://store/1")
+            # The owner's own error is reported, not "unknown resource" from another server
+            with pytest.raises(McpError, match="Invalid range in blob://store/bad"):
+                await session.read_resource("blob://store/bad")
+            with pytest.raises(McpError, match="Unknown resource: other://x"):
+                await session.read_resource("other://x")
+            return listed, pi, note, blob
+
+    listed, pi, note, blob = asyncio.run(run())
+    assert [str(resource.uri) for resource in listed.resources] == ["math://constants/pi"]
+    assert pi.contents[0].text == "3.14159"
+    assert note.contents[0].text == "note todo"
+    assert blob.contents[0].text == "blob"
@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import dev_blog_mcp_server
+import upstream
+from mock_devto_server import create_app
+
+
+@pytest.fixture
+def devto(monkeypatch):
+    """The mock dev.to API, answering the dev_blog server's requests in-process."""
+    app = create_app(latency_ms=0, tail_rate=0)
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        upstream.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.ASGITransport(app=app), **kwargs),
+    )
+    monkeypatch.setenv("MCP_DEVTO_BREAKER_OPEN_SECONDS", "60")
+    for name in ("MCP_DEVTO_HEDGING", "MCP_DEVTO_PREFETCH_K"):
+        monkeypatch.delenv(name, raising=False)
+    return app
+
+
+def call(connect, server, calls):
+    async def run():
+        async with connect(server) as session:
+            return [await session.call_tool(name, arguments) for name, arguments in calls]
+
+    return asyncio.run(run())
+
+
+def decoded(result):
+    return [json.loads(item.text) for item in result.content]
+
+
+def test_stale_results_keep_their_shape(connect, devto):
+    server = asyncio.run(dev_blog_mcp_server.serve("token", "http://devto.test/api"))
+    search = ("search_articles", {"query": "asyncio", "per_page": 3})
+    tags = ("get_tags", {"per_page": 2})
+    article = ("get_article", {"article_id": "7"})
+    chunks = ("get_article_chunks", {"article_id": "7", "query": "timeouts", "top_k": 1})
+
+    fresh = call(connect, server, [search, tags, article, chunks])
+    assert [len(result.content) for result in fresh] == [3, 2, 1, 1]
+
+    # dev.to fails until the circuits open; then the cached copies are served
+    devto.state.outage = "error"
+    call(connect, server, [search, tags, article] * 10)
+    stale = call(connect, server, [search, tags, article, chunks])
+
+    for before, after in zip(fresh, stale):
+        assert not after.isError
+        *items, warning = decoded(after)
+        assert items == decoded(before)
+        assert warning["warning"].startswith("dev.to is unavailable; showing data cached")
+
+    stats = json.loads(call(connect, server, [("server_stats", {})])[0].content[0].text)
+    assert stats["upstream"]["circuits"]["GET /articles"]["state"] == "open"
+
+
+def test_open_circuit_without_a_cached_copy_fails_fast(connect, devto):
+    server = asyncio.run(dev_blog_mcp_server.serve("token", "http://devto.test/api"))
+    devto.state.outage = "error"
+    call(connect, server, [("get_tags", {"per_page": 2})] * 10)
+    requests = devto.state.requests
+
+    [result] = call(connect, server, [("get_tags", {"per_page": 2})])
+    [error] = decoded(result)
+    assert error["error"].startswith("Failed to fetch tags: GET /tags is failing")
+    assert devto.state.requests == requests
+
+
+def test_prefetched_articles_say_how_old_they_are(connect, devto, monkeypatch):
+    monkeypatch.setenv("MCP_DEVTO_PREFETCH_K", "2")
+    server = asyncio.run(dev_blog_mcp_server.serve("token", "http://devto.test/api"))
+    tools = {tool.name: tool for tool in asyncio.run(server.list_tools())}
+    assert "may be up to 30s old" in tools["get_article"].description
+    assert "may be up to 30s old" in tools["get_article_chunks"].description
+
+    async def run():
+        async with connect(server) as session:
+            search = await session.call_tool("search_articles", {"query": "asyncio", "per_page": 2})
+            first_id = json.loads(search.content[0].text)["id"]
+            await asyncio.sleep(0.2)
+            return await session.call_tool("get_article", {"article_id": str(first_id)})
+
+    article, warning = decoded(asyncio.run(run()))
+    assert "body_markdown" in article
+    assert warning["warning"].endswith("s ago; dev.to may have a newer version")
+
+
+def test_without_prefetch_the_descriptions_do_not_mention_it(devto):
+    server = asyncio.run(dev_blog_mcp_server.serve("token", "http://devto.test/api"))
+    tools = {tool.name: tool for tool in asyncio.run(server.list_tools())}
+    assert "prefetched" not in tools["get_article"].description
@@ -0,0 +1,127 @@
+import math
+import time
+
+import pytest
+
+from expressions import MAX_OUTPUT_CHARS, MAX_RESULT_DIGITS, compile_expression
+
+
+def evaluate(source, **bindings):
+    return compile_expression(source).evaluate(bindings)
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("15 * 8 + 20", 140),
+        ("(1 + 2) ** 3 // 4 % 5", 1),
+        ("-2 ** 2", -4),
+        ("7 / 2", 3.5),
+        ("max(1, sqrt(16), abs(-3))", 4.0),
+        ("floor(pi) + ceil(e)", 6),
+        ("round(log10(1000))", 3),
+    ],
+)
+def test_arithmetic(source, expected):
+    assert evaluate(source) == expected
+
+
+def test_variables_and_bindings():
+    compiled = compile_expression("a * x + b")
+    assert compiled.variables == frozenset({"a", "x", "b"})
+    assert compiled.evaluate({"a": 2, "x": 3, "b": 1}) == 7
+    assert compiled.evaluate_many([{"x": 0}, {"x": 1}, {"x": 2}], {"a": 10, "b": 1}) == [1, 11, 21]
+    with pytest.raises(ValueError, match="Missing value for variable\\(s\\): b, x"):
+        compiled.evaluate({"a": 1})
+
+
+def test_compiled_expressions_are_cached():
+    assert compile_expression("x + 1") is compile_expression("x + 1")
+
+
+@pytest.mark.parametrize(
+    "source, message",
+    [
+        ("__import__('os').system('true')", "Unsupported function call"),
+        ("(1).__class__", "Unsupported syntax: Attribute"),
+        ("[1, 2]", "Unsupported syntax: List"),
+        ("'a' * 3", "Unsupported constant"),
+        ("True + 1", "Unsupported constant"),
+        ("1 << 2", "Unsupported operator: LShift"),
+        ("x if x else 1", "Unsupported syntax: IfExp"),
+        ("lambda: 1", "Unsupported syntax: Lambda"),
+        ("sqrt", "Function 'sqrt' must be called"),
+        ("round(2.5, ndigits=1)", "Keyword arguments"),
+        ("1 +", "Invalid expression"),
+        ("1 + " * 500 + "1", "longer than"),
+    ],
+)
+def test_rejects_anything_but_arithmetic(source, message):
+    with pytest.raises(ValueError, match=message):
+        compile_expression(source)
+
+
+@pytest.mark.parametrize(
+    "source, message",
+    [
+        ("1 / 0", "Division by zero"),
+        ("exp(1000)", "Numeric overflow"),
+        ("10.0 ** 400", "Numeric overflow"),
+    ],
+)
+def test_evaluation_errors(source, message):
+    with pytest.raises(ValueError, match=message):
+        evaluate(source)
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "9 ** 9 ** 9",
+        "(10 ** 4000) ** 4000",
+        "10 ** 10000",
+        "10 ** 3000 * 10 ** 3000",
+        "10 ** 4000 * 10 ** 4000 * 10 ** 4000",
+        "5 * 10 ** 4299 + 5 * 10 ** 4299",
+        "x ** 5000",
+        "floor(1e300) ** 20",
+    ],
+)
+def test_integer_results_are_bounded(source):
+    started = time.perf_counter()
+    with pytest.raises(ValueError, match="Result is too large"):
+        evaluate(source, x=10)
+    assert time.perf_counter() - started < 0.5
+
+
+def test_limits_allow_large_but_printable_integers():
+    assert evaluate("10 ** 4000") == 10**4000
+    assert evaluate("2 ** 14000").bit_length() == 14001
+    assert len(str(evaluate(f"10 ** {MAX_RESULT_DIGITS - 1}"))) == MAX_RESULT_DIGITS
+    # Small bases, negative and fractional exponents are cheap
+    assert evaluate("1 ** 100000000") == 1
+    assert evaluate("(-1) ** 100000001") == -1
+    assert evaluate("2 ** -2000") == 0.0
+    assert math.isclose(evaluate("1.0000001 ** 100000000"), math.exp(10), rel_tol=1e-4)
+
+
+def test_total_output_of_bindings_is_bounded():
+    compiled = compile_expression("10 ** x")
+    compiled.evaluate_many([{"x": 4000}] * 20)
+    with pytest.raises(ValueError, match=f"more than {MAX_OUTPUT_CHARS} characters"):
+        compiled.evaluate_many([{"x": 4000}] * 30)
+
+
+@pytest.mark.parametrize("ndigits", ["-10 ** 8", "10 ** 8", f"-{MAX_RESULT_DIGITS + 1}"])
+def test_round_digits_are_bounded(ndigits):
+    started = time.perf_counter()
+    with pytest.raises(ValueError, match=f"at most {MAX_RESULT_DIGITS} digits"):
+        evaluate(f"round(7, {ndigits})")
+    assert time.perf_counter() - started < 0.5
+
+
+def test_round():
+    assert evaluate("round(2.675, 2)") == 2.67
+    assert evaluate("round(1234, -2)") == 1200
+    assert evaluate(f"round(7, -{MAX_RESULT_DIGITS})") == 0
+    assert evaluate("round(2.5)") == 2
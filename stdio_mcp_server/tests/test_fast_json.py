@@ -0,0 +1,96 @@
+import asyncio
+import json
+
+import pytest
+from mcp.server.fastmcp import FastMCP, Image
+from mcp.server.fastmcp.server import _convert_to_content
+from mcp.types import ImageContent, TextContent
+
+import fast_json
+from fast_json import dumps, loads, to_content, use_fast_json
+
+ARTICLES = [{"id": i, "title": f"Article {i}", "tags": ["python"]} for i in range(3)]
+
+
+@pytest.fixture(params=["orjson", "pydantic_core"])
+def encoder(request, monkeypatch):
+    """Run a test with orjson, if installed, and with the pydantic_core fallback."""
+    if request.param == "orjson":
+        if fast_json.orjson is None:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(fast_json, "orjson", None)
+    return request.param
+
+
+def parsed(content):
+    """Decoded JSON items; strings are returned as text, not JSON."""
+    items = []
+    for item in content:
+        try:
+            items.append(json.loads(item.text))
+        except ValueError:
+            items.append(item.text)
+    return items
+
+
+@pytest.mark.parametrize(
+    "result",
+    [
+        ARTICLES,
+        (1, 2.5, "three"),
+        [[1, 2], [3]],
+        {"error": "Not found", "status": 404},
+        [],
+        "plain text",
+        7,
+    ],
+)
+def test_same_items_as_fastmcp(encoder, result):
+    content = to_content(result)
+    expected = _convert_to_content(result)
+    assert len(content) == len(expected)
+    assert all(isinstance(item, TextContent) for item in content)
+    assert parsed(content) == parsed(expected)
+    # Compact rather than indented
+    assert all("\n" not in item.text for item in content)
+
+
+def test_content_objects_pass_through():
+    text = TextContent(type="text", text="hi")
+    image = Image(data=b"\x89PNG", format="png")
+    assert to_content(None) == []
+    assert to_content(text) == [text]
+    [first, second, third] = to_content([text, image, {"a": 1}])
+    assert first is text
+    assert isinstance(second, ImageContent) and second.mimeType == "image/png"
+    assert third.text == '{"a":1}'
+
+
+def test_dumps_edge_cases(encoder):
+    assert dumps({1: "one"}) == '{"1":"one"}'
+    # Wider than 64 bits: orjson refuses, pydantic_core does not
+    assert loads(dumps([2**70])) == [2**70]
+    assert dumps({"content": TextContent(type="text", text="x")}) == (
+        '{"content":{"type":"text","text":"x","annotations":null}}'
+    )
+    assert dumps(object).startswith('"<class')
+    assert loads(b'{"a": [1, 2]}') == loads('{"a": [1, 2]}') == {"a": [1, 2]}
+
+
+def test_server_returns_one_item_per_list_element(connect):
+    server = FastMCP("articles")
+
+    @server.tool()
+    def search_articles(per_page: int = 3) -> list:
+        return ARTICLES[:per_page]
+
+    use_fast_json(server)
+
+    async def run():
+        async with connect(server) as session:
+            return await session.call_tool("search_articles", {"per_page": 3})
+
+    result = asyncio.run(run())
+    assert not result.isError
+    assert parsed(result.content) == ARTICLES
@@ -0,0 +1,127 @@
+import asyncio
+import os
+import struct
+import zlib
+
+import pytest
+
+import image_render
+from image_render import ImageCache, cache_key, encode_png, render_params, render_pixels
+
+np = pytest.importorskip("numpy")
+
+
+def decode_png(data):
+    """Minimal decoder for the PNGs encode_png writes (8-bit, filter type 0)."""
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    position, chunks = 8, {}
+    while position < len(data):
+        (length,) = struct.unpack(">I", data[position : position + 4])
+        tag = data[position + 4 : position + 8]
+        body = data[position + 8 : position + 8 + length]
+        (crc,) = struct.unpack(">I", data[position + 8 + length : position + 12 + length])
+        assert crc == zlib.crc32(tag + body)
+        chunks[tag] = body
+        position += 12 + length
+
+    width, height, depth, color_type = struct.unpack(">IIBB", chunks[b"IHDR"][:10])
+    assert depth == 8 and b"IEND" in chunks
+    channels = 1 if color_type == 0 else 3
+    rows = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8)
+    rows = rows.reshape(height, width * channels + 1)
+    assert not rows[:, 0].any()
+    pixels = rows[:, 1:].reshape(height, width, channels)
+    return pixels[:, :, 0] if channels == 1 else pixels
+
+
+@pytest.mark.parametrize("shape", [(3, 5, 3), (4, 2), (1, 1, 3)])
+def test_encode_png_round_trip(shape):
+    pixels = np.random.default_rng(0).integers(0, 256, shape, dtype=np.uint8)
+    assert np.array_equal(decode_png(encode_png(pixels)), pixels)
+
+
+def test_render_is_deterministic_per_seed():
+    params = render_params(16, 8, "noise", {"seed": "3"})
+    assert render_pixels(params).shape == (8, 16, 3)
+    assert np.array_equal(render_pixels(params), render_pixels(params))
+    other = render_params(16, 8, "noise", {"seed": "4"})
+    assert not np.array_equal(render_pixels(params), render_pixels(other))
+
+    gray = render_params(16, 8, "gradient", {"grayscale": "1", "blur": "2"})
+    assert render_pixels(gray).shape == (8, 16)
+    solid = render_pixels(render_params(4, 4, "solid"))
+    assert (solid == solid[0, 0]).all()
+
+
+@pytest.mark.parametrize(
+    "args, message",
+    [
+        ((0, 10), "between 1 and"),
+        ((5001, 10), "between 1 and"),
+        ((5000, 5000), "limited to"),
+        ((10, 10, "stripes"), "Unknown pattern 'stripes'"),
+        ((10, 10, "noise", {"blur": "11"}), "Blur must be between"),
+        ((10, 10, "noise", {"seed": "x"}), "Invalid image option"),
+    ],
+)
+def test_invalid_render_params(args, message):
+    with pytest.raises(ValueError, match=message):
+        render_params(*args)
+
+
+def test_cache_key_depends_on_parameters_only():
+    params = render_params(10, 20, options={"seed": 1, "quality": "90"})
+    assert cache_key(params) == cache_key(render_params(10, 20, options={"seed": "1"}))
+    assert cache_key(params) != cache_key(render_params(10, 21, options={"seed": 1}))
+
+
+def test_repeat_and_concurrent_requests_render_once(tmp_path):
+    cache = ImageCache(tmp_path)
+    params = render_params(32, 32, "noise")
+
+    async def run():
+        results = await asyncio.gather(*[cache.get_or_render(params) for _ in range(5)])
+        return results, await cache.get_or_render(params)
+
+    results, repeat = asyncio.run(run())
+    assert cache.renders == 1
+    assert [cached for _, _, cached in results].count(False) == 1
+    key, path, cached = repeat
+    assert cached and key == cache_key(params)
+    assert np.array_equal(decode_png(path.read_bytes()), render_pixels(params))
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    def render(cache, seed):
+        return asyncio.run(cache.get_or_render(render_params(64, 64, "noise", {"seed": seed})))
+
+    probe = ImageCache(tmp_path / "probe")
+    _, path, _ = render(probe, 0)
+    entry_size = path.stat().st_size + probe.metadata_path_for(path.stem).stat().st_size
+
+    cache = ImageCache(tmp_path / "cache", max_bytes=int(entry_size * 3.5))
+    first, _, _ = render(cache, 1)
+    second, _, _ = render(cache, 2)
+    render(cache, 3)
+    # Age the first two images; the hit on the first one makes it recently used again
+    for key in (first, second):
+        os.utime(cache.path_for(key), (0, 0))
+    assert render(cache, 1)[2]
+    render(cache, 4)
+
+    assert cache.evictions == 1
+    assert not cache.path_for(second).exists()
+    assert not cache.metadata_path_for(second).exists()
+    assert cache.path_for(first).exists()
+    assert len(list(cache.directory.glob("*.png"))) == 3
+    assert cache._size == sum(p.stat().st_size for p in cache.directory.iterdir())
+
+
+def test_cache_limit_from_environment(monkeypatch, tmp_path):
+    monkeypatch.setenv("MCP_IMAGE_CACHE_MAX_BYTES", "1000")
+    assert ImageCache(tmp_path).max_bytes == 1000
+    monkeypatch.setenv("MCP_IMAGE_CACHE_MAX_BYTES", "lots")
+    with pytest.raises(ValueError, match="must be an integer"):
+        ImageCache(tmp_path)
+    monkeypatch.delenv("MCP_IMAGE_CACHE_MAX_BYTES")
+    assert ImageCache(tmp_path).max_bytes == image_render.DEFAULT_CACHE_MAX_BYTES
@@ -0,0 +1,120 @@
+import asyncio
+import base64
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.exceptions import McpError
+
+import image_resources
+from image_render import ImageCache
+from image_resources import encode_file_base64, register_image_resources, resource_uri
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """A cache holding one fake 1000-byte "image" under the key abc123."""
+    cache = ImageCache(tmp_path)
+    cache.path_for("abc123").write_bytes(bytes(range(256)) * 3 + b"\xff" * 232)
+    cache.metadata_path_for("abc123").write_text(
+        '{"width": 4, "height": 2, "pattern": "noise", "seed": 1, "grayscale": false, "blur": 0}'
+    )
+    return cache
+
+
+@pytest.mark.parametrize(
+    "offset, length, expected",
+    [(0, None, (0, 1000)), (10, 5, (10, 5)), (990, 50, (990, 10)), (2000, None, (1000, 0))],
+)
+def test_encode_file_base64_clips_ranges(cache, offset, length, expected):
+    path = cache.path_for("abc123")
+    blob, start, size, total = encode_file_base64(path, offset, length)
+    assert (start, size, total) == (*expected, 1000)
+    assert base64.b64decode(blob) == path.read_bytes()[start : start + size]
+
+
+def test_reads_are_limited_to_max_length(cache):
+    path = cache.path_for("abc123")
+    pieces, offset = [], 0
+    while True:
+        blob, offset, length, total = encode_file_base64(path, offset, max_length=300)
+        if not length:
+            break
+        assert length <= 300
+        pieces.append(base64.b64decode(blob))
+        offset += length
+    assert b"".join(pieces) == path.read_bytes()
+
+
+def image_server(cache):
+    server = FastMCP("images")
+
+    @server.resource("note://readme")
+    def readme() -> str:
+        return "hello"
+
+    register_image_resources(server, cache)
+    return server
+
+
+def test_list_and_read_image_resources(connect, cache, monkeypatch):
+    monkeypatch.setattr(image_resources, "MAX_READ_BYTES", 400)
+
+    async def run():
+        async with connect(image_server(cache)) as session:
+            listed = await session.list_resources()
+            ranged = await session.read_resource(f"{resource_uri('abc123')}?offset=100&length=50")
+            first = await session.read_resource(f"{resource_uri('abc123')}?offset=0")
+            note = await session.read_resource("note://readme")
+            return listed, ranged, first, note
+
+    listed, ranged, first, note = asyncio.run(run())
+    assert {str(resource.uri) for resource in listed.resources} == {
+        "note://readme",
+        "image://cache/abc123.png",
+    }
+    [image] = [r for r in listed.resources if r.name == "abc123.png"]
+    assert (image.size, image.mimeType) == (1000, "image/png")
+    assert image.description.startswith("4x2 noise image")
+
+    [contents] = ranged.contents
+    assert base64.b64decode(contents.blob) == cache.path_for("abc123").read_bytes()[100:150]
+    assert contents.model_extra["_meta"] == {"range": {"offset": 100, "length": 50, "total": 1000}}
+    # Without a length, a ranged read stops at MAX_READ_BYTES
+    assert first.contents[0].model_extra["_meta"]["range"] == {
+        "offset": 0,
+        "length": 400,
+        "total": 1000,
+    }
+    assert note.contents[0].text == "hello"
+
+
+@pytest.mark.parametrize(
+    "uri, message",
+    [
+        ("image://cache/missing.png", "not found"),
+        ("image://cache/abc123.png?offset=-1", "Invalid range"),
+        ("image://cache/abc123.png?length=x", "Invalid range"),
+        ("image://cache/a.b.png", "Unknown image resource"),
+    ],
+)
+def test_invalid_image_uris(connect, cache, uri, message):
+    async def run():
+        async with connect(image_server(cache)) as session:
+            with pytest.raises(McpError, match=message):
+                await session.read_resource(uri)
+
+    asyncio.run(run())
+
+
+def test_reads_without_a_range_are_whole_images_or_fail(connect, cache, monkeypatch):
+    async def run():
+        async with connect(image_server(cache)) as session:
+            whole = await session.read_resource(resource_uri("abc123"))
+            monkeypatch.setattr(image_resources, "MAX_READ_BYTES", 999)
+            with pytest.raises(McpError, match=r"Image is 1000 bytes, more than 999 .*\?offset="):
+                await session.read_resource(resource_uri("abc123"))
+            return whole
+
+    [contents] = asyncio.run(run()).contents
+    assert base64.b64decode(contents.blob) == cache.path_for("abc123").read_bytes()
+    assert contents.model_extra["_meta"]["range"] == {"offset": 0, "length": 1000, "total": 1000}
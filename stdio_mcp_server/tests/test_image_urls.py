@@ -0,0 +1,113 @@
+import asyncio
+import json
+
+import pytest
+from mcp.server.fastmcp.exceptions import ToolError
+
+import image_urls
+from image_urls import (
+    MAX_URLS,
+    compact_urls,
+    expand_urls,
+    image_url,
+    image_urls_from_grid,
+    image_urls_from_specs,
+    seed_range,
+)
+
+
+def test_image_url_encodes_options():
+    assert image_url(200, 300) == "https://picsum.photos/200/300"
+    assert image_url(200, 300, {"grayscale": "1", "blur": 2}) == (
+        "https://picsum.photos/200/300?grayscale=1&blur=2"
+    )
+
+
+def test_grid_puts_the_seed_last():
+    urls = image_urls_from_grid([100, 200], [50], range(7, 9), {"seed": "0", "blur": "1"})
+    assert urls == [
+        "https://picsum.photos/100/50?blur=1&seed=7",
+        "https://picsum.photos/100/50?blur=1&seed=8",
+        "https://picsum.photos/200/50?blur=1&seed=7",
+        "https://picsum.photos/200/50?blur=1&seed=8",
+    ]
+    assert image_urls_from_grid([10], [20, 30]) == [
+        "https://picsum.photos/10/20",
+        "https://picsum.photos/10/30",
+    ]
+
+
+def test_limits_and_invalid_specs():
+    with pytest.raises(ValueError, match=f"maximum per call is {MAX_URLS}"):
+        image_urls_from_grid(range(101), range(100))
+    with pytest.raises(ValueError, match="Spec 1 needs integer 'width' and 'height'"):
+        image_urls_from_specs([{"width": 1, "height": 2}, {"width": "wide", "height": 2}])
+
+
+def test_seed_range():
+    assert seed_range(None, None) is None
+    assert seed_range(5, None) == range(5, 6)
+    assert seed_range(5, 3) == range(5, 8)
+    with pytest.raises(ValueError, match="seed_count needs seed_start"):
+        seed_range(None, 10)
+    with pytest.raises(ValueError, match="at least 1"):
+        seed_range(1, 0)
+
+
+def test_compact_grid_is_one_template_with_only_the_varying_numbers():
+    urls = image_urls_from_grid([100, 250, 1000], [80, 600], range(1, 101), {"grayscale": "1"})
+    compact = compact_urls(urls)
+
+    [group] = compact["groups"]
+    assert group["template"] == "https://picsum.photos/{0}/{1}?grayscale=1&seed={2}"
+    assert group["values"][:2] == [[100, 80, 1], [100, 80, 2]]
+    assert compact["count"] == len(urls) == 600
+    assert expand_urls(compact) == urls
+    # The repeated query string is not sent per item
+    assert len(json.dumps(compact)) < len(json.dumps(urls)) / 3
+
+
+def test_compact_writes_constant_numbers_into_the_template():
+    urls = image_urls_from_grid([640], [480], range(1, 4), {"blur": "2"})
+    compact = compact_urls(urls)
+    assert compact["groups"] == [
+        {
+            "template": "https://picsum.photos/640/480?blur=2&seed={0}",
+            "values": [[1], [2], [3]],
+        }
+    ]
+
+
+@pytest.mark.parametrize(
+    "urls",
+    [
+        [],
+        ["https://picsum.photos/200/300"],
+        [image_url(10, 20, {"grayscale": "1"}), image_url(10, 20), image_url(30, 40)],
+        [image_url(1, 2, {"seed": "007"}), image_url(1, 2, {"seed": "008"})],
+        [image_url(1, 2, {"seed": "9" * 40}), image_url(1, 2, {"seed": "-3"})],
+        [image_url(1, 2, {"tag": "{0}}"}), image_url(3, 4, {"tag": "{0}}"})],
+    ],
+)
+def test_compact_round_trip(urls):
+    compact = compact_urls(urls)
+    assert compact["count"] == len(urls)
+    assert expand_urls(compact) == urls
+
+
+def test_generate_image_urls_tool(monkeypatch, tmp_path):
+    monkeypatch.setenv("MCP_IMAGE_CACHE_DIR", str(tmp_path))
+    from image_generator_mcp_server import serve
+
+    async def run():
+        server = await serve()
+        grid = {"widths": [200, 300], "heights": [100], "seed_start": 1, "seed_count": 2}
+        compact = await server.call_tool("generate_image_urls", grid)
+        with pytest.raises(ToolError, match="seed_count needs seed_start"):
+            await server.call_tool(
+                "generate_image_urls", {"widths": [200], "heights": [100], "seed_count": 5}
+            )
+        return json.loads(compact[0].text)
+
+    result = asyncio.run(run())
+    assert expand_urls(result) == image_urls.image_urls_from_grid([200, 300], [100], range(1, 3))
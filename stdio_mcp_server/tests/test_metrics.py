@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+
+from metrics import LATENCY_BUCKETS, UNKNOWN_TOOL, Histogram, instrument_metrics
+
+
+def instrumented_server():
+    server = FastMCP("metrics-test")
+
+    @server.tool()
+    def echo(text: str) -> str:
+        return text
+
+    @server.tool()
+    def lookup(key: str) -> dict:
+        if key == "missing":
+            return {"error": f"No value for '{key}'"}
+        return {"key": key, "value": "found"}
+
+    @server.tool()
+    def fail() -> str:
+        raise RuntimeError("boom")
+
+    return server, instrument_metrics(server)
+
+
+def test_histogram_quantiles_interpolate_inside_buckets():
+    histogram = Histogram(LATENCY_BUCKETS)
+    for _ in range(100):
+        histogram.observe(0.003)
+    assert histogram.quantile(0.5) == pytest.approx(0.0025)
+    assert histogram.quantile(0.99) <= 0.005
+
+    histogram.observe(60.0)  # Beyond the last bucket
+    assert histogram.cumulative_counts()[-1] == ("+Inf", 101)
+    assert histogram.quantile(1.0) == LATENCY_BUCKETS[-1]
+
+
+def test_counts_calls_latency_and_payload_sizes():
+    server, metrics = instrumented_server()
+    asyncio.run(server.call_tool("echo", {"text": "héllo"}))
+
+    stats = metrics.snapshot()["tools"]["echo"]
+    assert (stats["calls"], stats["errors"], stats["in_flight"]) == (1, 0, 0)
+    # Bytes, not characters: é is two bytes in UTF-8
+    assert stats["request_bytes_total"] == len('{"text":"héllo"}'.encode())
+    assert stats["response_bytes_total"] == len("héllo".encode())
+
+
+def test_error_results_and_exceptions_count_as_errors():
+    server, metrics = instrumented_server()
+
+    async def run():
+        await server.call_tool("lookup", {"key": "present"})
+        await server.call_tool("lookup", {"key": "missing"})
+        with pytest.raises(ToolError):
+            await server.call_tool("fail", {})
+
+    asyncio.run(run())
+    tools = metrics.snapshot()["tools"]
+    assert (tools["lookup"]["calls"], tools["lookup"]["errors"]) == (2, 1)
+    assert (tools["fail"]["calls"], tools["fail"]["errors"]) == (1, 1)
+
+
+def test_unknown_tools_share_one_series():
+    server, metrics = instrumented_server()
+
+    async def run():
+        for i in range(50):
+            with pytest.raises(ToolError):
+                await server.call_tool(f"no_such_tool_{i}", {})
+
+    asyncio.run(run())
+    tools = metrics.snapshot()["tools"]
+    assert set(tools) == {UNKNOWN_TOOL}
+    assert (tools[UNKNOWN_TOOL]["calls"], tools[UNKNOWN_TOOL]["errors"]) == (50, 50)
+
+
+def test_server_stats_tool_and_prometheus_output():
+    server, metrics = instrumented_server()
+    asyncio.run(server.call_tool("echo", {"text": "x"}))
+    content = asyncio.run(server.call_tool("server_stats", {}))
+
+    snapshot = json.loads(content[0].text)
+    assert snapshot["server"] == "metrics-test"
+    assert snapshot["tools"]["echo"]["calls"] == 1
+
+    text = metrics.render_prometheus()
+    assert 'mcp_tool_calls_total{server="metrics-test",tool="echo"} 1' in text
+    assert 'mcp_tool_duration_seconds_bucket{server="metrics-test",tool="echo",le="+Inf"} 1' in text
+    assert text.endswith("\n")
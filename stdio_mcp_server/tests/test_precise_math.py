@@ -0,0 +1,125 @@
+import decimal
+import time
+from fractions import Fraction
+
+import pytest
+
+from precise_math import (
+    AUTO_SUMMARY_DIGITS,
+    MAX_PRECISION,
+    MAX_RESULT_DIGITS,
+    calculate,
+    describe_operand,
+    format_number,
+    integer_digits,
+    make_context,
+    parse_operand,
+    summarize_integer,
+)
+
+
+def test_int_mode_is_exact_for_huge_numbers():
+    big = str(10**60 + 7)
+    assert calculate("multiply", big, big) == (10**60 + 7) ** 2
+    assert calculate("subtract", "0x10", "-0X1f") == 47
+    assert calculate("add", 2**70, "1") == 2**70 + 1
+
+
+def test_decimal_mode_respects_precision():
+    assert calculate("add", "0.1", "0.2", mode="decimal") == decimal.Decimal("0.3")
+    assert str(calculate("multiply", "1.23456789", "1", mode="decimal", precision=4)) == "1.235"
+    assert calculate("subtract", "1e-50", "0", mode="decimal") == decimal.Decimal("1E-50")
+
+
+def test_fraction_mode_keeps_ratios():
+    assert calculate("add", "1/3", "1/6", mode="fraction") == Fraction(1, 2)
+    assert calculate("multiply", "2/3", 3, mode="fraction") == 2
+    assert format_number(calculate("subtract", "1/3", "1/2", mode="fraction")) == "-1/6"
+
+
+@pytest.mark.parametrize(
+    "value, mode, message",
+    [
+        ("1.5", "int", "Invalid int operand"),
+        ("0xZZ", "int", "Invalid int operand"),
+        ("abc", "decimal", "Invalid decimal operand"),
+        ("1/0", "fraction", "Invalid fraction operand"),
+        ("1", "float", "Unknown precision mode 'float'"),
+    ],
+)
+def test_invalid_operands(value, mode, message):
+    with pytest.raises(ValueError, match=message):
+        parse_operand(value, mode, make_context())
+
+
+@pytest.mark.parametrize(
+    "value", ["1e10000000", "1e-10000000", "1/1e5000", "1E99999999999999999999", "3" * 4301]
+)
+def test_fraction_operands_are_bounded(value):
+    started = time.perf_counter()
+    with pytest.raises(ValueError, match=f"more than {MAX_RESULT_DIGITS} digits"):
+        calculate("add", value, "1", mode="fraction")
+    assert time.perf_counter() - started < 0.5
+
+
+def test_fraction_operands_within_the_budget():
+    assert calculate("add", "1e4000", "1.5e-10", mode="fraction") == 10**4000 + Fraction(3, 2 * 10**10)
+    assert calculate("add", "2_5e1_0", "1/4", mode="fraction") == 25 * 10**10 + Fraction(1, 4)
+
+
+def test_invalid_operation_and_precision():
+    with pytest.raises(ValueError, match="Unknown operation 'divide'"):
+        calculate("divide", 1, 2)
+    with pytest.raises(ValueError, match="Precision must be between"):
+        make_context(0)
+    with pytest.raises(ValueError, match="Precision must be between"):
+        make_context(MAX_PRECISION + 1)
+
+
+@pytest.mark.parametrize("exponent", [1, 77, 78, 1000, 5000, 20000])
+@pytest.mark.parametrize("offset", [-1, 0, 1])
+def test_integer_digits_at_powers_of_ten(exponent, offset):
+    n = 10**exponent + offset
+    assert integer_digits(n) == (exponent + 1 if offset >= 0 else exponent)
+    assert integer_digits(-n) == integer_digits(n)
+
+
+def test_summary_has_leading_and_trailing_digits():
+    n = 123456789012345 * 10**3000 + 987654321
+    assert summarize_integer(n) == "1234567890…0987654321 (3015 digits)"
+    assert summarize_integer(-n).startswith("-1234567890…")
+    # Just below a power of ten the leading digits are all nines
+    assert summarize_integer(10**5000 - 1) == "9999999999…9999999999 (5000 digits)"
+    assert summarize_integer(12345) == "12345"
+
+
+def test_format_number_encodings():
+    assert format_number(255, "hex") == "0xff"
+    assert format_number(-255, "decimal") == "-255"
+    assert format_number(Fraction(10**30, 3), "hex") == f"{hex(10**30)}/0x3"
+    assert format_number(decimal.Decimal("1.50")) == "1.50"
+    assert format_number(decimal.Decimal("123456789012"), "summary") == (
+        "1.234567890e+11 (12 significant digits)"
+    )
+    with pytest.raises(ValueError, match="Unknown encoding 'binary'"):
+        format_number(1, "binary")
+
+
+def test_auto_encoding_summarizes_only_huge_numbers():
+    small = 10 ** (AUTO_SUMMARY_DIGITS - 10)
+    assert format_number(small) == str(small)
+    assert format_number(10**100_000).endswith("(100001 digits)")
+
+
+def test_formatting_huge_integers_is_fast():
+    n = 3**2_000_000  # About 950,000 digits; str() would be refused
+    started = time.perf_counter()
+    assert format_number(n).endswith("(954243 digits)")
+    assert format_number(n, "hex").startswith("0x")
+    assert time.perf_counter() - started < 1.0
+
+
+def test_describe_operand_shortens_long_inputs():
+    assert describe_operand("12.5") == "12.5"
+    assert describe_operand("7" * 100) == "7777777777…7777777777 (100 characters)"
+    assert describe_operand(10**2000).endswith("(2001 digits)")
@@ -0,0 +1,163 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import prefetch
+from prefetch import ArticlePrefetcher
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A manual clock for the prefetcher's expiry and ages."""
+    now = [1000.0]
+    monkeypatch.setattr(prefetch, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+class FakeDevto:
+    """Fetches articles after `release` is set, recording which were asked for."""
+
+    def __init__(self, fail=()):
+        self.fetched = []
+        self.fail = set(fail)
+        self.release = asyncio.Event()
+
+    async def fetch(self, article_id):
+        self.fetched.append(article_id)
+        await self.release.wait()
+        if article_id in self.fail:
+            raise RuntimeError("boom")
+        return {"id": int(article_id), "path": f"/user/post-{article_id}"}
+
+
+def results(*ids):
+    return [{"id": i, "path": f"/user/post-{i}"} for i in ids]
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_prefetched_articles_are_served_with_their_age(clock):
+    async def run():
+        devto = FakeDevto()
+        devto.release.set()
+        prefetcher = ArticlePrefetcher(devto.fetch, top_k=2, ttl=30)
+        prefetcher.schedule(results(1, 2, 3))
+        await settle()
+        assert devto.fetched == ["1", "2"]
+
+        clock[0] += 12
+        article, age = await prefetcher.get("1")
+        assert article["id"] == 1 and age == 12
+        # Also under its path
+        assert (await prefetcher.get("/user/post-2/"))[1] == 12
+        assert await prefetcher.get("3") is None
+
+        # Expired
+        clock[0] += 19
+        assert await prefetcher.get("1") is None
+        return prefetcher.snapshot()
+
+    snapshot = asyncio.run(run())
+    assert snapshot["hits"] == 2 and snapshot["misses"] == 2
+    assert snapshot["used_rate"] == 1.0
+
+
+def test_requests_for_articles_in_flight_wait_for_the_prefetch():
+    async def run():
+        devto = FakeDevto()
+        prefetcher = ArticlePrefetcher(devto.fetch, top_k=1)
+        prefetcher.schedule(results(1))
+        waiter = asyncio.create_task(prefetcher.get("1"))
+        await settle()
+        assert not waiter.done()
+        devto.release.set()
+        article, age = await waiter
+        assert article["id"] == 1 and age == 0
+        assert devto.fetched == ["1"]
+        return prefetcher.snapshot()
+
+    assert asyncio.run(run())["in_flight_hits"] == 1
+
+
+def test_a_new_search_cancels_unfinished_prefetches():
+    async def run():
+        devto = FakeDevto()
+        prefetcher = ArticlePrefetcher(devto.fetch, top_k=2, concurrency=1)
+        prefetcher.schedule(results(1, 2))
+        waiter = asyncio.create_task(prefetcher.get("2"))
+        await settle()
+        prefetcher.schedule(results(3))
+        # The request for the cancelled prefetch is a miss, not an error
+        assert await waiter is None
+        devto.release.set()
+        await settle()
+        assert (await prefetcher.get("3"))[0]["id"] == 3
+        return prefetcher.snapshot()
+
+    snapshot = asyncio.run(run())
+    assert snapshot["cancelled"] == 2 and snapshot["fetched"] == 1
+
+
+def test_cancelling_a_request_does_not_cancel_the_prefetch():
+    async def run():
+        devto = FakeDevto()
+        prefetcher = ArticlePrefetcher(devto.fetch, top_k=1)
+        prefetcher.schedule(results(1))
+        waiter = asyncio.create_task(prefetcher.get("1"))
+        await settle()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        devto.release.set()
+        await settle()
+        return await prefetcher.get("1")
+
+    article, _ = asyncio.run(run())
+    assert article["id"] == 1
+
+
+def test_failed_prefetches_and_invalidation():
+    async def run():
+        devto = FakeDevto(fail={"1"})
+        devto.release.set()
+        prefetcher = ArticlePrefetcher(devto.fetch, top_k=2)
+        prefetcher.schedule(results(1, 2))
+        await settle()
+        assert await prefetcher.get("1") is None
+        prefetcher.invalidate("2")
+        assert await prefetcher.get("user/post-2") is None
+        return prefetcher.snapshot()
+
+    snapshot = asyncio.run(run())
+    assert snapshot["failed"] == 1 and snapshot["cached"] == 0
+
+
+def test_least_recently_stored_articles_are_evicted():
+    async def run():
+        devto = FakeDevto()
+        devto.release.set()
+        # Two entries per article: its id and its path
+        prefetcher = ArticlePrefetcher(devto.fetch, top_k=3, max_entries=4)
+        prefetcher.schedule(results(1, 2, 3))
+        await settle()
+        return [await prefetcher.get(key) for key in ("1", "2", "3")]
+
+    first, second, third = asyncio.run(run())
+    assert first is None and second[0]["id"] == 2 and third[0]["id"] == 3
+
+
+def test_settings_from_env(monkeypatch):
+    for name in ("K", "CONCURRENCY", "TTL"):
+        monkeypatch.delenv(f"MCP_DEVTO_PREFETCH_{name}", raising=False)
+    assert prefetch.settings_from_env() == {"top_k": 0, "concurrency": 2, "ttl": 30.0}
+    monkeypatch.setenv("MCP_DEVTO_PREFETCH_K", "3")
+    monkeypatch.setenv("MCP_DEVTO_PREFETCH_TTL", "5")
+    settings = prefetch.settings_from_env()
+    assert ArticlePrefetcher(lambda _: None, **settings).enabled
+    assert settings["ttl"] == 5.0
+    assert not ArticlePrefetcher(lambda _: None, top_k=0).enabled
+
@@ -0,0 +1,126 @@
+import asyncio
+from typing import Dict, List, Optional
+
+import pytest
+from mcp.server import Server
+
+import server as lowlevel_server
+from server import CACHED_TEXT_LENGTH, ToolRegistry, text_result
+
+
+def make_registry() -> ToolRegistry:
+    registry = ToolRegistry()
+
+    @registry.tool()
+    async def total(values: List[int], scale: float = 1.0) -> float:
+        """Sum the values."""
+        return sum(values) * scale
+
+    @registry.tool(description="Count words per label.")
+    async def labels(
+        counts: Dict[str, List[str]], flag: bool = False, note: Optional[str] = None
+    ) -> str:
+        return f"{sorted(counts)} {flag} {note}"
+
+    return registry
+
+
+def call(registry, name, arguments):
+    return asyncio.run(registry.call(name, arguments))
+
+
+def test_schema_includes_item_types_and_defaults():
+    tools = {tool.name: tool for tool in make_registry().tools}
+    assert tools["total"].description == "Sum the values."
+    assert tools["total"].inputSchema == {
+        "type": "object",
+        "properties": {
+            "values": {"type": "array", "items": {"type": "integer"}},
+            "scale": {"type": "number", "default": 1.0},
+        },
+        "required": ["values"],
+    }
+    counts = tools["labels"].inputSchema["properties"]["counts"]
+    assert counts == {
+        "type": "object",
+        "additionalProperties": {"type": "array", "items": {"type": "string"}},
+    }
+
+
+def test_valid_calls():
+    registry = make_registry()
+    assert call(registry, "total", {"values": [1, 2, 3]})[0].text == "6.0"
+    assert call(registry, "total", {"values": [4], "scale": 0.5})[0].text == "2.0"
+    assert call(registry, "labels", {"counts": {"b": ["x"], "a": []}, "note": None})[0].text == (
+        "['a', 'b'] False None"
+    )
+
+
+@pytest.mark.parametrize(
+    "name, arguments, message",
+    [
+        ("total", {"values": [1, "2"]}, "Argument 'values' for total has the wrong type"),
+        ("total", {"values": [1, True]}, "Argument 'values'"),
+        ("total", {"values": [1.5]}, "Argument 'values'"),
+        ("total", {"values": None}, "Argument 'values'"),
+        ("total", {"values": [1], "scale": True}, "Argument 'scale'"),
+        ("total", {}, "Missing required argument 'values' for total"),
+        ("total", {"values": [], "extra": 1}, "Unknown argument\\(s\\) for total: extra"),
+        ("labels", {"counts": {"a": [1]}}, "Argument 'counts'"),
+        ("labels", {"counts": {"a": "xy"}}, "Argument 'counts'"),
+        ("labels", {"counts": {}, "flag": 1}, "Argument 'flag'"),
+        ("missing", {}, "Unknown tool: missing"),
+    ],
+)
+def test_invalid_calls_never_reach_the_handler(name, arguments, message):
+    with pytest.raises(ValueError, match=message):
+        call(make_registry(), name, arguments)
+
+
+def test_unsupported_annotations_and_duplicates():
+    registry = make_registry()
+    with pytest.raises(TypeError, match="Object keys are strings"):
+
+        @registry.tool()
+        async def by_number(values: Dict[int, str]) -> str:
+            return ""
+
+    with pytest.raises(TypeError, match="Unsupported parameter annotation"):
+
+        @registry.tool()
+        async def untyped(value) -> str:
+            return ""
+
+    with pytest.raises(ValueError, match="already registered"):
+
+        @registry.tool(name="total")
+        async def other(values: List[int]) -> int:
+            return 0
+
+
+def test_only_short_text_results_are_shared():
+    short = "x" * CACHED_TEXT_LENGTH
+    assert text_result(short) is text_result(short)
+    long = "x" * (CACHED_TEXT_LENGTH + 1)
+    assert text_result(long) is not text_result(long)
+    assert text_result(long)[0].text == long
+
+
+def test_errors_are_tool_results(connect):
+    server = lowlevel_server.create_server()
+    assert isinstance(server, Server)
+
+    class Wrapper:
+        _mcp_server = server
+
+    async def run():
+        async with connect(Wrapper) as session:
+            tools = await session.list_tools()
+            ok = await session.call_tool("sum_two_numbers", {"a": 2, "b": 3})
+            bad = await session.call_tool("sum_two_numbers", {"a": 2, "b": [3]})
+            return tools, ok, bad
+
+    tools, ok, bad = asyncio.run(run())
+    assert [tool.name for tool in tools.tools] == ["sum_two_numbers", "echo"]
+    assert (ok.isError, ok.content[0].text) == (False, "5")
+    assert bad.isError and "Argument 'b'" in bad.content[0].text
@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import pytest
+from mcp import types
+from mcp.server.fastmcp import FastMCP
+
+import tracing
+from tracing_setup import create_tracer_provider
+
+pytest.importorskip("opentelemetry.sdk")
+pytest.importorskip("opentelemetry.exporter.otlp.proto.common")
+
+TRACE_ID = "0af7651916cd43dd8448eb211c80319c"
+PARENT_ID = "b7ad6b7169203331"
+
+
+def read_spans(path):
+    spans = []
+    for line in path.read_text().splitlines():
+        for resource_spans in json.loads(line)["resourceSpans"]:
+            for scope_spans in resource_spans["scopeSpans"]:
+                spans.extend(scope_spans["spans"])
+    return spans
+
+
+def test_otlp_file_exporter_writes_hex_ids(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    provider = create_tracer_provider("test", "otlp-file", str(path), batch=False)
+    tracer = provider.get_tracer("test")
+    with tracer.start_as_current_span("outer"):
+        with tracer.start_as_current_span("inner"):
+            pass
+
+    inner, outer = read_spans(path)
+    assert (inner["name"], outer["name"]) == ("inner", "outer")
+    assert inner["traceId"] == outer["traceId"] and len(inner["traceId"]) == 32
+    assert inner["parentSpanId"] == outer["spanId"] and len(outer["spanId"]) == 16
+    assert "parentSpanId" not in outer
+
+
+def test_unknown_exporter_disables_tracing(tmp_path):
+    assert create_tracer_provider("test", "zipkin", str(tmp_path / "x"), batch=False) is None
+
+
+def test_server_span_joins_the_trace_sent_in_meta(connect, tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(tracing, "_tracer", None)
+    monkeypatch.setenv("MCP_TRACING_EXPORTER", "otlp-file")
+    monkeypatch.setenv("MCP_TRACING_FILE", str(path))
+    assert tracing.configure_tracing("test-server")
+
+    server = FastMCP("traced")
+
+    @server.tool()
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    tracing.instrument_tracing(server)
+
+    async def run():
+        async with connect(server) as session:
+            return await session.send_request(
+                types.ClientRequest(
+                    types.CallToolRequest(
+                        method="tools/call",
+                        params=types.CallToolRequestParams(
+                            name="add",
+                            arguments={"a": 1, "b": 2},
+                            _meta={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"},
+                        ),
+                    )
+                ),
+                types.CallToolResult,
+            )
+
+    result = asyncio.run(run())
+    assert result.content[0].text == "3"
+
+    [span] = read_spans(path)
+    assert span["name"] == "tools/call add"
+    assert (span["traceId"], span["parentSpanId"]) == (TRACE_ID, PARENT_ID)
@@ -0,0 +1,136 @@
+import asyncio
+import os
+import stat
+
+import anyio
+import pytest
+from mcp import ClientSession, types
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.message import SessionMessage
+
+import unix_transport
+from unix_transport import serve_unix, socket_streams
+
+
+class ScriptedStream:
+    """A byte stream that receives `chunks`, then EOF, and records what is sent."""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.sent = []
+
+    async def receive(self, max_bytes=65536):
+        await anyio.lowlevel.checkpoint()
+        if not self.chunks:
+            raise anyio.EndOfStream
+        return self.chunks.pop(0)
+
+    async def send(self, data):
+        self.sent.append(data)
+
+
+def ping(request_id):
+    return types.JSONRPCRequest(jsonrpc="2.0", id=request_id, method="ping")
+
+
+def line(request_id):
+    return ping(request_id).model_dump_json(by_alias=True, exclude_none=True).encode() + b"\n"
+
+
+def receive_all(chunks, **kwargs):
+    """Everything read from a stream delivering `chunks`, until the reader stops."""
+
+    async def run():
+        async with socket_streams(ScriptedStream(chunks), **kwargs) as (read_stream, _):
+            return [item async for item in read_stream]
+
+    return asyncio.run(run())
+
+
+def test_messages_split_across_reads():
+    first, second = line(1), line(2)
+    both = first + second
+    received = receive_all([both[:5], both[5 : len(first) + 3], both[len(first) + 3 :]])
+    assert [item.message.root.id for item in received] == [1, 2]
+
+
+def test_invalid_lines_are_reported_and_skipped():
+    received = receive_all([b"not json\n" + line(7)])
+    assert isinstance(received[0], Exception)
+    assert received[1].message.root.id == 7
+
+
+def test_overlong_lines_end_the_connection():
+    limit = len(line(1)) - 1
+    # A complete line that is too long
+    [error] = receive_all([line(1) + line(2)], max_line_bytes=limit - 1)
+    assert str(error) == f"Message longer than {limit - 1} bytes"
+    # A partial line that is already too long, however it continues
+    [message, error] = receive_all(
+        [line(1), b"x" * limit, b"x" * limit, line(2)], max_line_bytes=limit + 5
+    )
+    assert message.message.root.id == 1
+    assert isinstance(error, ValueError)
+
+
+def test_writer_sends_one_line_per_message():
+    stream = ScriptedStream([])
+
+    async def run():
+        async with socket_streams(stream) as (_, write_stream):
+            await write_stream.send(SessionMessage(types.JSONRPCMessage(ping(3))))
+            await anyio.sleep(0.01)
+
+    asyncio.run(run())
+    assert stream.sent == [line(3)]
+
+
+def test_serves_sessions_on_an_owner_only_socket(tmp_path, monkeypatch):
+    path = str(tmp_path / "mcp.sock")
+    umasks = []
+    real_create_unix_listener = unix_transport.anyio.create_unix_listener
+
+    async def create_unix_listener(path, mode=None):
+        # The socket must not be bound under a permissive umask, even briefly
+        umask = os.umask(0)
+        os.umask(umask)
+        umasks.append(umask)
+        return await real_create_unix_listener(path, mode=mode)
+
+    monkeypatch.setattr(unix_transport.anyio, "create_unix_listener", create_unix_listener)
+    server = FastMCP("unix")
+
+    @server.tool()
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    async def call(a, b):
+        async with await anyio.connect_unix(path) as stream:
+            async with socket_streams(stream) as streams:
+                async with ClientSession(*streams) as session:
+                    await session.initialize()
+                    return (await session.call_tool("add", {"a": a, "b": b})).content[0].text
+
+    async def run():
+        async with anyio.create_task_group() as tg:
+            await tg.start(serve_unix, server, path)
+            assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+            results = await asyncio.gather(call(1, 2), call(3, 4))
+            tg.cancel_scope.cancel()
+        return results
+
+    umask = os.umask(0o022)
+    try:
+        assert asyncio.run(run()) == ["3", "7"]
+        assert os.umask(0o022) == 0o022
+    finally:
+        os.umask(umask)
+    assert umasks == [0o177]
+    assert not os.path.exists(path)
+
+
+def test_refuses_to_replace_a_regular_file(tmp_path):
+    path = tmp_path / "mcp.sock"
+    path.write_text("")
+    with pytest.raises(ValueError, match="exists and is not a socket"):
+        asyncio.run(serve_unix(FastMCP("unix"), str(path)))
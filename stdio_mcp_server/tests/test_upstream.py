@@ -0,0 +1,280 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+import upstream
+from upstream import UpstreamClient, requested_budget, settings_from_env
+
+
+class Upstream:
+    """A mock dev.to: request n waits delays[n] seconds (the last delay repeats)."""
+
+    def __init__(self, *delays, status=200):
+        self.delays = list(delays) or [0.0]
+        self.status = status
+        self.started = 0
+        self.cancelled = []
+        self.finished = []
+
+    async def handle(self, request):
+        n = self.started
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delays[min(n, len(self.delays) - 1)])
+        except asyncio.CancelledError:
+            self.cancelled.append(n)
+            raise
+        self.finished.append(n)
+        status = self.status(n) if callable(self.status) else self.status
+        return httpx.Response(status, json={"request": n})
+
+    def client(self, **kwargs):
+        kwargs.setdefault("breaker", False)
+        transport = httpx.MockTransport(self.handle)
+        return UpstreamClient(
+            "https://dev.to/api", client=httpx.AsyncClient(transport=transport), **kwargs
+        )
+
+
+def get(client, budget=1.0, hedge=True):
+    async def run():
+        deadline = asyncio.get_running_loop().time() + budget
+        response = await client.get("/articles", "/articles", deadline, hedge=hedge)
+        # Give cancelled requests a chance to unwind
+        await asyncio.sleep(0.01)
+        return response.json()["request"]
+
+    return asyncio.run(run())
+
+
+def test_requests_past_their_deadline_time_out():
+    mock = Upstream(0.5)
+    client = mock.client()
+    with pytest.raises(TimeoutError, match=r"GET /articles did not answer within 0.1s"):
+        get(client, budget=0.1)
+    assert mock.cancelled == [0]
+    with pytest.raises(TimeoutError):
+        get(client, budget=0)
+    assert mock.started == 1  # An exhausted budget sends nothing
+    assert client.stats.timeouts == 2
+
+
+def handling(meta):
+    """A stand-in FastMCP server handling a request with `meta`."""
+    return SimpleNamespace(_mcp_server=SimpleNamespace(request_context=SimpleNamespace(meta=meta)))
+
+
+def test_deadline_per_tool_and_from_the_caller():
+    client = UpstreamClient(
+        "https://dev.to/api", deadlines={"get_article": 3.0, "create_article": 30.0}
+    )
+
+    async def budgets(server=None):
+        now = asyncio.get_running_loop().time()
+        return [
+            client.deadline(tool, server) - now for tool in ("get_article", "unknown")
+        ]
+
+    # Some time passes between reading the clock and computing the deadline
+    assert asyncio.run(budgets()) == pytest.approx([3, 30], abs=0.05)
+    # The caller's remaining budget shortens, but never extends, the tool's own
+    assert asyncio.run(budgets(handling(SimpleNamespace(deadline_ms=250)))) == pytest.approx(
+        [0.25, 0.25], abs=0.05
+    )
+    assert asyncio.run(budgets(handling(SimpleNamespace(deadline_ms=60_000)))) == pytest.approx(
+        [3, 30], abs=0.05
+    )
+
+    assert requested_budget(handling(SimpleNamespace(deadline_ms=-5))) == 0.0
+    assert requested_budget(handling(SimpleNamespace(deadline_ms="soon"))) is None
+    assert requested_budget(handling(None)) is None
+    # Outside of a request
+    assert requested_budget(FastMCP("idle")) is None
+
+
+def test_hedge_wins_and_the_slow_request_is_cancelled():
+    mock = Upstream(1.0, 0.0)
+    client = mock.client(hedging=True, hedge_delay=0.05, hedge_budget=1.0)
+    assert get(client) == 1
+    assert mock.cancelled == [0]
+    assert (client.stats.hedged, client.stats.hedge_wins) == (1, 1)
+    assert client.snapshot()["win_rate"] == 1.0
+
+
+def test_no_hedge_when_the_first_request_is_quick():
+    mock = Upstream(0.0)
+    client = mock.client(hedging=True, hedge_delay=0.2, hedge_budget=1.0)
+    assert get(client) == 0
+    assert mock.started == 1 and client.stats.hedged == 0
+
+
+def test_primary_can_still_win_after_hedging():
+    mock = Upstream(0.1, 1.0)
+    client = mock.client(hedging=True, hedge_delay=0.05, hedge_budget=1.0)
+    assert get(client) == 0
+    assert mock.cancelled == [1]
+    assert (client.stats.hedged, client.stats.hedge_wins) == (1, 0)
+
+
+def test_hedge_budget():
+    mock = Upstream(0.1, 0.0, 0.1, 0.0)
+    client = mock.client(hedging=True, hedge_delay=0.02, hedge_budget=0.5)
+    get(client)  # Hedged: 1 of 1 request
+    assert client.stats.hedged == 1
+    get(client)  # 1 hedge for 2 requests is the budget: wait for the primary
+    assert client.stats.hedged == 1 and mock.started == 3
+    assert mock.cancelled == [0]
+
+
+def test_hedging_only_for_idempotent_requests():
+    mock = Upstream(0.1)
+    client = mock.client(hedging=True, hedge_delay=0.01, hedge_budget=1.0)
+    get(client, hedge=False)
+    assert mock.started == 1
+
+
+def test_both_requests_failing_raises_the_first_error():
+    mock = Upstream(0.05, 0.0)
+
+    async def handle(request):
+        n = mock.started
+        mock.started += 1
+        await asyncio.sleep(mock.delays[n])
+        raise httpx.ConnectError(f"request {n} failed")
+
+    client = UpstreamClient(
+        "https://dev.to/api",
+        hedging=True,
+        hedge_delay=0.01,
+        hedge_budget=1.0,
+        breaker=False,
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handle)),
+    )
+    with pytest.raises(httpx.ConnectError, match="request 0 failed"):
+        get(client)
+    assert client.stats.errors == 1
+
+
+def test_cancelling_the_caller_cancels_both_requests():
+    mock = Upstream(1.0)
+    client = mock.client(hedging=True, hedge_delay=0.01, hedge_budget=1.0)
+
+    async def run():
+        deadline = asyncio.get_running_loop().time() + 5
+        task = asyncio.create_task(client.get("/articles", "/articles", deadline, hedge=True))
+        while mock.started < 2:
+            await asyncio.sleep(0.005)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.01)
+        return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    assert asyncio.run(run()) == []
+    assert sorted(mock.cancelled) == [0, 1]
+    assert mock.finished == []
+    assert client.stats.timeouts == 0
+
+
+def test_hedge_delay_follows_the_observed_p95():
+    client = UpstreamClient("https://dev.to/api", hedge_delay=0.5, min_samples=20)
+    assert client.hedge_delay("/articles") == 0.5
+    window = client.latencies["/articles"] = upstream.LatencyWindow()
+    for i in range(1, 101):
+        window.observe(i / 1000)
+    assert client.hedge_delay("/articles") == 0.096
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.setenv("MCP_DEVTO_DEADLINES", "get_article=3, search_articles=5")
+    monkeypatch.setenv("MCP_DEVTO_HEDGING", "on")
+    monkeypatch.setenv("MCP_DEVTO_HEDGE_DELAY_MS", "250")
+    settings = settings_from_env()
+    assert settings["deadlines"]["get_article"] == 3.0
+    assert settings["deadlines"]["search_articles"] == 5.0
+    assert settings["deadlines"]["create_article"] == 30.0
+    assert settings["hedging"] and settings["hedge_delay"] == 0.25
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controls the circuit breakers' clock, leaving the event loop's alone."""
+    now = [1000.0]
+    clock = SimpleNamespace(monotonic=lambda: now[0], perf_counter=time.perf_counter)
+    monkeypatch.setattr(upstream, "time", clock)
+    return now
+
+
+def test_breaker_opens_half_opens_and_closes(clock):
+    breaker = upstream.CircuitBreaker("GET /articles", failure_rate=0.5, min_calls=4, open_seconds=10)
+    for failed in (False, True, False):
+        breaker.record(breaker.allow(), failed)
+    assert breaker.state == "closed"  # Too few calls to judge
+    breaker.record(breaker.allow(), True)
+    assert breaker.state == "open" and breaker.times_opened == 1
+
+    assert breaker.allow() is None
+    assert breaker.retry_after() == 10
+    clock[0] += 10
+    # One probe at a time
+    assert breaker.allow() == "half_open"
+    assert breaker.allow() is None
+    assert breaker.rejected == 2
+    breaker.record("half_open", False)
+    assert breaker.state == "closed"
+    assert breaker.current_failure_rate() == 0
+
+
+def test_failed_or_cancelled_probes(clock):
+    breaker = upstream.CircuitBreaker("GET /tags", min_calls=1, open_seconds=5)
+    breaker.record(breaker.allow(), True)
+    clock[0] += 5
+    breaker.record(breaker.allow(), True)
+    assert breaker.state == "open" and breaker.times_opened == 2
+    assert breaker.retry_after() == 5
+
+    clock[0] += 5
+    admitted = breaker.allow()
+    breaker.record(admitted, None)  # Cancelled: the next request probes instead
+    assert breaker.state == "half_open" and breaker.allow() == "half_open"
+    # Outcomes of requests let through before the circuit opened are ignored
+    breaker.record("closed", False)
+    assert breaker.state == "half_open"
+
+
+def test_open_circuit_serves_the_last_response(clock):
+    mock = Upstream(0.0, status=lambda n: 200 if n == 0 else 503)
+    client = mock.client(breaker=True, open_seconds=15)
+    assert get(client, hedge=False) == 0
+    for _ in range(9):
+        get(client, hedge=False)  # 503s are returned, and counted as failures
+    # 9 failures of the last 10 requests
+    assert client.snapshot()["circuits"]["GET /articles"]["state"] == "open"
+
+    clock[0] += 3
+    with pytest.raises(upstream.CircuitOpenError) as raised:
+        get(client, hedge=False)
+    assert raised.value.stale.json() == {"request": 0}
+    assert raised.value.stale_age == 3
+    assert raised.value.retry_after == 12
+    assert mock.started == 10
+    assert (client.stats.rejected, client.stats.stale_served) == (1, 1)
+
+    # No stale copy for other parameters, nor for other methods
+    async def other():
+        deadline = asyncio.get_running_loop().time() + 1
+        await client.get("/articles", "/articles", deadline, params={"page": 2})
+
+    with pytest.raises(upstream.CircuitOpenError) as raised:
+        asyncio.run(other())
+    assert raised.value.stale is None
+
+    # After open_seconds the probe goes out, and its success closes the circuit
+    mock.status = 200
+    clock[0] += 12
+    assert get(client, hedge=False) == 10
+    assert client.circuits["GET /articles"].state == "closed"
@@ -0,0 +1,82 @@
+import asyncio
+import os
+import stat
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+import zygote as zygote_module
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+ZYGOTE = str(SERVER_DIR / "zygote.py")
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="the zygote needs fork()")
+
+
+@pytest.fixture(scope="module")
+def zygote(tmp_path_factory):
+    """A running zygote; yields its socket path."""
+    socket_path = str(tmp_path_factory.mktemp("zygote") / "zygote.sock")
+    process = subprocess.Popen(
+        [sys.executable, ZYGOTE, "serve", "--socket", socket_path],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while not os.path.exists(socket_path):
+        assert process.poll() is None and time.monotonic() < deadline, "zygote did not start"
+        time.sleep(0.05)
+    yield socket_path
+    process.terminate()
+    process.wait(timeout=10)
+
+
+def start_through_launcher(socket_path, script):
+    params = StdioServerParameters(
+        command=sys.executable, args=[ZYGOTE, "run", "--socket", socket_path, script]
+    )
+
+    async def run():
+        async with stdio_client(params) as streams:
+            async with ClientSession(*streams) as session:
+                init = await session.initialize()
+                tools = [tool.name for tool in (await session.list_tools()).tools]
+                return init.serverInfo.name, tools
+
+    return asyncio.run(run())
+
+
+def test_socket_is_owner_only(zygote):
+    assert stat.S_IMODE(os.stat(zygote).st_mode) == 0o600
+
+
+def test_launcher_runs_a_forked_server(zygote):
+    assert start_through_launcher(zygote, str(SERVER_DIR / "server.py")) == (
+        "mcp_server",
+        ["sum_two_numbers", "echo"],
+    )
+
+
+def test_launcher_runs_the_script_itself_without_a_zygote(tmp_path):
+    missing = str(tmp_path / "missing.sock")
+    assert start_through_launcher(missing, str(SERVER_DIR / "server.py"))[0] == "mcp_server"
+
+
+def test_scripts_outside_the_server_directory_are_not_forked(zygote, tmp_path):
+    script = tmp_path / "server.py"
+    script.write_text((SERVER_DIR / "server.py").read_text().replace('"mcp_server"', '"copy"'))
+    # A forked server would be the preloaded original, not the copy
+    assert start_through_launcher(zygote, str(script))[0] == "copy"
+
+
+def test_refuses_to_replace_anything_but_a_socket(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("keep me")
+    with pytest.raises(ValueError, match="exists and is not a socket"):
+        zygote_module.serve(str(path))
+    assert path.read_text() == "keep me"
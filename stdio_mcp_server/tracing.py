@@ -0,0 +1,123 @@
+"""
+Optional OpenTelemetry tracing for the MCP servers.
+
+Tracing is off unless MCP_TRACING_EXPORTER is set and opentelemetry-sdk is
+installed (`uv sync --extra tracing`). Supported exporters:
+
+    - console:   spans are printed to stderr (stdout carries the stdio JSON-RPC stream)
+    - otlp-file: spans are appended as OTLP/JSON lines to MCP_TRACING_FILE
+                 (default: traces.otlp.jsonl), readable offline without a collector
+
+The client propagates its trace context in the `_meta` field of each
+`tools/call` request, so server spans join the client's trace. The SSE server
+traces its tools with an identical copy of this module.
+"""
+
+import logging
+import os
+from contextlib import nullcontext
+from typing import Any, Dict, Sequence
+
+from mcp.server.fastmcp import FastMCP
+
+from middleware import CallNext, add_call_tool_middleware
+
+from lazy_imports import lazy_import
+from tracing_setup import create_tracer_provider
+
+# tracing is an optional extra, only imported once tracing is configured
+propagate = lazy_import("opentelemetry.propagate")
+trace = lazy_import("opentelemetry.trace")
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRACING_FILE = "traces.otlp.jsonl"
+
+_tracer = None
+
+
+def configure_tracing(service_name: str) -> bool:
+    """Install a tracer provider for this process if tracing is enabled.
+
+    Returns:
+        bool: Whether spans will be recorded.
+    """
+    global _tracer
+
+    exporter_name = os.getenv("MCP_TRACING_EXPORTER", "").strip().lower()
+    if exporter_name in ("", "none"):
+        return False
+
+    # Export synchronously: stdio servers are terminated by their client
+    # without running exit handlers, which would drop a pending batch.
+    provider = create_tracer_provider(
+        service_name,
+        exporter_name,
+        os.getenv("MCP_TRACING_FILE", DEFAULT_TRACING_FILE),
+        batch=False,
+    )
+    if provider is None:
+        return False
+
+    trace.set_tracer_provider(provider)
+    _tracer = provider.get_tracer(service_name)
+
+    logger.info(f"Tracing enabled ({exporter_name} exporter)")
+    return True
+
+
+def start_span(name: str, context: Any = None, kind: str = "internal", **attributes):
+    """Start a span as the current span, or do nothing when tracing is disabled.
+
+    Args:
+        name (str): The span name.
+        context (optional): Parent context, e.g. from `extract_context`.
+        kind (str): "internal", "server" or "client".
+        **attributes: Span attributes.
+    """
+    if _tracer is None:
+        return nullcontext()
+
+    return _tracer.start_as_current_span(
+        name,
+        context=context,
+        kind=trace.SpanKind[kind.upper()],
+        attributes=attributes,
+    )
+
+
+def extract_context(meta: Any) -> Any:
+    """Extract a trace context from an MCP request `_meta` object, if any."""
+    if _tracer is None or meta is None:
+        return None
+
+    carrier: Dict[str, Any] = meta.model_extra or {}
+    if "traceparent" not in carrier:
+        return None
+    return propagate.extract(carrier)
+
+
+def instrument_tracing(server: FastMCP) -> None:
+    """Record a server span around every tool call of a FastMCP server."""
+
+    async def trace_tool_call(
+        name: str, arguments: Dict[str, Any], call_next: CallNext
+    ) -> Sequence[Any]:
+        if _tracer is None:
+            return await call_next(name, arguments)
+
+        try:
+            meta = server._mcp_server.request_context.meta
+        except LookupError:
+            meta = None
+
+        with start_span(
+            f"tools/call {name}",
+            context=extract_context(meta),
+            kind="server",
+            **{"mcp.server.name": server.name, "mcp.tool.name": name},
+        ):
+            return await call_next(name, arguments)
+
+    add_call_tool_middleware(server, trace_tool_call)
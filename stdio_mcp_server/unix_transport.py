@@ -0,0 +1,145 @@
+"""
+Unix domain socket transport for MCP servers.
+
+A stdio server serves exactly one client, the process that spawned it, and
+SSE adds HTTP and event-stream framing to every message. Over a Unix socket
+one long-running server accepts any number of local clients, each with its
+own MCP session. Messages use the stdio framing, one JSON-RPC message per
+line.
+
+    await serve_unix(server, "/tmp/mcp.sock")
+
+Clients connect with `unix:///tmp/mcp.sock` (see mcp_client/unix_client.py,
+which frames messages with an identical copy of this module). The socket is
+created with mode 0600, so only the server's user can connect.
+"""
+
+import logging
+import os
+import stat
+from contextlib import asynccontextmanager
+
+import anyio
+import anyio.lowlevel
+from anyio.abc import ByteStream, TaskStatus
+from mcp import types
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.message import SessionMessage
+
+logger = logging.getLogger(__name__)
+
+READ_SIZE = 65536
+# Longest accepted message line; leaves room for base64 image reads (image_resources.py)
+MAX_LINE_BYTES = 16 * 1024 * 1024
+
+
+@asynccontextmanager
+async def socket_streams(stream: ByteStream, max_line_bytes: int = MAX_LINE_BYTES):
+    """
+    MCP read and write streams over a byte stream of newline-delimited JSON-RPC.
+
+    Shared by the server and by mcp_client/unix_client.py. A message longer
+    than `max_line_bytes` ends the connection.
+    """
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+
+    async def socket_reader():
+        buffer = bytearray()
+        scanned = 0  # length of the pending partial line, already searched for b"\n"
+        try:
+            async with read_stream_writer:
+                while True:
+                    try:
+                        buffer += await stream.receive(READ_SIZE)
+                    except (anyio.EndOfStream, anyio.BrokenResourceError):
+                        break
+                    start = 0
+                    while (end := buffer.find(b"\n", start + scanned)) != -1:
+                        scanned = 0
+                        if end - start > max_line_bytes:
+                            break
+                        line = bytes(buffer[start:end])
+                        start = end + 1
+                        try:
+                            message = types.JSONRPCMessage.model_validate_json(line)
+                        except Exception as exc:
+                            await read_stream_writer.send(exc)
+                            continue
+                        await read_stream_writer.send(SessionMessage(message))
+                    else:
+                        del buffer[:start]
+                        scanned = len(buffer)
+                        if scanned <= max_line_bytes:
+                            continue
+                    # Too long for one message: rather than buffer without bound,
+                    # drop the connection
+                    await read_stream_writer.send(
+                        ValueError(f"Message longer than {max_line_bytes} bytes")
+                    )
+                    break
+        except anyio.ClosedResourceError:
+            await anyio.lowlevel.checkpoint()
+
+    async def socket_writer():
+        try:
+            async with write_stream_reader:
+                async for session_message in write_stream_reader:
+                    json = session_message.message.model_dump_json(by_alias=True, exclude_none=True)
+                    await stream.send(json.encode() + b"\n")
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            await anyio.lowlevel.checkpoint()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(socket_reader)
+        tg.start_soon(socket_writer)
+        yield read_stream, write_stream
+        tg.cancel_scope.cancel()
+
+
+def _remove_stale_socket(path: str) -> None:
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            raise ValueError(f"{path} exists and is not a socket")
+    except FileNotFoundError:
+        return
+    os.unlink(path)
+
+
+async def serve_unix(
+    server: FastMCP, path: str, *, task_status: TaskStatus[None] = anyio.TASK_STATUS_IGNORED
+) -> None:
+    """Serve `server` on the Unix socket `path`, one MCP session per connection.
+
+    With `await task_group.start(serve_unix, ...)`, returns once the socket
+    accepts connections.
+    """
+    lowlevel_server = server._mcp_server
+    _remove_stale_socket(path)
+    # Created owner-only: a chmod after bind() would leave a window in which
+    # other local users could connect (as in zygote.py)
+    umask = os.umask(0o177)
+    try:
+        listener = await anyio.create_unix_listener(path, mode=0o600)
+    finally:
+        os.umask(umask)
+    logger.info(f"Listening on unix://{path}")
+    task_status.started()
+
+    async def handle(stream: ByteStream):
+        async with stream:
+            try:
+                async with socket_streams(stream) as (read_stream, write_stream):
+                    await lowlevel_server.run(
+                        read_stream,
+                        write_stream,
+                        lowlevel_server.create_initialization_options(),
+                    )
+            except Exception:
+                logger.exception("Unix socket session failed")
+
+    try:
+        async with listener:
+            await listener.serve(handle)
+    finally:
+        _remove_stale_socket(path)
@@ -0,0 +1,481 @@
+"""
+Deadline-bounded and hedged requests to an upstream HTTP API (dev.to).
+
+UpstreamClient shares one httpx.AsyncClient, so connections are reused
+across tool calls, and bounds every request by a deadline:
+
+    - each tool has a time budget (DEFAULT_DEADLINES, overridden with
+      MCP_DEVTO_DEADLINES="get_article=3,search_articles=5", in seconds)
+    - a caller may shorten it per request by sending its remaining budget as
+      `deadline_ms` in the request _meta
+    - when the deadline passes, the request is cancelled and TimeoutError is
+      raised
+
+Idempotent GETs can be hedged (MCP_DEVTO_HEDGING=on). If the first request has
+not answered after the p95 latency observed for that endpoint, a duplicate
+is sent. The first successful response wins and the other request is
+cancelled. Until `min_samples` latencies are known, MCP_DEVTO_HEDGE_DELAY_MS
+(default 500) stands in for the p95. At most MCP_DEVTO_HEDGE_BUDGET (default
+0.1) of the requests are hedged, so a slow upstream does not get twice the
+load.
+
+Each endpoint (method and route) has a circuit breaker, on by default
+(MCP_DEVTO_BREAKER=off disables it):
+
+    - closed:    requests go through. A request fails if it raises (a timeout
+                 included), gets a 5xx or 429, or takes longer than
+                 MCP_DEVTO_BREAKER_SLOW_MS (default 5000). Once
+                 MCP_DEVTO_BREAKER_FAILURE_RATE (default 0.5) of the last 20
+                 requests failed (at least 10 of them seen), the circuit opens
+    - open:      requests fail at once with CircuitOpenError, without
+                 queuing behind a dead upstream, for MCP_DEVTO_BREAKER_OPEN_SECONDS
+                 (default 15). A GET carries the last successful response for
+                 the same URL, if one is cached (MCP_DEVTO_STALE_ENTRIES, default
+                 256), so the tool can serve stale data
+    - half-open: one probe request goes through; if it succeeds the circuit
+                 closes, otherwise it opens again
+
+`snapshot()` reports requests, timeouts, the hedge rate (hedged/requests),
+the win rate (hedges that answered first/hedged), the current hedge delays,
+and the state of each circuit.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+import httpx
+from mcp.server.fastmcp import FastMCP
+
+logger = logging.getLogger(__name__)
+
+# Seconds each tool may spend waiting for dev.to
+DEFAULT_DEADLINES = {
+    "search_articles": 10.0,
+    "get_article": 10.0,
+    "get_article_chunks": 10.0,
+    "get_tags": 10.0,
+    "create_article": 30.0,
+    "update_article": 30.0,
+}
+
+
+def settings_from_env() -> Dict[str, Any]:
+    """Keyword arguments for UpstreamClient from MCP_DEVTO_* variables."""
+    deadlines = dict(DEFAULT_DEADLINES)
+    for entry in os.getenv("MCP_DEVTO_DEADLINES", "").split(","):
+        if entry.strip():
+            name, _, seconds = entry.partition("=")
+            deadlines[name.strip()] = float(seconds)
+    return {
+        "deadlines": deadlines,
+        "hedging": os.getenv("MCP_DEVTO_HEDGING", "off").lower() in ("1", "on", "true", "yes"),
+        "hedge_delay": float(os.getenv("MCP_DEVTO_HEDGE_DELAY_MS", "500")) / 1000,
+        "hedge_budget": float(os.getenv("MCP_DEVTO_HEDGE_BUDGET", "0.1")),
+        "breaker": os.getenv("MCP_DEVTO_BREAKER", "on").lower() in ("1", "on", "true", "yes"),
+        "failure_rate": float(os.getenv("MCP_DEVTO_BREAKER_FAILURE_RATE", "0.5")),
+        "slow_call": float(os.getenv("MCP_DEVTO_BREAKER_SLOW_MS", "5000")) / 1000,
+        "open_seconds": float(os.getenv("MCP_DEVTO_BREAKER_OPEN_SECONDS", "15")),
+        "stale_entries": int(os.getenv("MCP_DEVTO_STALE_ENTRIES", "256")),
+    }
+
+
+def requested_budget(server: FastMCP) -> Optional[float]:
+    """Seconds left for the current MCP request, if its caller sent `deadline_ms`."""
+    try:
+        meta = server._mcp_server.request_context.meta
+    except LookupError:  # Not handling a request
+        return None
+    deadline_ms = getattr(meta, "deadline_ms", None) if meta is not None else None
+    if deadline_ms is None:
+        return None
+    try:
+        return max(0.0, float(deadline_ms) / 1000)
+    except (TypeError, ValueError):
+        return None
+
+
+class LatencyWindow:
+    """The most recent latencies of one endpoint."""
+
+    def __init__(self, size: int = 256):
+        self.samples: Deque[float] = deque(maxlen=size)
+
+    def observe(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def quantile(self, q: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class CircuitOpenError(Exception):
+    """A request was refused because its endpoint's circuit is open.
+
+    `stale` is the last successful response for the same GET, if cached, and
+    `stale_age` its age in seconds.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        retry_after: float,
+        stale: Optional[httpx.Response] = None,
+        stale_age: float = 0.0,
+    ):
+        super().__init__(
+            f"{endpoint} is failing; not calling it for another {retry_after:.0f}s"
+        )
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+        self.stale = stale
+        self.stale_age = stale_age
+
+
+class CircuitBreaker:
+    """Closed, open and half-open states of one endpoint, from its recent outcomes."""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(
+        self,
+        endpoint: str,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        open_seconds: float = 15.0,
+        probes: int = 1,
+    ):
+        self.endpoint = endpoint
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.probes = probes
+
+        self.state = self.CLOSED
+        self.outcomes: Deque[bool] = deque(maxlen=window)  # True for a failure
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+        self.probe_successes = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    def current_failure_rate(self) -> float:
+        return sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_at + self.open_seconds - time.monotonic())
+
+    def allow(self) -> Optional[str]:
+        """The state a request is let through in, or None if it must not go out.
+
+        A request let through in half-open state is a probe.
+        """
+        if self.state == self.OPEN:
+            if self.retry_after() > 0:
+                self.rejected += 1
+                return None
+            self._transition(self.HALF_OPEN)
+            self.probes_in_flight = self.probe_successes = 0
+        if self.state == self.HALF_OPEN:
+            if self.probes_in_flight >= self.probes:
+                self.rejected += 1
+                return None
+            self.probes_in_flight += 1
+        return self.state
+
+    def record(self, admitted: str, failed: Optional[bool]) -> None:
+        """Record the outcome of a request let through in state `admitted`.
+
+        `failed` is None if the request was cancelled. Outcomes of requests
+        let through before the last state change are ignored.
+        """
+        if admitted != self.state:
+            return
+        if self.state == self.HALF_OPEN:
+            self.probes_in_flight = max(0, self.probes_in_flight - 1)
+            if failed:
+                self._open()
+            elif failed is not None:
+                self.probe_successes += 1
+                if self.probe_successes >= self.probes:
+                    self.outcomes.clear()
+                    self._transition(self.CLOSED)
+        elif failed is not None:
+            self.outcomes.append(failed)
+            if (
+                len(self.outcomes) >= self.min_calls
+                and self.current_failure_rate() >= self.failure_rate
+            ):
+                self._open()
+
+    def _open(self) -> None:
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        self._transition(self.OPEN)
+
+    def _transition(self, state: str) -> None:
+        logger.warning(f"Circuit for {self.endpoint}: {self.state} -> {state}")
+        self.state = state
+
+
+class StaleCache:
+    """The most recent successful GET responses, by URL and parameters."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Any, Tuple[float, httpx.Response]]" = OrderedDict()
+
+    def put(self, key: Any, response: httpx.Response) -> None:
+        if self.max_entries <= 0:
+            return
+        self.entries[key] = (time.monotonic(), response)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get(self, key: Any) -> Optional[Tuple[float, httpx.Response]]:
+        """The cached response and its age in seconds."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        return time.monotonic() - stored_at, response
+
+
+class UpstreamStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.rejected = 0
+        self.stale_served = 0
+
+
+class UpstreamClient:
+    """Deadline-bounded, optionally hedged requests to one base URL."""
+
+    def __init__(
+        self,
+        base_url: str,
+        deadlines: Optional[Dict[str, float]] = None,
+        hedging: bool = False,
+        hedge_delay: float = 0.5,
+        hedge_budget: float = 0.1,
+        min_samples: int = 20,
+        breaker: bool = True,
+        failure_rate: float = 0.5,
+        slow_call: float = 5.0,
+        open_seconds: float = 15.0,
+        stale_entries: int = 256,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.deadlines = deadlines or dict(DEFAULT_DEADLINES)
+        self.hedging = hedging
+        self.initial_hedge_delay = hedge_delay
+        self.hedge_budget = hedge_budget
+        self.min_samples = min_samples
+        self.client = client or httpx.AsyncClient()
+        self.stats = UpstreamStats()
+        self.latencies: Dict[str, LatencyWindow] = {}
+
+        self.breaker = breaker
+        self.failure_rate = failure_rate
+        self.slow_call = slow_call
+        self.open_seconds = open_seconds
+        self.circuits: Dict[str, CircuitBreaker] = {}
+        self.stale = StaleCache(stale_entries)
+
+    def deadline(self, tool: str, server: Optional[FastMCP] = None) -> float:
+        """Event loop time by which `tool` must have its answer."""
+        budget = self.deadlines.get(tool, max(self.deadlines.values()))
+        if server is not None:
+            requested = requested_budget(server)
+            if requested is not None:
+                budget = min(budget, requested)
+        return asyncio.get_running_loop().time() + budget
+
+    def hedge_delay(self, endpoint: str) -> float:
+        window = self.latencies.get(endpoint)
+        if window is None or len(window.samples) < self.min_samples:
+            return self.initial_hedge_delay
+        return window.quantile(0.95)
+
+    async def get(
+        self,
+        endpoint: str,
+        path: str,
+        deadline: float,
+        hedge: bool = False,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """GET `path` by `deadline`. `endpoint` names the route, e.g. "/articles/{id}"."""
+        return await self.request("GET", endpoint, path, deadline, hedge=hedge, **kwargs)
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        path: str,
+        deadline: float,
+        hedge: bool = False,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a request by `deadline`; only idempotent requests should be hedged.
+
+        Raises CircuitOpenError without sending anything while the circuit of
+        `method endpoint` is open.
+        """
+        name = f"{method} {endpoint}"
+        stale_key = (path, tuple(sorted((kwargs.get("params") or {}).items())))
+        circuit = admitted = None
+        if self.breaker:
+            circuit = self.circuits.get(name)
+            if circuit is None:
+                circuit = self.circuits[name] = CircuitBreaker(
+                    name, failure_rate=self.failure_rate, open_seconds=self.open_seconds
+                )
+            admitted = circuit.allow()
+            if admitted is None:
+                self.stats.rejected += 1
+                cached = self.stale.get(stale_key) if method == "GET" else None
+                if cached is None:
+                    raise CircuitOpenError(name, circuit.retry_after())
+                self.stats.stale_served += 1
+                age, response = cached
+                raise CircuitOpenError(name, circuit.retry_after(), response, age)
+
+        failed = None
+        started = time.perf_counter()
+        try:
+            response = await self._send(method, endpoint, path, deadline, hedge, **kwargs)
+            failed = (
+                response.status_code >= 500
+                or response.status_code == 429
+                or time.perf_counter() - started > self.slow_call
+            )
+        except Exception:
+            failed = True
+            raise
+        finally:
+            if circuit is not None:
+                circuit.record(admitted, failed)
+
+        if method == "GET" and response.is_success:
+            self.stale.put(stale_key, response)
+        return response
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        path: str,
+        deadline: float,
+        hedge: bool,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        self.stats.requests += 1
+        loop = asyncio.get_running_loop()
+        window = self.latencies.setdefault(endpoint, LatencyWindow())
+        budget = deadline - loop.time()
+
+        async def send() -> httpx.Response:
+            started = time.perf_counter()
+            try:
+                response = await self.client.request(
+                    method,
+                    self.base_url + path,
+                    timeout=max(0.001, deadline - loop.time()),
+                    **kwargs,
+                )
+            except asyncio.CancelledError:
+                # A cancelled request still tells us the latency was at least this long
+                window.observe(time.perf_counter() - started)
+                raise
+            window.observe(time.perf_counter() - started)
+            return response
+
+        try:
+            if budget <= 0:
+                raise TimeoutError
+            async with asyncio.timeout_at(deadline):
+                if hedge and self.hedging:
+                    return await self._hedged(send, self.hedge_delay(endpoint))
+                return await send()
+        except (TimeoutError, httpx.TimeoutException):
+            self.stats.timeouts += 1
+            raise TimeoutError(
+                f"{method} {endpoint} did not answer within {max(budget, 0.0):.1f}s"
+            ) from None
+        except Exception:
+            self.stats.errors += 1
+            raise
+
+    async def _hedged(
+        self, send: Callable[[], Awaitable[httpx.Response]], delay: float
+    ) -> httpx.Response:
+        primary = asyncio.create_task(send())
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or self.stats.hedged >= self.hedge_budget * self.stats.requests:
+                return await primary
+
+            self.stats.hedged += 1
+            backup = asyncio.create_task(send())
+            tasks.append(backup)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self.stats.hedge_wins += 1
+                        return task.result()
+            return primary.result()  # Both failed: raise the first request's error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # Retrieved, so asyncio does not log it
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-friendly summary of the upstream requests."""
+        stats = self.stats
+        return {
+            "requests": stats.requests,
+            "errors": stats.errors,
+            "timeouts": stats.timeouts,
+            "hedging": self.hedging,
+            "hedged": stats.hedged,
+            "hedge_rate": round(stats.hedged / stats.requests, 4) if stats.requests else 0.0,
+            "hedge_wins": stats.hedge_wins,
+            "win_rate": round(stats.hedge_wins / stats.hedged, 4) if stats.hedged else 0.0,
+            "hedge_delay_seconds": {
+                endpoint: round(self.hedge_delay(endpoint), 6) for endpoint in self.latencies
+            },
+            "rejected": stats.rejected,
+            "stale_served": stats.stale_served,
+            "circuits": {
+                name: {
+                    "state": circuit.state,
+                    "failure_rate": round(circuit.current_failure_rate(), 4),
+                    "times_opened": circuit.times_opened,
+                    "rejected": circuit.rejected,
+                    "retry_after_seconds": round(circuit.retry_after(), 3)
+                    if circuit.state == CircuitBreaker.OPEN
+                    else 0.0,
+                }
+                for name, circuit in self.circuits.items()
+            },
+        }
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
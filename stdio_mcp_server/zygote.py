@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Warm "zygote" launcher for the stdio MCP servers.
+
+Starting a stdio server spends most of its time importing `mcp` and its
+dependencies before it can answer `initialize`. The zygote pays that cost
+once: it imports every server module, then listens on a Unix socket and
+forks a ready server process for each connection.
+
+    python zygote.py serve [--socket PATH]            # start the zygote
+    python zygote.py run [--socket PATH] SERVER.py [ARGS...]
+
+`run` is a tiny launcher that MCP clients spawn in place of the server. It
+passes its stdin, stdout and stderr to the zygote over the socket, so the
+forked server talks to the client directly, then waits for the server and
+exits with its exit code. If no zygote is running, or the script is not one
+of the preloaded servers, `run` simply executes the script itself.
+
+The socket defaults to $MCP_ZYGOTE_SOCKET, or mcp-zygote-<uid>.sock in the
+temporary directory. Only servers in SERVER_MODULES can be forked.
+"""
+
+import json
+import os
+import signal
+import socket
+import sys
+import tempfile
+
+SERVER_MODULES = (
+    "calculator_mcp_server",
+    "combined_mcp_server",
+    "dev_blog_mcp_server",
+    "fast_mcp_server",
+    "image_generator_mcp_server",
+    "server",
+)
+
+# Optional dependencies that servers import lazily; loaded up front here so
+# forked servers start with them warm
+WARM_MODULES = ("numpy",)
+
+
+def default_socket_path() -> str:
+    return os.getenv("MCP_ZYGOTE_SOCKET") or os.path.join(
+        tempfile.gettempdir(), f"mcp-zygote-{os.getuid()}.sock"
+    )
+
+
+def _send_message(conn: socket.socket, message: dict) -> None:
+    conn.sendall(json.dumps(message).encode() + b"\n")
+
+
+# ---------------------------------------------------------------------------
+# Zygote
+
+
+def _preload() -> dict:
+    import importlib
+
+    modules = {name: importlib.import_module(name) for name in SERVER_MODULES}
+    for name in WARM_MODULES:
+        try:
+            # Touch an attribute so a lazily imported module actually loads
+            importlib.import_module(name).__name__
+        except ImportError:
+            pass
+    return modules
+
+
+def _reopen_stdio() -> None:
+    """Rebind sys.stdin/stdout/stderr, and log handlers, to the new fds 0-2."""
+    import logging
+
+    old_stderr = sys.stderr
+    sys.stdin = open(0, "r", encoding="utf-8", closefd=False)
+    sys.stdout = open(1, "w", encoding="utf-8", closefd=False)
+    sys.stderr = open(2, "w", buffering=1, encoding="utf-8", errors="backslashreplace", closefd=False)
+    for handler in logging.root.handlers:
+        if isinstance(handler, logging.StreamHandler) and handler.stream is old_stderr:
+            handler.setStream(sys.stderr)
+
+
+def _run_forked_server(module, request: dict, fds: list) -> None:
+    """Become the requested server, talking over the launcher's stdio. Never returns."""
+    code = 1
+    try:
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+            os.close(fd)
+        _reopen_stdio()
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+        sys.argv = [request["script"], *request["args"]]
+
+        module.main()
+        code = 0
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException:
+        import traceback
+
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def serve(socket_path: str) -> None:
+    import logging
+    import selectors
+    import stat
+    import time
+
+    # Only ever replace a stale socket: --socket may point at any file
+    try:
+        if not stat.S_ISSOCK(os.stat(socket_path).st_mode):
+            raise ValueError(f"{socket_path} exists and is not a socket")
+        os.unlink(socket_path)
+    except FileNotFoundError:
+        pass
+
+    started = time.perf_counter()
+    modules = _preload()
+    logger = logging.getLogger("zygote")
+    logger.info(f"Preloaded {len(modules)} servers in {time.perf_counter() - started:.2f}s")
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Created owner-only: a chmod after bind() would leave a window in which
+    # other local users could connect
+    umask = os.umask(0o177)
+    try:
+        listener.bind(socket_path)
+    finally:
+        os.umask(umask)
+    listener.listen()
+    logger.info(f"Zygote listening on {socket_path}")
+
+    selector = selectors.DefaultSelector()
+    selector.register(listener, selectors.EVENT_READ)
+    children = {}  # pid -> launcher connection
+
+    def handle_connection(conn: socket.socket) -> None:
+        message, fds, _, _ = socket.recv_fds(conn, 65536, 3)
+        try:
+            request = json.loads(message)
+            directory, filename = os.path.split(request["script"])
+            module_name = os.path.splitext(filename)[0]
+            if (
+                module_name not in modules
+                or directory != os.path.dirname(os.path.abspath(__file__))
+                or len(fds) != 3
+            ):
+                _send_message(conn, {"error": f"Cannot fork {request['script']}"})
+                conn.close()
+                return
+
+            sys.stdout.flush()
+            sys.stderr.flush()
+            pid = os.fork()
+            if pid == 0:
+                selector.close()
+                for sock in (listener, conn, *children.values()):
+                    sock.close()
+                _run_forked_server(modules[module_name], request, fds)
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+        children[pid] = conn
+        selector.register(conn, selectors.EVENT_READ, pid)
+        _send_message(conn, {"pid": pid})
+        logger.info(f"Forked {module_name} as pid {pid}")
+
+    try:
+        while True:
+            for key, _ in selector.select(timeout=0.2):
+                if key.fileobj is listener:
+                    conn, _ = listener.accept()
+                    try:
+                        handle_connection(conn)
+                    except (OSError, ValueError, KeyError) as e:
+                        logger.warning(f"Rejected launcher request: {e}")
+                        conn.close()
+                else:
+                    # The launcher went away without waiting for its server
+                    pid = key.data
+                    if not key.fileobj.recv(1):
+                        selector.unregister(key.fileobj)
+                        try:
+                            os.kill(pid, signal.SIGTERM)
+                        except ProcessLookupError:
+                            pass
+
+            while children:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+                if pid == 0:
+                    break
+                conn = children.pop(pid, None)
+                if conn is None:
+                    continue
+                try:
+                    selector.unregister(conn)
+                except KeyError:
+                    pass
+                try:
+                    _send_message(conn, {"exit": os.waitstatus_to_exitcode(status)})
+                except OSError:
+                    pass
+                conn.close()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        os.unlink(socket_path)
+
+
+# ---------------------------------------------------------------------------
+# Launcher
+
+
+def _exec_directly(script: str, args: list) -> None:
+    os.execv(sys.executable, [sys.executable, script, *args])
+
+
+def run(socket_path: str, script: str, args: list) -> None:
+    script = os.path.abspath(script)
+    try:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(socket_path)
+    except OSError:
+        _exec_directly(script, args)
+
+    request = {"script": script, "args": args, "cwd": os.getcwd(), "env": dict(os.environ)}
+    socket.send_fds(conn, [json.dumps(request).encode()], [0, 1, 2])
+
+    replies = conn.makefile("r")
+    reply = json.loads(replies.readline() or '{"error": "zygote closed the connection"}')
+    if "pid" not in reply:
+        conn.close()
+        _exec_directly(script, args)
+
+    # Forward termination to the server, which is the zygote's child, not ours
+    pid = reply["pid"]
+    for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+        signal.signal(signum, lambda signum, _: os.kill(pid, signum))
+
+    line = replies.readline()
+    sys.exit(json.loads(line)["exit"] if line else 1)
+
+
+def main() -> None:
+    import argparse
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--socket", default=None, help="Unix socket path")
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser(
+        "serve", parents=[common], help="Preload the servers and fork them on request"
+    )
+    run_parser = commands.add_parser(
+        "run", parents=[common], help="Start a server through the zygote"
+    )
+    run_parser.add_argument("script")
+    run_parser.add_argument("args", nargs=argparse.REMAINDER)
+    options = parser.parse_args()
+
+    socket_path = options.socket or default_socket_path()
+    if options.command == "serve":
+        serve(socket_path)
+    else:
+        run(socket_path, options.script, options.args)
+
+
+if __name__ == "__main__":
+    main()